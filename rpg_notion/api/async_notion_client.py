@@ -0,0 +1,387 @@
+"""
+Asynchronní klientská třída pro interakci s Notion API.
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from notion_client import AsyncClient
+from notion_client.errors import APIResponseError, HTTPResponseError
+
+from rpg_notion.api.notion_client import NotionClientWrapper
+from rpg_notion.api.rate_limiter import TokenBucketRateLimiter, get_default_rate_limiter
+from rpg_notion.api.schema_cache import DatabaseSchemaCache, validate_properties
+from rpg_notion.config.settings import (
+    NOTION_API_KEY,
+    NOTION_MAX_CONCURRENCY,
+    NOTION_MAX_RETRIES,
+    NOTION_RATE_LIMIT_DELAY,
+    NOTION_VALIDATE_PROPERTIES,
+    NOTION_VERSION,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNotionClientWrapper:
+    """
+    Asynchronní wrapper kolem oficiálního Notion klienta s omezením
+    souběžných požadavků, správou rate limitů a zpracováním chyb.
+
+    Nezávislé požadavky (např. vytvoření všech entit z jednoho tahu) lze
+    spustit souběžně pomocí ``asyncio.gather`` nebo metod ``create_pages``
+    a ``update_pages``; počet současně běžících požadavků omezuje semafor
+    a jejich rychlost limiter sdílený se synchronním klientem.
+    Vlastnosti zapisovaných stránek se kontrolují proti schématu databáze
+    stejně jako u synchronního klienta; cache schémat lze s ním sdílet.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        validate: bool = NOTION_VALIDATE_PROPERTIES,
+        schema_cache: Optional[DatabaseSchemaCache] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ):
+        """
+        Inicializace asynchronního Notion klienta.
+
+        Args:
+            api_key: Notion API klíč. Pokud není zadán, použije se z konfigurace.
+            max_concurrency: Maximální počet souběžných požadavků. Pokud není zadán, použije se z konfigurace.
+            rate_limiter: Limiter požadavků. Pokud není zadán, použije se limiter sdílený v rámci procesu.
+            validate: Zda kontrolovat vlastnosti stránek proti schématu databáze před odesláním.
+            schema_cache: Cache schémat databází (např. sdílená se synchronním klientem).
+                Pokud není zadána, vytvoří se nová.
+            http_client: HTTP klient pro požadavky na Notion API (např. napojený na lokální
+                náhradu ``FakeNotion``). Pokud není zadán, vytvoří se výchozí.
+        """
+        self.api_key = api_key or NOTION_API_KEY
+        if not self.api_key:
+            raise ValueError("Notion API klíč není nastaven.")
+
+        self.client = AsyncClient(auth=self.api_key, notion_version=NOTION_VERSION, client=http_client)
+        self.max_retries = NOTION_MAX_RETRIES
+        self.rate_limit_delay = NOTION_RATE_LIMIT_DELAY
+        self.max_concurrency = max_concurrency or NOTION_MAX_CONCURRENCY
+        if self.max_concurrency < 1:
+            raise ValueError(f"Neplatný limit souběžných požadavků: {self.max_concurrency}")
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
+        self.validate = validate
+        self.schema_cache = schema_cache or DatabaseSchemaCache()
+
+    async def __aenter__(self) -> "AsyncNotionClientWrapper":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Uzavře HTTP spojení klienta.
+        """
+        await self.client.aclose()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """
+        Vrátí semafor omezující počet souběžných požadavků.
+
+        Semafor se vytváří líně, aby vznikl uvnitř běžící smyčky událostí.
+
+        Returns:
+            Semafor pro omezení souběžnosti.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def _handle_rate_limit(self, retry_count: int) -> None:
+        """
+        Zpracování rate limitu s exponenciálním zpožděním.
+
+        Args:
+            retry_count: Počet dosavadních pokusů.
+        """
+        delay = self.rate_limit_delay * (2 ** retry_count)
+        logger.warning(f"Rate limit dosažen. Čekání {delay} sekund před dalším pokusem.")
+        await asyncio.sleep(delay)
+
+    async def _execute_with_retry(self, operation: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        Provede operaci s automatickým opakováním při rate limitu.
+
+        Během čekání na token limiteru ani na další pokus operace nedrží
+        místo v semaforu, takže neblokuje ostatní požadavky.
+
+        Args:
+            operation: Asynchronní funkce k provedení.
+            *args: Argumenty pro funkci.
+            **kwargs: Klíčové argumenty pro funkci.
+
+        Returns:
+            Výsledek operace.
+
+        Raises:
+            Exception: Pokud operace selže i po maximálním počtu pokusů.
+        """
+        retry_count = 0
+        while retry_count <= self.max_retries:
+            await self.rate_limiter.acquire_async()
+            try:
+                async with self._get_semaphore():
+                    return await operation(*args, **kwargs)
+            except (APIResponseError, HTTPResponseError) as e:
+                if hasattr(e, "code") and e.code == "rate_limited" and retry_count < self.max_retries:
+                    retry_count += 1
+                    retry_after = NotionClientWrapper._get_retry_after(e)
+                    if retry_after is not None:
+                        self.rate_limiter.pause(retry_after)
+                    else:
+                        await self._handle_rate_limit(retry_count)
+                else:
+                    logger.error(f"Chyba při volání Notion API: {e}")
+                    raise
+            except Exception as e:
+                logger.error(f"Neočekávaná chyba: {e}")
+                raise
+
+    # Databáze
+
+    async def get_database(self, database_id: str) -> Dict[str, Any]:
+        """
+        Získá databázi z Notion a uloží její schéma do cache.
+
+        Args:
+            database_id: ID databáze.
+
+        Returns:
+            Databáze.
+        """
+        database = await self._execute_with_retry(
+            self.client.databases.retrieve,
+            database_id=database_id,
+        )
+        if isinstance(database, dict) and isinstance(database.get("properties"), dict):
+            self.schema_cache.store(database_id, database["properties"])
+        return database
+
+    async def get_database_schema(self, database_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Vrátí schéma vlastností databáze, při prvním použití ho načte z Notion.
+
+        Args:
+            database_id: ID databáze.
+
+        Returns:
+            Schéma (název vlastnosti -> ID, typ a povolené možnosti).
+        """
+        schema = self.schema_cache.get(database_id)
+        if schema is None:
+            schema = self.schema_cache.store(database_id, (await self.get_database(database_id)).get("properties", {}))
+        return schema
+
+    async def _validate_properties(
+        self, database_id: str, properties: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Zkontroluje vlastnosti stránky proti schématu databáze, pokud je kontrola zapnutá.
+
+        Args:
+            database_id: ID databáze.
+            properties: Vlastnosti stránky.
+
+        Returns:
+            Převedené vlastnosti stránky.
+
+        Raises:
+            ValueError: Pokud vlastnosti neodpovídají schématu databáze.
+        """
+        if not self.validate or not properties:
+            return properties
+        return validate_properties(await self.get_database_schema(database_id), properties, database_id)
+
+    async def query_database(
+        self,
+        database_id: str,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        page_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Dotaz na databázi v Notion.
+
+        Args:
+            database_id: ID databáze.
+            filter: Filtr pro dotaz.
+            sorts: Řazení výsledků.
+            page_size: Počet výsledků na jednu stránku odpovědi.
+            max_pages: Maximální počet načtených stránek odpovědi.
+
+        Returns:
+            Seznam stránek v databázi.
+        """
+        return [
+            page
+            async for page in self.iter_query_database(
+                database_id, filter=filter, sorts=sorts, page_size=page_size, max_pages=max_pages
+            )
+        ]
+
+    async def iter_query_database(
+        self,
+        database_id: str,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        page_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        filter_properties: Optional[List[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Postupně prochází výsledky dotazu na databázi v Notion.
+
+        Args:
+            database_id: ID databáze.
+            filter: Filtr pro dotaz.
+            sorts: Řazení výsledků.
+            page_size: Počet výsledků na jednu stránku odpovědi.
+            max_pages: Maximální počet načtených stránek odpovědi.
+            filter_properties: ID vlastností, které mají stránky ve výsledku obsahovat.
+                Pokud nejsou zadána, vrátí se všechny vlastnosti.
+
+        Yields:
+            Stránky v databázi.
+        """
+        params = NotionClientWrapper._build_query_params(filter, sorts)
+        if filter_properties:
+            params["filter_properties"] = filter_properties
+        params["page_size"] = NotionClientWrapper._resolve_page_size(page_size)
+
+        start_cursor = None
+        pages_loaded = 0
+        while max_pages is None or pages_loaded < max_pages:
+            request_params = dict(params)
+            if start_cursor:
+                request_params["start_cursor"] = start_cursor
+
+            response = await self._execute_with_retry(
+                self.client.databases.query,
+                database_id=database_id,
+                **request_params,
+            )
+            pages_loaded += 1
+            for page in response.get("results", []):
+                if page.get("id"):
+                    self.schema_cache.remember_page(page["id"], database_id)
+                yield page
+
+            start_cursor = response.get("next_cursor")
+            if not response.get("has_more") or not start_cursor:
+                return
+
+        logger.warning(f"Dosažen limit {max_pages} stránek výsledků, další výsledky nebyly načteny.")
+
+    # Stránky
+
+    async def create_page(
+        self, parent_id: str, parent_type: str = "database_id", properties: Optional[Dict[str, Any]] = None,
+        content: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Vytvoří novou stránku v Notion.
+
+        Args:
+            parent_id: ID rodiče (databáze nebo stránky).
+            parent_type: Typ rodiče ('database_id' nebo 'page_id').
+            properties: Vlastnosti stránky.
+            content: Obsah stránky.
+
+        Returns:
+            Vytvořená stránka.
+        """
+        if parent_type == "database_id":
+            properties = await self._validate_properties(parent_id, properties)
+        params = NotionClientWrapper._build_create_page_params(parent_id, parent_type, properties, content)
+
+        page = await self._execute_with_retry(
+            self.client.pages.create,
+            **params,
+        )
+        if parent_type == "database_id" and isinstance(page, dict) and page.get("id"):
+            self.schema_cache.remember_page(page["id"], parent_id)
+        return page
+
+    async def update_page(
+        self, page_id: str, properties: Optional[Dict[str, Any]] = None, archived: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Aktualizuje existující stránku v Notion.
+
+        Vlastnosti se kontrolují proti schématu, pokud je známá databáze stránky
+        (stránka byla vytvořena, načtena nebo nalezena dotazem klientem se stejnou cache schémat).
+
+        Args:
+            page_id: ID stránky.
+            properties: Nové vlastnosti stránky.
+            archived: Zda má být stránka archivována.
+
+        Returns:
+            Aktualizovaná stránka.
+        """
+        database_id = self.schema_cache.database_of(page_id)
+        if database_id:
+            properties = await self._validate_properties(database_id, properties)
+        params = NotionClientWrapper._build_update_page_params(properties, archived)
+
+        return await self._execute_with_retry(
+            self.client.pages.update,
+            page_id=page_id,
+            **params,
+        )
+
+    async def create_pages(self, pages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Souběžně vytvoří více stránek v Notion.
+
+        Args:
+            pages: Seznam slovníků s argumenty pro ``create_page``
+                (parent_id, parent_type, properties, content).
+
+        Returns:
+            Vytvořené stránky ve stejném pořadí jako vstup.
+        """
+        return list(await asyncio.gather(*(self.create_page(**page) for page in pages)))
+
+    async def update_pages(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Souběžně aktualizuje více stránek v Notion.
+
+        Args:
+            updates: Seznam slovníků s argumenty pro ``update_page``
+                (page_id, properties, archived).
+
+        Returns:
+            Aktualizované stránky ve stejném pořadí jako vstup.
+        """
+        return list(await asyncio.gather(*(self.update_page(**update) for update in updates)))
+
+    async def append_block_children(self, block_id: str, children: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Přidá potomky k bloku (stránce nebo bloku) v Notion.
+
+        Args:
+            block_id: ID bloku.
+            children: Seznam potomků k přidání.
+
+        Returns:
+            Výsledek operace.
+        """
+        return await self._execute_with_retry(
+            self.client.blocks.children.append,
+            block_id=block_id,
+            children=children,
+        )
@@ -1,11 +1,14 @@
 """
 Správce databází v Notion.
 """
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from rpg_notion.api.notion_client import NotionClientWrapper
-from rpg_notion.config.settings import NOTION_DATABASE_IDS
+from rpg_notion.config.settings import NOTION_DATABASE_IDS, NOTION_MAX_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
@@ -15,15 +18,77 @@ class NotionDatabaseManager:
     Třída pro správu databází v Notion.
     """
 
-    def __init__(self, notion_client: Optional[NotionClientWrapper] = None):
+    # Názvy databází v Notion podle klíče databáze
+    DATABASE_TITLES = {
+        "events": "Události",
+        "npcs": "NPC",
+        "locations": "Lokace",
+        "items": "Předměty",
+        "monsters": "Příšery",
+        "quests": "Questy",
+        "factions": "Frakce",
+        "adventure_journal": "Deník dobrodružství",
+    }
+
+    def __init__(self, notion_client: Optional[NotionClientWrapper] = None, max_workers: int = NOTION_MAX_CONCURRENCY):
         """
         Inicializace správce databází.
 
         Args:
             notion_client: Instance NotionClientWrapper. Pokud není zadána, vytvoří se nová.
+            max_workers: Maximální počet souběžných požadavků při vytváření databází.
         """
         self.client = notion_client or NotionClientWrapper()
         self.database_ids = NOTION_DATABASE_IDS.copy()
+        self.max_workers = max_workers
+
+    def _create_database(self, key: str, parent_page_id: str, properties: Dict[str, Any]) -> str:
+        """
+        Vytvoří databázi v Notion a zapamatuje si její ID.
+
+        Args:
+            key: Klíč databáze (např. ``npcs``).
+            parent_page_id: ID rodičovské stránky.
+            properties: Vlastnosti databáze.
+
+        Returns:
+            ID vytvořené databáze.
+        """
+        title = self.DATABASE_TITLES[key]
+        response = self.client.create_database(
+            parent_page_id=parent_page_id,
+            title=title,
+            properties=properties,
+        )
+        
+        database_id = response["id"]
+        self.database_ids[key] = database_id
+        logger.info(f"Vytvořena databáze {title} s ID: {database_id}")
+        return database_id
+
+    def _database_properties(self, key: str) -> Dict[str, Any]:
+        """
+        Sestaví vlastnosti databáze podle jejího klíče.
+
+        Relace odkazují na databáze podle aktuálně známých ID.
+
+        Args:
+            key: Klíč databáze.
+
+        Returns:
+            Vlastnosti databáze pro Notion API.
+        """
+        builders: Dict[str, Callable[[], Dict[str, Any]]] = {
+            "events": self._events_properties,
+            "npcs": self._npcs_properties,
+            "locations": self._locations_properties,
+            "items": self._items_properties,
+            "monsters": self._monsters_properties,
+            "quests": self._quests_properties,
+            "factions": self._factions_properties,
+            "adventure_journal": self._adventure_journal_properties,
+        }
+        return builders[key]()
 
     def create_adventure_journal_db(self, parent_page_id: str) -> str:
         """
@@ -35,7 +100,16 @@ class NotionDatabaseManager:
         Returns:
             ID vytvořené databáze.
         """
-        properties = {
+        return self._create_database("adventure_journal", parent_page_id, self._adventure_journal_properties())
+
+    def _adventure_journal_properties(self) -> Dict[str, Any]:
+        """
+        Sestaví vlastnosti databáze Deník dobrodružství.
+
+        Returns:
+            Vlastnosti databáze pro Notion API.
+        """
+        return {
             "Datum a čas": {
                 "date": {}
             },
@@ -65,17 +139,6 @@ class NotionDatabaseManager:
             }
         }
 
-        response = self.client.create_database(
-            parent_page_id=parent_page_id,
-            title="Deník dobrodružství",
-            properties=properties,
-        )
-        
-        database_id = response["id"]
-        self.database_ids["adventure_journal"] = database_id
-        logger.info(f"Vytvořena databáze Deník dobrodružství s ID: {database_id}")
-        return database_id
-
     def create_npcs_db(self, parent_page_id: str) -> str:
         """
         Vytvoří databázi NPC v Notion.
@@ -86,7 +149,16 @@ class NotionDatabaseManager:
         Returns:
             ID vytvořené databáze.
         """
-        properties = {
+        return self._create_database("npcs", parent_page_id, self._npcs_properties())
+
+    def _npcs_properties(self) -> Dict[str, Any]:
+        """
+        Sestaví vlastnosti databáze NPC.
+
+        Returns:
+            Vlastnosti databáze pro Notion API.
+        """
+        return {
             "Jméno": {
                 "title": {}
             },
@@ -140,17 +212,6 @@ class NotionDatabaseManager:
             }
         }
 
-        response = self.client.create_database(
-            parent_page_id=parent_page_id,
-            title="NPC",
-            properties=properties,
-        )
-        
-        database_id = response["id"]
-        self.database_ids["npcs"] = database_id
-        logger.info(f"Vytvořena databáze NPC s ID: {database_id}")
-        return database_id
-
     def create_locations_db(self, parent_page_id: str) -> str:
         """
         Vytvoří databázi Lokace v Notion.
@@ -161,7 +222,16 @@ class NotionDatabaseManager:
         Returns:
             ID vytvořené databáze.
         """
-        properties = {
+        return self._create_database("locations", parent_page_id, self._locations_properties())
+
+    def _locations_properties(self) -> Dict[str, Any]:
+        """
+        Sestaví vlastnosti databáze Lokace.
+
+        Returns:
+            Vlastnosti databáze pro Notion API.
+        """
+        return {
             "Název": {
                 "title": {}
             },
@@ -229,17 +299,6 @@ class NotionDatabaseManager:
             }
         }
 
-        response = self.client.create_database(
-            parent_page_id=parent_page_id,
-            title="Lokace",
-            properties=properties,
-        )
-        
-        database_id = response["id"]
-        self.database_ids["locations"] = database_id
-        logger.info(f"Vytvořena databáze Lokace s ID: {database_id}")
-        return database_id
-
     def create_monsters_db(self, parent_page_id: str) -> str:
         """
         Vytvoří databázi Příšery v Notion.
@@ -250,7 +309,16 @@ class NotionDatabaseManager:
         Returns:
             ID vytvořené databáze.
         """
-        properties = {
+        return self._create_database("monsters", parent_page_id, self._monsters_properties())
+
+    def _monsters_properties(self) -> Dict[str, Any]:
+        """
+        Sestaví vlastnosti databáze Příšery.
+
+        Returns:
+            Vlastnosti databáze pro Notion API.
+        """
+        return {
             "Název/typ": {
                 "title": {}
             },
@@ -298,17 +366,6 @@ class NotionDatabaseManager:
             }
         }
 
-        response = self.client.create_database(
-            parent_page_id=parent_page_id,
-            title="Příšery",
-            properties=properties,
-        )
-        
-        database_id = response["id"]
-        self.database_ids["monsters"] = database_id
-        logger.info(f"Vytvořena databáze Příšery s ID: {database_id}")
-        return database_id
-
     def create_items_db(self, parent_page_id: str) -> str:
         """
         Vytvoří databázi Předměty v Notion.
@@ -319,7 +376,16 @@ class NotionDatabaseManager:
         Returns:
             ID vytvořené databáze.
         """
-        properties = {
+        return self._create_database("items", parent_page_id, self._items_properties())
+
+    def _items_properties(self) -> Dict[str, Any]:
+        """
+        Sestaví vlastnosti databáze Předměty.
+
+        Returns:
+            Vlastnosti databáze pro Notion API.
+        """
+        return {
             "Název": {
                 "title": {}
             },
@@ -371,17 +437,6 @@ class NotionDatabaseManager:
             }
         }
 
-        response = self.client.create_database(
-            parent_page_id=parent_page_id,
-            title="Předměty",
-            properties=properties,
-        )
-        
-        database_id = response["id"]
-        self.database_ids["items"] = database_id
-        logger.info(f"Vytvořena databáze Předměty s ID: {database_id}")
-        return database_id
-
     def create_quests_db(self, parent_page_id: str) -> str:
         """
         Vytvoří databázi Questy v Notion.
@@ -392,7 +447,16 @@ class NotionDatabaseManager:
         Returns:
             ID vytvořené databáze.
         """
-        properties = {
+        return self._create_database("quests", parent_page_id, self._quests_properties())
+
+    def _quests_properties(self) -> Dict[str, Any]:
+        """
+        Sestaví vlastnosti databáze Questy.
+
+        Returns:
+            Vlastnosti databáze pro Notion API.
+        """
+        return {
             "Název": {
                 "title": {}
             },
@@ -446,17 +510,6 @@ class NotionDatabaseManager:
             }
         }
 
-        response = self.client.create_database(
-            parent_page_id=parent_page_id,
-            title="Questy",
-            properties=properties,
-        )
-        
-        database_id = response["id"]
-        self.database_ids["quests"] = database_id
-        logger.info(f"Vytvořena databáze Questy s ID: {database_id}")
-        return database_id
-
     def create_factions_db(self, parent_page_id: str) -> str:
         """
         Vytvoří databázi Frakce v Notion.
@@ -467,7 +520,16 @@ class NotionDatabaseManager:
         Returns:
             ID vytvořené databáze.
         """
-        properties = {
+        return self._create_database("factions", parent_page_id, self._factions_properties())
+
+    def _factions_properties(self) -> Dict[str, Any]:
+        """
+        Sestaví vlastnosti databáze Frakce.
+
+        Returns:
+            Vlastnosti databáze pro Notion API.
+        """
+        return {
             "Název": {
                 "title": {}
             },
@@ -514,17 +576,6 @@ class NotionDatabaseManager:
             }
         }
 
-        response = self.client.create_database(
-            parent_page_id=parent_page_id,
-            title="Frakce",
-            properties=properties,
-        )
-        
-        database_id = response["id"]
-        self.database_ids["factions"] = database_id
-        logger.info(f"Vytvořena databáze Frakce s ID: {database_id}")
-        return database_id
-
     def create_events_db(self, parent_page_id: str) -> str:
         """
         Vytvoří databázi Události v Notion.
@@ -535,7 +586,16 @@ class NotionDatabaseManager:
         Returns:
             ID vytvořené databáze.
         """
-        properties = {
+        return self._create_database("events", parent_page_id, self._events_properties())
+
+    def _events_properties(self) -> Dict[str, Any]:
+        """
+        Sestaví vlastnosti databáze Události.
+
+        Returns:
+            Vlastnosti databáze pro Notion API.
+        """
+        return {
             "Název": {
                 "title": {}
             },
@@ -574,76 +634,207 @@ class NotionDatabaseManager:
             }
         }
 
-        response = self.client.create_database(
-            parent_page_id=parent_page_id,
-            title="Události",
-            properties=properties,
-        )
-        
-        database_id = response["id"]
-        self.database_ids["events"] = database_id
-        logger.info(f"Vytvořena databáze Události s ID: {database_id}")
-        return database_id
-
-    def create_all_databases(self, parent_page_id: str) -> Dict[str, str]:
+    def create_all_databases(self, parent_page_id: str, manifest_path: Optional[Union[str, Path]] = None) -> Dict[str, str]:
         """
-        Vytvoří všechny databáze v Notion.
+        Vytvoří všechny databáze v Notion, pokud ještě neexistují.
+
+        Existující databáze se najdou v manifestu (pokud je zadán) nebo jedním
+        vyhledáváním mezi databázemi rodičovské stránky, takže opakované
+        spuštění nic nevytváří. Chybějící databáze se vytvoří souběžně bez
+        relací na dosud neexistující databáze a všechny chybějící relace se
+        pak doplní jedním souběžným průchodem (po jedné aktualizaci na databázi).
+        U databází, které už existovaly, se relace zkontrolují podle jejich
+        schématu a chybějící se doplní, takže opakované spuštění opraví i běh,
+        který selhal při doplňování relací. Kontrola se vynechá, pokud manifest
+        potvrzuje, že předchozí běh skončil úspěšně.
 
         Args:
             parent_page_id: ID rodičovské stránky.
+            manifest_path: Cesta k souboru JSON s ID databází vytvořených pod rodičovskou
+                stránkou. Po vytvoření databází se manifest aktualizuje.
 
         Returns:
-            Slovník s ID všech vytvořených databází.
+            Slovník s ID všech databází.
         """
-        # Nejprve vytvoříme databáze, které nemají závislosti
-        self.create_events_db(parent_page_id)
-        self.create_npcs_db(parent_page_id)
-        self.create_locations_db(parent_page_id)
-        self.create_items_db(parent_page_id)
-        
-        # Poté vytvoříme databáze, které mají závislosti
-        self.create_monsters_db(parent_page_id)
-        self.create_quests_db(parent_page_id)
-        self.create_factions_db(parent_page_id)
-        self.create_adventure_journal_db(parent_page_id)
-        
-        # Aktualizujeme relace v databázích, které byly vytvořeny před jejich závislostmi
-        self._update_database_relations()
-        
+        existing, relations_complete = (
+            self._load_manifest(manifest_path, parent_page_id) if manifest_path else ({}, False)
+        )
+        if len(existing) < len(self.DATABASE_TITLES):
+            for key, database_id in self.find_existing_databases(parent_page_id).items():
+                existing.setdefault(key, database_id)
+
+        missing = [key for key in self.DATABASE_TITLES if key not in existing]
+        for key in self.DATABASE_TITLES:
+            self.database_ids[key] = existing.get(key)
+        if missing:
+            self._bootstrap_missing(parent_page_id, missing)
+            self._repair_relations([key for key in self.DATABASE_TITLES if key not in missing])
+        elif relations_complete:
+            logger.info("Všechny databáze už existují.")
+        else:
+            self._repair_relations(list(self.DATABASE_TITLES))
+
+        if manifest_path:
+            self._save_manifest(manifest_path, parent_page_id)
         return self.database_ids
 
-    def _update_database_relations(self) -> None:
+    def _bootstrap_missing(self, parent_page_id: str, missing: List[str]) -> None:
         """
-        Aktualizuje relace v databázích, které byly vytvořeny před jejich závislostmi.
+        Vytvoří chybějící databáze a doplní relace, které na ně vedou nebo z nich vycházejí.
+
+        Args:
+            parent_page_id: ID rodičovské stránky.
+            missing: Klíče chybějících databází.
         """
-        # Aktualizace relací v databázi NPC
-        if self.database_ids.get("npcs") and self.database_ids.get("locations"):
-            properties = {
-                "Lokace": {
-                    "relation": {
-                        "database_id": self.database_ids["locations"],
-                        "single_property": True,
-                    }
-                }
+        # Vytvoření chybějících databází, relace na ještě nevytvořené databáze se vynechají
+        creations = {}
+        for key in missing:
+            properties = self._database_properties(key)
+            creations[key] = {
+                name: value for name, value in properties.items()
+                if "relation" not in value or value["relation"]["database_id"]
             }
-            self.client.update_database(
-                database_id=self.database_ids["npcs"],
-                properties=properties,
-            )
-            logger.info("Aktualizovány relace v databázi NPC")
-        
-        # Aktualizace relací v databázi Události
-        if self.database_ids.get("events") and self.database_ids.get("locations"):
-            properties = {
-                "Místo": {
-                    "relation": {
-                        "database_id": self.database_ids["locations"],
-                        "single_property": True,
-                    }
-                }
+        self._run_parallel([
+            (lambda key=key, properties=properties: self._create_database(key, parent_page_id, properties))
+            for key, properties in creations.items()
+        ])
+
+        # Doplnění relací, které při vytváření chyběly
+        created_ids = {self.database_ids[key] for key in missing}
+        patches = {}
+        for key in self.DATABASE_TITLES:
+            relations = {
+                name: value for name, value in self._database_properties(key).items()
+                if "relation" in value
+                and (key in missing or value["relation"]["database_id"] in created_ids)
+                and creations.get(key, {}).get(name) != value
+            }
+            if relations:
+                patches[key] = relations
+        self._run_parallel([
+            (lambda key=key, relations=relations: self.client.update_database(
+                database_id=self.database_ids[key],
+                properties=relations,
+            ))
+            for key, relations in patches.items()
+        ])
+        logger.info(f"Aktualizovány relace v {len(patches)} databázích")
+
+    def _repair_relations(self, keys: List[str]) -> None:
+        """
+        Doplní relace, které ve schématu existujících databází chybějí nebo vedou jinam.
+
+        Args:
+            keys: Klíče existujících databází.
+        """
+        if not keys:
+            return
+        databases = self._run_parallel([
+            (lambda key=key: self.client.get_database(self.database_ids[key])) for key in keys
+        ])
+
+        patches = {}
+        for key, database in zip(keys, databases):
+            schema = database.get("properties", {})
+            relations = {
+                name: value for name, value in self._database_properties(key).items()
+                if "relation" in value and value["relation"]["database_id"].replace("-", "") != (
+                    schema.get(name, {}).get("relation", {}).get("database_id") or ""
+                ).replace("-", "")
             }
-            self.client.update_database(
-                database_id=self.database_ids["events"],
-                properties=properties,
+            if relations:
+                patches[key] = relations
+        self._run_parallel([
+            (lambda key=key, relations=relations: self.client.update_database(
+                database_id=self.database_ids[key],
+                properties=relations,
+            ))
+            for key, relations in patches.items()
+        ])
+        if patches:
+            logger.info(f"Doplněny chybějící relace v {len(patches)} databázích")
+
+    def find_existing_databases(self, parent_page_id: str) -> Dict[str, str]:
+        """
+        Najde databáze tohoto projektu, které už existují pod rodičovskou stránkou.
+
+        Args:
+            parent_page_id: ID rodičovské stránky.
+
+        Returns:
+            Slovník klíč databáze -> ID databáze.
+        """
+        keys_by_title = {title: key for key, title in self.DATABASE_TITLES.items()}
+        parent = parent_page_id.replace("-", "")
+        found: Dict[str, str] = {}
+        for result in self.client.search("", filter={"property": "object", "value": "database"}):
+            if result.get("archived") or result.get("in_trash"):
+                continue
+            if result.get("parent", {}).get("page_id", "").replace("-", "") != parent:
+                continue
+            title = "".join(item.get("plain_text", "") for item in result.get("title", []))
+            key = keys_by_title.get(title)
+            if key and key not in found:
+                found[key] = result["id"]
+        return found
+
+    def _run_parallel(self, calls: List[Callable[[], Any]]) -> List[Any]:
+        """
+        Provede volání Notion API souběžně.
+
+        Args:
+            calls: Volání bez argumentů.
+
+        Returns:
+            Výsledky volání ve stejném pořadí.
+        """
+        if len(calls) <= 1 or self.max_workers <= 1:
+            return [call() for call in calls]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(calls))) as executor:
+            return list(executor.map(lambda call: call(), calls))
+
+    def _load_manifest(self, manifest_path: Union[str, Path], parent_page_id: str) -> Tuple[Dict[str, str], bool]:
+        """
+        Načte ID databází z manifestu.
+
+        Args:
+            manifest_path: Cesta k manifestu.
+            parent_page_id: ID rodičovské stránky, ke které se manifest musí vztahovat.
+
+        Returns:
+            Slovník klíč databáze -> ID databáze (prázdný, pokud manifest neexistuje
+            nebo patří jiné rodičovské stránce) a příznak, zda jsou doplněny všechny relace.
+        """
+        path = Path(manifest_path)
+        if not path.exists():
+            return {}, False
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("parent_page_id") != parent_page_id:
+            return {}, False
+        database_ids = {
+            key: database_id for key, database_id in manifest.get("database_ids", {}).items()
+            if key in self.DATABASE_TITLES and database_id
+        }
+        return database_ids, bool(manifest.get("relations_complete"))
+
+    def _save_manifest(self, manifest_path: Union[str, Path], parent_page_id: str) -> None:
+        """
+        Uloží ID databází do manifestu.
+
+        Ukládá se jen po úspěšném vytvoření databází i relací, proto manifest
+        zároveň potvrzuje, že relace jsou kompletní.
+
+        Args:
+            manifest_path: Cesta k manifestu.
+            parent_page_id: ID rodičovské stránky.
+        """
+        path = Path(manifest_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"parent_page_id": parent_page_id, "database_ids": self.database_ids, "relations_complete": True},
+                f,
+                ensure_ascii=False,
+                indent=2,
             )
-            logger.info("Aktualizovány relace v databázi Události")
@@ -2,11 +2,14 @@
 Správce entit v Notion.
 """
 import logging
+import re
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple
 
 from rpg_notion.api.notion_client import NotionClientWrapper
 from rpg_notion.config.settings import NOTION_DATABASE_IDS
+from rpg_notion.models.converters import NotionConverter
+from rpg_notion.models.entities import EntityType
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +19,20 @@ class NotionEntityManager:
     Třída pro správu entit v Notion.
     """
 
+    # Maximální počet podmínek v jednom složeném filtru Notion API
+    MAX_FILTER_CONDITIONS = 100
+
+    # Maximální délka obsahu jednoho textového objektu a maximální počet textových
+    # objektů v jedné hodnotě rich_text
+    MAX_TEXT_LENGTH = 2000
+    MAX_TEXT_OBJECTS = 100
+
+    # Maximální počet bloků v jednom požadavku na přidání potomků bloku
+    MAX_BLOCK_CHILDREN = 100
+
+    # Záznam historie začíná časovým razítkem z _format_history_entry
+    HISTORY_ENTRY_PATTERN = re.compile(r"^\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] ")
+
     def __init__(self, notion_client: Optional[NotionClientWrapper] = None):
         """
         Inicializace správce entit.
@@ -26,27 +43,6 @@ class NotionEntityManager:
         self.client = notion_client or NotionClientWrapper()
         self.database_ids = NOTION_DATABASE_IDS.copy()
 
-    def _create_title_property(self, title: str) -> Dict[str, Any]:
-        """
-        Vytvoří vlastnost title pro Notion.
-
-        Args:
-            title: Název entity.
-
-        Returns:
-            Vlastnost title pro Notion.
-        """
-        return {
-            "title": [
-                {
-                    "type": "text",
-                    "text": {
-                        "content": title,
-                    },
-                }
-            ]
-        }
-
     def _create_rich_text_property(self, text: str) -> Dict[str, Any]:
         """
         Vytvoří vlastnost rich_text pro Notion.
@@ -58,105 +54,47 @@ class NotionEntityManager:
             Vlastnost rich_text pro Notion.
         """
         return {
-            "rich_text": [
-                {
-                    "type": "text",
-                    "text": {
-                        "content": text,
-                    },
-                }
-            ]
+            "rich_text": self._create_text_objects(text)
         }
 
-    def _create_select_property(self, option: str) -> Dict[str, Any]:
+    def _create_text_objects(self, text: str) -> List[Dict[str, Any]]:
         """
-        Vytvoří vlastnost select pro Notion.
+        Rozdělí text na textové objekty Notion s nejvýše MAX_TEXT_LENGTH znaky.
 
         Args:
-            option: Vybraná možnost.
+            text: Text.
 
         Returns:
-            Vlastnost select pro Notion.
-        """
-        return {
-            "select": {
-                "name": option,
+            Seznam textových objektů (alespoň jeden, i pro prázdný text).
+        """
+        chunks = [text[start:start + self.MAX_TEXT_LENGTH] for start in range(0, len(text), self.MAX_TEXT_LENGTH)]
+        return [
+            {
+                "type": "text",
+                "text": {
+                    "content": chunk,
+                },
             }
-        }
-
-    def _create_multi_select_property(self, options: List[str]) -> Dict[str, Any]:
-        """
-        Vytvoří vlastnost multi_select pro Notion.
+            for chunk in chunks or [""]
+        ]
 
-        Args:
-            options: Seznam vybraných možností.
-
-        Returns:
-            Vlastnost multi_select pro Notion.
-        """
-        return {
-            "multi_select": [
-                {
-                    "name": option,
-                }
-                for option in options
-            ]
-        }
-
-    def _create_relation_property(self, page_ids: Union[str, List[str]]) -> Dict[str, Any]:
-        """
-        Vytvoří vlastnost relation pro Notion.
-
-        Args:
-            page_ids: ID stránky nebo seznam ID stránek.
-
-        Returns:
-            Vlastnost relation pro Notion.
-        """
-        if isinstance(page_ids, str):
-            page_ids = [page_ids]
-
-        return {
-            "relation": [
-                {
-                    "id": page_id,
-                }
-                for page_id in page_ids
-            ]
-        }
-
-    def _create_date_property(self, date: Optional[datetime] = None) -> Dict[str, Any]:
-        """
-        Vytvoří vlastnost date pro Notion.
-
-        Args:
-            date: Datum a čas. Pokud není zadáno, použije se aktuální datum a čas.
-
-        Returns:
-            Vlastnost date pro Notion.
-        """
-        if date is None:
-            date = datetime.now()
-
-        return {
-            "date": {
-                "start": date.isoformat(),
-            }
-        }
-
-    def _create_number_property(self, number: Union[int, float]) -> Dict[str, Any]:
+    def _entity_properties(
+        self, entity_type: EntityType, values: Dict[str, Any], required: Tuple[str, ...] = ("name",)
+    ) -> Dict[str, Any]:
         """
-        Vytvoří vlastnost number pro Notion.
+        Sestaví vlastnosti nové stránky z hodnot polí podle PROPERTY_MAP.
 
         Args:
-            number: Číslo.
+            entity_type: Typ entity.
+            values: Slovník název pole modelu -> hodnota.
+            required: Pole, která se zapíší i s prázdnou hodnotou. Ostatní prázdná pole se vynechají.
 
         Returns:
-            Vlastnost number pro Notion.
+            Vlastnosti pro Notion API.
         """
-        return {
-            "number": number
-        }
+        return NotionConverter.values_to_properties(
+            entity_type, {field: value for field, value in values.items() if field in required or value}
+        )
 
     def find_entity_by_name(self, database_id: str, name: str) -> Optional[Dict[str, Any]]:
         """
@@ -176,15 +114,67 @@ class NotionEntityManager:
             }
         }
 
+        # Stačí první výsledek, další stránky se nenačítají
         results = self.client.query_database(
             database_id=database_id,
             filter=filter_params,
+            page_size=1,
+            max_pages=1,
         )
 
         if results:
             return results[0]
         return None
 
+    def find_entities_by_names(self, database_id: str, names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Najde v databázi entity podle více názvů najednou.
+
+        Názvy se spojí do složeného filtru ``or``, takže na jednu dávku
+        (nejvýše MAX_FILTER_CONDITIONS názvů) stačí jeden dotaz.
+
+        Args:
+            database_id: ID databáze.
+            names: Názvy entit.
+
+        Returns:
+            Seznam nalezených stránek (v libovolném pořadí).
+        """
+        results = []
+        for filter_params in self.name_filters(names):
+            results.extend(self.client.query_database(database_id=database_id, filter=filter_params))
+
+        return results
+
+    @classmethod
+    def name_filters(cls, names: List[str]) -> List[Dict[str, Any]]:
+        """
+        Sestaví složené filtry pro vyhledání entit podle více názvů.
+
+        Args:
+            names: Názvy entit.
+
+        Returns:
+            Filtry ``or`` s nejvýše MAX_FILTER_CONDITIONS názvy, jeden na dotaz.
+        """
+        unique_names = list(dict.fromkeys(name for name in names if name))
+
+        filters = []
+        for start in range(0, len(unique_names), cls.MAX_FILTER_CONDITIONS):
+            chunk = unique_names[start:start + cls.MAX_FILTER_CONDITIONS]
+            filters.append({
+                "or": [
+                    {
+                        "property": "title",
+                        "title": {
+                            "equals": name,
+                        },
+                    }
+                    for name in chunk
+                ]
+            })
+        return filters
+
     def find_entity_by_property(
         self, database_id: str, property_name: str, property_value: Any, property_type: str = "rich_text"
     ) -> Optional[Dict[str, Any]]:
@@ -231,9 +221,12 @@ class NotionEntityManager:
         else:
             raise ValueError(f"Nepodporovaný typ vlastnosti: {property_type}")
 
+        # Stačí první výsledek, další stránky se nenačítají
         results = self.client.query_database(
             database_id=database_id,
             filter=filter_params,
+            page_size=1,
+            max_pages=1,
         )
 
         if results:
@@ -269,29 +262,21 @@ class NotionEntityManager:
         Returns:
             Vytvořená NPC postava.
         """
-        properties = {
-            "Jméno": self._create_title_property(name),
-            "Popis": self._create_rich_text_property(description),
-            "Stav": self._create_select_property(status),
-        }
-
-        if occupation:
-            properties["Povolání/role"] = self._create_rich_text_property(occupation)
-
-        if location_id:
-            properties["Lokace"] = self._create_relation_property(location_id)
-
-        if related_npc_ids:
-            properties["Vztahy"] = self._create_relation_property(related_npc_ids)
-
-        if item_ids:
-            properties["Významné předměty"] = self._create_relation_property(item_ids)
-
-        if history:
-            properties["Historie změn"] = self._create_rich_text_property(history)
-
-        if tags:
-            properties["Tagy"] = self._create_multi_select_property(tags)
+        properties = self._entity_properties(
+            EntityType.NPC,
+            {
+                "name": name,
+                "description": description,
+                "status": status,
+                "occupation": occupation,
+                "location_id": location_id,
+                "related_npc_ids": related_npc_ids,
+                "item_ids": item_ids,
+                "history": history,
+                "tags": tags,
+            },
+            required=("name", "description", "status"),
+        )
 
         return self.client.create_page(
             parent_id=self.database_ids["npcs"],
@@ -327,29 +312,21 @@ class NotionEntityManager:
         Returns:
             Vytvořená lokace.
         """
-        properties = {
-            "Název": self._create_title_property(name),
-            "Typ": self._create_select_property(location_type),
-            "Stav": self._create_select_property(status),
-        }
-
-        if hierarchy:
-            properties["Hierarchie"] = self._create_rich_text_property(hierarchy)
-
-        if description:
-            properties["Popis prostředí"] = self._create_rich_text_property(description)
-
-        if npc_ids:
-            properties["Obyvatelé"] = self._create_relation_property(npc_ids)
-
-        if item_ids:
-            properties["Významné objekty"] = self._create_relation_property(item_ids)
-
-        if event_ids:
-            properties["Události"] = self._create_relation_property(event_ids)
-
-        if tags:
-            properties["Tagy"] = self._create_multi_select_property(tags)
+        properties = self._entity_properties(
+            EntityType.LOCATION,
+            {
+                "name": name,
+                "location_type": location_type,
+                "hierarchy": hierarchy,
+                "description": description,
+                "npc_ids": npc_ids,
+                "item_ids": item_ids,
+                "event_ids": event_ids,
+                "status": status,
+                "tags": tags,
+            },
+            required=("name", "location_type", "status"),
+        )
 
         return self.client.create_page(
             parent_id=self.database_ids["locations"],
@@ -383,28 +360,20 @@ class NotionEntityManager:
         Returns:
             Vytvořená příšera.
         """
-        properties = {
-            "Název/typ": self._create_title_property(name),
-            "Stav": self._create_select_property(status),
-        }
-
-        if description:
-            properties["Popis a schopnosti"] = self._create_rich_text_property(description)
-
-        if location_ids:
-            properties["Místo výskytu"] = self._create_relation_property(location_ids)
-
-        if combat_history:
-            properties["Průběh soubojů"] = self._create_rich_text_property(combat_history)
-
-        if weaknesses_strengths:
-            properties["Slabiny a silné stránky"] = self._create_rich_text_property(weaknesses_strengths)
-
-        if loot_ids:
-            properties["Kořist"] = self._create_relation_property(loot_ids)
-
-        if tags:
-            properties["Tagy"] = self._create_multi_select_property(tags)
+        properties = self._entity_properties(
+            EntityType.MONSTER,
+            {
+                "name": name,
+                "description": description,
+                "location_ids": location_ids,
+                "status": status,
+                "combat_history": combat_history,
+                "weaknesses_strengths": weaknesses_strengths,
+                "loot_ids": loot_ids,
+                "tags": tags,
+            },
+            required=("name", "status"),
+        )
 
         return self.client.create_page(
             parent_id=self.database_ids["monsters"],
@@ -438,28 +407,20 @@ class NotionEntityManager:
         Returns:
             Vytvořený předmět.
         """
-        properties = {
-            "Název": self._create_title_property(name),
-            "Typ": self._create_select_property(item_type),
-        }
-
-        if description:
-            properties["Popis a vlastnosti"] = self._create_rich_text_property(description)
-
-        if location_id:
-            properties["Místo nalezení"] = self._create_relation_property(location_id)
-
-        if owner_id:
-            properties["Současný vlastník"] = self._create_relation_property(owner_id)
-
-        if ownership_history:
-            properties["Historie vlastnictví"] = self._create_rich_text_property(ownership_history)
-
-        if special_abilities:
-            properties["Speciální schopnosti"] = self._create_rich_text_property(special_abilities)
-
-        if tags:
-            properties["Tagy"] = self._create_multi_select_property(tags)
+        properties = self._entity_properties(
+            EntityType.ITEM,
+            {
+                "name": name,
+                "item_type": item_type,
+                "description": description,
+                "location_id": location_id,
+                "owner_id": owner_id,
+                "ownership_history": ownership_history,
+                "special_abilities": special_abilities,
+                "tags": tags,
+            },
+            required=("name", "item_type"),
+        )
 
         return self.client.create_page(
             parent_id=self.database_ids["items"],
@@ -495,31 +456,21 @@ class NotionEntityManager:
         Returns:
             Vytvořený quest.
         """
-        properties = {
-            "Název": self._create_title_property(name),
-            "Stav": self._create_select_property(status),
-        }
-
-        if description:
-            properties["Popis a cíle"] = self._create_rich_text_property(description)
-
-        if giver_id:
-            properties["Zadavatel"] = self._create_relation_property(giver_id)
-
-        if rewards:
-            properties["Odměny"] = self._create_rich_text_property(rewards)
-
-        if location_ids:
-            properties["Související lokace"] = self._create_relation_property(location_ids)
-
-        if npc_ids:
-            properties["Související NPC"] = self._create_relation_property(npc_ids)
-
-        if timeline:
-            properties["Časová linie"] = self._create_rich_text_property(timeline)
-
-        if tags:
-            properties["Tagy"] = self._create_multi_select_property(tags)
+        properties = self._entity_properties(
+            EntityType.QUEST,
+            {
+                "name": name,
+                "description": description,
+                "giver_id": giver_id,
+                "status": status,
+                "rewards": rewards,
+                "location_ids": location_ids,
+                "npc_ids": npc_ids,
+                "timeline": timeline,
+                "tags": tags,
+            },
+            required=("name", "status"),
+        )
 
         return self.client.create_page(
             parent_id=self.database_ids["quests"],
@@ -553,28 +504,20 @@ class NotionEntityManager:
         Returns:
             Vytvořená frakce.
         """
-        properties = {
-            "Název": self._create_title_property(name),
-            "Vztah k hráči": self._create_number_property(player_relation),
-        }
-
-        if description:
-            properties["Popis a cíle"] = self._create_rich_text_property(description)
-
-        if member_ids:
-            properties["Členové"] = self._create_relation_property(member_ids)
-
-        if territory_ids:
-            properties["Území"] = self._create_relation_property(territory_ids)
-
-        if faction_relations:
-            properties["Vztahy s jinými frakcemi"] = self._create_rich_text_property(faction_relations)
-
-        if event_ids:
-            properties["Významné události"] = self._create_relation_property(event_ids)
-
-        if tags:
-            properties["Tagy"] = self._create_multi_select_property(tags)
+        properties = self._entity_properties(
+            EntityType.FACTION,
+            {
+                "name": name,
+                "description": description,
+                "member_ids": member_ids,
+                "territory_ids": territory_ids,
+                "faction_relations": faction_relations,
+                "player_relation": player_relation,
+                "event_ids": event_ids,
+                "tags": tags,
+            },
+            required=("name", "player_relation"),
+        )
 
         return self.client.create_page(
             parent_id=self.database_ids["factions"],
@@ -606,25 +549,19 @@ class NotionEntityManager:
         Returns:
             Vytvořená událost.
         """
-        properties = {
-            "Název": self._create_title_property(name),
-            "Datum a čas": self._create_date_property(date),
-        }
-
-        if description:
-            properties["Popis"] = self._create_rich_text_property(description)
-
-        if location_id:
-            properties["Místo"] = self._create_relation_property(location_id)
-
-        if npc_ids:
-            properties["Zúčastněné postavy"] = self._create_relation_property(npc_ids)
-
-        if consequences:
-            properties["Důsledky"] = self._create_rich_text_property(consequences)
-
-        if tags:
-            properties["Tagy"] = self._create_multi_select_property(tags)
+        properties = self._entity_properties(
+            EntityType.EVENT,
+            {
+                "name": name,
+                "date": date or datetime.now(),
+                "description": description,
+                "location_id": location_id,
+                "npc_ids": npc_ids,
+                "consequences": consequences,
+                "tags": tags,
+            },
+            required=("name", "date"),
+        )
 
         return self.client.create_page(
             parent_id=self.database_ids["events"],
@@ -654,22 +591,18 @@ class NotionEntityManager:
         Returns:
             Vytvořený záznam v deníku dobrodružství.
         """
-        properties = {
-            "Název epizody": self._create_title_property(title),
-            "Datum a čas": self._create_date_property(date),
-        }
-
-        if summary:
-            properties["Shrnutí příběhu"] = self._create_rich_text_property(summary)
-
-        if event_ids:
-            properties["Klíčové události"] = self._create_relation_property(event_ids)
-
-        if npc_ids:
-            properties["Zúčastněné postavy"] = self._create_relation_property(npc_ids)
-
-        if location_ids:
-            properties["Navštívené lokace"] = self._create_relation_property(location_ids)
+        properties = self._entity_properties(
+            EntityType.ADVENTURE_JOURNAL,
+            {
+                "name": title,
+                "date": date or datetime.now(),
+                "summary": summary,
+                "event_ids": event_ids,
+                "npc_ids": npc_ids,
+                "location_ids": location_ids,
+            },
+            required=("name", "date"),
+        )
 
         return self.client.create_page(
             parent_id=self.database_ids["adventure_journal"],
@@ -692,10 +625,43 @@ class NotionEntityManager:
             properties=properties,
         )
 
+    def _format_history_entry(self, entry: str) -> str:
+        """
+        Opatří záznam historie časovým razítkem.
+
+        Args:
+            entry: Záznam historie.
+
+        Returns:
+            Záznam s časovým razítkem.
+        """
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return f"[{timestamp}] {entry}"
+
+    def _get_rich_text_content(self, page: Dict[str, Any], property_name: str) -> str:
+        """
+        Získá text textové vlastnosti stránky.
+
+        Args:
+            page: Stránka z Notion API.
+            property_name: Název vlastnosti.
+
+        Returns:
+            Text vlastnosti, nebo prázdný řetězec, pokud vlastnost chybí.
+        """
+        return "".join(
+            text_item.get("text", {}).get("content", "")
+            for text_item in page.get("properties", {}).get(property_name, {}).get("rich_text") or []
+            if text_item.get("type") == "text"
+        )
+
     def update_entity_history(self, page_id: str, history_property: str, new_entry: str) -> Dict[str, Any]:
         """
         Aktualizuje historii entity v Notion.
 
+        Celá historie se načte ze stránky a zapíše zpět do vlastnosti, pro
+        dlouhou historii je výhodnější append_entity_history.
+
         Args:
             page_id: ID stránky entity.
             history_property: Název vlastnosti historie.
@@ -708,15 +674,11 @@ class NotionEntityManager:
         page = self.client.get_page(page_id)
         
         # Získáme aktuální historii
-        current_history = ""
-        if page.get("properties", {}).get(history_property, {}).get("rich_text"):
-            for text_item in page["properties"][history_property]["rich_text"]:
-                if text_item.get("type") == "text":
-                    current_history += text_item.get("text", {}).get("content", "")
+        current_history = self._get_rich_text_content(page, history_property)
         
         # Přidáme nový záznam s časovým razítkem
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        updated_history = f"{current_history}\n\n[{timestamp}] {new_entry}" if current_history else f"[{timestamp}] {new_entry}"
+        entry = self._format_history_entry(new_entry)
+        updated_history = f"{current_history}\n\n{entry}" if current_history else entry
         
         # Aktualizujeme stránku
         properties = {
@@ -727,3 +689,74 @@ class NotionEntityManager:
             page_id=page_id,
             properties=properties,
         )
+
+    def append_entity_history(self, page_id: str, entries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Připojí záznamy historie jako bloky na konec stránky entity.
+
+        Každý záznam (s časovým razítkem) tvoří jeden odstavec. Stránka se
+        nenačítá a velikost požadavku nezávisí na délce dosavadní historie;
+        všechny záznamy se odešlou jedním požadavkem (po MAX_BLOCK_CHILDREN blocích).
+
+        Args:
+            page_id: ID stránky entity.
+            entries: Záznamy historie.
+
+        Returns:
+            Odpovědi Notion API na jednotlivé požadavky.
+        """
+        blocks = [
+            {
+                "object": "block",
+                "type": "paragraph",
+                "paragraph": {
+                    "rich_text": self._create_text_objects(self._format_history_entry(entry))[:self.MAX_TEXT_OBJECTS],
+                },
+            }
+            for entry in entries
+        ]
+        return [
+            self.client.append_block_children(page_id, blocks[start:start + self.MAX_BLOCK_CHILDREN])
+            for start in range(0, len(blocks), self.MAX_BLOCK_CHILDREN)
+        ]
+
+    def compact_entity_history(self, page_id: str, history_property: str) -> Dict[str, Any]:
+        """
+        Zapíše historii uloženou v blocích stránky do vlastnosti pro zobrazení v databázi.
+
+        Za historii se považují jen odstavce připojené append_entity_history,
+        tedy ty, které začínají časovým razítkem; ostatní obsah stránky se
+        nekopíruje. Dosavadní text vlastnosti zůstane zachován a připojí se
+        za něj jen záznamy, které v něm ještě nejsou. Pokud se historie do
+        vlastnosti nevejde (MAX_TEXT_OBJECTS objektů po MAX_TEXT_LENGTH
+        znacích), zapíše se jen její konec.
+
+        Args:
+            page_id: ID stránky entity.
+            history_property: Název vlastnosti historie.
+
+        Returns:
+            Aktualizovaná entita.
+        """
+        current_history = self._get_rich_text_content(self.client.get_page(page_id), history_property)
+
+        entries = []
+        for block in self.client.iter_block_children(page_id):
+            if block.get("type") != "paragraph":
+                continue
+            text = "".join(
+                item.get("text", {}).get("content", "")
+                for item in block["paragraph"].get("rich_text", [])
+                if item.get("type") == "text"
+            )
+            if self.HISTORY_ENTRY_PATTERN.match(text):
+                entries.append(text)
+
+        # Záznamy do posledního již zkompaktovaného včetně ve vlastnosti jsou
+        compacted = max((index + 1 for index, entry in enumerate(entries) if entry in current_history), default=0)
+        history = "\n\n".join(([current_history] if current_history else []) + entries[compacted:])
+        history = history[-self.MAX_TEXT_LENGTH * self.MAX_TEXT_OBJECTS:]
+        return self.client.update_page(
+            page_id=page_id,
+            properties={history_property: self._create_rich_text_property(history)},
+        )
@@ -0,0 +1,1086 @@
+"""
+Lokální náhrada Notion API pro testy a zátěžová měření bez přístupu k síti.
+
+``FakeNotion`` drží databáze, stránky a bloky v paměti a odpovídá na
+požadavky oficiálního klienta ve stejném tvaru jako Notion API. K klientovi
+se připojuje přes transport knihovny httpx::
+
+    fake = FakeNotion(latency=0.05)
+    client = NotionClientWrapper(api_key="secret", http_client=fake.http_client())
+
+Podporované operace: ``databases.create/retrieve/update/query``,
+``pages.create/retrieve/update``, ``blocks.children.list/append`` a ``search``.
+Dotazy na databáze podporují filtry vlastností (title, rich_text, select,
+status, multi_select, relation, number, date, checkbox), filtry podle času
+vytvoření a úpravy, složené filtry ``and``/``or``, řazení, stránkování
+kurzorem a ``filter_properties``. Odezvu lze zpomalit a chyby 429 a 5xx
+vkládat jednotlivě (``fail_next``) nebo náhodně (``error_rate``).
+"""
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Maximální počet výsledků na stránku odpovědi a bloků v jednom požadavku
+MAX_PAGE_SIZE = 100
+MAX_BLOCK_CHILDREN = 100
+
+# Chybové kódy Notion API podle HTTP stavu vkládané chyby
+ERROR_CODES = {
+    400: "validation_error",
+    404: "object_not_found",
+    409: "conflict_error",
+    429: "rate_limited",
+    500: "internal_server_error",
+    502: "bad_gateway",
+    503: "service_unavailable",
+    504: "gateway_timeout",
+}
+
+# Typy vlastností s hodnotou ve tvaru pole textových objektů
+TEXT_TYPES = ("title", "rich_text")
+
+# Typy vlastností s hodnotou vybranou ze seznamu možností
+OPTION_TYPES = ("select", "status", "multi_select")
+
+# Barvy přiřazované nově vzniklým možnostem
+OPTION_COLORS = ["default", "gray", "brown", "orange", "yellow", "green", "blue", "purple", "pink", "red"]
+
+# Cesty podporovaných operací (metoda, regulární výraz cesty, název operace)
+ROUTES = [
+    ("POST", r"/v1/databases", "databases.create"),
+    ("GET", r"/v1/databases/(?P<id>[^/]+)", "databases.retrieve"),
+    ("PATCH", r"/v1/databases/(?P<id>[^/]+)", "databases.update"),
+    ("POST", r"/v1/databases/(?P<id>[^/]+)/query", "databases.query"),
+    ("POST", r"/v1/pages", "pages.create"),
+    ("GET", r"/v1/pages/(?P<id>[^/]+)", "pages.retrieve"),
+    ("PATCH", r"/v1/pages/(?P<id>[^/]+)", "pages.update"),
+    ("GET", r"/v1/blocks/(?P<id>[^/]+)/children", "blocks.children.list"),
+    ("PATCH", r"/v1/blocks/(?P<id>[^/]+)/children", "blocks.children.append"),
+    ("POST", r"/v1/search", "search"),
+]
+COMPILED_ROUTES = [(method, re.compile(pattern + "/?$"), name) for method, pattern, name in ROUTES]
+
+
+class FakeNotionError(Exception):
+    """
+    Chyba vrácená lokální náhradou Notion API jako chybová odpověď.
+    """
+
+    def __init__(self, status: int, message: str, code: Optional[str] = None, retry_after: Optional[float] = None):
+        """
+        Inicializace chyby.
+
+        Args:
+            status: HTTP stav odpovědi.
+            message: Popis chyby.
+            code: Chybový kód Notion API. Pokud není zadán, odvodí se ze stavu.
+            retry_after: Hodnota hlavičky Retry-After v sekundách.
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.code = code or ERROR_CODES.get(status, "internal_server_error")
+        self.retry_after = retry_after
+
+
+def _key(notion_id: str) -> str:
+    """
+    Normalizuje ID z Notion (s pomlčkami i bez nich).
+    """
+    return notion_id.replace("-", "")
+
+
+def _format_time(value: datetime) -> str:
+    """
+    Naformátuje čas ve tvaru, který vrací Notion API.
+    """
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.") + f"{value.microsecond // 1000:03d}Z"
+
+
+def _parse_time(value: Optional[str]) -> Optional[datetime]:
+    """
+    Převede datum nebo čas ve formátu ISO 8601 na čas v UTC.
+
+    Datum bez času odpovídá půlnoci, čas bez časového pásma se bere jako UTC.
+    """
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _plain_text(items: Optional[List[Dict[str, Any]]]) -> str:
+    """
+    Spojí čistý text pole textových objektů.
+    """
+    return "".join(item.get("plain_text", "") for item in items or [])
+
+
+def _rich_text(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Doplní textové objekty požadavku do tvaru, který vrací Notion API.
+
+    Args:
+        items: Textové objekty z požadavku.
+
+    Returns:
+        Textové objekty s poli ``plain_text``, ``annotations`` a ``href``.
+    """
+    result = []
+    for item in items:
+        text = item.get("text", {})
+        content = text.get("content", item.get("plain_text", ""))
+        result.append({
+            "type": "text",
+            "text": {"content": content, "link": text.get("link")},
+            "annotations": item.get("annotations", {
+                "bold": False, "italic": False, "strikethrough": False,
+                "underline": False, "code": False, "color": "default",
+            }),
+            "plain_text": content,
+            "href": (text.get("link") or {}).get("url"),
+        })
+    return result
+
+
+class FakeNotion:
+    """
+    Stav lokální náhrady Notion API a obsluha jejích požadavků.
+
+    Obsluha je vláknově bezpečná, takže ji lze sdílet mezi klienty
+    v různých vláknech i mezi synchronním a asynchronním klientem.
+    ID objektů se generují z ``seed``, takže stejný scénář dává stejná ID.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_statuses: Tuple[int, ...] = (429, 500, 502, 503),
+        retry_after: Optional[float] = 1.0,
+        seed: int = 1,
+        clock: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        """
+        Inicializace lokální náhrady Notion API.
+
+        Args:
+            latency: Doba odezvy každého požadavku v sekundách.
+            jitter: Největší náhodné prodloužení odezvy v sekundách.
+            error_rate: Podíl požadavků, které náhodně skončí chybou (0.0 - 1.0).
+            error_statuses: HTTP stavy, ze kterých se náhodné chyby vybírají.
+            retry_after: Hodnota hlavičky Retry-After u chyb 429 (None = bez hlavičky).
+            seed: Semínko generátoru ID a náhodných chyb.
+            clock: Zdroj aktuálního času pro ``created_time`` a ``last_edited_time``.
+
+        Raises:
+            ValueError: Pokud je podíl chyb mimo rozsah 0.0 - 1.0 nebo je odezva záporná.
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError(f"Podíl chyb musí být v rozsahu 0.0 - 1.0, zadáno: {error_rate}")
+        if latency < 0 or jitter < 0:
+            raise ValueError(f"Neplatná doba odezvy: {latency} (+{jitter}) s")
+
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.retry_after = retry_after
+        self.clock = clock
+
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.pages: Dict[str, Dict[str, Any]] = {}
+        self.blocks: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[str, List[str]] = {}
+        self.calls: Counter = Counter()
+        self._failures: Deque[FakeNotionError] = deque()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    # Připojení ke klientovi
+
+    def http_client(self) -> httpx.Client:
+        """
+        Vytvoří synchronní HTTP klienta, jehož požadavky obsluhuje tato náhrada.
+
+        Returns:
+            HTTP klient pro ``notion_client.Client`` a ``NotionClientWrapper``.
+        """
+        return httpx.Client(transport=FakeNotionTransport(self))
+
+    def async_http_client(self) -> httpx.AsyncClient:
+        """
+        Vytvoří asynchronní HTTP klienta, jehož požadavky obsluhuje tato náhrada.
+
+        Returns:
+            HTTP klient pro ``notion_client.AsyncClient`` a ``AsyncNotionClientWrapper``.
+        """
+        return httpx.AsyncClient(transport=AsyncFakeNotionTransport(self))
+
+    def delay(self) -> float:
+        """
+        Vrátí dobu odezvy dalšího požadavku.
+
+        Returns:
+            Doba odezvy v sekundách.
+        """
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._rng.uniform(0, self.jitter)
+
+    # Vkládání chyb
+
+    def fail_next(
+        self, status: int = 429, times: int = 1, retry_after: Optional[float] = None, code: Optional[str] = None
+    ) -> None:
+        """
+        Nastaví, že následující požadavky skončí chybou.
+
+        Args:
+            status: HTTP stav chybové odpovědi.
+            times: Počet požadavků, které skončí chybou.
+            retry_after: Hodnota hlavičky Retry-After. Pokud není zadána, u chyby 429
+                se použije výchozí hodnota.
+            code: Chybový kód Notion API. Pokud není zadán, odvodí se ze stavu.
+        """
+        if retry_after is None and status == 429:
+            retry_after = self.retry_after
+        with self._lock:
+            for _ in range(times):
+                self._failures.append(
+                    FakeNotionError(status, f"Vložená chyba {status}", code=code, retry_after=retry_after)
+                )
+
+    def _next_failure(self) -> Optional[FakeNotionError]:
+        """
+        Vrátí chybu, kterou má skončit aktuální požadavek, pokud nějaká je.
+        """
+        if self._failures:
+            return self._failures.popleft()
+        if self.error_rate and self._rng.random() < self.error_rate:
+            status = self._rng.choice(self.error_statuses)
+            return FakeNotionError(
+                status, f"Náhodná chyba {status}", retry_after=self.retry_after if status == 429 else None
+            )
+        return None
+
+    # Obsluha požadavků
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """
+        Obslouží jeden HTTP požadavek (bez simulované odezvy).
+
+        Args:
+            request: Požadavek klienta Notion.
+
+        Returns:
+            Odpověď ve tvaru Notion API.
+        """
+        path = request.url.path
+        match = None
+        for method, pattern, name in COMPILED_ROUTES:
+            match = pattern.match(path)
+            if match and method == request.method:
+                break
+        else:
+            return self._error_response(FakeNotionError(400, f"Neplatná URL požadavku: {request.method} {path}",
+                                                        code="invalid_request_url"))
+
+        body = json.loads(request.content) if request.content else {}
+        with self._lock:
+            self.calls[name] += 1
+            try:
+                failure = self._next_failure()
+                if failure is not None:
+                    logger.debug(f"Vložená chyba {failure.status} pro operaci {name}")
+                    raise failure
+                result = self._dispatch(name, match.groupdict().get("id"), body, request.url.params)
+            except FakeNotionError as e:
+                return self._error_response(e)
+        return httpx.Response(200, json=result)
+
+    @staticmethod
+    def _error_response(error: FakeNotionError) -> httpx.Response:
+        """
+        Sestaví chybovou odpověď ve tvaru Notion API.
+        """
+        headers = {}
+        if error.retry_after is not None:
+            headers["Retry-After"] = str(error.retry_after)
+        payload = {"object": "error", "status": error.status, "code": error.code, "message": error.message}
+        return httpx.Response(error.status, json=payload, headers=headers)
+
+    def _dispatch(self, name: str, object_id: Optional[str], body: Dict[str, Any], params: httpx.QueryParams) -> Any:
+        """
+        Provede operaci podle jejího názvu.
+        """
+        if name == "databases.create":
+            return self._create_database(body)
+        if name == "databases.retrieve":
+            return self._database(object_id)
+        if name == "databases.update":
+            return self._update_database(object_id, body)
+        if name == "databases.query":
+            return self._query_database(object_id, body, params.get_list("filter_properties"))
+        if name == "pages.create":
+            return self._create_page(body)
+        if name == "pages.retrieve":
+            return self._page(object_id)
+        if name == "pages.update":
+            return self._update_page(object_id, body)
+        if name == "blocks.children.list":
+            return self._list_children(object_id, params)
+        if name == "blocks.children.append":
+            return self._append_children(object_id, body.get("children", []))
+        return self._search(body)
+
+    # Přímé vytváření dat (bez HTTP, pro přípravu zátěžových scénářů)
+
+    def add_database(
+        self, title: str, properties: Dict[str, Any], parent_page_id: str = "fake-parent-page"
+    ) -> Dict[str, Any]:
+        """
+        Vytvoří databázi přímo, bez požadavku přes klienta.
+
+        Args:
+            title: Název databáze.
+            properties: Vlastnosti databáze ve tvaru požadavku Notion API.
+            parent_page_id: ID rodičovské stránky.
+
+        Returns:
+            Vytvořená databáze.
+        """
+        with self._lock:
+            return self._create_database({
+                "parent": {"type": "page_id", "page_id": parent_page_id},
+                "title": [{"type": "text", "text": {"content": title}}],
+                "properties": properties,
+            })
+
+    def add_page(self, database_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Vytvoří stránku v databázi přímo, bez požadavku přes klienta.
+
+        Args:
+            database_id: ID databáze.
+            properties: Vlastnosti stránky ve tvaru požadavku Notion API.
+
+        Returns:
+            Vytvořená stránka.
+
+        Raises:
+            FakeNotionError: Pokud databáze neexistuje nebo vlastnosti neodpovídají jejímu schématu.
+        """
+        with self._lock:
+            return self._create_page({"parent": {"database_id": database_id}, "properties": properties})
+
+    # Databáze
+
+    def _new_id(self) -> str:
+        """
+        Vygeneruje nové ID objektu.
+        """
+        return str(uuid.UUID(int=self._rng.getrandbits(128), version=4))
+
+    def _now(self) -> str:
+        """
+        Vrátí aktuální čas ve tvaru Notion API.
+        """
+        return _format_time(self.clock())
+
+    def _database(self, database_id: str) -> Dict[str, Any]:
+        """
+        Vrátí databázi podle ID.
+
+        Raises:
+            FakeNotionError: Pokud databáze neexistuje.
+        """
+        database = self.databases.get(_key(database_id))
+        if database is None:
+            raise FakeNotionError(404, f"Databáze s ID {database_id} neexistuje.")
+        return database
+
+    def _database_property(self, name: str, definition: Dict[str, Any], existing: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Sestaví definici vlastnosti databáze ve tvaru Notion API.
+
+        Args:
+            name: Název vlastnosti.
+            definition: Definice vlastnosti z požadavku.
+            existing: Dosavadní definice vlastnosti při aktualizaci databáze.
+
+        Returns:
+            Definice vlastnosti s ID, názvem a typem.
+
+        Raises:
+            FakeNotionError: Pokud definice neurčuje typ vlastnosti.
+        """
+        property_type = definition.get("type") or next(
+            (key for key in definition if key not in ("id", "name", "type", "description")), None
+        )
+        if property_type is None:
+            raise FakeNotionError(400, f"Vlastnost {name} nemá určený typ.")
+
+        config = dict(definition.get(property_type) or {})
+        if property_type in OPTION_TYPES:
+            config["options"] = [
+                {
+                    "id": option.get("id") or self._new_id()[:8],
+                    "name": option["name"],
+                    "color": option.get("color", "default"),
+                }
+                for option in config.get("options", [])
+            ]
+        if property_type == "relation":
+            config.setdefault("single_property", {})
+            if config["single_property"] is True:
+                config["single_property"] = {}
+
+        if existing is not None and existing["type"] == property_type:
+            property_id = existing["id"]
+        elif property_type == "title":
+            property_id = "title"
+        else:
+            property_id = self._new_id()[:4]
+        return {"id": property_id, "name": name, "type": property_type, property_type: config}
+
+    def _create_database(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Vytvoří databázi.
+
+        Raises:
+            FakeNotionError: Pokud databáze nemá právě jednu vlastnost typu title.
+        """
+        properties = {
+            name: self._database_property(name, definition, None)
+            for name, definition in body.get("properties", {}).items()
+        }
+        if sum(1 for definition in properties.values() if definition["type"] == "title") != 1:
+            raise FakeNotionError(400, "Databáze musí mít právě jednu vlastnost typu title.")
+
+        now = self._now()
+        database_id = self._new_id()
+        database = {
+            "object": "database",
+            "id": database_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "title": _rich_text(body.get("title", [])),
+            "description": [],
+            "parent": body.get("parent", {}),
+            "properties": properties,
+            "archived": False,
+            "in_trash": False,
+            "url": f"https://www.notion.so/{_key(database_id)}",
+        }
+        self.databases[_key(database_id)] = database
+        return database
+
+    def _update_database(self, database_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Aktualizuje název a vlastnosti databáze.
+
+        Vlastnost s hodnotou None se z databáze odstraní.
+        """
+        database = self._database(database_id)
+        if "title" in body:
+            database["title"] = _rich_text(body["title"])
+        for name, definition in (body.get("properties") or {}).items():
+            if definition is None:
+                database["properties"].pop(name, None)
+                continue
+            new_name = definition.get("name", name)
+            existing = database["properties"].pop(name, None)
+            if set(definition) <= {"name"} and existing is not None:
+                existing["name"] = new_name
+                database["properties"][new_name] = existing
+            else:
+                database["properties"][new_name] = self._database_property(new_name, definition, existing)
+        if "archived" in body:
+            database["archived"] = database["in_trash"] = bool(body["archived"])
+        database["last_edited_time"] = self._now()
+        return database
+
+    # Stránky
+
+    def _page(self, page_id: str) -> Dict[str, Any]:
+        """
+        Vrátí stránku podle ID.
+
+        Raises:
+            FakeNotionError: Pokud stránka neexistuje.
+        """
+        page = self.pages.get(_key(page_id))
+        if page is None:
+            raise FakeNotionError(404, f"Stránka s ID {page_id} neexistuje.")
+        return page
+
+    def _page_property(self, name: str, value: Dict[str, Any], definition: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Převede hodnotu vlastnosti z požadavku do tvaru, který vrací Notion API.
+
+        Neznámé možnosti výběru se do schématu databáze přidají, stejně jako v Notion.
+
+        Args:
+            name: Název vlastnosti.
+            value: Hodnota vlastnosti z požadavku.
+            definition: Definice vlastnosti v databázi (None u stránek mimo databázi).
+
+        Returns:
+            Hodnota vlastnosti s ID a typem.
+
+        Raises:
+            FakeNotionError: Pokud typ hodnoty neodpovídá schématu databáze.
+        """
+        if definition is not None:
+            property_type = definition["type"]
+            property_id = definition["id"]
+        else:
+            property_type = value.get("type") or next(key for key in value if key not in ("id", "type"))
+            property_id = property_type if property_type == "title" else name
+        if property_type not in value:
+            raise FakeNotionError(400, f"{name} je vlastnost typu {property_type}, hodnota ji neobsahuje.")
+
+        raw = value[property_type]
+        if property_type in TEXT_TYPES:
+            converted = _rich_text(raw or [])
+        elif property_type in ("select", "status"):
+            converted = self._option(definition, raw) if raw else None
+        elif property_type == "multi_select":
+            converted = [self._option(definition, option) for option in raw or []]
+        elif property_type == "relation":
+            converted = [{"id": item["id"]} for item in raw or []]
+        else:
+            converted = raw
+
+        result = {"id": property_id, "type": property_type, property_type: converted}
+        if property_type == "relation":
+            result["has_more"] = False
+        return result
+
+    def _option(self, definition: Optional[Dict[str, Any]], option: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Najde možnost výběru podle názvu, případně ji do schématu přidá.
+        """
+        if definition is None:
+            return {"id": option.get("id", option["name"]), "name": option["name"], "color": "default"}
+        options = definition[definition["type"]].setdefault("options", [])
+        for existing in options:
+            if existing["name"] == option.get("name") or existing["id"] == option.get("id"):
+                return existing
+        if "name" not in option:
+            raise FakeNotionError(400, f"Možnost s ID {option.get('id')} v databázi neexistuje.")
+        created = {
+            "id": self._new_id()[:8],
+            "name": option["name"],
+            "color": option.get("color", OPTION_COLORS[len(options) % len(OPTION_COLORS)]),
+        }
+        options.append(created)
+        return created
+
+    def _page_properties(self, properties: Dict[str, Any], database: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Převede vlastnosti stránky z požadavku.
+
+        Raises:
+            FakeNotionError: Pokud vlastnost v databázi neexistuje.
+        """
+        converted = {}
+        for name, value in properties.items():
+            definition = None
+            if database is not None:
+                definition = database["properties"].get(name)
+                if definition is None:
+                    definition = next((d for d in database["properties"].values() if d["id"] == name), None)
+                if definition is None:
+                    raise FakeNotionError(400, f"{name} is not a property that exists.")
+                name = definition["name"]
+            converted[name] = self._page_property(name, value, definition)
+        return converted
+
+    def _create_page(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Vytvoří stránku v databázi nebo pod jinou stránkou.
+
+        Raises:
+            FakeNotionError: Pokud rodič neexistuje nebo vlastnosti neodpovídají schématu.
+        """
+        parent = body.get("parent", {})
+        database = None
+        if parent.get("database_id"):
+            database = self._database(parent["database_id"])
+            parent = {"type": "database_id", "database_id": database["id"]}
+        elif parent.get("page_id"):
+            parent = {"type": "page_id", "page_id": parent["page_id"]}
+        else:
+            raise FakeNotionError(400, "Stránka musí mít rodičovskou databázi nebo stránku.")
+
+        properties = self._page_properties(body.get("properties", {}), database)
+        if database is not None:
+            # Notion vrací všechny vlastnosti databáze, nevyplněné jako prázdné hodnoty
+            for name, definition in database["properties"].items():
+                if name not in properties:
+                    properties[name] = self._empty_property(definition)
+
+        now = self._now()
+        page_id = self._new_id()
+        page = {
+            "object": "page",
+            "id": page_id,
+            "created_time": now,
+            "last_edited_time": now,
+            "created_by": {"object": "user", "id": "fake-user"},
+            "last_edited_by": {"object": "user", "id": "fake-user"},
+            "cover": None,
+            "icon": None,
+            "parent": parent,
+            "archived": False,
+            "in_trash": False,
+            "properties": properties,
+            "url": f"https://www.notion.so/{_key(page_id)}",
+            "public_url": None,
+        }
+        self.pages[_key(page_id)] = page
+        self.children[_key(page_id)] = []
+        if body.get("children"):
+            self._append_children(page_id, body["children"])
+        return page
+
+    @staticmethod
+    def _empty_property(definition: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Vrátí prázdnou hodnotu vlastnosti podle její definice.
+        """
+        property_type = definition["type"]
+        if property_type in TEXT_TYPES or property_type in ("multi_select", "relation", "people", "files"):
+            value: Any = []
+        elif property_type == "checkbox":
+            value = False
+        else:
+            value = None
+        result = {"id": definition["id"], "type": property_type, property_type: value}
+        if property_type == "relation":
+            result["has_more"] = False
+        return result
+
+    def _update_page(self, page_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Aktualizuje vlastnosti stránky nebo ji archivuje.
+        """
+        page = self._page(page_id)
+        database = None
+        if page["parent"].get("database_id"):
+            database = self._database(page["parent"]["database_id"])
+        page["properties"].update(self._page_properties(body.get("properties") or {}, database))
+        for flag in ("archived", "in_trash"):
+            if flag in body:
+                page["archived"] = page["in_trash"] = bool(body[flag])
+        for field in ("icon", "cover"):
+            if field in body:
+                page[field] = body[field]
+        page["last_edited_time"] = self._now()
+        return page
+
+    # Bloky
+
+    def _append_children(self, block_id: str, children: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Připojí bloky na konec stránky nebo bloku.
+
+        Raises:
+            FakeNotionError: Pokud rodič neexistuje nebo je bloků příliš mnoho.
+        """
+        parent_key = _key(block_id)
+        if parent_key not in self.children:
+            raise FakeNotionError(404, f"Blok s ID {block_id} neexistuje.")
+        if len(children) > MAX_BLOCK_CHILDREN:
+            raise FakeNotionError(
+                400, f"body.children.length should be ≤ `{MAX_BLOCK_CHILDREN}`, instead was `{len(children)}`."
+            )
+
+        now = self._now()
+        parent_type = "page_id" if parent_key in self.pages else "block_id"
+        created = []
+        for child in children:
+            block_type = child.get("type") or next(key for key in child if key != "object")
+            content = dict(child.get(block_type) or {})
+            if "rich_text" in content:
+                content["rich_text"] = _rich_text(content["rich_text"])
+            block_id_new = self._new_id()
+            block = {
+                "object": "block",
+                "id": block_id_new,
+                "parent": {"type": parent_type, parent_type: block_id},
+                "created_time": now,
+                "last_edited_time": now,
+                "has_children": False,
+                "archived": False,
+                "in_trash": False,
+                "type": block_type,
+                block_type: content,
+            }
+            self.blocks[_key(block_id_new)] = block
+            self.children[_key(block_id_new)] = []
+            self.children[parent_key].append(_key(block_id_new))
+            created.append(block)
+
+        if parent_key in self.blocks:
+            self.blocks[parent_key]["has_children"] = True
+        elif parent_key in self.pages:
+            self.pages[parent_key]["last_edited_time"] = now
+        return {"object": "list", "results": created, "next_cursor": None, "has_more": False, "type": "block", "block": {}}
+
+    def _list_children(self, block_id: str, params: httpx.QueryParams) -> Dict[str, Any]:
+        """
+        Vrátí stránku bloků připojených ke stránce nebo bloku.
+
+        Raises:
+            FakeNotionError: Pokud rodič neexistuje.
+        """
+        children = self.children.get(_key(block_id))
+        if children is None:
+            raise FakeNotionError(404, f"Blok s ID {block_id} neexistuje.")
+        page_size = int(params.get("page_size") or MAX_PAGE_SIZE)
+        blocks = [self.blocks[child] for child in children]
+        return self._paginate(blocks, params.get("start_cursor"), page_size, "block")
+
+    # Dotazy
+
+    @staticmethod
+    def _paginate(
+        results: List[Dict[str, Any]], start_cursor: Optional[str], page_size: Optional[int], result_type: str
+    ) -> Dict[str, Any]:
+        """
+        Vrátí jednu stránku výsledků se stránkováním kurzorem.
+
+        Kurzorem je ID prvního výsledku další stránky, stejně jako v Notion API.
+
+        Raises:
+            FakeNotionError: Pokud je velikost stránky nebo kurzor neplatný.
+        """
+        page_size = page_size or MAX_PAGE_SIZE
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise FakeNotionError(400, f"body.page_size should be ≤ `{MAX_PAGE_SIZE}`, instead was `{page_size}`.")
+        start = 0
+        if start_cursor:
+            ids = [_key(result["id"]) for result in results]
+            if _key(start_cursor) not in ids:
+                raise FakeNotionError(400, f"Neplatný kurzor: {start_cursor}")
+            start = ids.index(_key(start_cursor))
+
+        chunk = results[start:start + page_size]
+        has_more = start + page_size < len(results)
+        return {
+            "object": "list",
+            "results": chunk,
+            "next_cursor": results[start + page_size]["id"] if has_more else None,
+            "has_more": has_more,
+            "type": result_type,
+            result_type: {},
+        }
+
+    def _query_database(
+        self, database_id: str, body: Dict[str, Any], filter_properties: List[str]
+    ) -> Dict[str, Any]:
+        """
+        Vrátí stránky databáze odpovídající filtru a řazení.
+        """
+        database = self._database(database_id)
+        database_key = _key(database["id"])
+        pages = [
+            page for page in self.pages.values()
+            if not page["archived"] and _key(page["parent"].get("database_id", "")) == database_key
+        ]
+        if body.get("filter"):
+            pages = [page for page in pages if self._matches(page, body["filter"], database)]
+        for sort in reversed(body.get("sorts") or []):
+            pages.sort(key=lambda page: self._sort_key(page, sort), reverse=sort.get("direction") == "descending")
+
+        response = self._paginate(pages, body.get("start_cursor"), body.get("page_size"), "page")
+        if filter_properties:
+            wanted = set(filter_properties)
+            response["results"] = [
+                dict(page, properties={
+                    name: value for name, value in page["properties"].items() if value["id"] in wanted
+                })
+                for page in response["results"]
+            ]
+        return response
+
+    def _search(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Vyhledá stránky a databáze podle názvu.
+        """
+        query = (body.get("query") or "").lower()
+        object_filter = (body.get("filter") or {}).get("value")
+        candidates = []
+        if object_filter in (None, "database"):
+            candidates.extend(self.databases.values())
+        if object_filter in (None, "page"):
+            candidates.extend(self.pages.values())
+
+        results = [
+            candidate for candidate in candidates
+            if not candidate["archived"] and query in self._title(candidate).lower()
+        ]
+        sort = body.get("sort") or {"timestamp": "last_edited_time", "direction": "descending"}
+        results.sort(key=lambda result: result[sort.get("timestamp", "last_edited_time")],
+                     reverse=sort.get("direction") == "descending")
+        return self._paginate(results, body.get("start_cursor"), body.get("page_size"), "page_or_database")
+
+    @staticmethod
+    def _title(notion_object: Dict[str, Any]) -> str:
+        """
+        Vrátí název stránky nebo databáze.
+        """
+        if notion_object["object"] == "database":
+            return _plain_text(notion_object["title"])
+        for value in notion_object["properties"].values():
+            if value["type"] == "title":
+                return _plain_text(value["title"])
+        return ""
+
+    @staticmethod
+    def _property_value(page: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+        """
+        Najde hodnotu vlastnosti stránky podle názvu nebo ID.
+        """
+        value = page["properties"].get(name)
+        if value is None:
+            value = next((value for value in page["properties"].values() if value["id"] == name), None)
+        return value
+
+    def _sort_key(self, page: Dict[str, Any], sort: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Vrátí klíč řazení stránky, prázdné hodnoty se řadí na konec.
+        """
+        if "timestamp" in sort:
+            return (False, page[sort["timestamp"]])
+        value = self._property_value(page, sort["property"])
+        comparable = self._comparable(value) if value is not None else None
+        if isinstance(comparable, list):
+            comparable = comparable[0] if comparable else None
+        return (comparable is None, comparable if comparable is not None else "")
+
+    @staticmethod
+    def _comparable(value: Dict[str, Any]) -> Any:
+        """
+        Převede hodnotu vlastnosti na hodnotu pro porovnání ve filtrech a řazení.
+        """
+        property_type = value["type"]
+        raw = value[property_type]
+        if property_type in TEXT_TYPES:
+            return _plain_text(raw)
+        if property_type in ("select", "status"):
+            return raw["name"] if raw else None
+        if property_type == "multi_select":
+            return [option["name"] for option in raw]
+        if property_type == "relation":
+            return [_key(item["id"]) for item in raw]
+        if property_type == "date":
+            return _parse_time(raw["start"]) if raw else None
+        return raw
+
+    def _matches(self, page: Dict[str, Any], condition: Dict[str, Any], database: Dict[str, Any]) -> bool:
+        """
+        Vyhodnotí filtr dotazu na databázi pro jednu stránku.
+
+        Raises:
+            FakeNotionError: Pokud filtr odkazuje na neexistující vlastnost nebo nepodporovanou podmínku.
+        """
+        if "and" in condition:
+            return all(self._matches(page, part, database) for part in condition["and"])
+        if "or" in condition:
+            return any(self._matches(page, part, database) for part in condition["or"])
+
+        if "timestamp" in condition:
+            timestamp = condition["timestamp"]
+            return self._match_date(_parse_time(page[timestamp]), condition[timestamp])
+
+        name = condition.get("property")
+        value = self._property_value(page, name) if name else None
+        if value is None:
+            raise FakeNotionError(400, f"Could not find property with name or id: {name}")
+        filter_type = next(key for key in condition if key != "property")
+        if filter_type != value["type"] and not (filter_type in TEXT_TYPES and value["type"] in TEXT_TYPES):
+            raise FakeNotionError(
+                400, f"Filtr typu {filter_type} neodpovídá vlastnosti {name} typu {value['type']}."
+            )
+
+        comparable = self._comparable(value)
+        operator, operand = next(iter(condition[filter_type].items()))
+        if filter_type in TEXT_TYPES:
+            return self._match_text(comparable, operator, operand)
+        if filter_type in ("select", "status"):
+            return self._match_equality(comparable, operator, operand)
+        if filter_type in ("multi_select", "relation"):
+            if filter_type == "relation" and operand is not True:
+                operand = _key(operand)
+            return self._match_list(comparable, operator, operand)
+        if filter_type == "date":
+            return self._match_date(comparable, condition[filter_type])
+        if filter_type == "number":
+            return self._match_number(comparable, operator, operand)
+        if filter_type == "checkbox":
+            return self._match_equality(bool(comparable), operator, operand)
+        raise FakeNotionError(400, f"Nepodporovaný filtr typu {filter_type}.")
+
+    @staticmethod
+    def _match_text(text: str, operator: str, operand: Any) -> bool:
+        """
+        Vyhodnotí podmínku textového filtru.
+        """
+        if operator == "is_empty":
+            return not text
+        if operator == "is_not_empty":
+            return bool(text)
+        operations = {
+            "equals": lambda: text == operand,
+            "does_not_equal": lambda: text != operand,
+            "contains": lambda: operand.lower() in text.lower(),
+            "does_not_contain": lambda: operand.lower() not in text.lower(),
+            "starts_with": lambda: text.lower().startswith(operand.lower()),
+            "ends_with": lambda: text.lower().endswith(operand.lower()),
+        }
+        if operator not in operations:
+            raise FakeNotionError(400, f"Nepodporovaná podmínka textového filtru: {operator}")
+        return operations[operator]()
+
+    @staticmethod
+    def _match_equality(value: Any, operator: str, operand: Any) -> bool:
+        """
+        Vyhodnotí podmínku filtru výběru nebo zaškrtávacího pole.
+        """
+        if operator == "equals":
+            return value == operand
+        if operator == "does_not_equal":
+            return value != operand
+        if operator == "is_empty":
+            return value is None
+        if operator == "is_not_empty":
+            return value is not None
+        raise FakeNotionError(400, f"Nepodporovaná podmínka filtru: {operator}")
+
+    @staticmethod
+    def _match_list(values: List[Any], operator: str, operand: Any) -> bool:
+        """
+        Vyhodnotí podmínku filtru vícenásobného výběru nebo relace.
+        """
+        if operator == "contains":
+            return operand in values
+        if operator == "does_not_contain":
+            return operand not in values
+        if operator == "is_empty":
+            return not values
+        if operator == "is_not_empty":
+            return bool(values)
+        raise FakeNotionError(400, f"Nepodporovaná podmínka filtru: {operator}")
+
+    @staticmethod
+    def _match_number(value: Optional[float], operator: str, operand: Any) -> bool:
+        """
+        Vyhodnotí podmínku číselného filtru.
+        """
+        if operator == "is_empty":
+            return value is None
+        if operator == "is_not_empty":
+            return value is not None
+        if value is None:
+            return False
+        operations = {
+            "equals": lambda: value == operand,
+            "does_not_equal": lambda: value != operand,
+            "greater_than": lambda: value > operand,
+            "less_than": lambda: value < operand,
+            "greater_than_or_equal_to": lambda: value >= operand,
+            "less_than_or_equal_to": lambda: value <= operand,
+        }
+        if operator not in operations:
+            raise FakeNotionError(400, f"Nepodporovaná podmínka číselného filtru: {operator}")
+        return operations[operator]()
+
+    @staticmethod
+    def _match_date(value: Optional[datetime], condition: Dict[str, Any]) -> bool:
+        """
+        Vyhodnotí podmínku filtru data nebo času vytvoření či úpravy.
+        """
+        operator, operand = next(iter(condition.items()))
+        if operator == "is_empty":
+            return value is None
+        if operator == "is_not_empty":
+            return value is not None
+        if value is None:
+            return False
+        if operator == "past_week":
+            return value >= datetime.now(timezone.utc) - timedelta(days=7)
+        bound = _parse_time(operand)
+        operations = {
+            "equals": lambda: value == bound,
+            "before": lambda: value < bound,
+            "after": lambda: value > bound,
+            "on_or_before": lambda: value <= bound,
+            "on_or_after": lambda: value >= bound,
+        }
+        if operator not in operations:
+            raise FakeNotionError(400, f"Nepodporovaná podmínka filtru data: {operator}")
+        return operations[operator]()
+
+
+class FakeNotionTransport(httpx.BaseTransport):
+    """
+    Synchronní transport httpx, který požadavky předává lokální náhradě Notion API.
+    """
+
+    def __init__(self, fake: FakeNotion):
+        """
+        Inicializace transportu.
+
+        Args:
+            fake: Lokální náhrada Notion API.
+        """
+        self.fake = fake
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.fake.delay()
+        if delay:
+            time.sleep(delay)
+        request.read()
+        return self.fake.handle(request)
+
+
+class AsyncFakeNotionTransport(httpx.AsyncBaseTransport):
+    """
+    Asynchronní transport httpx, který požadavky předává lokální náhradě Notion API.
+    """
+
+    def __init__(self, fake: FakeNotion):
+        """
+        Inicializace transportu.
+
+        Args:
+            fake: Lokální náhrada Notion API.
+        """
+        self.fake = fake
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.fake.delay()
+        if delay:
+            await asyncio.sleep(delay)
+        await request.aread()
+        return self.fake.handle(request)
@@ -3,8 +3,9 @@ Klientská třída pro interakci s Notion API.
 """
 import logging
 import time
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
 
+import httpx
 import requests
 from notion_client import Client
 from notion_client.errors import APIResponseError, HTTPResponseError
@@ -12,9 +13,13 @@ from notion_client.errors import APIResponseError, HTTPResponseError
 from rpg_notion.config.settings import (
     NOTION_API_KEY,
     NOTION_MAX_RETRIES,
+    NOTION_PAGE_SIZE,
     NOTION_RATE_LIMIT_DELAY,
+    NOTION_VALIDATE_PROPERTIES,
     NOTION_VERSION,
 )
+from rpg_notion.api.rate_limiter import TokenBucketRateLimiter, get_default_rate_limiter
+from rpg_notion.api.schema_cache import DatabaseSchemaCache, validate_properties
 
 logger = logging.getLogger(__name__)
 
@@ -23,22 +28,60 @@ class NotionClientWrapper:
     """
     Wrapper kolem oficiálního Notion klienta s přidanou funkcionalitou
     pro správu rate limitů a zpracování chyb.
+
+    Všechny požadavky procházejí sdíleným token bucket limiterem, takže
+    klient proaktivně dodržuje limit Notion API a na chybu 429 naráží jen výjimečně.
+    Vlastnosti zapisovaných stránek se před odesláním kontrolují proti
+    schématu databáze uloženému v lokální cache.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        validate: bool = NOTION_VALIDATE_PROPERTIES,
+        http_client: Optional[httpx.Client] = None,
+    ):
         """
         Inicializace Notion klienta.
 
         Args:
             api_key: Notion API klíč. Pokud není zadán, použije se z konfigurace.
+            rate_limiter: Limiter požadavků. Pokud není zadán, použije se limiter sdílený v rámci procesu.
+            validate: Zda kontrolovat vlastnosti stránek proti schématu databáze před odesláním.
+            http_client: HTTP klient pro požadavky na Notion API (např. napojený na lokální
+                náhradu ``FakeNotion``). Pokud není zadán, vytvoří se výchozí.
         """
         self.api_key = api_key or NOTION_API_KEY
         if not self.api_key:
             raise ValueError("Notion API klíč není nastaven.")
 
-        self.client = Client(auth=self.api_key, version=NOTION_VERSION)
+        self.client = Client(auth=self.api_key, notion_version=NOTION_VERSION, client=http_client)
         self.max_retries = NOTION_MAX_RETRIES
         self.rate_limit_delay = NOTION_RATE_LIMIT_DELAY
+        self.rate_limiter = rate_limiter or get_default_rate_limiter()
+        self.validate = validate
+        self.schema_cache = DatabaseSchemaCache()
+
+    @staticmethod
+    def _get_retry_after(error: Exception) -> Optional[float]:
+        """
+        Zjistí z chyby Notion API, kolik sekund je nutné počkat (hlavička Retry-After).
+
+        Args:
+            error: Chyba vrácená Notion API.
+
+        Returns:
+            Doba čekání v sekundách nebo None, pokud ji odpověď neobsahuje.
+        """
+        headers = getattr(error, "headers", None)
+        if not headers:
+            return None
+        try:
+            value = headers.get("retry-after") or headers.get("Retry-After")
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
 
     def _handle_rate_limit(self, retry_count: int) -> None:
         """
@@ -55,6 +98,10 @@ class NotionClientWrapper:
         """
         Provede operaci s automatickým opakováním při rate limitu.
 
+        Před každým pokusem si operace vyžádá token ze sdíleného limiteru.
+        Pokud Notion API vrátí hlavičku Retry-After, pozastaví se celý limiter
+        (a tím i ostatní požadavky), jinak se čeká s exponenciálním zpožděním.
+
         Args:
             operation: Funkce k provedení.
             *args: Argumenty pro funkci.
@@ -68,12 +115,17 @@ class NotionClientWrapper:
         """
         retry_count = 0
         while retry_count <= self.max_retries:
+            self.rate_limiter.acquire()
             try:
                 return operation(*args, **kwargs)
             except (APIResponseError, HTTPResponseError) as e:
                 if hasattr(e, "code") and e.code == "rate_limited" and retry_count < self.max_retries:
                     retry_count += 1
-                    self._handle_rate_limit(retry_count)
+                    retry_after = self._get_retry_after(e)
+                    if retry_after is not None:
+                        self.rate_limiter.pause(retry_after)
+                    else:
+                        self._handle_rate_limit(retry_count)
                 else:
                     logger.error(f"Chyba při volání Notion API: {e}")
                     raise
@@ -81,6 +133,139 @@ class NotionClientWrapper:
                 logger.error(f"Neočekávaná chyba: {e}")
                 raise
 
+    @staticmethod
+    def _resolve_page_size(page_size: Optional[int] = None) -> int:
+        """
+        Určí velikost stránky pro stránkované dotazy.
+
+        Args:
+            page_size: Požadovaná velikost stránky. Pokud není zadána, použije se z konfigurace.
+
+        Returns:
+            Velikost stránky.
+
+        Raises:
+            ValueError: Pokud je velikost stránky mimo povolený rozsah.
+        """
+        page_size = page_size or NOTION_PAGE_SIZE
+        if not 1 <= page_size <= 100:
+            raise ValueError(f"Neplatná velikost stránky: {page_size} (povoleno 1 - 100)")
+        return page_size
+
+    def _iter_paginated(
+        self,
+        operation: Callable[..., Dict[str, Any]],
+        page_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        **params,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Prochází stránkovanou odpověď Notion API pomocí kurzoru ``next_cursor``.
+
+        Každá stránka výsledků se načítá samostatně (s opakováním při rate
+        limitu), takže v paměti je vždy nejvýše jedna stránka.
+
+        Args:
+            operation: Stránkovaná operace Notion klienta.
+            page_size: Počet výsledků na stránku (1 - 100). Pokud není zadán, použije se z konfigurace.
+            max_pages: Maximální počet načtených stránek. None znamená bez omezení.
+            **params: Další parametry operace.
+
+        Yields:
+            Jednotlivé výsledky ze všech načtených stránek.
+        """
+        page_size = self._resolve_page_size(page_size)
+
+        start_cursor = None
+        pages_loaded = 0
+        while max_pages is None or pages_loaded < max_pages:
+            request_params = dict(params, page_size=page_size)
+            if start_cursor:
+                request_params["start_cursor"] = start_cursor
+
+            response = self._execute_with_retry(operation, **request_params)
+            pages_loaded += 1
+            yield from response.get("results", [])
+
+            start_cursor = response.get("next_cursor")
+            if not response.get("has_more") or not start_cursor:
+                return
+
+        logger.warning(f"Dosažen limit {max_pages} stránek výsledků, další výsledky nebyly načteny.")
+
+    @staticmethod
+    def _build_query_params(
+        filter: Optional[Dict[str, Any]] = None, sorts: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Sestaví parametry dotazu na databázi.
+
+        Args:
+            filter: Filtr pro dotaz.
+            sorts: Řazení výsledků.
+
+        Returns:
+            Parametry dotazu.
+        """
+        params = {}
+        if filter:
+            params["filter"] = filter
+        if sorts:
+            params["sorts"] = sorts
+        return params
+
+    @staticmethod
+    def _build_create_page_params(
+        parent_id: str,
+        parent_type: str = "database_id",
+        properties: Optional[Dict[str, Any]] = None,
+        content: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Sestaví parametry pro vytvoření stránky.
+
+        Args:
+            parent_id: ID rodiče (databáze nebo stránky).
+            parent_type: Typ rodiče ('database_id' nebo 'page_id').
+            properties: Vlastnosti stránky.
+            content: Obsah stránky.
+
+        Returns:
+            Parametry pro vytvoření stránky.
+        """
+        params = {
+            "parent": {
+                "type": parent_type,
+                parent_type: parent_id,
+            },
+        }
+        if properties:
+            params["properties"] = properties
+        if content:
+            params["children"] = content
+        return params
+
+    @staticmethod
+    def _build_update_page_params(
+        properties: Optional[Dict[str, Any]] = None, archived: Optional[bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Sestaví parametry pro aktualizaci stránky.
+
+        Args:
+            properties: Nové vlastnosti stránky.
+            archived: Zda má být stránka archivována.
+
+        Returns:
+            Parametry pro aktualizaci stránky.
+        """
+        params = {}
+        if properties:
+            params["properties"] = properties
+        if archived is not None:
+            params["archived"] = archived
+        return params
+
     # Databáze
 
     def create_database(
@@ -97,7 +282,7 @@ class NotionClientWrapper:
         Returns:
             Vytvořená databáze.
         """
-        return self._execute_with_retry(
+        response = self._execute_with_retry(
             self.client.databases.create,
             parent={
                 "type": "page_id",
@@ -113,6 +298,8 @@ class NotionClientWrapper:
             ],
             properties=properties,
         )
+        self._store_schema(response)
+        return response
 
     def update_database(
         self, database_id: str, title: Optional[str] = None, properties: Optional[Dict[str, Any]] = None
@@ -141,38 +328,143 @@ class NotionClientWrapper:
         if properties:
             params["properties"] = properties
 
-        return self._execute_with_retry(
+        self.schema_cache.invalidate(database_id)
+        response = self._execute_with_retry(
             self.client.databases.update,
             database_id=database_id,
             **params,
         )
+        self._store_schema(response)
+        return response
+
+    def get_database(self, database_id: str) -> Dict[str, Any]:
+        """
+        Získá databázi z Notion (včetně schématu vlastností).
+
+        Args:
+            database_id: ID databáze.
+
+        Returns:
+            Databáze.
+        """
+        response = self._execute_with_retry(
+            self.client.databases.retrieve,
+            database_id=database_id,
+        )
+        self._store_schema(response)
+        return response
+
+    def get_database_schema(self, database_id: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Vrátí schéma vlastností databáze, při prvním použití ho načte z Notion.
+
+        Args:
+            database_id: ID databáze.
+
+        Returns:
+            Schéma (název vlastnosti -> ID, typ a povolené možnosti).
+        """
+        schema = self.schema_cache.get(database_id)
+        if schema is None:
+            schema = self.schema_cache.store(database_id, self.get_database(database_id).get("properties", {}))
+        return schema
+
+    def _store_schema(self, database: Any) -> None:
+        """
+        Uloží schéma databáze z odpovědi Notion API do cache.
+
+        Args:
+            database: Odpověď Notion API s databází.
+        """
+        if isinstance(database, dict) and isinstance(database.get("properties"), dict) and database.get("id"):
+            self.schema_cache.store(database["id"], database["properties"])
+
+    def _validate_properties(self, database_id: str, properties: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Zkontroluje vlastnosti stránky proti schématu databáze, pokud je kontrola zapnutá.
+
+        Args:
+            database_id: ID databáze.
+            properties: Vlastnosti stránky.
+
+        Returns:
+            Převedené vlastnosti stránky.
+
+        Raises:
+            ValueError: Pokud vlastnosti neodpovídají schématu databáze.
+        """
+        if not self.validate or not properties:
+            return properties
+        return validate_properties(self.get_database_schema(database_id), properties, database_id)
 
     def query_database(
-        self, database_id: str, filter: Optional[Dict[str, Any]] = None, sorts: Optional[List[Dict[str, Any]]] = None
+        self,
+        database_id: str,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        page_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Dotaz na databázi v Notion.
 
+        Načte všechny stránky výsledků. Pro velké databáze použijte
+        ``iter_query_database``, který výsledky nedrží v paměti najednou.
+
         Args:
             database_id: ID databáze.
             filter: Filtr pro dotaz.
             sorts: Řazení výsledků.
+            page_size: Počet výsledků na jednu stránku odpovědi.
+            max_pages: Maximální počet načtených stránek odpovědi.
 
         Returns:
             Seznam stránek v databázi.
         """
-        params = {}
-        if filter:
-            params["filter"] = filter
-        if sorts:
-            params["sorts"] = sorts
+        return list(
+            self.iter_query_database(
+                database_id, filter=filter, sorts=sorts, page_size=page_size, max_pages=max_pages
+            )
+        )
 
-        response = self._execute_with_retry(
+    def iter_query_database(
+        self,
+        database_id: str,
+        filter: Optional[Dict[str, Any]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        page_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        filter_properties: Optional[List[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Postupně prochází výsledky dotazu na databázi v Notion.
+
+        Args:
+            database_id: ID databáze.
+            filter: Filtr pro dotaz.
+            sorts: Řazení výsledků.
+            page_size: Počet výsledků na jednu stránku odpovědi.
+            max_pages: Maximální počet načtených stránek odpovědi.
+            filter_properties: ID vlastností, které mají stránky ve výsledku obsahovat.
+                Pokud nejsou zadána, vrátí se všechny vlastnosti.
+
+        Yields:
+            Stránky v databázi.
+        """
+        params = self._build_query_params(filter, sorts)
+        if filter_properties:
+            params["filter_properties"] = filter_properties
+
+        for page in self._iter_paginated(
             self.client.databases.query,
+            page_size=page_size,
+            max_pages=max_pages,
             database_id=database_id,
             **params,
-        )
-        return response.get("results", [])
+        ):
+            if page.get("id"):
+                self.schema_cache.remember_page(page["id"], database_id)
+            yield page
 
     # Stránky
 
@@ -192,21 +484,17 @@ class NotionClientWrapper:
         Returns:
             Vytvořená stránka.
         """
-        params = {
-            "parent": {
-                "type": parent_type,
-                parent_type: parent_id,
-            },
-        }
-        if properties:
-            params["properties"] = properties
-        if content:
-            params["children"] = content
+        if parent_type == "database_id":
+            properties = self._validate_properties(parent_id, properties)
+        params = self._build_create_page_params(parent_id, parent_type, properties, content)
 
-        return self._execute_with_retry(
+        page = self._execute_with_retry(
             self.client.pages.create,
             **params,
         )
+        if parent_type == "database_id" and isinstance(page, dict) and page.get("id"):
+            self.schema_cache.remember_page(page["id"], parent_id)
+        return page
 
     def update_page(
         self, page_id: str, properties: Optional[Dict[str, Any]] = None, archived: Optional[bool] = None
@@ -214,6 +502,9 @@ class NotionClientWrapper:
         """
         Aktualizuje existující stránku v Notion.
 
+        Vlastnosti se kontrolují proti schématu, pokud je známá databáze stránky
+        (stránka byla tímto klientem vytvořena, načtena nebo nalezena dotazem).
+
         Args:
             page_id: ID stránky.
             properties: Nové vlastnosti stránky.
@@ -222,11 +513,10 @@ class NotionClientWrapper:
         Returns:
             Aktualizovaná stránka.
         """
-        params = {}
-        if properties:
-            params["properties"] = properties
-        if archived is not None:
-            params["archived"] = archived
+        database_id = self.schema_cache.database_of(page_id)
+        if database_id:
+            properties = self._validate_properties(database_id, properties)
+        params = self._build_update_page_params(properties, archived)
 
         return self._execute_with_retry(
             self.client.pages.update,
@@ -244,26 +534,50 @@ class NotionClientWrapper:
         Returns:
             Stránka.
         """
-        return self._execute_with_retry(
+        page = self._execute_with_retry(
             self.client.pages.retrieve,
             page_id=page_id,
         )
+        if isinstance(page, dict) and page.get("parent", {}).get("database_id"):
+            self.schema_cache.remember_page(page_id, page["parent"]["database_id"])
+        return page
 
-    def get_block_children(self, block_id: str) -> List[Dict[str, Any]]:
+    def get_block_children(
+        self, block_id: str, page_size: Optional[int] = None, max_pages: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
         """
         Získá potomky bloku (stránky nebo bloku) z Notion.
 
         Args:
             block_id: ID bloku.
+            page_size: Počet výsledků na jednu stránku odpovědi.
+            max_pages: Maximální počet načtených stránek odpovědi.
 
         Returns:
             Seznam potomků bloku.
         """
-        response = self._execute_with_retry(
+        return list(self.iter_block_children(block_id, page_size=page_size, max_pages=max_pages))
+
+    def iter_block_children(
+        self, block_id: str, page_size: Optional[int] = None, max_pages: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Postupně prochází potomky bloku (stránky nebo bloku) z Notion.
+
+        Args:
+            block_id: ID bloku.
+            page_size: Počet výsledků na jednu stránku odpovědi.
+            max_pages: Maximální počet načtených stránek odpovědi.
+
+        Yields:
+            Potomci bloku.
+        """
+        yield from self._iter_paginated(
             self.client.blocks.children.list,
+            page_size=page_size,
+            max_pages=max_pages,
             block_id=block_id,
         )
-        return response.get("results", [])
 
     def append_block_children(self, block_id: str, children: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -285,7 +599,12 @@ class NotionClientWrapper:
     # Vyhledávání
 
     def search(
-        self, query: str, filter: Optional[Dict[str, Any]] = None, sort: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        filter: Optional[Dict[str, Any]] = None,
+        sort: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
     ) -> List[Dict[str, Any]]:
         """
         Vyhledávání v Notion.
@@ -294,18 +613,44 @@ class NotionClientWrapper:
             query: Dotaz pro vyhledávání.
             filter: Filtr pro vyhledávání.
             sort: Řazení výsledků.
+            page_size: Počet výsledků na jednu stránku odpovědi.
+            max_pages: Maximální počet načtených stránek odpovědi.
 
         Returns:
             Seznam výsledků vyhledávání.
         """
+        return list(self.iter_search(query, filter=filter, sort=sort, page_size=page_size, max_pages=max_pages))
+
+    def iter_search(
+        self,
+        query: str,
+        filter: Optional[Dict[str, Any]] = None,
+        sort: Optional[Dict[str, Any]] = None,
+        page_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Postupně prochází výsledky vyhledávání v Notion.
+
+        Args:
+            query: Dotaz pro vyhledávání.
+            filter: Filtr pro vyhledávání.
+            sort: Řazení výsledků.
+            page_size: Počet výsledků na jednu stránku odpovědi.
+            max_pages: Maximální počet načtených stránek odpovědi.
+
+        Yields:
+            Výsledky vyhledávání.
+        """
         params = {"query": query}
         if filter:
             params["filter"] = filter
         if sort:
             params["sort"] = sort
 
-        response = self._execute_with_retry(
+        yield from self._iter_paginated(
             self.client.search,
+            page_size=page_size,
+            max_pages=max_pages,
             **params,
         )
-        return response.get("results", [])
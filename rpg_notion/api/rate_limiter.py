@@ -0,0 +1,185 @@
+"""
+Proaktivní omezování rychlosti požadavků na Notion API.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from rpg_notion.config.settings import NOTION_RATE_LIMIT_BURST, NOTION_RATE_LIMIT_JITTER, NOTION_RATE_LIMIT_RPS
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucketRateLimiter:
+    """
+    Token bucket sdílený všemi požadavky na Notion API.
+
+    Každý požadavek si před odesláním rezervuje jeden token. Pokud je
+    kbelík prázdný, požadavek počká, než se token doplní, takže průměrná
+    rychlost nepřekročí nastavený limit (Notion povoluje v průměru přibližně
+    3 požadavky za sekundu). Rezervace probíhá pod zámkem a samotné čekání
+    mimo něj, takže limiter lze sdílet mezi vlákny i asynchronními úlohami.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        capacity: Optional[int] = None,
+        jitter: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Inicializace limiteru.
+
+        Args:
+            rate: Průměrný počet požadavků za sekundu. Pokud není zadán, použije se z konfigurace.
+            capacity: Maximální počet tokenů (velikost nárazu). Pokud není zadána, použije se z konfigurace.
+            jitter: Maximální náhodné prodloužení čekání v sekundách. Pokud není zadán, použije se z konfigurace.
+            clock: Monotónní hodiny vracející čas v sekundách.
+        """
+        self.rate = rate if rate is not None else NOTION_RATE_LIMIT_RPS
+        self.capacity = capacity if capacity is not None else NOTION_RATE_LIMIT_BURST
+        self.jitter = jitter if jitter is not None else NOTION_RATE_LIMIT_JITTER
+        if self.rate <= 0 or self.capacity < 1:
+            raise ValueError("Rychlost i kapacita limiteru musí být kladné.")
+
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(self.capacity)
+        self._updated_at = clock()
+
+        # Metriky
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._acquired = 0
+        self._delayed = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._pauses = 0
+
+    def _reserve(self) -> float:
+        """
+        Rezervuje jeden token a vrátí dobu, po kterou je nutné počkat.
+
+        Returns:
+            Doba čekání v sekundách.
+        """
+        with self._lock:
+            now = self._clock()
+            if now > self._updated_at:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+
+            self._tokens -= 1
+            wait = max(0.0, self._updated_at - now)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            if wait > 0 and self.jitter > 0:
+                wait += random.uniform(0, self.jitter)
+
+            self._acquired += 1
+            if wait > 0:
+                self._delayed += 1
+                self._total_wait += wait
+                self._max_wait = max(self._max_wait, wait)
+                self._queue_depth += 1
+                self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+            return wait
+
+    def _release_waiter(self) -> None:
+        """
+        Odebere čekající požadavek z fronty.
+        """
+        with self._lock:
+            self._queue_depth -= 1
+
+    def acquire(self) -> float:
+        """
+        Počká na volný token (blokující varianta).
+
+        Returns:
+            Doba, po kterou požadavek čekal, v sekundách.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                time.sleep(wait)
+            finally:
+                self._release_waiter()
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Počká na volný token (asynchronní varianta).
+
+        Returns:
+            Doba, po kterou požadavek čekal, v sekundách.
+        """
+        wait = self._reserve()
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            finally:
+                self._release_waiter()
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """
+        Pozastaví vydávání tokenů, např. podle hlavičky Retry-After.
+
+        Kbelík se vyprázdní a začne se doplňovat až po uplynutí pauzy, takže
+        čekající požadavky se po pauze rozloží v čase a nenarazí na API najednou.
+
+        Args:
+            seconds: Délka pauzy v sekundách.
+        """
+        if seconds <= 0:
+            return
+
+        with self._lock:
+            resume_at = self._clock() + seconds
+            if resume_at > self._updated_at:
+                self._updated_at = resume_at
+            self._tokens = min(self._tokens, 0.0)
+            self._pauses += 1
+        logger.warning(f"Notion API požaduje pauzu {seconds} sekund (Retry-After).")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Vrátí metriky limiteru.
+
+        Returns:
+            Slovník s aktuální a maximální hloubkou fronty, počty požadavků a dobami čekání.
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queue_depth,
+                "max_queue_depth": self._max_queue_depth,
+                "acquired": self._acquired,
+                "delayed": self._delayed,
+                "total_wait_seconds": self._total_wait,
+                "max_wait_seconds": self._max_wait,
+                "average_wait_seconds": self._total_wait / self._acquired if self._acquired else 0.0,
+                "pauses": self._pauses,
+            }
+
+
+_default_rate_limiter: Optional[TokenBucketRateLimiter] = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> TokenBucketRateLimiter:
+    """
+    Vrátí limiter sdílený všemi klienty Notion API v rámci procesu.
+
+    Returns:
+        Sdílený limiter.
+    """
+    global _default_rate_limiter
+    with _default_rate_limiter_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = TokenBucketRateLimiter()
+        return _default_rate_limiter
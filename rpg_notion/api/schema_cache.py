@@ -0,0 +1,274 @@
+"""
+Lokální cache schémat databází Notion a kontrola vlastností před odesláním.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Maximální délka obsahu jednoho textového objektu a maximální počet odkazů v relaci
+MAX_TEXT_LENGTH = 2000
+MAX_RELATION_ITEMS = 100
+
+# Výchozí počet stránek, u kterých si cache pamatuje jejich databázi
+DEFAULT_MAX_PAGES = 10000
+
+# Typy vlastností, jejichž hodnoty se vybírají z pevného seznamu možností
+OPTION_TYPES = ("select", "multi_select", "status")
+
+# Typy vlastností, které lze zapsat jedna za druhou (stejný tvar hodnoty)
+COMPATIBLE_TYPES = {
+    ("rich_text", "title"),
+    ("title", "rich_text"),
+}
+
+
+class DatabaseSchemaCache:
+    """
+    Cache názvů a typů vlastností databází Notion.
+
+    Schéma každé databáze se načte nejvýše jednou a obnoví se po jejím
+    vytvoření nebo aktualizaci. Cache si navíc pamatuje, do které databáze
+    patří známé stránky, aby bylo možné kontrolovat i aktualizace stránek.
+    Počet zapamatovaných stránek je omezený a nejdéle nepoužité stránky se
+    zapomínají, takže procházení velkých databází nezvyšuje paměť bez omezení.
+    """
+
+    def __init__(self, max_pages: int = DEFAULT_MAX_PAGES):
+        """
+        Inicializace cache schémat.
+
+        Args:
+            max_pages: Maximální počet stránek, u kterých si cache pamatuje jejich databázi.
+
+        Raises:
+            ValueError: Pokud je max_pages menší než 1.
+        """
+        if max_pages < 1:
+            raise ValueError(f"Neplatný počet zapamatovaných stránek: {max_pages}")
+        self.max_pages = max_pages
+        self._schemas: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._page_databases: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(notion_id: str) -> str:
+        """
+        Normalizuje ID z Notion (s pomlčkami i bez nich).
+
+        Args:
+            notion_id: ID databáze nebo stránky.
+
+        Returns:
+            ID bez pomlček.
+        """
+        return notion_id.replace("-", "")
+
+    def get(self, database_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Vrátí schéma databáze, pokud je v cache.
+
+        Args:
+            database_id: ID databáze.
+
+        Returns:
+            Schéma (název vlastnosti -> ID, typ a povolené možnosti) nebo None.
+        """
+        with self._lock:
+            return self._schemas.get(self._key(database_id))
+
+    def store(self, database_id: str, properties: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Uloží schéma databáze z vlastností vrácených Notion API.
+
+        Args:
+            database_id: ID databáze.
+            properties: Vlastnosti databáze z odpovědi Notion API.
+
+        Returns:
+            Uložené schéma.
+        """
+        schema = {}
+        for name, definition in properties.items():
+            property_type = definition.get("type")
+            options = None
+            if property_type in OPTION_TYPES:
+                options = {option.get("name") for option in definition.get(property_type, {}).get("options", [])}
+            schema[name] = {"id": definition.get("id"), "type": property_type, "options": options}
+
+        with self._lock:
+            self._schemas[self._key(database_id)] = schema
+        return schema
+
+    def invalidate(self, database_id: Optional[str] = None) -> None:
+        """
+        Odstraní schéma databáze z cache.
+
+        Args:
+            database_id: ID databáze. Pokud není zadáno, odstraní se všechna schémata.
+        """
+        with self._lock:
+            if database_id is None:
+                self._schemas.clear()
+            else:
+                self._schemas.pop(self._key(database_id), None)
+
+    def remember_page(self, page_id: str, database_id: str) -> None:
+        """
+        Zapamatuje si, do které databáze stránka patří.
+
+        Args:
+            page_id: ID stránky.
+            database_id: ID databáze.
+        """
+        key = self._key(page_id)
+        with self._lock:
+            self._page_databases[key] = database_id
+            self._page_databases.move_to_end(key)
+            while len(self._page_databases) > self.max_pages:
+                self._page_databases.popitem(last=False)
+
+    def database_of(self, page_id: str) -> Optional[str]:
+        """
+        Vrátí ID databáze, do které stránka patří, pokud je známé.
+
+        Args:
+            page_id: ID stránky.
+
+        Returns:
+            ID databáze nebo None.
+        """
+        key = self._key(page_id)
+        with self._lock:
+            database_id = self._page_databases.get(key)
+            if database_id is not None:
+                self._page_databases.move_to_end(key)
+            return database_id
+
+
+def _split_text_objects(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rozdělí textové objekty delší než MAX_TEXT_LENGTH znaků.
+
+    Args:
+        items: Textové objekty hodnoty title nebo rich_text.
+
+    Returns:
+        Textové objekty s nejvýše MAX_TEXT_LENGTH znaky.
+    """
+    if all(len(item.get("text", {}).get("content", "")) <= MAX_TEXT_LENGTH for item in items):
+        return items
+
+    result = []
+    for item in items:
+        content = item.get("text", {}).get("content", "")
+        if len(content) <= MAX_TEXT_LENGTH:
+            result.append(item)
+            continue
+        for start in range(0, len(content), MAX_TEXT_LENGTH):
+            chunk = dict(item)
+            chunk["text"] = dict(item["text"], content=content[start:start + MAX_TEXT_LENGTH])
+            result.append(chunk)
+    return result
+
+
+def _coerce_value(name: str, property_type: str, value: Any, options: Optional[set]) -> Any:
+    """
+    Zkontroluje a případně převede hodnotu jedné vlastnosti.
+
+    Args:
+        name: Název vlastnosti.
+        property_type: Typ vlastnosti podle schématu.
+        value: Hodnota vlastnosti ve tvaru Notion API (bez klíče typu).
+        options: Povolené možnosti výběru nebo None.
+
+    Returns:
+        Převedená hodnota.
+
+    Raises:
+        ValueError: Pokud hodnotu nelze zapsat.
+    """
+    if property_type in ("title", "rich_text"):
+        if isinstance(value, str):
+            value = [{"type": "text", "text": {"content": value}}] if value else []
+        return _split_text_objects(value)
+
+    if property_type == "number":
+        if isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError(f"Vlastnost {name} očekává číslo, zadáno: {value!r}") from None
+        return value
+
+    if property_type in ("select", "status"):
+        if isinstance(value, str):
+            value = {"name": value}
+        if property_type == "status" and value is not None and value.get("name") not in options:
+            raise ValueError(f"Vlastnost {name} nemá stav {value.get('name')!r}")
+        return value
+
+    if property_type == "multi_select":
+        return [{"name": option} if isinstance(option, str) else option for option in value]
+
+    if property_type == "relation":
+        value = [{"id": page_id} if isinstance(page_id, str) else page_id for page_id in value]
+        if len(value) > MAX_RELATION_ITEMS:
+            raise ValueError(f"Relace {name} má {len(value)} odkazů, Notion jich přijme nejvýše {MAX_RELATION_ITEMS}")
+        return value
+
+    if property_type == "date":
+        if isinstance(value, (date, datetime)):
+            value = {"start": value.isoformat()}
+        elif value is not None and isinstance(value.get("start"), (date, datetime)):
+            value = dict(value, start=value["start"].isoformat())
+        return value
+
+    return value
+
+
+def validate_properties(
+    schema: Dict[str, Dict[str, Any]], properties: Dict[str, Any], database_id: str = ""
+) -> Dict[str, Any]:
+    """
+    Zkontroluje vlastnosti stránky proti schématu databáze a převede je do tvaru Notion API.
+
+    Kontroluje se existence vlastnosti a shoda typu, délka textů se upraví
+    podle limitu Notion a jednoduché hodnoty (řetězec, číslo, datum) se
+    převedou na odpovídající tvar.
+
+    Args:
+        schema: Schéma databáze.
+        properties: Vlastnosti stránky.
+        database_id: ID databáze (pro chybové zprávy).
+
+    Returns:
+        Převedené vlastnosti stránky.
+
+    Raises:
+        ValueError: Pokud vlastnost v databázi neexistuje nebo má jiný typ.
+    """
+    validated = {}
+    for name, value in properties.items():
+        definition = schema.get(name)
+        if definition is None:
+            raise ValueError(
+                f"Databáze {database_id} nemá vlastnost {name!r}. Dostupné vlastnosti: {', '.join(sorted(schema))}"
+            )
+
+        property_type = definition["type"]
+        payload_types = [key for key in value if key not in ("id", "type")]
+        if len(payload_types) != 1:
+            raise ValueError(f"Hodnota vlastnosti {name!r} musí obsahovat právě jeden typ, zadáno: {payload_types}")
+
+        payload_type = payload_types[0]
+        if payload_type != property_type and (payload_type, property_type) not in COMPATIBLE_TYPES:
+            raise ValueError(f"Vlastnost {name!r} má v databázi typ {property_type}, zapisuje se {payload_type}")
+
+        validated[name] = {
+            property_type: _coerce_value(name, property_type, value[payload_type], definition["options"])
+        }
+    return validated
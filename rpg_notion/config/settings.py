@@ -23,6 +23,42 @@ NOTION_VERSION: str = os.getenv("NOTION_VERSION", "2022-06-28")
 NOTION_RATE_LIMIT_DELAY: float = float(os.getenv("NOTION_RATE_LIMIT_DELAY", "0.5"))
 NOTION_MAX_RETRIES: int = int(os.getenv("NOTION_MAX_RETRIES", "3"))
 
+# Proaktivní limit požadavků (Notion povoluje v průměru přibližně 3 požadavky za sekundu)
+NOTION_RATE_LIMIT_RPS: float = float(os.getenv("NOTION_RATE_LIMIT_RPS", "3"))
+NOTION_RATE_LIMIT_BURST: int = int(os.getenv("NOTION_RATE_LIMIT_BURST", "3"))
+NOTION_RATE_LIMIT_JITTER: float = float(os.getenv("NOTION_RATE_LIMIT_JITTER", "0.1"))
+
+# Kontrola vlastností stránek proti lokální cache schémat databází před odesláním do Notion
+NOTION_VALIDATE_PROPERTIES: bool = os.getenv("NOTION_VALIDATE_PROPERTIES", "true").lower() in ("1", "true", "yes")
+
+# Počet výsledků na jednu stránku stránkovaných odpovědí (maximum Notion API je 100)
+NOTION_PAGE_SIZE: int = int(os.getenv("NOTION_PAGE_SIZE", "100"))
+
+# Maximální počet souběžných požadavků asynchronního klienta
+NOTION_MAX_CONCURRENCY: int = int(os.getenv("NOTION_MAX_CONCURRENCY", "10"))
+
+# Souběžné vyhledávání a ukládání entit během zpracování tahu přes asynchronního klienta
+NOTION_CONCURRENT_REQUESTS: bool = os.getenv("NOTION_CONCURRENT_REQUESTS", "true").lower() in ("1", "true", "yes")
+
+# Lokální cache entit (doba platnosti záznamu v sekundách a maximální počet záznamů)
+ENTITY_CACHE_TTL: float = float(os.getenv("ENTITY_CACHE_TTL", "600"))
+ENTITY_CACHE_MAX_SIZE: int = int(os.getenv("ENTITY_CACHE_MAX_SIZE", "2048"))
+
+# Cesta k lokálnímu zrcadlu databází v SQLite (prázdná hodnota zrcadlo vypne)
+LOCAL_MIRROR_PATH: Optional[str] = os.getenv("LOCAL_MIRROR_PATH") or None
+
+# Trvalá fronta zápisů do Notion v SQLite (prázdná cesta zapisuje přímo), prodleva mezi
+# průchody frontou v sekundách a maximální počet pokusů o jeden zápis
+NOTION_OUTBOX_PATH: Optional[str] = os.getenv("NOTION_OUTBOX_PATH") or None
+NOTION_OUTBOX_FLUSH_INTERVAL: float = float(os.getenv("NOTION_OUTBOX_FLUSH_INTERVAL", "1.0"))
+NOTION_OUTBOX_MAX_ATTEMPTS: int = int(os.getenv("NOTION_OUTBOX_MAX_ATTEMPTS", "8"))
+
+# Způsob ukládání historie entit ("property" přepisuje vlastnost, "blocks" připojuje bloky
+# na konec stránky) a po kolika připojených záznamech se historie zkopíruje do vlastnosti
+# pro zobrazení v databázi (0 = nikdy)
+ENTITY_HISTORY_MODE: str = os.getenv("ENTITY_HISTORY_MODE", "property")
+ENTITY_HISTORY_COMPACT_EVERY: int = int(os.getenv("ENTITY_HISTORY_COMPACT_EVERY", "0"))
+
 # ID databází v Notion (budou nastaveny později při vytváření)
 NOTION_DATABASE_IDS = {
     "adventure_journal": os.getenv("NOTION_DB_ADVENTURE_JOURNAL"),
@@ -38,3 +74,5 @@ NOTION_DATABASE_IDS = {
 # NLP konfigurace
 NLP_MODELS_DIR = DATA_DIR / "models"
 SPACY_MODEL = os.getenv("SPACY_MODEL", "cs_core_news_lg")
+# Volitelný soubor JSON s kampaňovými výrazy pro fantasy_ner ve formátu {štítek: [výrazy]}
+NLP_GAZETTEER_PATH: Optional[str] = os.getenv("NLP_GAZETTEER_PATH") or None
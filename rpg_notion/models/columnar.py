@@ -0,0 +1,622 @@
+"""
+Kompaktní sloupcová reprezentace entit pro analýzy a hromadné operace.
+"""
+import logging
+from array import array
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, get_args, get_origin
+
+import numpy as np
+
+from rpg_notion.models.entities import ENTITY_CLASSES, BaseEntity, EntityType
+from rpg_notion.models.local_mirror import LocalMirror
+from rpg_notion.models.repository import EntityRepository
+
+logger = logging.getLogger(__name__)
+
+# Počátek epochy pro převod datumů na mikrosekundy (datetime64[us])
+EPOCH = datetime(1970, 1, 1)
+
+# Hodnota chybějícího datumu (NaT) v reprezentaci int64
+NAT = np.iinfo(np.int64).min
+
+# Druhy sloupců podle typu pole modelu
+STRING, ENUM, ID, IDS, STRINGS, DATETIME, INTEGER = "string", "enum", "id", "ids", "strings", "datetime", "integer"
+
+
+class StringPool:
+    """
+    Sdílený slovník řetězců.
+
+    Každý řetězec je uložen jen jednou a sloupce drží jeho celočíselný kód,
+    chybějící hodnota (None) má kód -1.
+    """
+
+    def __init__(self):
+        """
+        Inicializace slovníku řetězců.
+        """
+        self._codes: Dict[str, int] = {}
+        self._values: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def encode(self, value: Optional[str]) -> int:
+        """
+        Vrátí kód řetězce, případně ho do slovníku přidá.
+
+        Args:
+            value: Řetězec nebo None.
+
+        Returns:
+            Kód řetězce (-1 pro None).
+        """
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def lookup(self, value: Optional[str]) -> int:
+        """
+        Vrátí kód řetězce bez přidání do slovníku.
+
+        Args:
+            value: Řetězec nebo None.
+
+        Returns:
+            Kód řetězce nebo -1, pokud řetězec ve slovníku není.
+        """
+        return -1 if value is None else self._codes.get(value, -1)
+
+    def decode(self, code: int) -> Optional[str]:
+        """
+        Vrátí řetězec podle kódu.
+
+        Args:
+            code: Kód řetězce.
+
+        Returns:
+            Řetězec nebo None pro kód -1.
+        """
+        return None if code < 0 else self._values[code]
+
+
+def _column_kind(name: str, annotation: Any) -> Tuple[str, Optional[Tuple[Enum, ...]]]:
+    """
+    Určí druh sloupce pro pole modelu.
+
+    Args:
+        name: Název pole.
+        annotation: Typová anotace pole.
+
+    Returns:
+        Druh sloupce a u výčtů jejich členy v pořadí kódů.
+
+    Raises:
+        ValueError: Pokud typ pole nelze uložit do sloupce.
+    """
+    if get_origin(annotation) is Union:
+        annotation = next(arg for arg in get_args(annotation) if arg is not type(None))
+
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return ENUM, tuple(annotation)
+    if get_origin(annotation) in (list, List):
+        return (IDS if name.endswith("_ids") else STRINGS), None
+    if annotation is datetime:
+        return DATETIME, None
+    if annotation is int:
+        return INTEGER, None
+    if annotation is str:
+        return (ID if name in ("id", "notion_page_id") or name.endswith("_id") else STRING), None
+    raise ValueError(f"Pole {name} s typem {annotation} nelze uložit do sloupce")
+
+
+def _to_microseconds(value: Optional[datetime]) -> int:
+    """
+    Převede datum na počet mikrosekund od počátku epochy v UTC.
+
+    Args:
+        value: Datum (s časovou zónou nebo bez ní) nebo None.
+
+    Returns:
+        Počet mikrosekund nebo NAT.
+    """
+    if value is None:
+        return NAT
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+class ColumnarTable:
+    """
+    Entity jednoho typu uložené po sloupcích v polích NumPy.
+
+    Řetězce a ID stránek jsou kódy do sdílených slovníků (int32), výčty
+    jsou kódy členů (int8), data jsou ``datetime64[us]`` v UTC a seznamy
+    (relace, tagy) jsou uloženy ve formátu CSR: pole ``offsets`` délky
+    počet entit + 1 a pole hodnot, kde hodnoty řádku ``i`` leží v rozsahu
+    ``offsets[i]:offsets[i + 1]``.
+    """
+
+    def __init__(
+        self,
+        entity_type: EntityType,
+        strings: Optional[StringPool] = None,
+        ids: Optional[StringPool] = None,
+    ):
+        """
+        Inicializace prázdné tabulky.
+
+        Args:
+            entity_type: Typ entity.
+            strings: Slovník textových hodnot. Pokud není zadán, vytvoří se nový.
+            ids: Slovník ID stránek. Pokud není zadán, vytvoří se nový.
+
+        Raises:
+            ValueError: Pokud je zadán neplatný typ entity.
+        """
+        if entity_type not in ENTITY_CLASSES:
+            raise ValueError(f"Neplatný typ entity: {entity_type}")
+
+        self.entity_type = entity_type
+        self.strings = strings if strings is not None else StringPool()
+        self.ids = ids if ids is not None else StringPool()
+        self.kinds: Dict[str, str] = {}
+        self.enum_members: Dict[str, Tuple[Enum, ...]] = {}
+        for name, info in ENTITY_CLASSES[entity_type].model_fields.items():
+            if name == "type":
+                continue
+            self.kinds[name], members = _column_kind(name, info.annotation)
+            if members is not None:
+                self.enum_members[name] = members
+
+        self.columns: Dict[str, np.ndarray] = {}
+        self.offsets: Dict[str, np.ndarray] = {}
+        self._size = 0
+        self._rows_by_id: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @classmethod
+    def from_entities(
+        cls,
+        entity_type: EntityType,
+        entities: Iterable[BaseEntity],
+        strings: Optional[StringPool] = None,
+        ids: Optional[StringPool] = None,
+    ) -> "ColumnarTable":
+        """
+        Sestaví tabulku z entit.
+
+        Entity se procházejí postupně a hodnoty se ukládají rovnou do
+        kompaktních polí, takže vstupem může být i generátor (např.
+        ``EntityRepository.iter_all``) a entity nemusí být v paměti najednou.
+
+        Args:
+            entity_type: Typ entity.
+            entities: Entity daného typu.
+            strings: Slovník textových hodnot. Pokud není zadán, vytvoří se nový.
+            ids: Slovník ID stránek. Pokud není zadán, vytvoří se nový.
+
+        Returns:
+            Sestavená tabulka.
+        """
+        table = cls(entity_type, strings, ids)
+        table.extend(entities)
+        return table
+
+    def extend(self, entities: Iterable[BaseEntity]) -> int:
+        """
+        Přidá entity na konec tabulky.
+
+        Args:
+            entities: Entity typu tabulky.
+
+        Returns:
+            Počet přidaných entit.
+
+        Raises:
+            ValueError: Pokud má některá entita jiný typ.
+        """
+        typecodes = {STRING: "i", ENUM: "b", ID: "i", IDS: "i", STRINGS: "i", DATETIME: "q", INTEGER: "q"}
+        values = {name: array(typecodes[kind]) for name, kind in self.kinds.items()}
+        offsets = {name: array("i", [0]) for name, kind in self.kinds.items() if kind in (IDS, STRINGS)}
+        enum_codes = {
+            name: {member: code for code, member in enumerate(members)}
+            for name, members in self.enum_members.items()
+        }
+        fields = [(name, kind, values[name]) for name, kind in self.kinds.items()]
+        encode_string, encode_id = self.strings.encode, self.ids.encode
+
+        added = 0
+        for entity in entities:
+            if entity.type != self.entity_type:
+                raise ValueError(f"Entita {entity.name} má typ {entity.type}, tabulka {self.entity_type}")
+
+            for name, kind, column in fields:
+                value = getattr(entity, name)
+                if kind == STRING:
+                    column.append(encode_string(value))
+                elif kind == ID:
+                    column.append(encode_id(value))
+                elif kind == ENUM:
+                    column.append(enum_codes[name][value])
+                elif kind == DATETIME:
+                    column.append(_to_microseconds(value))
+                elif kind == INTEGER:
+                    column.append(value)
+                else:
+                    encode = encode_id if kind == IDS else encode_string
+                    column.extend(encode(item) for item in value)
+                    offsets[name].append(len(column))
+            added += 1
+
+        self._append_columns(values, offsets)
+        self._size += added
+        self._rows_by_id = None
+        return added
+
+    def _append_columns(self, values: Dict[str, array], offsets: Dict[str, array]) -> None:
+        """
+        Převede nasbírané hodnoty na pole NumPy a připojí je k existujícím sloupcům.
+
+        Args:
+            values: Hodnoty sloupců.
+            offsets: Začátky seznamů (CSR) u seznamových sloupců.
+        """
+        dtypes = {STRING: np.int32, ENUM: np.int8, ID: np.int32, IDS: np.int32, STRINGS: np.int32,
+                  DATETIME: np.int64, INTEGER: np.int64}
+        for name, kind in self.kinds.items():
+            column = np.frombuffer(values[name], dtype=dtypes[kind]) if len(values[name]) else np.empty(0, dtypes[kind])
+            if kind == DATETIME:
+                column = column.view("datetime64[us]")
+
+            if kind in (IDS, STRINGS):
+                new_offsets = np.frombuffer(offsets[name], dtype=np.int32)
+                if name in self.offsets:
+                    base = self.offsets[name][-1]
+                    self.offsets[name] = np.concatenate([self.offsets[name], new_offsets[1:] + base])
+                else:
+                    self.offsets[name] = new_offsets
+
+            if name in self.columns:
+                self.columns[name] = np.concatenate([self.columns[name], column])
+            else:
+                self.columns[name] = column
+
+    def _encode(self, field: str, value: Any) -> Any:
+        """
+        Převede hodnotu pole na hodnotu ve sloupci (kód, datetime64, číslo).
+
+        Args:
+            field: Název pole.
+            value: Hodnota pole.
+
+        Returns:
+            Hodnota ve tvaru sloupce. Kód -1 znamená, že hodnota v tabulce není.
+
+        Raises:
+            ValueError: Pokud pole neexistuje nebo hodnota neodpovídá výčtu.
+        """
+        kind = self.kinds.get(field)
+        if kind is None:
+            raise ValueError(f"Neplatné pole {field} pro typ entity: {self.entity_type}")
+
+        if kind == ENUM:
+            for code, member in enumerate(self.enum_members[field]):
+                if value == member or value == member.value:
+                    return code
+            raise ValueError(f"Neplatná hodnota {value!r} pole {field}")
+        if kind in (STRING, STRINGS):
+            return self.strings.lookup(value)
+        if kind in (ID, IDS):
+            return self.ids.lookup(value)
+        if kind == DATETIME:
+            return np.int64(_to_microseconds(value)).view("datetime64[us]")
+        return value
+
+    def _decode(self, field: str, code: Any) -> Any:
+        """
+        Převede hodnotu ve sloupci zpět na hodnotu pole.
+
+        Args:
+            field: Název pole.
+            code: Hodnota ve sloupci.
+
+        Returns:
+            Hodnota pole.
+        """
+        kind = self.kinds[field]
+        if kind == ENUM:
+            return self.enum_members[field][code]
+        if kind in (STRING, STRINGS):
+            return self.strings.decode(int(code))
+        if kind in (ID, IDS):
+            return self.ids.decode(int(code))
+        if kind == DATETIME:
+            return None if np.isnat(code) else code.astype(datetime).replace(tzinfo=timezone.utc)
+        return int(code)
+
+    def _row_numbers(self, field: str) -> np.ndarray:
+        """
+        Vrátí pro každou hodnotu seznamového sloupce číslo řádku, ke kterému patří.
+
+        Args:
+            field: Název seznamového pole.
+
+        Returns:
+            Pole čísel řádků stejné délky jako hodnoty sloupce.
+        """
+        return np.repeat(np.arange(self._size, dtype=np.int32), np.diff(self.offsets[field]))
+
+    def mask_equals(self, field: str, value: Any) -> np.ndarray:
+        """
+        Vrátí masku řádků, kde má pole zadanou hodnotu.
+
+        U seznamových polí (relace ``*_ids``, tagy) se hledají řádky, jejichž
+        seznam hodnotu obsahuje.
+
+        Args:
+            field: Název pole.
+            value: Hledaná hodnota (u výčtů člen výčtu nebo jeho hodnota).
+
+        Returns:
+            Booleovská maska délky počtu entit.
+
+        Raises:
+            ValueError: Pokud pole neexistuje nebo hodnota neodpovídá výčtu.
+        """
+        encoded = self._encode(field, value)
+        column = self.columns[field]
+
+        if self.kinds[field] in (IDS, STRINGS):
+            mask = np.zeros(self._size, dtype=bool)
+            if encoded >= 0:
+                mask[self._row_numbers(field)[column == encoded]] = True
+            return mask
+
+        if self.kinds[field] in (STRING, ID) and encoded < 0 and value is not None:
+            return np.zeros(self._size, dtype=bool)
+        if self.kinds[field] == DATETIME and value is None:
+            return np.isnat(column)
+        return column == encoded
+
+    def count_by(self, field: str) -> Dict[Any, int]:
+        """
+        Spočítá počet entit podle hodnoty pole.
+
+        U seznamových polí se počítá každá hodnota seznamu zvlášť (např.
+        kolik NPC má daný tag nebo kolikrát je odkazováno na danou stránku).
+
+        Args:
+            field: Název pole (výčet, text, ID nebo seznam).
+
+        Returns:
+            Slovník hodnota -> počet, seřazený sestupně podle počtu.
+
+        Raises:
+            ValueError: Pokud pole neexistuje nebo podle něj nelze seskupovat.
+        """
+        kind = self.kinds.get(field)
+        if kind is None:
+            raise ValueError(f"Neplatné pole {field} pro typ entity: {self.entity_type}")
+        if kind in (DATETIME, INTEGER):
+            values, counts = np.unique(self.columns[field], return_counts=True)
+            return {self._decode(field, value): int(count) for value, count in zip(values, counts)}
+
+        codes = self.columns[field].astype(np.int64) + 1
+        counts = np.bincount(codes)
+        order = np.argsort(-counts, kind="stable")
+        return {self._decode(field, code - 1) if code else None: int(counts[code]) for code in order if counts[code]}
+
+    def relation_lengths(self, field: str) -> np.ndarray:
+        """
+        Vrátí délky seznamů v seznamovém poli (např. počet předmětů každé NPC).
+
+        Args:
+            field: Název seznamového pole.
+
+        Returns:
+            Pole délek (int32) pro každý řádek.
+
+        Raises:
+            ValueError: Pokud pole není seznamové.
+        """
+        if field not in self.offsets:
+            raise ValueError(f"Pole {field} není seznamové pole typu entity: {self.entity_type}")
+        return np.diff(self.offsets[field])
+
+    def rows_for_ids(self, id_codes: np.ndarray) -> np.ndarray:
+        """
+        Převede kódy ID stránek na čísla řádků této tabulky.
+
+        Slouží ke spojení relace jiné tabulky (se stejným slovníkem ID) s touto tabulkou.
+
+        Args:
+            id_codes: Kódy ID stránek.
+
+        Returns:
+            Čísla řádků (-1 pro stránky, které v tabulce nejsou).
+        """
+        if self._rows_by_id is None or len(self._rows_by_id) < len(self.ids):
+            rows_by_id = np.full(len(self.ids) + 1, -1, dtype=np.int32)
+            page_codes = self.columns["notion_page_id"]
+            known = page_codes >= 0
+            rows_by_id[page_codes[known]] = np.flatnonzero(known)
+            self._rows_by_id = rows_by_id
+        # Kód -1 (chybějící ID) ukazuje na poslední prvek, který je vždy -1
+        return self._rows_by_id[id_codes]
+
+    def to_entity(self, row: int) -> BaseEntity:
+        """
+        Sestaví entitu z jednoho řádku tabulky.
+
+        Args:
+            row: Číslo řádku.
+
+        Returns:
+            Entita.
+        """
+        values = {}
+        for field, kind in self.kinds.items():
+            column = self.columns[field]
+            if kind in (IDS, STRINGS):
+                start, end = self.offsets[field][row], self.offsets[field][row + 1]
+                values[field] = [self._decode(field, code) for code in column[start:end]]
+            else:
+                values[field] = self._decode(field, column[row])
+        return ENTITY_CLASSES[self.entity_type](**values)
+
+    def entities(self, rows: Optional[Union[Sequence[int], np.ndarray]] = None) -> Iterator[BaseEntity]:
+        """
+        Postupně sestaví entity z vybraných řádků.
+
+        Args:
+            rows: Čísla řádků nebo booleovská maska. Pokud nejsou zadána, projdou se všechny řádky.
+
+        Yields:
+            Entity.
+        """
+        if rows is None:
+            rows = range(self._size)
+        elif isinstance(rows, np.ndarray) and rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        for row in rows:
+            yield self.to_entity(int(row))
+
+    def nbytes(self) -> int:
+        """
+        Vrátí velikost polí tabulky v bajtech (bez sdílených slovníků).
+
+        Returns:
+            Velikost v bajtech.
+        """
+        return sum(column.nbytes for column in self.columns.values()) + sum(
+            offsets.nbytes for offsets in self.offsets.values()
+        )
+
+
+class ColumnarStore:
+    """
+    Sloupcové tabulky všech typů entit se sdílenými slovníky řetězců a ID stránek.
+
+    Díky společnému slovníku ID lze relace mezi tabulkami spojovat
+    vektorově (viz ``join``).
+    """
+
+    def __init__(self):
+        """
+        Inicializace prázdného úložiště.
+        """
+        self.strings = StringPool()
+        self.ids = StringPool()
+        self.tables: Dict[EntityType, ColumnarTable] = {}
+
+    def add(self, entity_type: EntityType, entities: Iterable[BaseEntity]) -> ColumnarTable:
+        """
+        Přidá entity do tabulky daného typu (tabulku případně vytvoří).
+
+        Args:
+            entity_type: Typ entity.
+            entities: Entity daného typu.
+
+        Returns:
+            Tabulka daného typu.
+        """
+        table = self.tables.get(entity_type)
+        if table is None:
+            table = self.tables[entity_type] = ColumnarTable(entity_type, self.strings, self.ids)
+        table.extend(entities)
+        return table
+
+    def table(self, entity_type: EntityType) -> ColumnarTable:
+        """
+        Vrátí tabulku daného typu entity.
+
+        Args:
+            entity_type: Typ entity.
+
+        Returns:
+            Tabulka.
+
+        Raises:
+            ValueError: Pokud tabulka daného typu v úložišti není.
+        """
+        table = self.tables.get(entity_type)
+        if table is None:
+            raise ValueError(f"Úložiště neobsahuje entity typu: {entity_type}")
+        return table
+
+    @classmethod
+    def from_repository(
+        cls, repository: EntityRepository, entity_types: Optional[Iterable[EntityType]] = None
+    ) -> "ColumnarStore":
+        """
+        Sestaví úložiště z entit načtených repozitářem.
+
+        Entity se načítají postupně přes ``EntityRepository.iter_all``.
+
+        Args:
+            repository: Repozitář entit.
+            entity_types: Typy entit. Pokud nejsou zadány, načtou se všechny typy s nastavenou databází.
+
+        Returns:
+            Sestavené úložiště.
+        """
+        store = cls()
+        for entity_type in entity_types or [t for t in ENTITY_CLASSES if repository._has_database(t)]:
+            table = store.add(entity_type, repository.iter_all(entity_type))
+            logger.info(f"Do sloupcového úložiště načteno {len(table)} entit typu {entity_type.value}")
+        return store
+
+    @classmethod
+    def from_mirror(cls, mirror: LocalMirror, entity_types: Optional[Iterable[EntityType]] = None) -> "ColumnarStore":
+        """
+        Sestaví úložiště z lokálního zrcadla.
+
+        Args:
+            mirror: Lokální zrcadlo.
+            entity_types: Typy entit. Pokud nejsou zadány, načtou se všechny synchronizované typy.
+
+        Returns:
+            Sestavené úložiště.
+        """
+        store = cls()
+        for entity_type in entity_types or [t for t in ENTITY_CLASSES if mirror.is_synced(t)]:
+            store.add(entity_type, mirror.find_all(entity_type))
+        return store
+
+    def join(self, source_type: EntityType, field: str, target_type: EntityType) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Spojí relační pole jedné tabulky s řádky cílové tabulky.
+
+        Args:
+            source_type: Typ entity s relačním polem.
+            field: Relační pole (``*_id`` nebo ``*_ids``).
+            target_type: Typ entity, na kterou relace odkazuje.
+
+        Returns:
+            Dvojice (offsets, řádky cílové tabulky) ve formátu CSR. U pole
+            ``*_id`` má každý řádek právě jednu hodnotu. Odkazy na stránky,
+            které v cílové tabulce nejsou, mají hodnotu -1.
+
+        Raises:
+            ValueError: Pokud pole není relační.
+        """
+        source = self.table(source_type)
+        target = self.table(target_type)
+        kind = source.kinds.get(field)
+        if kind not in (ID, IDS) or field in ("id", "notion_page_id"):
+            raise ValueError(f"Pole {field} není relační pole typu entity: {source_type}")
+
+        rows = target.rows_for_ids(source.columns[field])
+        if kind == IDS:
+            return source.offsets[field], rows
+        return np.arange(len(source) + 1, dtype=np.int32), rows
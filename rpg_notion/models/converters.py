@@ -3,182 +3,237 @@ Konvertory mezi datovými modely a Notion záznamy.
 """
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Type, TypeVar, Union, cast
+from enum import Enum
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Tuple, TypeVar, cast
 
 from rpg_notion.models.entities import (
-    AdventureJournalEntry, BaseEntity, EntityType, Event, Faction, Item, Location, Monster, NPC, Quest
+    ENTITY_CLASSES, AdventureJournalEntry, BaseEntity, EntityType, Event, Faction, Item, Location, Monster, NPC, Quest
 )
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseEntity)
 
-
-class NotionConverter:
-    """
-    Třída pro konverzi mezi datovými modely a Notion záznamy.
+# Maximální délka obsahu jednoho textového objektu v Notion API
+MAX_TEXT_LENGTH = 2000
+
+# Mapování polí modelů na vlastnosti Notion: pole -> (název vlastnosti, typ vlastnosti)
+PROPERTY_MAP: Dict[EntityType, Dict[str, Tuple[str, str]]] = {
+    EntityType.NPC: {
+        "name": ("Jméno", "title"),
+        "description": ("Popis", "rich_text"),
+        "status": ("Stav", "select"),
+        "occupation": ("Povolání/role", "rich_text"),
+        "location_id": ("Lokace", "relation"),
+        "related_npc_ids": ("Vztahy", "relation"),
+        "item_ids": ("Významné předměty", "relation"),
+        "history": ("Historie změn", "rich_text"),
+        "tags": ("Tagy", "multi_select"),
+    },
+    EntityType.LOCATION: {
+        "name": ("Název", "title"),
+        "location_type": ("Typ", "select"),
+        "hierarchy": ("Hierarchie", "rich_text"),
+        "description": ("Popis prostředí", "rich_text"),
+        "npc_ids": ("Obyvatelé", "relation"),
+        "item_ids": ("Významné objekty", "relation"),
+        "event_ids": ("Události", "relation"),
+        "status": ("Stav", "select"),
+        "tags": ("Tagy", "multi_select"),
+    },
+    EntityType.MONSTER: {
+        "name": ("Název/typ", "title"),
+        "description": ("Popis a schopnosti", "rich_text"),
+        "location_ids": ("Místo výskytu", "relation"),
+        "status": ("Stav", "select"),
+        "combat_history": ("Průběh soubojů", "rich_text"),
+        "weaknesses_strengths": ("Slabiny a silné stránky", "rich_text"),
+        "loot_ids": ("Kořist", "relation"),
+        "tags": ("Tagy", "multi_select"),
+    },
+    EntityType.ITEM: {
+        "name": ("Název", "title"),
+        "item_type": ("Typ", "select"),
+        "description": ("Popis a vlastnosti", "rich_text"),
+        "location_id": ("Místo nalezení", "relation"),
+        "owner_id": ("Současný vlastník", "relation"),
+        "ownership_history": ("Historie vlastnictví", "rich_text"),
+        "special_abilities": ("Speciální schopnosti", "rich_text"),
+        "tags": ("Tagy", "multi_select"),
+    },
+    EntityType.QUEST: {
+        "name": ("Název", "title"),
+        "description": ("Popis a cíle", "rich_text"),
+        "giver_id": ("Zadavatel", "relation"),
+        "status": ("Stav", "select"),
+        "rewards": ("Odměny", "rich_text"),
+        "location_ids": ("Související lokace", "relation"),
+        "npc_ids": ("Související NPC", "relation"),
+        "timeline": ("Časová linie", "rich_text"),
+        "tags": ("Tagy", "multi_select"),
+    },
+    EntityType.FACTION: {
+        "name": ("Název", "title"),
+        "description": ("Popis a cíle", "rich_text"),
+        "member_ids": ("Členové", "relation"),
+        "territory_ids": ("Území", "relation"),
+        "faction_relations": ("Vztahy s jinými frakcemi", "rich_text"),
+        "player_relation": ("Vztah k hráči", "number"),
+        "event_ids": ("Významné události", "relation"),
+        "tags": ("Tagy", "multi_select"),
+    },
+    EntityType.EVENT: {
+        "name": ("Název", "title"),
+        "date": ("Datum a čas", "date"),
+        "description": ("Popis", "rich_text"),
+        "location_id": ("Místo", "relation"),
+        "npc_ids": ("Zúčastněné postavy", "relation"),
+        "consequences": ("Důsledky", "rich_text"),
+        "tags": ("Tagy", "multi_select"),
+    },
+    EntityType.ADVENTURE_JOURNAL: {
+        "name": ("Název epizody", "title"),
+        "date": ("Datum a čas", "date"),
+        "summary": ("Shrnutí příběhu", "rich_text"),
+        "event_ids": ("Klíčové události", "relation"),
+        "npc_ids": ("Zúčastněné postavy", "relation"),
+        "location_ids": ("Navštívené lokace", "relation"),
+    },
+}
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
     """
+    Převede datum ve formátu ISO 8601 z Notion na datetime.
 
-    @staticmethod
-    def _extract_title(properties: Dict[str, Any], property_name: str = "title") -> str:
-        """
-        Extrahuje název z vlastností Notion.
-
-        Args:
-            properties: Vlastnosti Notion.
-            property_name: Název vlastnosti s názvem.
-
-        Returns:
-            Extrahovaný název.
-        """
-        title_property = properties.get(property_name, {})
-        if not title_property:
-            return ""
-        
-        title = title_property.get("title", [])
-        if not title:
-            return ""
-        
-        return "".join(item.get("plain_text", "") for item in title)
-
-    @staticmethod
-    def _extract_rich_text(properties: Dict[str, Any], property_name: str) -> str:
-        """
-        Extrahuje text z vlastností Notion.
-
-        Args:
-            properties: Vlastnosti Notion.
-            property_name: Název vlastnosti s textem.
+    Notion uvádí časy v UTC s příponou "Z", kterou datetime.fromisoformat
+    podporuje až od Pythonu 3.11, proto se nahradí posunem "+00:00".
 
-        Returns:
-            Extrahovaný text.
-        """
-        text_property = properties.get(property_name, {})
-        if not text_property:
-            return ""
-        
-        rich_text = text_property.get("rich_text", [])
-        if not rich_text:
-            return ""
-        
-        return "".join(item.get("plain_text", "") for item in rich_text)
+    Args:
+        value: Datum jako řetězec.
 
-    @staticmethod
-    def _extract_select(properties: Dict[str, Any], property_name: str) -> str:
-        """
-        Extrahuje vybranou možnost z vlastností Notion.
+    Returns:
+        Datum nebo None, pokud není zadáno nebo je neplatné.
+    """
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (ValueError, TypeError, AttributeError):
+        return None
 
-        Args:
-            properties: Vlastnosti Notion.
-            property_name: Název vlastnosti s výběrem.
 
-        Returns:
-            Extrahovaná vybraná možnost.
-        """
-        select_property = properties.get(property_name, {})
-        if not select_property:
-            return ""
-        
-        select = select_property.get("select", {})
-        if not select:
-            return ""
-        
-        return select.get("name", "")
+def _property_decoder(property_name: str, property_type: str, single: bool) -> Callable[[Dict[str, Any]], Any]:
+    """
+    Vytvoří funkci, která z vlastností stránky Notion přečte hodnotu jednoho pole.
 
-    @staticmethod
-    def _extract_multi_select(properties: Dict[str, Any], property_name: str) -> List[str]:
-        """
-        Extrahuje vybrané možnosti z vlastností Notion.
+    Args:
+        property_name: Název vlastnosti v Notion.
+        property_type: Typ vlastnosti v Notion.
+        single: Zda relace odpovídá jednomu ID (pole ``*_id``), nikoli seznamu.
 
-        Args:
-            properties: Vlastnosti Notion.
-            property_name: Název vlastnosti s více výběry.
+    Returns:
+        Funkce vlastnosti stránky -> hodnota pole.
 
-        Returns:
-            Seznam extrahovaných vybraných možností.
-        """
-        multi_select_property = properties.get(property_name, {})
-        if not multi_select_property:
-            return []
-        
-        multi_select = multi_select_property.get("multi_select", [])
-        if not multi_select:
-            return []
-        
-        return [item.get("name", "") for item in multi_select]
+    Raises:
+        ValueError: Pokud je zadán nepodporovaný typ vlastnosti.
+    """
+    if property_type in ("title", "rich_text"):
+        def decode(properties: Dict[str, Any]) -> Any:
+            items = (properties.get(property_name) or {}).get(property_type)
+            return "".join([item.get("plain_text", "") for item in items]) if items else ""
+    elif property_type == "select":
+        def decode(properties: Dict[str, Any]) -> Any:
+            option = (properties.get(property_name) or {}).get("select")
+            return option.get("name", "") if option else ""
+    elif property_type == "multi_select":
+        def decode(properties: Dict[str, Any]) -> Any:
+            options = (properties.get(property_name) or {}).get("multi_select")
+            return [option.get("name", "") for option in options] if options else []
+    elif property_type == "relation" and single:
+        def decode(properties: Dict[str, Any]) -> Any:
+            references = (properties.get(property_name) or {}).get("relation")
+            return references[0].get("id", "") if references else None
+    elif property_type == "relation":
+        def decode(properties: Dict[str, Any]) -> Any:
+            references = (properties.get(property_name) or {}).get("relation")
+            return [reference.get("id", "") for reference in references] if references else []
+    elif property_type == "date":
+        def decode(properties: Dict[str, Any]) -> Any:
+            date = (properties.get(property_name) or {}).get("date")
+            return _parse_datetime(date.get("start")) if date else None
+    elif property_type == "number":
+        def decode(properties: Dict[str, Any]) -> Any:
+            number = (properties.get(property_name) or {}).get("number")
+            return int(number) if number is not None else 0
+    else:
+        raise ValueError(f"Nepodporovaný typ vlastnosti: {property_type}")
+    return decode
+
+
+# Povinná pole modelů, která se dekódují i při načtení jen vybraných polí
+REQUIRED_FIELDS: Dict[EntityType, FrozenSet[str]] = {
+    entity_type: frozenset(
+        field for field in PROPERTY_MAP[entity_type]
+        if ENTITY_CLASSES[entity_type].model_fields[field].is_required()
+    )
+    for entity_type in PROPERTY_MAP
+}
+
+
+def _compile_page_converter(
+    entity_type: EntityType, fields: Optional[FrozenSet[str]] = None
+) -> Callable[[Dict[str, Any]], BaseEntity]:
+    """
+    Sestaví z PROPERTY_MAP funkci, která převede stránku Notion na entitu daného typu.
 
-    @staticmethod
-    def _extract_relation(properties: Dict[str, Any], property_name: str) -> List[str]:
-        """
-        Extrahuje ID propojených stránek z vlastností Notion.
+    Pro každé pole se jednou připraví dekodér vlastnosti, takže při převodu
+    se už neprochází tabulka ani nerozhoduje podle typu vlastnosti.
 
-        Args:
-            properties: Vlastnosti Notion.
-            property_name: Název vlastnosti s relací.
+    Args:
+        entity_type: Typ entity.
+        fields: Pole, která se mají dekódovat (povinná pole modelu se dekódují vždy). Ostatní
+            pole dostanou výchozí hodnotu. Pokud nejsou zadána, dekódují se všechna pole.
 
-        Returns:
-            Seznam ID propojených stránek.
-        """
-        relation_property = properties.get(property_name, {})
-        if not relation_property:
-            return []
-        
-        relation = relation_property.get("relation", [])
-        if not relation:
-            return []
-        
-        return [item.get("id", "") for item in relation]
+    Returns:
+        Funkce stránka -> entita.
+    """
+    entity_class = ENTITY_CLASSES[entity_type]
+    if fields is not None:
+        fields = fields | REQUIRED_FIELDS[entity_type]
+    decoders = tuple(
+        (field, _property_decoder(property_name, property_type, field.endswith("_id")))
+        for field, (property_name, property_type) in PROPERTY_MAP[entity_type].items()
+        if fields is None or field in fields
+    )
+
+    def convert(page: Dict[str, Any]) -> BaseEntity:
+        properties = page.get("properties", {})
+        values = {field: decode(properties) for field, decode in decoders}
+        values["id"] = values["notion_page_id"] = page.get("id")
+        values["created_at"] = _parse_datetime(page.get("created_time"))
+        values["updated_at"] = _parse_datetime(page.get("last_edited_time"))
+        return entity_class(**values)
 
-    @staticmethod
-    def _extract_date(properties: Dict[str, Any], property_name: str) -> Optional[datetime]:
-        """
-        Extrahuje datum z vlastností Notion.
+    return convert
 
-        Args:
-            properties: Vlastnosti Notion.
-            property_name: Název vlastnosti s datem.
 
-        Returns:
-            Extrahované datum nebo None, pokud datum není nastaveno.
-        """
-        date_property = properties.get(property_name, {})
-        if not date_property:
-            return None
-        
-        date = date_property.get("date", {})
-        if not date:
-            return None
-        
-        start = date.get("start")
-        if not start:
-            return None
-        
-        try:
-            return datetime.fromisoformat(start)
-        except (ValueError, TypeError):
-            return None
+class NotionConverter:
+    """
+    Třída pro konverzi mezi datovými modely a Notion záznamy.
 
-    @staticmethod
-    def _extract_number(properties: Dict[str, Any], property_name: str) -> int:
-        """
-        Extrahuje číslo z vlastností Notion.
+    Převod je řízen tabulkou PROPERTY_MAP: pro každý typ entity se z ní
+    jednou sestaví převodník stránek a stejná tabulka slouží i pro sestavení
+    vlastností odesílaných do Notion.
+    """
 
-        Args:
-            properties: Vlastnosti Notion.
-            property_name: Název vlastnosti s číslem.
+    # Převodníky stránek podle typu entity, sestavené z PROPERTY_MAP
+    _page_converters: Dict[EntityType, Callable[[Dict[str, Any]], BaseEntity]] = {
+        entity_type: _compile_page_converter(entity_type) for entity_type in PROPERTY_MAP
+    }
 
-        Returns:
-            Extrahované číslo.
-        """
-        number_property = properties.get(property_name, {})
-        if not number_property:
-            return 0
-        
-        number = number_property.get("number")
-        if number is None:
-            return 0
-        
-        return int(number)
+    # Převodníky stránek omezené na vybraná pole, sestavené při prvním použití
+    _projected_converters: Dict[Tuple[EntityType, FrozenSet[str]], Callable[[Dict[str, Any]], BaseEntity]] = {}
 
     @classmethod
     def notion_to_npc(cls, page: Dict[str, Any]) -> NPC:
@@ -191,23 +246,7 @@ class NotionConverter:
         Returns:
             NPC objekt.
         """
-        properties = page.get("properties", {})
-        
-        return NPC(
-            id=page.get("id"),
-            name=cls._extract_title(properties, "Jméno"),
-            description=cls._extract_rich_text(properties, "Popis"),
-            status=cls._extract_select(properties, "Stav"),
-            occupation=cls._extract_rich_text(properties, "Povolání/role"),
-            location_id=cls._extract_relation(properties, "Lokace")[0] if cls._extract_relation(properties, "Lokace") else None,
-            related_npc_ids=cls._extract_relation(properties, "Vztahy"),
-            item_ids=cls._extract_relation(properties, "Významné předměty"),
-            history=cls._extract_rich_text(properties, "Historie změn"),
-            tags=cls._extract_multi_select(properties, "Tagy"),
-            notion_page_id=page.get("id"),
-            created_at=datetime.fromisoformat(page.get("created_time")) if page.get("created_time") else None,
-            updated_at=datetime.fromisoformat(page.get("last_edited_time")) if page.get("last_edited_time") else None,
-        )
+        return cast(NPC, cls._page_converters[EntityType.NPC](page))
 
     @classmethod
     def notion_to_location(cls, page: Dict[str, Any]) -> Location:
@@ -220,23 +259,7 @@ class NotionConverter:
         Returns:
             Location objekt.
         """
-        properties = page.get("properties", {})
-        
-        return Location(
-            id=page.get("id"),
-            name=cls._extract_title(properties, "Název"),
-            location_type=cls._extract_select(properties, "Typ"),
-            hierarchy=cls._extract_rich_text(properties, "Hierarchie"),
-            description=cls._extract_rich_text(properties, "Popis prostředí"),
-            npc_ids=cls._extract_relation(properties, "Obyvatelé"),
-            item_ids=cls._extract_relation(properties, "Významné objekty"),
-            event_ids=cls._extract_relation(properties, "Události"),
-            status=cls._extract_select(properties, "Stav"),
-            tags=cls._extract_multi_select(properties, "Tagy"),
-            notion_page_id=page.get("id"),
-            created_at=datetime.fromisoformat(page.get("created_time")) if page.get("created_time") else None,
-            updated_at=datetime.fromisoformat(page.get("last_edited_time")) if page.get("last_edited_time") else None,
-        )
+        return cast(Location, cls._page_converters[EntityType.LOCATION](page))
 
     @classmethod
     def notion_to_monster(cls, page: Dict[str, Any]) -> Monster:
@@ -249,22 +272,7 @@ class NotionConverter:
         Returns:
             Monster objekt.
         """
-        properties = page.get("properties", {})
-        
-        return Monster(
-            id=page.get("id"),
-            name=cls._extract_title(properties, "Název/typ"),
-            description=cls._extract_rich_text(properties, "Popis a schopnosti"),
-            location_ids=cls._extract_relation(properties, "Místo výskytu"),
-            status=cls._extract_select(properties, "Stav"),
-            combat_history=cls._extract_rich_text(properties, "Průběh soubojů"),
-            weaknesses_strengths=cls._extract_rich_text(properties, "Slabiny a silné stránky"),
-            loot_ids=cls._extract_relation(properties, "Kořist"),
-            tags=cls._extract_multi_select(properties, "Tagy"),
-            notion_page_id=page.get("id"),
-            created_at=datetime.fromisoformat(page.get("created_time")) if page.get("created_time") else None,
-            updated_at=datetime.fromisoformat(page.get("last_edited_time")) if page.get("last_edited_time") else None,
-        )
+        return cast(Monster, cls._page_converters[EntityType.MONSTER](page))
 
     @classmethod
     def notion_to_item(cls, page: Dict[str, Any]) -> Item:
@@ -277,22 +285,7 @@ class NotionConverter:
         Returns:
             Item objekt.
         """
-        properties = page.get("properties", {})
-        
-        return Item(
-            id=page.get("id"),
-            name=cls._extract_title(properties, "Název"),
-            item_type=cls._extract_select(properties, "Typ"),
-            description=cls._extract_rich_text(properties, "Popis a vlastnosti"),
-            location_id=cls._extract_relation(properties, "Místo nalezení")[0] if cls._extract_relation(properties, "Místo nalezení") else None,
-            owner_id=cls._extract_relation(properties, "Současný vlastník")[0] if cls._extract_relation(properties, "Současný vlastník") else None,
-            ownership_history=cls._extract_rich_text(properties, "Historie vlastnictví"),
-            special_abilities=cls._extract_rich_text(properties, "Speciální schopnosti"),
-            tags=cls._extract_multi_select(properties, "Tagy"),
-            notion_page_id=page.get("id"),
-            created_at=datetime.fromisoformat(page.get("created_time")) if page.get("created_time") else None,
-            updated_at=datetime.fromisoformat(page.get("last_edited_time")) if page.get("last_edited_time") else None,
-        )
+        return cast(Item, cls._page_converters[EntityType.ITEM](page))
 
     @classmethod
     def notion_to_quest(cls, page: Dict[str, Any]) -> Quest:
@@ -305,23 +298,7 @@ class NotionConverter:
         Returns:
             Quest objekt.
         """
-        properties = page.get("properties", {})
-        
-        return Quest(
-            id=page.get("id"),
-            name=cls._extract_title(properties, "Název"),
-            description=cls._extract_rich_text(properties, "Popis a cíle"),
-            giver_id=cls._extract_relation(properties, "Zadavatel")[0] if cls._extract_relation(properties, "Zadavatel") else None,
-            status=cls._extract_select(properties, "Stav"),
-            rewards=cls._extract_rich_text(properties, "Odměny"),
-            location_ids=cls._extract_relation(properties, "Související lokace"),
-            npc_ids=cls._extract_relation(properties, "Související NPC"),
-            timeline=cls._extract_rich_text(properties, "Časová linie"),
-            tags=cls._extract_multi_select(properties, "Tagy"),
-            notion_page_id=page.get("id"),
-            created_at=datetime.fromisoformat(page.get("created_time")) if page.get("created_time") else None,
-            updated_at=datetime.fromisoformat(page.get("last_edited_time")) if page.get("last_edited_time") else None,
-        )
+        return cast(Quest, cls._page_converters[EntityType.QUEST](page))
 
     @classmethod
     def notion_to_faction(cls, page: Dict[str, Any]) -> Faction:
@@ -334,22 +311,7 @@ class NotionConverter:
         Returns:
             Faction objekt.
         """
-        properties = page.get("properties", {})
-        
-        return Faction(
-            id=page.get("id"),
-            name=cls._extract_title(properties, "Název"),
-            description=cls._extract_rich_text(properties, "Popis a cíle"),
-            member_ids=cls._extract_relation(properties, "Členové"),
-            territory_ids=cls._extract_relation(properties, "Území"),
-            faction_relations=cls._extract_rich_text(properties, "Vztahy s jinými frakcemi"),
-            player_relation=cls._extract_number(properties, "Vztah k hráči"),
-            event_ids=cls._extract_relation(properties, "Významné události"),
-            tags=cls._extract_multi_select(properties, "Tagy"),
-            notion_page_id=page.get("id"),
-            created_at=datetime.fromisoformat(page.get("created_time")) if page.get("created_time") else None,
-            updated_at=datetime.fromisoformat(page.get("last_edited_time")) if page.get("last_edited_time") else None,
-        )
+        return cast(Faction, cls._page_converters[EntityType.FACTION](page))
 
     @classmethod
     def notion_to_event(cls, page: Dict[str, Any]) -> Event:
@@ -362,21 +324,7 @@ class NotionConverter:
         Returns:
             Event objekt.
         """
-        properties = page.get("properties", {})
-        
-        return Event(
-            id=page.get("id"),
-            name=cls._extract_title(properties, "Název"),
-            date=cls._extract_date(properties, "Datum a čas"),
-            description=cls._extract_rich_text(properties, "Popis"),
-            location_id=cls._extract_relation(properties, "Místo")[0] if cls._extract_relation(properties, "Místo") else None,
-            npc_ids=cls._extract_relation(properties, "Zúčastněné postavy"),
-            consequences=cls._extract_rich_text(properties, "Důsledky"),
-            tags=cls._extract_multi_select(properties, "Tagy"),
-            notion_page_id=page.get("id"),
-            created_at=datetime.fromisoformat(page.get("created_time")) if page.get("created_time") else None,
-            updated_at=datetime.fromisoformat(page.get("last_edited_time")) if page.get("last_edited_time") else None,
-        )
+        return cast(Event, cls._page_converters[EntityType.EVENT](page))
 
     @classmethod
     def notion_to_adventure_journal_entry(cls, page: Dict[str, Any]) -> AdventureJournalEntry:
@@ -389,51 +337,139 @@ class NotionConverter:
         Returns:
             AdventureJournalEntry objekt.
         """
-        properties = page.get("properties", {})
-        
-        return AdventureJournalEntry(
-            id=page.get("id"),
-            name=cls._extract_title(properties, "Název epizody"),
-            date=cls._extract_date(properties, "Datum a čas"),
-            summary=cls._extract_rich_text(properties, "Shrnutí příběhu"),
-            event_ids=cls._extract_relation(properties, "Klíčové události"),
-            npc_ids=cls._extract_relation(properties, "Zúčastněné postavy"),
-            location_ids=cls._extract_relation(properties, "Navštívené lokace"),
-            notion_page_id=page.get("id"),
-            created_at=datetime.fromisoformat(page.get("created_time")) if page.get("created_time") else None,
-            updated_at=datetime.fromisoformat(page.get("last_edited_time")) if page.get("last_edited_time") else None,
-        )
+        return cast(AdventureJournalEntry, cls._page_converters[EntityType.ADVENTURE_JOURNAL](page))
 
     @classmethod
-    def notion_to_entity(cls, page: Dict[str, Any], entity_type: EntityType) -> BaseEntity:
+    def notion_to_entity(
+        cls, page: Dict[str, Any], entity_type: EntityType, fields: Optional[Iterable[str]] = None
+    ) -> BaseEntity:
         """
         Konvertuje Notion stránku na entitu podle typu.
 
         Args:
             page: Notion stránka.
             entity_type: Typ entity.
+            fields: Pole, která se mají dekódovat. Ostatní pole (kromě povinných) dostanou
+                výchozí hodnotu. Pokud nejsou zadána, dekódují se všechna pole.
 
         Returns:
             Entita odpovídajícího typu.
 
         Raises:
-            ValueError: Pokud je zadán neplatný typ entity.
+            ValueError: Pokud je zadán neplatný typ entity nebo pole.
         """
-        if entity_type == EntityType.NPC:
-            return cls.notion_to_npc(page)
-        elif entity_type == EntityType.LOCATION:
-            return cls.notion_to_location(page)
-        elif entity_type == EntityType.MONSTER:
-            return cls.notion_to_monster(page)
-        elif entity_type == EntityType.ITEM:
-            return cls.notion_to_item(page)
-        elif entity_type == EntityType.QUEST:
-            return cls.notion_to_quest(page)
-        elif entity_type == EntityType.FACTION:
-            return cls.notion_to_faction(page)
-        elif entity_type == EntityType.EVENT:
-            return cls.notion_to_event(page)
-        elif entity_type == EntityType.ADVENTURE_JOURNAL:
-            return cls.notion_to_adventure_journal_entry(page)
+        if fields is None:
+            converter = cls._page_converters.get(entity_type)
         else:
+            converter = cls._projected_converter(entity_type, frozenset(fields))
+        if converter is None:
             raise ValueError(f"Neplatný typ entity: {entity_type}")
+        return converter(page)
+
+    @classmethod
+    def _projected_converter(
+        cls, entity_type: EntityType, fields: FrozenSet[str]
+    ) -> Optional[Callable[[Dict[str, Any]], BaseEntity]]:
+        """
+        Vrátí převodník stránek omezený na vybraná pole, případně ho sestaví.
+
+        Args:
+            entity_type: Typ entity.
+            fields: Pole, která se mají dekódovat.
+
+        Returns:
+            Převodník stránek nebo None, pokud je zadán neplatný typ entity.
+
+        Raises:
+            ValueError: Pokud typ entity nemá některé ze zadaných polí.
+        """
+        converter = cls._projected_converters.get((entity_type, fields))
+        if converter is None:
+            if entity_type not in PROPERTY_MAP:
+                return None
+            unknown = fields - PROPERTY_MAP[entity_type].keys()
+            if unknown:
+                raise ValueError(f"Neplatná pole pro typ entity {entity_type}: {', '.join(sorted(unknown))}")
+            converter = _compile_page_converter(entity_type, fields)
+            cls._projected_converters[(entity_type, fields)] = converter
+        return converter
+
+    @staticmethod
+    def _to_property_value(property_type: str, value: Any) -> Dict[str, Any]:
+        """
+        Převede hodnotu pole modelu na hodnotu vlastnosti Notion.
+
+        Args:
+            property_type: Typ vlastnosti Notion.
+            value: Hodnota pole.
+
+        Returns:
+            Hodnota vlastnosti pro Notion API.
+
+        Raises:
+            ValueError: Pokud je zadán nepodporovaný typ vlastnosti.
+        """
+        if isinstance(value, Enum):
+            value = value.value
+
+        if property_type in ("title", "rich_text"):
+            chunks = [value[start:start + MAX_TEXT_LENGTH] for start in range(0, len(value or ""), MAX_TEXT_LENGTH)]
+            return {property_type: [{"type": "text", "text": {"content": chunk}} for chunk in chunks]}
+        elif property_type == "select":
+            return {"select": {"name": value} if value else None}
+        elif property_type == "multi_select":
+            return {"multi_select": [{"name": option} for option in value]}
+        elif property_type == "relation":
+            page_ids = [value] if isinstance(value, str) else (value or [])
+            return {"relation": [{"id": page_id} for page_id in page_ids]}
+        elif property_type == "date":
+            return {"date": {"start": value.isoformat()} if value else None}
+        elif property_type == "number":
+            return {"number": value}
+        else:
+            raise ValueError(f"Nepodporovaný typ vlastnosti: {property_type}")
+
+    @classmethod
+    def values_to_properties(cls, entity_type: EntityType, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Konvertuje hodnoty polí modelu na vlastnosti Notion stránky.
+
+        Pole, která nemají odpovídající vlastnost v Notion, se přeskočí.
+
+        Args:
+            entity_type: Typ entity.
+            values: Slovník název pole -> hodnota.
+
+        Returns:
+            Vlastnosti pro Notion API (např. pro ``create_page``).
+        """
+        property_map = PROPERTY_MAP.get(entity_type, {})
+        properties = {}
+        for field, value in values.items():
+            if field in property_map:
+                property_name, property_type = property_map[field]
+                properties[property_name] = cls._to_property_value(property_type, value)
+        return properties
+
+    @classmethod
+    def entity_to_properties(cls, entity: BaseEntity, fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Konvertuje entitu (nebo jen vybraná pole) na vlastnosti Notion stránky.
+
+        Pole, která nemají odpovídající vlastnost v Notion (např. ``id`` nebo
+        ``updated_at``), se přeskočí.
+
+        Args:
+            entity: Entita.
+            fields: Pole, která se mají převést. Pokud nejsou zadána, převedou se všechna.
+
+        Returns:
+            Vlastnosti pro Notion API (např. pro ``update_page``).
+        """
+        property_map = PROPERTY_MAP.get(entity.type, {})
+        if fields is None:
+            fields = property_map.keys()
+
+        return cls.values_to_properties(
+            entity.type, {field: getattr(entity, field) for field in fields if field in property_map}
+        )
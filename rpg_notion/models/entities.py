@@ -1,11 +1,12 @@
 """
 Datové modely pro entity v RPG Notion.
 """
+import copy
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Type, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class EntityType(str, Enum):
@@ -92,9 +93,49 @@ class QuestStatus(str, Enum):
     PAUSED = "Pozastavený"
 
 
+# Neměnné hodnoty, které lze ve snímku stavu entity sdílet bez kopírování
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None), datetime, Enum)
+
+
+def _snapshot(value: Any) -> Any:
+    """
+    Vrátí kopii hodnoty pole, kterou pozdější změny entity na místě neovlivní.
+
+    Args:
+        value: Hodnota pole.
+
+    Returns:
+        Kopie hodnoty (neměnné hodnoty se nekopírují).
+    """
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return value
+    if isinstance(value, list) and all(isinstance(item, _IMMUTABLE_TYPES) for item in value):
+        # Seznamy řetězců (ID, tagy) stačí zkopírovat mělce
+        return list(value)
+    return copy.deepcopy(value)
+
+
+def _same_value(first: Any, second: Any) -> bool:
+    """
+    Porovná dvě hodnoty pole včetně jejich typu (0, False a 0.0 jsou různé hodnoty).
+
+    Args:
+        first: První hodnota.
+        second: Druhá hodnota.
+
+    Returns:
+        True, pokud jsou hodnoty stejné.
+    """
+    return type(first) is type(second) and first == second
+
+
 class BaseEntity(BaseModel):
     """
     Základní model pro entity.
+
+    Entita si pamatuje snímek hodnot svých polí z okamžiku vytvoření (načtení)
+    nebo posledního uložení, takže lze zjistit, která pole se od té doby
+    změnila, a to i při změně seznamu na místě (např. ``append``).
     """
     id: Optional[str] = None
     name: str
@@ -104,6 +145,53 @@ class BaseEntity(BaseModel):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
+    _clean_values: Dict[str, Any] = PrivateAttr(default_factory=dict)
+
+    def model_post_init(self, __context: Any) -> None:
+        """
+        Po vytvoření entity uloží hodnoty polí jako čistý stav.
+        """
+        self.mark_clean()
+
+    def mark_clean(self, fields: Optional[Iterable[str]] = None) -> None:
+        """
+        Označí aktuální stav entity (nebo jen vybraných polí) jako uložený.
+
+        Args:
+            fields: Pole, která se označí jako uložená. Pokud nejsou zadána, označí se všechna.
+        """
+        if fields is None:
+            self._clean_values = {name: _snapshot(value) for name, value in self.__dict__.items()}
+            return
+        for name in fields:
+            self._clean_values[name] = _snapshot(self.__dict__[name])
+
+    @property
+    def is_dirty(self) -> bool:
+        """
+        Zda se entita od posledního uložení změnila.
+
+        Returns:
+            True, pokud se obsah entity změnil.
+        """
+        clean = self._clean_values
+        return any(
+            name not in clean or not _same_value(clean[name], value) for name, value in self.__dict__.items()
+        )
+
+    def dirty_fields(self) -> Set[str]:
+        """
+        Vrátí pole změněná od vytvoření nebo posledního uložení entity.
+
+        Returns:
+            Množina názvů změněných polí.
+        """
+        clean = self._clean_values
+        return {
+            name for name, value in self.__dict__.items()
+            if name not in clean or not _same_value(clean[name], value)
+        }
+
 
 class NPC(BaseEntity):
     """
@@ -208,3 +296,16 @@ class AdventureJournalEntry(BaseEntity):
     event_ids: List[str] = Field(default_factory=list)
     npc_ids: List[str] = Field(default_factory=list)
     location_ids: List[str] = Field(default_factory=list)
+
+
+# Třídy entit podle typu entity
+ENTITY_CLASSES: Dict[EntityType, Type[BaseEntity]] = {
+    EntityType.NPC: NPC,
+    EntityType.LOCATION: Location,
+    EntityType.MONSTER: Monster,
+    EntityType.ITEM: Item,
+    EntityType.QUEST: Quest,
+    EntityType.FACTION: Faction,
+    EntityType.EVENT: Event,
+    EntityType.ADVENTURE_JOURNAL: AdventureJournalEntry,
+}
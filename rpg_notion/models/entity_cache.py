@@ -0,0 +1,172 @@
+"""
+Lokální cache entit načtených z Notion.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from rpg_notion.config.settings import ENTITY_CACHE_MAX_SIZE, ENTITY_CACHE_TTL
+from rpg_notion.models.entities import BaseEntity, EntityType
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[EntityType, str]
+
+
+class EntityCache:
+    """
+    Cache entit v rámci procesu s omezenou dobou platnosti (TTL) a LRU vytěsňováním.
+
+    Klíčem je dvojice (typ entity, normalizovaný název). Ukládají se i negativní
+    výsledky (entita neexistuje), takže opakované dotazy na stejný název během
+    jednoho sezení neopustí proces. Repozitář do cache zapisuje při vytvoření
+    a aktualizaci entity (write-through), takže negativní záznam se po vytvoření
+    entity okamžitě přepíše.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        max_size: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Inicializace cache.
+
+        Args:
+            ttl: Doba platnosti záznamu v sekundách. Pokud není zadána, použije se z konfigurace.
+            max_size: Maximální počet záznamů. Pokud není zadán, použije se z konfigurace.
+            clock: Monotónní hodiny vracející čas v sekundách.
+        """
+        self.ttl = ttl if ttl is not None else ENTITY_CACHE_TTL
+        self.max_size = max_size if max_size is not None else ENTITY_CACHE_MAX_SIZE
+        if self.max_size < 1:
+            raise ValueError(f"Neplatná velikost cache: {self.max_size}")
+
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Optional[BaseEntity]]]" = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize_name(name: str) -> str:
+        """
+        Normalizuje název entity pro použití v klíči cache.
+
+        Args:
+            name: Název entity.
+
+        Returns:
+            Normalizovaný název (bez okrajových a zdvojených mezer, malými písmeny).
+        """
+        return " ".join(name.split()).casefold()
+
+    def _make_key(self, entity_type: EntityType, name: str) -> CacheKey:
+        """
+        Vytvoří klíč cache.
+
+        Args:
+            entity_type: Typ entity.
+            name: Název entity.
+
+        Returns:
+            Klíč cache.
+        """
+        return entity_type, self.normalize_name(name)
+
+    def lookup(self, entity_type: EntityType, name: str) -> Tuple[bool, Optional[BaseEntity]]:
+        """
+        Vyhledá entitu v cache.
+
+        Args:
+            entity_type: Typ entity.
+            name: Název entity.
+
+        Returns:
+            Dvojice (nalezeno v cache, entita). Entita je None, pokud je v cache
+            uložen negativní výsledek.
+        """
+        key = self._make_key(entity_type, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, entity = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, entity
+                del self._entries[key]
+
+            self.misses += 1
+            return False, None
+
+    def put(self, entity_type: EntityType, name: str, entity: Optional[BaseEntity]) -> None:
+        """
+        Uloží entitu (nebo negativní výsledek) do cache.
+
+        Args:
+            entity_type: Typ entity.
+            name: Název entity.
+            entity: Entita nebo None, pokud entita neexistuje.
+        """
+        key = self._make_key(entity_type, name)
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, entity)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def put_entity(self, entity: BaseEntity) -> None:
+        """
+        Uloží entitu do cache pod jejím názvem a typem.
+
+        Args:
+            entity: Entita.
+        """
+        self.put(entity.type, entity.name, entity)
+
+    def invalidate(self, entity_type: EntityType, name: str) -> None:
+        """
+        Odstraní záznam z cache.
+
+        Args:
+            entity_type: Typ entity.
+            name: Název entity.
+        """
+        with self._lock:
+            self._entries.pop(self._make_key(entity_type, name), None)
+
+    def clear(self) -> None:
+        """
+        Vyprázdní cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Vrátí statistiky cache.
+
+        Returns:
+            Slovník s počty zásahů, minutí, vytěsnění a aktuální velikostí cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+            }
@@ -0,0 +1,384 @@
+"""
+Lokální zrcadlo databází Notion v SQLite.
+"""
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Type, Union
+
+from rpg_notion.models.entities import ENTITY_CLASSES, BaseEntity, EntityType
+from rpg_notion.models.entity_cache import EntityCache
+
+logger = logging.getLogger(__name__)
+
+
+def _relation_fields(entity_class: Type[BaseEntity]) -> List[str]:
+    """
+    Vrátí názvy polí entity, která odkazují na jiné stránky.
+
+    Args:
+        entity_class: Třída entity.
+
+    Returns:
+        Seznam názvů relačních polí.
+    """
+    return [
+        name for name in entity_class.model_fields
+        if name not in ("id", "notion_page_id") and (name.endswith("_id") or name.endswith("_ids"))
+    ]
+
+
+RELATION_FIELDS: Dict[EntityType, List[str]] = {
+    entity_type: _relation_fields(entity_class) for entity_type, entity_class in ENTITY_CLASSES.items()
+}
+
+
+class LocalMirror:
+    """
+    Perzistentní zrcadlo databází Notion uložené v SQLite.
+
+    Každý typ entity má vlastní tabulku (``entity_<typ>``) s normalizovaným
+    názvem, časem poslední úpravy v Notion a serializovanou entitou. Relace
+    jsou uloženy ve spojovacích tabulkách (``relation_<typ>``), takže lze
+    rychle dohledat i opačný směr relace. Tabulka ``sync_state`` drží pro
+    každý typ entity značku (watermark) poslední synchronizace.
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:"):
+        """
+        Inicializace zrcadla.
+
+        Args:
+            path: Cesta k souboru databáze SQLite. Výchozí ``:memory:`` vytvoří dočasnou databázi v paměti.
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    @staticmethod
+    def _entity_table(entity_type: EntityType) -> str:
+        return f"entity_{entity_type.value}"
+
+    @staticmethod
+    def _relation_table(entity_type: EntityType) -> str:
+        return f"relation_{entity_type.value}"
+
+    def _create_schema(self) -> None:
+        """
+        Vytvoří tabulky zrcadla, pokud ještě neexistují.
+        """
+        statements = [
+            """
+            CREATE TABLE IF NOT EXISTS sync_state (
+                entity_type TEXT PRIMARY KEY,
+                database_id TEXT,
+                watermark TEXT,
+                synced_at TEXT
+            )
+            """
+        ]
+        for entity_type in EntityType:
+            entity_table = self._entity_table(entity_type)
+            relation_table = self._relation_table(entity_type)
+            statements.extend([
+                f"""
+                CREATE TABLE IF NOT EXISTS {entity_table} (
+                    page_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    name_key TEXT NOT NULL,
+                    last_edited_time TEXT,
+                    data TEXT NOT NULL
+                )
+                """,
+                f"CREATE INDEX IF NOT EXISTS idx_{entity_table}_name_key ON {entity_table} (name_key)",
+                f"""
+                CREATE TABLE IF NOT EXISTS {relation_table} (
+                    page_id TEXT NOT NULL,
+                    field TEXT NOT NULL,
+                    target_id TEXT NOT NULL,
+                    PRIMARY KEY (page_id, field, target_id)
+                )
+                """,
+                f"CREATE INDEX IF NOT EXISTS idx_{relation_table}_target ON {relation_table} (target_id)",
+            ])
+
+        with self._lock, self._connection:
+            for statement in statements:
+                self._connection.execute(statement)
+
+    def close(self) -> None:
+        """
+        Uzavře spojení s databází.
+        """
+        with self._lock:
+            self._connection.close()
+
+    # Zápis
+
+    def upsert(self, entity: BaseEntity, last_edited_time: Optional[str] = None) -> None:
+        """
+        Vloží nebo aktualizuje entitu v zrcadle.
+
+        Args:
+            entity: Entita s nastaveným ``notion_page_id`` nebo ``id``.
+            last_edited_time: Čas poslední úpravy stránky v Notion (ISO 8601).
+                Pokud není zadán, použije se ``updated_at`` entity.
+        """
+        self.upsert_many([entity], [last_edited_time])
+
+    def upsert_many(
+        self, entities: Iterable[BaseEntity], last_edited_times: Optional[Iterable[Optional[str]]] = None
+    ) -> int:
+        """
+        Vloží nebo aktualizuje více entit v jedné transakci.
+
+        Args:
+            entities: Entity s nastaveným ``notion_page_id`` nebo ``id``.
+            last_edited_times: Časy poslední úpravy stránek v Notion ve stejném pořadí jako entity.
+
+        Returns:
+            Počet uložených entit.
+
+        Raises:
+            ValueError: Pokud entita nemá ID stránky.
+        """
+        entities = list(entities)
+        last_edited_times = list(last_edited_times) if last_edited_times is not None else [None] * len(entities)
+
+        with self._lock, self._connection:
+            for entity, last_edited_time in zip(entities, last_edited_times):
+                page_id = entity.notion_page_id or entity.id
+                if not page_id:
+                    raise ValueError(f"Entita {entity.name} nemá nastavené ID stránky")
+                if last_edited_time is None and entity.updated_at is not None:
+                    last_edited_time = entity.updated_at.isoformat()
+
+                entity_table = self._entity_table(entity.type)
+                relation_table = self._relation_table(entity.type)
+                self._connection.execute(
+                    f"INSERT OR REPLACE INTO {entity_table} (page_id, name, name_key, last_edited_time, data) "
+                    f"VALUES (?, ?, ?, ?, ?)",
+                    (page_id, entity.name, EntityCache.normalize_name(entity.name), last_edited_time,
+                     entity.model_dump_json()),
+                )
+                self._connection.execute(f"DELETE FROM {relation_table} WHERE page_id = ?", (page_id,))
+                self._connection.executemany(
+                    f"INSERT OR IGNORE INTO {relation_table} (page_id, field, target_id) VALUES (?, ?, ?)",
+                    [
+                        (page_id, field, target_id)
+                        for field in RELATION_FIELDS[entity.type]
+                        for target_id in self._relation_values(getattr(entity, field, None))
+                    ],
+                )
+        return len(entities)
+
+    @staticmethod
+    def _relation_values(value: Union[None, str, List[str]]) -> List[str]:
+        """
+        Převede hodnotu relačního pole na seznam ID.
+        """
+        if not value:
+            return []
+        if isinstance(value, str):
+            return [value]
+        return [target_id for target_id in value if target_id]
+
+    def delete(self, entity_type: EntityType, page_id: str) -> None:
+        """
+        Odstraní entitu ze zrcadla.
+
+        Args:
+            entity_type: Typ entity.
+            page_id: ID stránky v Notion.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self._entity_table(entity_type)} WHERE page_id = ?", (page_id,))
+            self._connection.execute(f"DELETE FROM {self._relation_table(entity_type)} WHERE page_id = ?", (page_id,))
+
+    def delete_missing(self, entity_type: EntityType, keep_page_ids: Iterable[str]) -> int:
+        """
+        Odstraní entity daného typu, které nejsou v zadané množině (po úplné synchronizaci).
+
+        Args:
+            entity_type: Typ entity.
+            keep_page_ids: ID stránek, které v Notion stále existují.
+
+        Returns:
+            Počet odstraněných entit.
+        """
+        keep = set(keep_page_ids)
+        with self._lock:
+            stored = [
+                row["page_id"]
+                for row in self._connection.execute(f"SELECT page_id FROM {self._entity_table(entity_type)}")
+            ]
+        removed = [page_id for page_id in stored if page_id not in keep]
+        for page_id in removed:
+            self.delete(entity_type, page_id)
+        return len(removed)
+
+    # Čtení
+
+    def _to_entity(self, entity_type: EntityType, row: sqlite3.Row) -> BaseEntity:
+        return ENTITY_CLASSES[entity_type].model_validate_json(row["data"])
+
+    def get(self, entity_type: EntityType, page_id: str) -> Optional[BaseEntity]:
+        """
+        Vrátí entitu podle ID stránky.
+
+        Args:
+            entity_type: Typ entity.
+            page_id: ID stránky v Notion.
+
+        Returns:
+            Entita nebo None, pokud v zrcadle není.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT data FROM {self._entity_table(entity_type)} WHERE page_id = ?", (page_id,)
+            ).fetchone()
+        return self._to_entity(entity_type, row) if row else None
+
+    def find_by_name(self, entity_type: EntityType, name: str) -> Optional[BaseEntity]:
+        """
+        Najde entitu podle názvu (bez ohledu na velikost písmen a mezery).
+
+        Args:
+            entity_type: Typ entity.
+            name: Název entity.
+
+        Returns:
+            Nalezená entita nebo None.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT data FROM {self._entity_table(entity_type)} WHERE name_key = ? "
+                f"ORDER BY last_edited_time DESC LIMIT 1",
+                (EntityCache.normalize_name(name),),
+            ).fetchone()
+        return self._to_entity(entity_type, row) if row else None
+
+    def find_all(self, entity_type: EntityType) -> List[BaseEntity]:
+        """
+        Vrátí všechny entity daného typu.
+
+        Args:
+            entity_type: Typ entity.
+
+        Returns:
+            Seznam entit.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT data FROM {self._entity_table(entity_type)} ORDER BY name"
+            ).fetchall()
+        return [self._to_entity(entity_type, row) for row in rows]
+
+    def get_related_ids(self, entity_type: EntityType, page_id: str, field: Optional[str] = None) -> List[str]:
+        """
+        Vrátí ID stránek, na které entita odkazuje.
+
+        Args:
+            entity_type: Typ entity.
+            page_id: ID stránky entity.
+            field: Název relačního pole. Pokud není zadán, vrátí se odkazy ze všech polí.
+
+        Returns:
+            Seznam ID propojených stránek.
+        """
+        query = f"SELECT target_id FROM {self._relation_table(entity_type)} WHERE page_id = ?"
+        params: tuple = (page_id,)
+        if field:
+            query += " AND field = ?"
+            params += (field,)
+        with self._lock:
+            return [row["target_id"] for row in self._connection.execute(query, params)]
+
+    def find_referencing(
+        self, entity_type: EntityType, target_id: str, field: Optional[str] = None
+    ) -> List[BaseEntity]:
+        """
+        Najde entity daného typu, které odkazují na zadanou stránku (opačný směr relace).
+
+        Args:
+            entity_type: Typ odkazujících entit.
+            target_id: ID stránky, na kterou se odkazuje.
+            field: Název relačního pole. Pokud není zadán, prohledají se všechna pole.
+
+        Returns:
+            Seznam odkazujících entit.
+        """
+        entity_table = self._entity_table(entity_type)
+        relation_table = self._relation_table(entity_type)
+        query = (
+            f"SELECT DISTINCT e.data FROM {entity_table} e "
+            f"JOIN {relation_table} r ON r.page_id = e.page_id WHERE r.target_id = ?"
+        )
+        params: tuple = (target_id,)
+        if field:
+            query += " AND r.field = ?"
+            params += (field,)
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [self._to_entity(entity_type, row) for row in rows]
+
+    def count(self, entity_type: EntityType) -> int:
+        """
+        Vrátí počet entit daného typu v zrcadle.
+        """
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM {self._entity_table(entity_type)}").fetchone()[0]
+
+    # Stav synchronizace
+
+    def get_watermark(self, entity_type: EntityType) -> Optional[str]:
+        """
+        Vrátí značku poslední synchronizace (nejnovější ``last_edited_time``).
+
+        Args:
+            entity_type: Typ entity.
+
+        Returns:
+            Značka ve formátu ISO 8601 nebo None, pokud typ ještě nebyl synchronizován.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT watermark FROM sync_state WHERE entity_type = ?", (entity_type.value,)
+            ).fetchone()
+        return row["watermark"] if row else None
+
+    def is_synced(self, entity_type: EntityType) -> bool:
+        """
+        Zjistí, zda již proběhla alespoň jedna synchronizace daného typu entity.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT synced_at FROM sync_state WHERE entity_type = ?", (entity_type.value,)
+            ).fetchone()
+        return bool(row and row["synced_at"])
+
+    def set_watermark(self, entity_type: EntityType, database_id: str, watermark: Optional[str]) -> None:
+        """
+        Uloží značku synchronizace.
+
+        Args:
+            entity_type: Typ entity.
+            database_id: ID databáze v Notion.
+            watermark: Nejnovější ``last_edited_time`` mezi synchronizovanými stránkami.
+        """
+        synced_at = datetime.now(timezone.utc).isoformat()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sync_state (entity_type, database_id, watermark, synced_at) "
+                "VALUES (?, ?, ?, ?)",
+                (entity_type.value, database_id, watermark, synced_at),
+            )
@@ -0,0 +1,513 @@
+"""
+Trvalá fronta zápisů do Notion (write-behind outbox) v SQLite.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from rpg_notion.api.notion_client import NotionClientWrapper
+from rpg_notion.config.settings import NOTION_OUTBOX_FLUSH_INTERVAL, NOTION_OUTBOX_MAX_ATTEMPTS
+from rpg_notion.models.entities import EntityType
+
+logger = logging.getLogger(__name__)
+
+# Předpona dočasných ID entit, které ještě nebyly zapsány do Notion
+PROVISIONAL_ID_PREFIX = "local-"
+
+# Stavové kódy odpovědí Notion API, u kterých nemá smysl zápis opakovat
+_PERMANENT_ERROR_STATUSES = {400, 401, 403, 404, 422}
+
+
+def is_provisional_id(page_id: Optional[str]) -> bool:
+    """
+    Zjistí, zda jde o dočasné ID entity čekající na zápis do Notion.
+
+    Args:
+        page_id: ID stránky.
+
+    Returns:
+        True, pokud jde o dočasné ID.
+    """
+    return bool(page_id) and page_id.startswith(PROVISIONAL_ID_PREFIX)
+
+
+class NotionOutbox:
+    """
+    Trvalá fronta zápisů do Notion uložená v SQLite.
+
+    Vytvoření stránky se do fronty zapíše okamžitě a volající dostane dočasné
+    ID (``local-...``). Fronta se zpracovává v pořadí vložení: dočasná ID
+    v cílové stránce i v relacích se při zápisu nahradí skutečnými ID
+    z tabulky ``id_map``. Každý zápis má idempotenční klíč odvozený z operace,
+    cíle a vlastností, takže opakované vložení stejné čekající operace se
+    ignoruje; po provedení se klíč uvolní. Vytvoření stránky, jehož výsledek
+    se po výpadku nepodařilo zaznamenat, se při dalším pokusu dohledá
+    v databázi místo vytvoření duplicity. Zápisy přežijí pád procesu.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        max_attempts: Optional[int] = None,
+        backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Inicializace fronty zápisů.
+
+        Args:
+            path: Cesta k souboru databáze SQLite. Výchozí ``:memory:`` vytvoří dočasnou databázi v paměti.
+            max_attempts: Maximální počet pokusů o zápis. Pokud není zadán, použije se z konfigurace.
+            backoff: Počáteční prodleva před opakováním neúspěšného zápisu v sekundách.
+            max_backoff: Maximální prodleva před opakováním v sekundách.
+            clock: Hodiny vracející čas v sekundách.
+        """
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.max_attempts = max_attempts if max_attempts is not None else NOTION_OUTBOX_MAX_ATTEMPTS
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        """
+        Vytvoří tabulky fronty, pokud ještě neexistují.
+        """
+        statements = [
+            """
+            CREATE TABLE IF NOT EXISTS outbox (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                operation TEXT NOT NULL,
+                entity_type TEXT NOT NULL,
+                target_id TEXT NOT NULL,
+                database_id TEXT,
+                properties TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                first_attempt_at TEXT,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                last_error TEXT
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox (status, seq)",
+            """
+            CREATE TABLE IF NOT EXISTS id_map (
+                provisional_id TEXT PRIMARY KEY,
+                page_id TEXT NOT NULL
+            )
+            """,
+        ]
+        with self._lock, self._connection:
+            for statement in statements:
+                self._connection.execute(statement)
+
+    def close(self) -> None:
+        """
+        Uzavře spojení s databází.
+        """
+        with self._lock:
+            self._connection.close()
+
+    # Vkládání
+
+    @staticmethod
+    def _operation_key(operation: str, target: str, properties: Dict[str, Any]) -> str:
+        """
+        Odvodí idempotenční klíč z operace, jejího cíle a vlastností.
+
+        Args:
+            operation: Operace ("create" nebo "update").
+            target: Cíl operace (databáze nebo stránka).
+            properties: Vlastnosti stránky.
+
+        Returns:
+            Idempotenční klíč.
+        """
+        digest = hashlib.sha256(json.dumps(properties, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return f"{operation}:{target}:{digest}"
+
+    def enqueue_create(
+        self,
+        entity_type: EntityType,
+        database_id: str,
+        properties: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        """
+        Vloží do fronty vytvoření stránky.
+
+        Args:
+            entity_type: Typ entity.
+            database_id: ID databáze, do které se stránka vytvoří.
+            properties: Vlastnosti stránky (mohou obsahovat dočasná ID v relacích).
+            idempotency_key: Idempotenční klíč. Pokud není zadán, odvodí se z databáze a vlastností.
+
+        Returns:
+            Dočasné ID stránky. Při opakovaném vložení stejného klíče ID z prvního vložení.
+        """
+        provisional_id = f"{PROVISIONAL_ID_PREFIX}{uuid.uuid4()}"
+        key = idempotency_key or self._operation_key("create", database_id, properties)
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                """
+                INSERT OR IGNORE INTO outbox (idempotency_key, operation, entity_type, target_id, database_id, properties)
+                VALUES (?, 'create', ?, ?, ?, ?)
+                """,
+                (key, entity_type.value, provisional_id, database_id, json.dumps(properties, ensure_ascii=False)),
+            )
+            if cursor.rowcount:
+                return provisional_id
+            row = self._connection.execute("SELECT target_id FROM outbox WHERE idempotency_key = ?", (key,)).fetchone()
+            return row["target_id"]
+
+    def enqueue_update(
+        self,
+        entity_type: EntityType,
+        page_id: str,
+        properties: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+    ) -> None:
+        """
+        Vloží do fronty aktualizaci stránky.
+
+        Args:
+            entity_type: Typ entity.
+            page_id: ID stránky (i dočasné).
+            properties: Měněné vlastnosti stránky.
+            idempotency_key: Idempotenční klíč. Pokud není zadán, odvodí se ze stránky a vlastností.
+        """
+        key = idempotency_key or self._operation_key("update", page_id, properties)
+        with self._lock, self._connection:
+            self._connection.execute(
+                """
+                INSERT OR IGNORE INTO outbox (idempotency_key, operation, entity_type, target_id, properties)
+                VALUES (?, 'update', ?, ?, ?)
+                """,
+                (key, entity_type.value, page_id, json.dumps(properties, ensure_ascii=False)),
+            )
+
+    # Čtení
+
+    def resolve_id(self, page_id: str) -> Optional[str]:
+        """
+        Přeloží dočasné ID na skutečné ID stránky v Notion.
+
+        Args:
+            page_id: ID stránky (dočasné nebo skutečné).
+
+        Returns:
+            Skutečné ID stránky, nebo None, pokud dočasná stránka ještě nebyla vytvořena.
+        """
+        if not is_provisional_id(page_id):
+            return page_id
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT page_id FROM id_map WHERE provisional_id = ?", (page_id,)
+            ).fetchone()
+        return row["page_id"] if row else None
+
+    def pending_count(self) -> int:
+        """
+        Vrátí počet zápisů čekajících ve frontě.
+
+        Returns:
+            Počet čekajících zápisů.
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def failed(self) -> List[Dict[str, Any]]:
+        """
+        Vrátí zápisy, které se nepodařilo provést ani po maximálním počtu pokusů.
+
+        Returns:
+            Seznam neúspěšných zápisů.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT seq, operation, entity_type, target_id, attempts, last_error FROM outbox "
+                "WHERE status = 'failed' ORDER BY seq"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # Zpracování
+
+    def _resolve_properties(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Nahradí dočasná ID v relacích skutečnými ID stránek.
+
+        Args:
+            properties: Vlastnosti stránky.
+
+        Returns:
+            Vlastnosti se skutečnými ID.
+
+        Raises:
+            ValueError: Pokud některé dočasné ID ještě nemá skutečné ID.
+        """
+        for value in properties.values():
+            for reference in value.get("relation") or []:
+                if is_provisional_id(reference["id"]):
+                    page_id = self.resolve_id(reference["id"])
+                    if page_id is None:
+                        raise ValueError(f"Nevyřešené dočasné ID v relaci: {reference['id']}")
+                    reference["id"] = page_id
+        return properties
+
+    @staticmethod
+    def _find_created_page(
+        client: NotionClientWrapper, database_id: str, properties: Dict[str, Any], since: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Dohledá stránku vytvořenou předchozím pokusem, jehož výsledek nebyl zaznamenán.
+
+        Notion ukládá čas vytvoření stránky zaokrouhlený dolů na minuty, čas
+        prvního pokusu se proto před porovnáním zaokrouhlí stejně.
+
+        Args:
+            client: Klient Notion API.
+            database_id: ID databáze.
+            properties: Vlastnosti vytvářené stránky.
+            since: Čas prvního pokusu (ISO 8601).
+
+        Returns:
+            Nalezená stránka nebo None.
+        """
+        since = datetime.fromisoformat(since).replace(second=0, microsecond=0).isoformat()
+        for property_name, value in properties.items():
+            if "title" in value:
+                title = "".join(item["text"]["content"] for item in value["title"])
+                pages = client.query_database(
+                    database_id,
+                    filter={
+                        "and": [
+                            {"property": property_name, "title": {"equals": title}},
+                            {"timestamp": "created_time", "created_time": {"on_or_after": since}},
+                        ]
+                    },
+                    page_size=1,
+                    max_pages=1,
+                )
+                return pages[0] if pages else None
+        return None
+
+    def _next_row(self) -> Optional[sqlite3.Row]:
+        """
+        Vrátí nejstarší čekající zápis.
+
+        Returns:
+            Záznam fronty nebo None, pokud fronta neobsahuje čekající zápisy.
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT * FROM outbox WHERE status = 'pending' ORDER BY seq LIMIT 1"
+            ).fetchone()
+
+    def _complete(self, row: sqlite3.Row, page_id: Optional[str] = None) -> None:
+        """
+        Označí zápis jako provedený a případně uloží skutečné ID vytvořené stránky.
+
+        Idempotenční klíč se uvolní, aby pozdější stejná operace nebyla ignorována.
+
+        Args:
+            row: Záznam fronty.
+            page_id: Skutečné ID vytvořené stránky.
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE outbox SET status = 'done', last_error = NULL, idempotency_key = idempotency_key || ':' || seq "
+                "WHERE seq = ?",
+                (row["seq"],),
+            )
+            if page_id is not None:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO id_map (provisional_id, page_id) VALUES (?, ?)", (row["target_id"], page_id)
+                )
+
+    def _fail(self, row: sqlite3.Row, error: Exception, permanent: bool) -> None:
+        """
+        Zaznamená neúspěšný pokus a naplánuje další s exponenciální prodlevou.
+
+        Args:
+            row: Záznam fronty.
+            error: Chyba pokusu.
+            permanent: Zda zápis už nemá smysl opakovat.
+        """
+        attempts = row["attempts"] + 1
+        status = "failed" if permanent or attempts >= self.max_attempts else "pending"
+        delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE seq = ?",
+                (status, attempts, self._clock() + delay, str(error), row["seq"]),
+            )
+            if status == "failed":
+                self._connection.execute(
+                    "UPDATE outbox SET idempotency_key = idempotency_key || ':' || seq WHERE seq = ?", (row["seq"],)
+                )
+        if status == "failed":
+            logger.error(f"Zápis {row['operation']} {row['target_id']} do Notion selhal trvale: {error}")
+        else:
+            logger.warning(f"Zápis {row['operation']} {row['target_id']} do Notion selhal (pokus {attempts}): {error}")
+
+    def flush(
+        self,
+        client: NotionClientWrapper,
+        on_created: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        limit: Optional[int] = None,
+    ) -> int:
+        """
+        Zapíše čekající operace do Notion v pořadí vložení.
+
+        Zpracování se zastaví u první operace, která čeká na opakování, aby se
+        zachovalo pořadí zápisů (např. vytvoření stránky před její aktualizací).
+
+        Args:
+            client: Klient Notion API.
+            on_created: Funkce volaná po vytvoření stránky s dočasným ID a vytvořenou stránkou.
+            limit: Maximální počet zpracovaných operací.
+
+        Returns:
+            Počet úspěšně provedených operací.
+        """
+        processed = 0
+        with self._flush_lock:
+            while limit is None or processed < limit:
+                row = self._next_row()
+                if row is None or row["next_attempt_at"] > self._clock():
+                    break
+
+                # Čas prvního pokusu se zapíše před voláním Notion API, takže je
+                # nastavený i po pádu procesu uprostřed zápisu
+                attempted = row["first_attempt_at"] is not None
+                if not attempted:
+                    first_attempt_at = datetime.now(timezone.utc).isoformat()
+                    with self._lock, self._connection:
+                        self._connection.execute(
+                            "UPDATE outbox SET first_attempt_at = ? WHERE seq = ?", (first_attempt_at, row["seq"])
+                        )
+                else:
+                    first_attempt_at = row["first_attempt_at"]
+
+                try:
+                    properties = self._resolve_properties(json.loads(row["properties"]))
+                    if row["operation"] == "create":
+                        page = None
+                        if attempted:
+                            page = self._find_created_page(client, row["database_id"], properties, first_attempt_at)
+                        if page is None:
+                            page = client.create_page(parent_id=row["database_id"], properties=properties)
+                        self._complete(row, page["id"])
+                        if on_created is not None:
+                            on_created(row["target_id"], page)
+                    else:
+                        page_id = self.resolve_id(row["target_id"])
+                        if page_id is None:
+                            raise ValueError(f"Nevyřešené dočasné ID stránky: {row['target_id']}")
+                        client.update_page(page_id=page_id, properties=properties)
+                        self._complete(row)
+                except ValueError as e:
+                    # Závislá operace, jejíž vytvoření selhalo trvale, ani zápis neodpovídající
+                    # schématu databáze se už nikdy neprovede
+                    self._fail(row, e, permanent=True)
+                    continue
+                except Exception as e:
+                    self._fail(row, e, permanent=getattr(e, "status", None) in _PERMANENT_ERROR_STATUSES)
+                    continue
+
+                processed += 1
+
+        return processed
+
+
+class OutboxFlusher:
+    """
+    Vlákno na pozadí, které průběžně zapisuje frontu zápisů do Notion.
+    """
+
+    def __init__(
+        self,
+        outbox: NotionOutbox,
+        client: NotionClientWrapper,
+        on_created: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        interval: Optional[float] = None,
+    ):
+        """
+        Inicializace vlákna pro zápis fronty.
+
+        Args:
+            outbox: Fronta zápisů.
+            client: Klient Notion API.
+            on_created: Funkce volaná po vytvoření stránky s dočasným ID a vytvořenou stránkou.
+            interval: Prodleva mezi průchody frontou v sekundách. Pokud není zadána, použije se z konfigurace.
+        """
+        self.outbox = outbox
+        self.client = client
+        self.on_created = on_created
+        self.interval = interval if interval is not None else NOTION_OUTBOX_FLUSH_INTERVAL
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """
+        Spustí vlákno, pokud ještě neběží.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="notion-outbox-flusher", daemon=True)
+        self._thread.start()
+
+    def notify(self) -> None:
+        """
+        Probudí vlákno, aby frontu zpracovalo hned.
+        """
+        self._wakeup.set()
+
+    def stop(self, drain: bool = True, timeout: Optional[float] = None) -> None:
+        """
+        Zastaví vlákno.
+
+        Args:
+            drain: Zda před zastavením zapsat všechny připravené operace.
+            timeout: Maximální doba čekání na ukončení vlákna v sekundách.
+        """
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if drain:
+            self.outbox.flush(self.client, self.on_created)
+
+    def _run(self) -> None:
+        """
+        Hlavní smyčka vlákna.
+        """
+        while not self._stopped.is_set():
+            try:
+                self.outbox.flush(self.client, self.on_created)
+            except Exception as e:
+                logger.error(f"Chyba při zpracování fronty zápisů: {e}")
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
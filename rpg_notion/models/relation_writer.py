@@ -0,0 +1,184 @@
+"""
+Dávkový zápis relací mezi entitami.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from rpg_notion.models.entities import BaseEntity, EntityType
+from rpg_notion.models.local_mirror import RELATION_FIELDS
+from rpg_notion.models.repository import EntityRepository
+
+logger = logging.getLogger(__name__)
+
+# Inverzní strany relací: (typ entity, pole) -> (typ cílové entity, inverzní pole)
+INVERSE_RELATIONS: Dict[Tuple[EntityType, str], Tuple[EntityType, str]] = {
+    (EntityType.NPC, "location_id"): (EntityType.LOCATION, "npc_ids"),
+    (EntityType.LOCATION, "npc_ids"): (EntityType.NPC, "location_id"),
+    (EntityType.NPC, "item_ids"): (EntityType.ITEM, "owner_id"),
+    (EntityType.ITEM, "owner_id"): (EntityType.NPC, "item_ids"),
+    (EntityType.LOCATION, "item_ids"): (EntityType.ITEM, "location_id"),
+    (EntityType.ITEM, "location_id"): (EntityType.LOCATION, "item_ids"),
+    (EntityType.LOCATION, "event_ids"): (EntityType.EVENT, "location_id"),
+    (EntityType.EVENT, "location_id"): (EntityType.LOCATION, "event_ids"),
+    (EntityType.NPC, "related_npc_ids"): (EntityType.NPC, "related_npc_ids"),
+}
+
+
+class RelationWriter:
+    """
+    Sběr relací nalezených během jednoho zpracování textu a jejich hromadný zápis.
+
+    Hrany se deduplikují vůči sobě i vůči relacím, které entity už mají,
+    a ke každé hraně se doplní inverzní strana (např. lokace NPC a obyvatelé
+    lokace). Inverzní strana se dopočítá z entit v paměti, takže nevyžaduje
+    další čtení z Notion. Při přepsání jednohodnotové relace (např. přesunu
+    NPC do jiné lokace) se entita odebere z inverzní strany původního cíle;
+    ten se dohledá mezi zpracovávanými entitami, případně přes repozitář.
+    Změny jedné stránky se zapíší jedinou aktualizací.
+    """
+
+    def __init__(self, repository: Optional[EntityRepository] = None):
+        """
+        Inicializace zapisovače relací.
+
+        Args:
+            repository: Repozitář entit. Pokud není zadán, vytvoří se nový.
+        """
+        self.repository = repository or EntityRepository()
+        self._pending: Dict[int, Tuple[BaseEntity, Dict[str, List[str]]]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(target_ids) for _, fields in self._pending.values() for target_ids in fields.values())
+
+    def add(self, source: BaseEntity, field: str, target: BaseEntity) -> None:
+        """
+        Přidá relaci mezi entitami včetně její inverzní strany.
+
+        Args:
+            source: Entita, ze které relace vede.
+            field: Relační pole zdrojové entity (např. ``item_ids``).
+            target: Cílová entita.
+
+        Raises:
+            ValueError: Pokud zdrojová entita nemá zadané relační pole.
+        """
+        if field not in RELATION_FIELDS.get(source.type, []):
+            raise ValueError(f"Neplatné relační pole {field} pro typ entity: {source.type}")
+
+        self._queue(source, field, target)
+
+        inverse = INVERSE_RELATIONS.get((source.type, field))
+        if inverse is not None and inverse[0] == target.type:
+            self._queue(target, inverse[1], source)
+
+    def _queue(self, entity: BaseEntity, field: str, target: BaseEntity) -> None:
+        """
+        Zařadí jednu stranu relace k zápisu.
+
+        Args:
+            entity: Entita, které se relace zapíše.
+            field: Relační pole.
+            target: Cílová entita.
+        """
+        target_id = target.notion_page_id or target.id
+        if not target_id:
+            logger.warning(f"Relaci na entitu {target.name} nelze zapsat, entita nemá ID stránky.")
+            return
+
+        _, fields = self._pending.setdefault(id(entity), (entity, {}))
+        target_ids = fields.setdefault(field, [])
+        if target_id not in target_ids:
+            target_ids.append(target_id)
+
+    def apply(self) -> List[BaseEntity]:
+        """
+        Promítne zařazené relace do entit v paměti.
+
+        U vícehodnotových relací se přidají jen chybějící ID, jednohodnotové
+        relace (``*_id``) se nastaví na poslední zařazenou hodnotu. Pokud
+        jednohodnotová relace předtím vedla jinam (nebo se v dávce zařadilo
+        více cílů), entita se odebere z inverzní strany přepsaných cílů.
+
+        Returns:
+            Entity, které se relacemi změnily.
+        """
+        changed = []
+        replaced: List[Tuple[BaseEntity, str, str]] = []
+        for entity, fields in self._pending.values():
+            modified = False
+            for field, target_ids in fields.items():
+                current = getattr(entity, field)
+                if field.endswith("_ids"):
+                    current = current or []
+                    new_ids = [target_id for target_id in target_ids if target_id not in current]
+                    if new_ids:
+                        setattr(entity, field, current + new_ids)
+                        modified = True
+                else:
+                    # Původní hodnota i hodnoty zařazené před poslední se přepíší
+                    for previous_id in dict.fromkeys([current, *target_ids[:-1]]):
+                        if previous_id and previous_id != target_ids[-1]:
+                            replaced.append((entity, field, previous_id))
+                    if current != target_ids[-1]:
+                        setattr(entity, field, target_ids[-1])
+                        modified = True
+            if modified:
+                changed.append(entity)
+
+        # Odebrání z inverzních stran až po přidání všech hran, aby je přidání znovu nevrátilo
+        for entity, field, previous_id in replaced:
+            previous = self._remove_inverse(entity, field, previous_id)
+            if previous is not None and all(previous is not other for other in changed):
+                changed.append(previous)
+
+        self._pending.clear()
+        return changed
+
+    def _remove_inverse(self, entity: BaseEntity, field: str, previous_id: str) -> Optional[BaseEntity]:
+        """
+        Odebere entitu z inverzní strany původního cíle přepsané jednohodnotové relace.
+
+        Args:
+            entity: Entita, jejíž relace se přepsala.
+            field: Jednohodnotové relační pole.
+            previous_id: ID původního cíle relace.
+
+        Returns:
+            Původní cíl, pokud se změnil, jinak None.
+        """
+        inverse = INVERSE_RELATIONS.get((entity.type, field))
+        entity_id = entity.notion_page_id or entity.id
+        if inverse is None or not entity_id:
+            return None
+
+        target_type, inverse_field = inverse
+        previous = next(
+            (
+                pending for pending, _ in self._pending.values()
+                if pending.type == target_type and previous_id in (pending.notion_page_id, pending.id)
+            ),
+            None,
+        )
+        if previous is None:
+            previous = self.repository.find_by_id(target_type, previous_id)
+        if previous is None:
+            logger.warning(f"Původní cíl relace {field} entity {entity.name} nebyl nalezen: {previous_id}")
+            return None
+
+        current = getattr(previous, inverse_field) or []
+        if entity_id not in current:
+            return None
+        setattr(previous, inverse_field, [target_id for target_id in current if target_id != entity_id])
+        return previous
+
+    def flush(self) -> List[BaseEntity]:
+        """
+        Promítne zařazené relace do entit a změněné entity uloží do Notion.
+
+        Returns:
+            Uložené entity.
+        """
+        changed = self.apply()
+        for entity in changed:
+            self.repository.save_changes(entity)
+        return changed
@@ -1,13 +1,24 @@
 """
 Repozitář pro práci s entitami.
 """
+import asyncio
 import logging
-from typing import Dict, List, Optional, Type, TypeVar, Union, cast
+import threading
+from typing import (
+    Any, Awaitable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type, TypeVar, Union, cast
+)
 
+from rpg_notion.api.async_notion_client import AsyncNotionClientWrapper
 from rpg_notion.api.entity_manager import NotionEntityManager
 from rpg_notion.api.notion_client import NotionClientWrapper
-from rpg_notion.config.settings import NOTION_DATABASE_IDS
-from rpg_notion.models.converters import NotionConverter
+from rpg_notion.config.settings import (
+    ENTITY_HISTORY_COMPACT_EVERY, ENTITY_HISTORY_MODE, LOCAL_MIRROR_PATH, NOTION_CONCURRENT_REQUESTS,
+    NOTION_DATABASE_IDS, NOTION_OUTBOX_PATH
+)
+from rpg_notion.models.converters import PROPERTY_MAP, REQUIRED_FIELDS, NotionConverter, _parse_datetime
+from rpg_notion.models.entity_cache import EntityCache
+from rpg_notion.models.local_mirror import RELATION_FIELDS, LocalMirror
+from rpg_notion.models.outbox import NotionOutbox, OutboxFlusher, is_provisional_id
 from rpg_notion.models.entities import (
     AdventureJournalEntry, BaseEntity, EntityType, Event, Faction, Item, Location, Monster, NPC, Quest
 )
@@ -15,6 +26,7 @@ from rpg_notion.models.entities import (
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseEntity)
+R = TypeVar("R")
 
 
 class EntityRepository:
@@ -22,8 +34,30 @@ class EntityRepository:
     Repozitář pro práci s entitami.
     """
 
+    # Maximální počet odkazů v jedné vlastnosti relation v požadavku na Notion API
+    MAX_RELATION_ITEMS = 100
+
+    # Pole s historií podle typu entity
+    HISTORY_FIELDS = {
+        EntityType.NPC: "history",
+        EntityType.MONSTER: "combat_history",
+        EntityType.ITEM: "ownership_history",
+    }
+
+    # Podporované způsoby ukládání historie
+    HISTORY_MODES = ("property", "blocks")
+
     def __init__(
-        self, notion_client: Optional[NotionClientWrapper] = None, entity_manager: Optional[NotionEntityManager] = None
+        self,
+        notion_client: Optional[NotionClientWrapper] = None,
+        entity_manager: Optional[NotionEntityManager] = None,
+        cache: Optional[EntityCache] = None,
+        mirror: Optional[LocalMirror] = None,
+        outbox: Optional[NotionOutbox] = None,
+        start_flusher: bool = True,
+        history_mode: str = ENTITY_HISTORY_MODE,
+        history_compact_every: int = ENTITY_HISTORY_COMPACT_EVERY,
+        async_client: Optional[AsyncNotionClientWrapper] = None,
     ):
         """
         Inicializace repozitáře.
@@ -31,11 +65,63 @@ class EntityRepository:
         Args:
             notion_client: Instance NotionClientWrapper. Pokud není zadána, vytvoří se nová.
             entity_manager: Instance NotionEntityManager. Pokud není zadána, vytvoří se nová.
+            cache: Cache entit. Pokud není zadána, vytvoří se nová.
+            mirror: Lokální zrcadlo databází. Pokud není zadáno a je nastavena cesta
+                LOCAL_MIRROR_PATH, otevře se zrcadlo z konfigurace.
+            outbox: Fronta zápisů do Notion. Pokud není zadána a je nastavena cesta
+                NOTION_OUTBOX_PATH, otevře se fronta z konfigurace. Bez fronty se zapisuje přímo.
+            start_flusher: Zda spustit vlákno, které frontu zápisů zpracovává na pozadí.
+            history_mode: Způsob ukládání historie entit: "property" přepisuje vlastnost
+                s historií, "blocks" připojuje záznamy jako bloky na konec stránky.
+            history_compact_every: V režimu "blocks" počet připojených záznamů, po kterém se
+                historie zkopíruje do vlastnosti (0 = nikdy).
+            async_client: Asynchronní klient pro souběžné vyhledávání a ukládání entit během tahu.
+                Pokud není zadán, repozitář si vytváří vlastního klienta a je zapnuto
+                NOTION_CONCURRENT_REQUESTS, vytvoří se klient sdílející jeho limiter a cache schémat.
+                Bez asynchronního klienta se požadavky posílají postupně.
+
+        Raises:
+            ValueError: Pokud je zadán nepodporovaný způsob ukládání historie.
         """
+        if history_mode not in self.HISTORY_MODES:
+            raise ValueError(f"Nepodporovaný způsob ukládání historie: {history_mode}")
+
         self.client = notion_client or NotionClientWrapper()
         self.entity_manager = entity_manager or NotionEntityManager(self.client)
         self.database_ids = NOTION_DATABASE_IDS.copy()
         self.converter = NotionConverter()
+        self.cache = cache or EntityCache()
+        self.mirror = mirror or (LocalMirror(LOCAL_MIRROR_PATH) if LOCAL_MIRROR_PATH else None)
+        self.outbox = outbox or (NotionOutbox(NOTION_OUTBOX_PATH) if NOTION_OUTBOX_PATH else None)
+        self.history_mode = history_mode
+        self.history_compact_every = history_compact_every
+        if async_client is None and notion_client is None and NOTION_CONCURRENT_REQUESTS:
+            async_client = AsyncNotionClientWrapper(
+                api_key=self.client.api_key,
+                rate_limiter=self.client.rate_limiter,
+                validate=self.client.validate,
+                schema_cache=self.client.schema_cache,
+            )
+        self.async_client = async_client
+        # Smyčka událostí pro souběžné požadavky, vytvoří se při prvním použití
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Záznamy historie čekající na připojení ke stránkám (ID stránky -> (entita, záznamy))
+        # a počty záznamů připojených od poslední kompaktace
+        self._pending_history: Dict[str, Tuple[BaseEntity, List[str]]] = {}
+        self._history_since_compaction: Dict[str, int] = {}
+
+        # Entity s dočasným ID čekající na vytvoření stránky v Notion
+        self._provisional: Dict[str, BaseEntity] = {}
+        # Skutečná ID stránek vytvořených vláknem fronty, která se entitám
+        # doplní až ve vlákně volajícího (dočasné ID -> ID stránky)
+        self._created_pages: Dict[str, str] = {}
+        self._created_pages_lock = threading.Lock()
+        self.outbox_flusher: Optional[OutboxFlusher] = None
+        if self.outbox is not None:
+            self.outbox_flusher = OutboxFlusher(self.outbox, self.client, on_created=self._on_page_created)
+            if start_flusher:
+                self.outbox_flusher.start()
 
     def _get_database_id_for_entity_type(self, entity_type: EntityType) -> str:
         """
@@ -74,10 +160,26 @@ class EntityRepository:
 
         return db_id
 
+    def _mirror_serves(self, entity_type: EntityType) -> bool:
+        """
+        Zjistí, zda lze čtení daného typu entity obsloužit z lokálního zrcadla.
+
+        Args:
+            entity_type: Typ entity.
+
+        Returns:
+            True, pokud je zrcadlo k dispozici a daný typ již byl synchronizován.
+        """
+        return self.mirror is not None and self.mirror.is_synced(entity_type)
+
     def find_by_name(self, entity_type: EntityType, name: str) -> Optional[BaseEntity]:
         """
         Najde entitu podle názvu.
 
+        Výsledek (včetně negativního) se ukládá do cache, takže opakované
+        dotazy na stejný název se do Notion neposílají. Pokud je daný typ
+        entity synchronizován do lokálního zrcadla, čte se ze zrcadla.
+
         Args:
             entity_type: Typ entity.
             name: Název entity.
@@ -85,27 +187,548 @@ class EntityRepository:
         Returns:
             Nalezená entita nebo None, pokud entita nebyla nalezena.
         """
+        self.apply_created_pages()
+        found, entity = self.cache.lookup(entity_type, name)
+        if found:
+            return entity
+
+        if self._mirror_serves(entity_type):
+            entity = self.mirror.find_by_name(entity_type, name)
+            self.cache.put(entity_type, name, entity)
+            return entity
+
         db_id = self._get_database_id_for_entity_type(entity_type)
         page = self.entity_manager.find_entity_by_name(db_id, name)
-        
-        if page:
-            return self.converter.notion_to_entity(page, entity_type)
-        return None
+
+        entity = self.converter.notion_to_entity(page, entity_type) if page else None
+        self.cache.put(entity_type, name, entity)
+        return entity
+
+    def find_many_by_names(self, entity_type: EntityType, names: Iterable[str]) -> Dict[str, Optional[BaseEntity]]:
+        """
+        Najde více entit podle názvů najednou.
+
+        Názvy, které nejsou v cache ani v lokálním zrcadle, se vyhledají
+        jedním složeným dotazem na databázi (případně rozděleným do dávek).
+
+        Args:
+            entity_type: Typ entity.
+            names: Názvy entit.
+
+        Returns:
+            Slovník název -> nalezená entita nebo None, pokud entita nebyla nalezena.
+        """
+        self.apply_created_pages()
+        resolved, missing = self._lookup_local(entity_type, names)
+        if missing:
+            db_id = self._get_database_id_for_entity_type(entity_type)
+            pages = self.entity_manager.find_entities_by_names(db_id, missing)
+            self._resolve_pages(entity_type, missing, pages, resolved)
+        return resolved
+
+    def find_many_by_types(
+        self, names_by_type: Dict[EntityType, Iterable[str]]
+    ) -> Dict[EntityType, Dict[str, Optional[BaseEntity]]]:
+        """
+        Najde entity více typů podle názvů najednou.
+
+        S asynchronním klientem se dotazy na všechny databáze odešlou souběžně,
+        jinak se typy vyhledají postupně pomocí ``find_many_by_names``.
+        Nelze volat z běžící smyčky událostí; tam slouží ``find_many_by_types_async``.
+
+        Args:
+            names_by_type: Názvy entit podle typu entity.
+
+        Returns:
+            Slovník typ entity -> (název -> nalezená entita nebo None).
+        """
+        if self.async_client is None:
+            return {
+                entity_type: self.find_many_by_names(entity_type, names)
+                for entity_type, names in names_by_type.items()
+            }
+        return self._run(self.find_many_by_types_async(names_by_type))
+
+    async def find_many_by_types_async(
+        self, names_by_type: Dict[EntityType, Iterable[str]]
+    ) -> Dict[EntityType, Dict[str, Optional[BaseEntity]]]:
+        """
+        Najde entity více typů podle názvů najednou souběžnými dotazy přes asynchronního klienta.
+
+        Args:
+            names_by_type: Názvy entit podle typu entity.
+
+        Returns:
+            Slovník typ entity -> (název -> nalezená entita nebo None).
+
+        Raises:
+            ValueError: Pokud repozitář nemá asynchronního klienta.
+        """
+        if self.async_client is None:
+            raise ValueError("Repozitář nemá asynchronního klienta")
+
+        self.apply_created_pages()
+        resolved: Dict[EntityType, Dict[str, Optional[BaseEntity]]] = {}
+        missing: Dict[EntityType, List[str]] = {}
+        queries: List[Tuple[EntityType, str, Dict[str, Any]]] = []
+        for entity_type, names in names_by_type.items():
+            resolved[entity_type], missing[entity_type] = self._lookup_local(entity_type, names)
+            if missing[entity_type]:
+                db_id = self._get_database_id_for_entity_type(entity_type)
+                queries.extend(
+                    (entity_type, db_id, filter_params)
+                    for filter_params in NotionEntityManager.name_filters(missing[entity_type])
+                )
+
+        results = await asyncio.gather(*(
+            self.async_client.query_database(db_id, filter=filter_params) for _, db_id, filter_params in queries
+        ))
+        pages_by_type: Dict[EntityType, List[Dict[str, Any]]] = {}
+        for (entity_type, _, _), pages in zip(queries, results):
+            pages_by_type.setdefault(entity_type, []).extend(pages)
+
+        for entity_type, names in missing.items():
+            if names:
+                self._resolve_pages(entity_type, names, pages_by_type.get(entity_type, []), resolved[entity_type])
+        return resolved
+
+    def _lookup_local(
+        self, entity_type: EntityType, names: Iterable[str]
+    ) -> Tuple[Dict[str, Optional[BaseEntity]], List[str]]:
+        """
+        Vyhledá entity podle názvů v cache a v lokálním zrcadle.
+
+        Args:
+            entity_type: Typ entity.
+            names: Názvy entit.
+
+        Returns:
+            Dvojice: nalezené názvy (název -> entita nebo None) a názvy, které je nutné vyhledat v Notion.
+        """
+        resolved: Dict[str, Optional[BaseEntity]] = {}
+        missing = []
+        for name in dict.fromkeys(names):
+            found, entity = self.cache.lookup(entity_type, name)
+            if found:
+                resolved[name] = entity
+            elif self._mirror_serves(entity_type):
+                resolved[name] = self.mirror.find_by_name(entity_type, name)
+                self.cache.put(entity_type, name, resolved[name])
+            else:
+                missing.append(name)
+        return resolved, missing
+
+    def _resolve_pages(
+        self,
+        entity_type: EntityType,
+        names: List[str],
+        pages: List[Dict[str, Any]],
+        resolved: Dict[str, Optional[BaseEntity]],
+    ) -> None:
+        """
+        Přiřadí hledaným názvům stránky nalezené v Notion a výsledky uloží do cache.
+
+        Args:
+            entity_type: Typ entity.
+            names: Názvy vyhledané v Notion.
+            pages: Nalezené stránky.
+            resolved: Slovník název -> entita, do kterého se výsledky doplní.
+        """
+        by_key: Dict[str, BaseEntity] = {}
+        for page in pages:
+            entity = self.converter.notion_to_entity(page, entity_type)
+            by_key.setdefault(EntityCache.normalize_name(entity.name), entity)
+
+        for name in names:
+            entity = by_key.get(EntityCache.normalize_name(name))
+            resolved[name] = entity
+            self.cache.put(entity_type, name, entity)
+
+    def _run(self, coroutine: Awaitable[R]) -> R:
+        """
+        Provede korutinu ve smyčce událostí repozitáře.
+
+        Smyčka zůstává otevřená až do ``close``, aby asynchronní klient mohl
+        mezi tahy znovu používat otevřená spojení.
+
+        Args:
+            coroutine: Korutina k provedení.
+
+        Returns:
+            Výsledek korutiny.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(coroutine)
+
+    def _remember(self, entity: T) -> T:
+        """
+        Zapíše vytvořenou nebo aktualizovanou entitu do cache a do lokálního zrcadla.
+
+        Args:
+            entity: Entita.
+
+        Returns:
+            Stejná entita.
+        """
+        self.cache.put_entity(entity)
+        if self.mirror is not None:
+            self.mirror.upsert(entity)
+        return entity
+
+    def _enqueue_create(self, entity: T) -> T:
+        """
+        Vloží vytvoření entity do fronty zápisů a přidělí jí dočasné ID.
+
+        Args:
+            entity: Entita.
+
+        Returns:
+            Stejná entita s dočasným ID. Pokud stejné vytvoření už ve frontě čeká,
+            vrátí se dříve zařazená entita.
+        """
+        properties = {
+            name: value for name, value in self.converter.entity_to_properties(entity).items()
+            if next(iter(value.values())) not in (None, [])
+        }
+        provisional_id = self.outbox.enqueue_create(
+            entity.type, self._get_database_id_for_entity_type(entity.type), properties
+        )
+        queued = self._provisional.get(provisional_id)
+        if queued is not None:
+            return cast(T, queued)
+        entity.id = provisional_id
+        entity.notion_page_id = provisional_id
+        entity.mark_clean()
+        self._provisional[provisional_id] = entity
+        self.outbox_flusher.notify()
+        return self._remember(entity)
+
+    def _on_page_created(self, provisional_id: str, page: Dict[str, Any]) -> None:
+        """
+        Zaznamená skutečné ID stránky vytvořené z fronty zápisů.
+
+        Volá se z vlákna fronty, proto entity neupravuje; ID se entitám
+        doplní až ve vlákně volajícího (``apply_created_pages``).
+
+        Args:
+            provisional_id: Dočasné ID.
+            page: Vytvořená stránka.
+        """
+        with self._created_pages_lock:
+            self._created_pages[provisional_id] = page["id"]
+
+    def apply_created_pages(self) -> int:
+        """
+        Nahradí dočasná ID entit skutečnými ID stránek vytvořených z fronty zápisů.
+
+        Volá se automaticky z veřejných metod repozitáře, takže entity, cache
+        i zrcadlo se mění jen ve vlákně volajícího.
+
+        Returns:
+            Počet entit, kterým bylo doplněno skutečné ID.
+        """
+        with self._created_pages_lock:
+            created, self._created_pages = self._created_pages, {}
+
+        applied = 0
+        for provisional_id, page_id in created.items():
+            entity = self._provisional.pop(provisional_id, None)
+            if entity is None:
+                continue
+            entity.id = page_id
+            entity.notion_page_id = page_id
+            entity.mark_clean(["id", "notion_page_id"])
+            if self.mirror is not None:
+                self.mirror.delete(entity.type, provisional_id)
+            self._remember(entity)
+            applied += 1
+        return applied
+
+    def flush_outbox(self) -> int:
+        """
+        Okamžitě zapíše připravené operace z fronty zápisů do Notion.
+
+        Returns:
+            Počet provedených operací.
+        """
+        if self.outbox is None:
+            return 0
+        processed = self.outbox.flush(self.client, on_created=self._on_page_created)
+        self.apply_created_pages()
+        return processed
+
+    def close(self) -> None:
+        """
+        Zastaví vlákno fronty zápisů, zapíše připravené operace a zařazené záznamy historie.
+        """
+        if self.outbox_flusher is not None:
+            self.outbox_flusher.stop()
+        self.apply_created_pages()
+        self.flush_history()
+        if self._loop is not None:
+            if self.async_client is not None:
+                self._loop.run_until_complete(self.async_client.aclose())
+            self._loop.close()
+            self._loop = None
+
+    def find_by_id(self, entity_type: EntityType, page_id: str) -> Optional[BaseEntity]:
+        """
+        Najde entitu podle ID stránky v Notion.
+
+        Args:
+            entity_type: Typ entity.
+            page_id: ID stránky.
+
+        Returns:
+            Nalezená entita nebo None, pokud entita nebyla nalezena.
+        """
+        self.apply_created_pages()
+        if self._mirror_serves(entity_type):
+            entity = self.mirror.get(entity_type, page_id)
+            if entity is not None:
+                return entity
+
+        if is_provisional_id(page_id):
+            entity = self._provisional.get(page_id)
+            if entity is not None:
+                return entity
+            page_id = self.outbox.resolve_id(page_id) if self.outbox is not None else None
+            if page_id is None:
+                return None
+
+        page = self.client.get_page(page_id)
+        if not page:
+            return None
+        return self._remember(self.converter.notion_to_entity(page, entity_type))
+
+    def find_related(self, entity: BaseEntity, field: str, target_type: EntityType) -> List[BaseEntity]:
+        """
+        Najde entity, na které entita odkazuje relačním polem.
+
+        Args:
+            entity: Entita.
+            field: Název relačního pole entity (např. ``location_id`` nebo ``item_ids``).
+            target_type: Typ odkazovaných entit.
+
+        Returns:
+            Seznam odkazovaných entit.
+        """
+        value = getattr(entity, field, None)
+        target_ids = [value] if isinstance(value, str) else list(value or [])
+
+        related = []
+        for target_id in target_ids:
+            target = self.find_by_id(target_type, target_id)
+            if target is not None:
+                related.append(target)
+        return related
+
+    def find_referencing(
+        self, entity_type: EntityType, target_id: str, field: Optional[str] = None
+    ) -> List[BaseEntity]:
+        """
+        Najde entity daného typu, které odkazují na zadanou stránku.
+
+        Bez synchronizovaného zrcadla se prochází celá databáze daného typu.
+
+        Args:
+            entity_type: Typ odkazujících entit.
+            target_id: ID stránky, na kterou se odkazuje.
+            field: Název relačního pole. Pokud není zadán, prohledají se všechna relační pole.
+
+        Returns:
+            Seznam odkazujících entit.
+        """
+        if self._mirror_serves(entity_type):
+            return self.mirror.find_referencing(entity_type, target_id, field)
+
+        fields = [field] if field else RELATION_FIELDS[entity_type]
+        referencing = []
+        for entity in self.find_all(entity_type):
+            for name in fields:
+                value = getattr(entity, name, None)
+                if value == target_id or (isinstance(value, list) and target_id in value):
+                    referencing.append(entity)
+                    break
+        return referencing
+
+    def sync_mirror(
+        self, entity_types: Optional[Iterable[EntityType]] = None, full: bool = False
+    ) -> Dict[EntityType, int]:
+        """
+        Synchronizuje lokální zrcadlo s Notion.
+
+        Inkrementální synchronizace načte pouze stránky upravené od poslední
+        značky (``last_edited_time``). Notion ukládá čas úprav s přesností na
+        minuty, proto se dotazuje včetně značky a již uložené stránky se jen
+        přepíší. Archivované stránky Notion v dotazech nevrací, jejich
+        odstranění ze zrcadla zajistí až úplná synchronizace (``full=True``).
+
+        Args:
+            entity_types: Typy entit k synchronizaci. Pokud nejsou zadány, synchronizují
+                se všechny typy s nastaveným ID databáze.
+            full: Zda ignorovat značku a načíst celou databázi.
+
+        Returns:
+            Slovník s počtem synchronizovaných stránek pro každý typ entity.
+
+        Raises:
+            ValueError: Pokud repozitář nemá lokální zrcadlo.
+        """
+        if self.mirror is None:
+            raise ValueError("Repozitář nemá nastavené lokální zrcadlo")
+
+        if entity_types is None:
+            entity_types = [entity_type for entity_type in EntityType if self._has_database(entity_type)]
+
+        synced = {}
+        for entity_type in entity_types:
+            synced[entity_type] = self._sync_entity_type(entity_type, full)
+        return synced
+
+    def _has_database(self, entity_type: EntityType) -> bool:
+        """
+        Zjistí, zda je pro daný typ entity nastaveno ID databáze.
+        """
+        try:
+            self._get_database_id_for_entity_type(entity_type)
+        except ValueError:
+            return False
+        return True
+
+    def _sync_entity_type(self, entity_type: EntityType, full: bool) -> int:
+        """
+        Synchronizuje jeden typ entity do lokálního zrcadla.
+
+        Args:
+            entity_type: Typ entity.
+            full: Zda ignorovat značku a načíst celou databázi.
+
+        Returns:
+            Počet synchronizovaných stránek.
+        """
+        db_id = self._get_database_id_for_entity_type(entity_type)
+        watermark = None if full else self.mirror.get_watermark(entity_type)
+
+        filter = None
+        if watermark:
+            filter = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": watermark}}
+        sorts = [{"timestamp": "last_edited_time", "direction": "ascending"}]
+
+        entities = []
+        last_edited_times = []
+        newest = watermark
+        for page in self.client.iter_query_database(db_id, filter=filter, sorts=sorts):
+            last_edited_time = page.get("last_edited_time")
+            entities.append(self.converter.notion_to_entity(page, entity_type))
+            last_edited_times.append(last_edited_time)
+            if last_edited_time and (newest is None or last_edited_time > newest):
+                newest = last_edited_time
+
+        self.mirror.upsert_many(entities, last_edited_times)
+        if full:
+            removed = self.mirror.delete_missing(entity_type, (entity.notion_page_id for entity in entities))
+            if removed:
+                logger.info(f"Ze zrcadla odstraněno {removed} entit typu {entity_type.value}")
+        self.mirror.set_watermark(entity_type, db_id, newest)
+
+        for entity in entities:
+            self.cache.put_entity(entity)
+
+        logger.info(f"Synchronizováno {len(entities)} entit typu {entity_type.value} (značka {newest})")
+        return len(entities)
+
+    def iter_all(
+        self,
+        entity_type: EntityType,
+        filter: Optional[Dict[str, Any]] = None,
+        batch_size: Optional[int] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[BaseEntity]:
+        """
+        Postupně prochází entity daného typu.
+
+        Stránky se z Notion načítají po dávkách a převádějí jedna po druhé,
+        takže v paměti je vždy nejvýše jedna dávka. Pokud je daný typ entity
+        synchronizován do lokálního zrcadla a není zadán filtr, čte se ze zrcadla.
+
+        Při zadání polí Notion vrací jen odpovídající vlastnosti a dekódují
+        se jen tato pole (a povinná pole modelu, např. název). Ostatní pole mají výchozí hodnotu, proto
+        se takové entity neukládají do cache ani do zrcadla.
+
+        Args:
+            entity_type: Typ entity.
+            filter: Filtr dotazu na databázi ve formátu Notion API.
+            batch_size: Počet stránek načtených jedním požadavkem (1 - 100).
+                Pokud není zadán, použije se z konfigurace.
+            fields: Pole entity, která se mají načíst. Pokud nejsou zadána, načtou se všechna.
+
+        Yields:
+            Entity daného typu.
+
+        Raises:
+            ValueError: Pokud typ entity nemá některé ze zadaných polí.
+        """
+        if filter is None and self._mirror_serves(entity_type):
+            yield from self.mirror.find_all(entity_type)
+            return
+
+        db_id = self._get_database_id_for_entity_type(entity_type)
+        filter_properties = None
+        if fields is not None:
+            fields = frozenset(fields) | REQUIRED_FIELDS[entity_type]
+            filter_properties = self._property_ids(db_id, entity_type, fields)
+
+        pages = self.client.iter_query_database(
+            db_id, filter=filter, page_size=batch_size, filter_properties=filter_properties
+        )
+        for page in pages:
+            entity = self.converter.notion_to_entity(page, entity_type, fields)
+            yield entity if fields is not None else self._remember(entity)
+
+    def _property_ids(self, db_id: str, entity_type: EntityType, fields: Iterable[str]) -> Optional[List[str]]:
+        """
+        Vrátí ID vlastností Notion odpovídajících polím entity.
+
+        Args:
+            db_id: ID databáze.
+            entity_type: Typ entity.
+            fields: Pole entity.
+
+        Returns:
+            Seznam ID vlastností nebo None, pokud některé ID není ve schématu databáze známé.
+
+        Raises:
+            ValueError: Pokud typ entity nemá některé ze zadaných polí.
+        """
+        property_map = PROPERTY_MAP[entity_type]
+        unknown = [field for field in fields if field not in property_map]
+        if unknown:
+            raise ValueError(f"Neplatná pole pro typ entity {entity_type}: {', '.join(sorted(unknown))}")
+
+        schema = self.client.get_database_schema(db_id)
+        property_ids = []
+        for field in fields:
+            property_id = schema.get(property_map[field][0], {}).get("id")
+            if not property_id:
+                return None
+            property_ids.append(property_id)
+        return property_ids
 
     def find_all(self, entity_type: EntityType) -> List[BaseEntity]:
         """
         Najde všechny entity daného typu.
 
+        Pro velké databáze použijte ``iter_all``, který entity nedrží v paměti najednou.
+
         Args:
             entity_type: Typ entity.
 
         Returns:
             Seznam entit.
         """
-        db_id = self._get_database_id_for_entity_type(entity_type)
-        pages = self.client.query_database(db_id)
-        
-        return [self.converter.notion_to_entity(page, entity_type) for page in pages]
+        return list(self.iter_all(entity_type))
 
     def create_npc(self, npc: NPC) -> NPC:
         """
@@ -117,6 +740,9 @@ class EntityRepository:
         Returns:
             Vytvořená NPC postava.
         """
+        if self.outbox is not None:
+            return self._enqueue_create(npc)
+
         page = self.entity_manager.create_npc(
             name=npc.name,
             description=npc.description,
@@ -129,7 +755,7 @@ class EntityRepository:
             tags=npc.tags,
         )
         
-        return cast(NPC, self.converter.notion_to_entity(page, EntityType.NPC))
+        return self._remember(cast(NPC, self.converter.notion_to_entity(page, EntityType.NPC)))
 
     def create_location(self, location: Location) -> Location:
         """
@@ -141,6 +767,9 @@ class EntityRepository:
         Returns:
             Vytvořená lokace.
         """
+        if self.outbox is not None:
+            return self._enqueue_create(location)
+
         page = self.entity_manager.create_location(
             name=location.name,
             location_type=location.location_type,
@@ -153,7 +782,7 @@ class EntityRepository:
             tags=location.tags,
         )
         
-        return cast(Location, self.converter.notion_to_entity(page, EntityType.LOCATION))
+        return self._remember(cast(Location, self.converter.notion_to_entity(page, EntityType.LOCATION)))
 
     def create_monster(self, monster: Monster) -> Monster:
         """
@@ -165,6 +794,9 @@ class EntityRepository:
         Returns:
             Vytvořená příšera.
         """
+        if self.outbox is not None:
+            return self._enqueue_create(monster)
+
         page = self.entity_manager.create_monster(
             name=monster.name,
             description=monster.description,
@@ -176,7 +808,7 @@ class EntityRepository:
             tags=monster.tags,
         )
         
-        return cast(Monster, self.converter.notion_to_entity(page, EntityType.MONSTER))
+        return self._remember(cast(Monster, self.converter.notion_to_entity(page, EntityType.MONSTER)))
 
     def create_item(self, item: Item) -> Item:
         """
@@ -188,6 +820,9 @@ class EntityRepository:
         Returns:
             Vytvořený předmět.
         """
+        if self.outbox is not None:
+            return self._enqueue_create(item)
+
         page = self.entity_manager.create_item(
             name=item.name,
             item_type=item.item_type,
@@ -199,7 +834,7 @@ class EntityRepository:
             tags=item.tags,
         )
         
-        return cast(Item, self.converter.notion_to_entity(page, EntityType.ITEM))
+        return self._remember(cast(Item, self.converter.notion_to_entity(page, EntityType.ITEM)))
 
     def create_quest(self, quest: Quest) -> Quest:
         """
@@ -211,6 +846,9 @@ class EntityRepository:
         Returns:
             Vytvořený quest.
         """
+        if self.outbox is not None:
+            return self._enqueue_create(quest)
+
         page = self.entity_manager.create_quest(
             name=quest.name,
             description=quest.description,
@@ -223,7 +861,7 @@ class EntityRepository:
             tags=quest.tags,
         )
         
-        return cast(Quest, self.converter.notion_to_entity(page, EntityType.QUEST))
+        return self._remember(cast(Quest, self.converter.notion_to_entity(page, EntityType.QUEST)))
 
     def create_faction(self, faction: Faction) -> Faction:
         """
@@ -235,6 +873,9 @@ class EntityRepository:
         Returns:
             Vytvořená frakce.
         """
+        if self.outbox is not None:
+            return self._enqueue_create(faction)
+
         page = self.entity_manager.create_faction(
             name=faction.name,
             description=faction.description,
@@ -246,7 +887,7 @@ class EntityRepository:
             tags=faction.tags,
         )
         
-        return cast(Faction, self.converter.notion_to_entity(page, EntityType.FACTION))
+        return self._remember(cast(Faction, self.converter.notion_to_entity(page, EntityType.FACTION)))
 
     def create_event(self, event: Event) -> Event:
         """
@@ -258,6 +899,9 @@ class EntityRepository:
         Returns:
             Vytvořená událost.
         """
+        if self.outbox is not None:
+            return self._enqueue_create(event)
+
         page = self.entity_manager.create_event(
             name=event.name,
             date=event.date,
@@ -268,7 +912,7 @@ class EntityRepository:
             tags=event.tags,
         )
         
-        return cast(Event, self.converter.notion_to_entity(page, EntityType.EVENT))
+        return self._remember(cast(Event, self.converter.notion_to_entity(page, EntityType.EVENT)))
 
     def create_adventure_journal_entry(self, entry: AdventureJournalEntry) -> AdventureJournalEntry:
         """
@@ -280,6 +924,9 @@ class EntityRepository:
         Returns:
             Vytvořený záznam v deníku dobrodružství.
         """
+        if self.outbox is not None:
+            return self._enqueue_create(entry)
+
         page = self.entity_manager.create_adventure_journal_entry(
             title=entry.name,
             date=entry.date,
@@ -289,12 +936,204 @@ class EntityRepository:
             location_ids=entry.location_ids,
         )
         
-        return cast(AdventureJournalEntry, self.converter.notion_to_entity(page, EntityType.ADVENTURE_JOURNAL))
+        return self._remember(cast(AdventureJournalEntry, self.converter.notion_to_entity(page, EntityType.ADVENTURE_JOURNAL)))
+
+    @classmethod
+    def _limit_relations(cls, entity: BaseEntity, properties: Dict[str, Any]) -> Tuple[Dict[str, Any], Set[str]]:
+        """
+        Omezí relace ve vlastnostech stránky na MAX_RELATION_ITEMS nejnovějších odkazů.
+
+        Notion při aktualizaci hodnotu relace nahrazuje celou, delší relaci
+        proto nelze rozdělit do více aktualizací. Nové odkazy se přidávají na
+        konec seznamu, zapíše se proto posledních MAX_RELATION_ITEMS odkazů.
+
+        Args:
+            entity: Ukládaná entita (pro zprávu v logu).
+            properties: Vlastnosti stránky.
+
+        Returns:
+            Vlastnosti stránky s omezenými relacemi a názvy zkrácených vlastností.
+        """
+        limited = {}
+        truncated = set()
+        for name, value in properties.items():
+            references = value.get("relation")
+            if references is not None and len(references) > cls.MAX_RELATION_ITEMS:
+                logger.warning(
+                    f"Relace {name} entity {entity.name} má {len(references)} odkazů, "
+                    f"zapíše se jen posledních {cls.MAX_RELATION_ITEMS}."
+                )
+                value = {"relation": references[-cls.MAX_RELATION_ITEMS:]}
+                truncated.add(name)
+            limited[name] = value
+        return limited, truncated
+
+    def save_changes(self, entity: T) -> T:
+        """
+        Uloží do Notion změny entity provedené od jejího načtení nebo posledního uložení.
+
+        Odešle se jediná aktualizace stránky obsahující jen změněná pole (při
+        použití fronty zápisů se aktualizace jen vloží do fronty). Relace se
+        zkrátí na MAX_RELATION_ITEMS nejnovějších odkazů; zkrácená pole
+        zůstanou označená jako změněná, protože se do Notion nezapsala celá.
+        Nezměněná entita se přeskočí bez volání API.
+
+        Args:
+            entity: Entita.
+
+        Returns:
+            Stejná entita označená jako uložená.
+
+        Raises:
+            ValueError: Pokud entita nemá nastavené notion_page_id.
+        """
+        self.apply_created_pages()
+        if not entity.is_dirty:
+            return entity
+
+        properties, truncated = self._changed_properties(entity)
+        page = None
+        if properties and self.outbox is not None:
+            self.outbox.enqueue_update(entity.type, entity.notion_page_id, properties)
+            self.outbox_flusher.notify()
+        elif properties:
+            page = self.entity_manager.update_entity(entity.notion_page_id, properties)
+        return self._mark_saved(entity, properties, truncated, page)
+
+    def save_many(self, entities: Iterable[T]) -> List[T]:
+        """
+        Uloží do Notion změny více entit.
+
+        S asynchronním klientem a bez fronty zápisů se aktualizace stránek
+        odešlou souběžně, jinak se entity uloží postupně pomocí ``save_changes``.
+        Nelze volat z běžící smyčky událostí; tam slouží ``save_many_async``.
+
+        Args:
+            entities: Entity.
+
+        Returns:
+            Stejné entity označené jako uložené.
+
+        Raises:
+            ValueError: Pokud některá změněná entita nemá nastavené notion_page_id.
+        """
+        entities = list(entities)
+        if self.async_client is None or self.outbox is not None:
+            return [self.save_changes(entity) for entity in entities]
+        return self._run(self.save_many_async(entities))
+
+    async def save_many_async(self, entities: Iterable[T]) -> List[T]:
+        """
+        Uloží do Notion změny více entit souběžnými aktualizacemi přes asynchronního klienta.
+
+        Při použití fronty zápisů se aktualizace jen vloží do fronty.
+
+        Args:
+            entities: Entity.
+
+        Returns:
+            Stejné entity označené jako uložené.
+
+        Raises:
+            ValueError: Pokud repozitář nemá asynchronního klienta nebo některá
+                změněná entita nemá nastavené notion_page_id.
+        """
+        if self.async_client is None:
+            raise ValueError("Repozitář nemá asynchronního klienta")
+
+        entities = list(entities)
+        if self.outbox is not None:
+            return [self.save_changes(entity) for entity in entities]
+
+        self.apply_created_pages()
+        changes: Dict[int, Tuple[T, Dict[str, Any], Set[str]]] = {}
+        for entity in entities:
+            if entity.is_dirty and id(entity) not in changes:
+                properties, truncated = self._changed_properties(entity)
+                changes[id(entity)] = (entity, properties, truncated)
+
+        updates = [(entity, properties) for entity, properties, _ in changes.values() if properties]
+        pages = await self.async_client.update_pages([
+            {"page_id": entity.notion_page_id, "properties": properties} for entity, properties in updates
+        ])
+        pages_by_entity = {id(entity): page for (entity, _), page in zip(updates, pages)}
+
+        for entity, properties, truncated in changes.values():
+            self._mark_saved(entity, properties, truncated, pages_by_entity.get(id(entity)))
+        return entities
+
+    def _changed_properties(self, entity: BaseEntity) -> Tuple[Dict[str, Any], Set[str]]:
+        """
+        Převede změněná pole entity na vlastnosti stránky v Notion.
+
+        Args:
+            entity: Změněná entita.
+
+        Returns:
+            Dvojice: vlastnosti k zápisu a názvy vlastností se zkrácenými relacemi.
+
+        Raises:
+            ValueError: Pokud entita nemá nastavené notion_page_id.
+        """
+        if not entity.notion_page_id:
+            raise ValueError("Entita nemá nastavené notion_page_id")
+
+        properties = self.converter.entity_to_properties(entity, entity.dirty_fields())
+        return self._limit_relations(entity, properties)
+
+    def _mark_saved(
+        self, entity: T, properties: Dict[str, Any], truncated: Set[str], page: Optional[Dict[str, Any]]
+    ) -> T:
+        """
+        Označí entitu jako uloženou a zapíše ji do cache a do lokálního zrcadla.
+
+        Args:
+            entity: Entita.
+            properties: Zapsané vlastnosti stránky.
+            truncated: Názvy vlastností se zkrácenými relacemi.
+            page: Aktualizovaná stránka, pokud se změny zapsaly přímo do Notion.
+
+        Returns:
+            Stejná entita.
+        """
+        if page is not None:
+            updated_at = _parse_datetime(page.get("last_edited_time"))
+            if updated_at:
+                entity.updated_at = updated_at
+            logger.debug(f"Uloženy změny entity {entity.name}: {', '.join(properties)}")
+
+        truncated_fields = {
+            field for field, (name, _) in PROPERTY_MAP.get(entity.type, {}).items() if name in truncated
+        }
+        entity.mark_clean(field for field in type(entity).model_fields if field not in truncated_fields)
+        return self._remember(entity)
+
+    def _history_property(self, entity: BaseEntity) -> str:
+        """
+        Vrátí název vlastnosti Notion s historií entity.
+
+        Args:
+            entity: Entita.
+
+        Returns:
+            Název vlastnosti.
+
+        Raises:
+            ValueError: Pokud typ entity historii nepodporuje.
+        """
+        field = self.HISTORY_FIELDS.get(entity.type)
+        if field is None:
+            raise ValueError(f"Aktualizace historie není podporována pro typ entity: {entity.type}")
+        return PROPERTY_MAP[entity.type][field][0]
 
     def update_entity_history(self, entity: BaseEntity, new_entry: str) -> BaseEntity:
         """
         Aktualizuje historii entity.
 
+        V režimu "property" se přepíše celá vlastnost s historií, v režimu
+        "blocks" se záznam připojí jako blok na konec stránky (spolu se všemi
+        záznamy zařazenými přes queue_history_entry).
+
         Args:
             entity: Entita.
             new_entry: Nový záznam historie.
@@ -305,13 +1144,12 @@ class EntityRepository:
         if not entity.notion_page_id:
             raise ValueError("Entita nemá nastavené notion_page_id")
         
-        history_property = ""
-        if isinstance(entity, NPC):
-            history_property = "Historie změn"
-        elif isinstance(entity, Item):
-            history_property = "Historie vlastnictví"
-        else:
-            raise ValueError(f"Aktualizace historie není podporována pro typ entity: {entity.type}")
+        history_property = self._history_property(entity)
+
+        if self.history_mode == "blocks":
+            self.queue_history_entry(entity, new_entry)
+            self.flush_history()
+            return entity
         
         page = self.entity_manager.update_entity_history(
             page_id=entity.notion_page_id,
@@ -319,4 +1157,52 @@ class EntityRepository:
             new_entry=new_entry,
         )
         
-        return self.converter.notion_to_entity(page, entity.type)
+        return self._remember(self.converter.notion_to_entity(page, entity.type))
+
+    def queue_history_entry(self, entity: BaseEntity, entry: str) -> None:
+        """
+        Zařadí záznam historie k připojení ke stránce entity při příštím flush_history.
+
+        Args:
+            entity: Entita.
+            entry: Záznam historie.
+
+        Raises:
+            ValueError: Pokud entita nemá ID stránky nebo typ entity historii nepodporuje.
+        """
+        if not entity.notion_page_id:
+            raise ValueError("Entita nemá nastavené notion_page_id")
+        self._history_property(entity)
+
+        _, entries = self._pending_history.setdefault(entity.notion_page_id, (entity, []))
+        entries.append(entry)
+
+    def flush_history(self) -> int:
+        """
+        Připojí zařazené záznamy historie ke stránkám, jedním požadavkem na stránku.
+
+        Záznamy stránek, které ještě čekají ve frontě zápisů na vytvoření,
+        zůstanou zařazené do dalšího volání.
+
+        Returns:
+            Počet připojených záznamů.
+        """
+        appended = 0
+        for page_id, (entity, entries) in list(self._pending_history.items()):
+            target_id = self.outbox.resolve_id(page_id) if self.outbox is not None else page_id
+            if target_id is None:
+                continue
+
+            self.entity_manager.append_entity_history(target_id, entries)
+            del self._pending_history[page_id]
+            appended += len(entries)
+
+            count = self._history_since_compaction.get(target_id, 0) + len(entries)
+            if self.history_compact_every and count >= self.history_compact_every:
+                self.entity_manager.compact_entity_history(target_id, self._history_property(entity))
+                count = 0
+            self._history_since_compaction[target_id] = count
+
+        if appended:
+            logger.debug(f"Připojeno {appended} záznamů historie.")
+        return appended
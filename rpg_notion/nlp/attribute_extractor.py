@@ -3,333 +3,556 @@ Modul pro extrakci atributů entit z textu.
 """
 import logging
 import re
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Dict, List, Optional, Pattern, Set, Tuple, Union
 
-import spacy
 from spacy.language import Language
 from spacy.tokens import Doc, Span, Token
 
 from rpg_notion.config.settings import SPACY_MODEL
 from rpg_notion.models.entities import EntityType
+from rpg_notion.nlp.model_registry import get_model_registry
+from rpg_notion.nlp.parsed_text import ParsedText, ensure_parsed
 
 logger = logging.getLogger(__name__)
 
 
+class PatternTemplate:
+    """
+    Vzor nezávislý na názvu entity ve tvaru ``[prefix] NÁZEV [tail]``.
+
+    Prefix i tail se kompilují jednou jako dopředné výrazy (lookahead), takže
+    jeden průchod textem najde všechny pozice, kde mohou začínat nebo končit,
+    pro všechny entity najednou. Konkrétní entitě se výsledky přiřadí podle
+    pozic jejích zmínek v textu. Hledaná hodnota je v tailu označena
+    pojmenovanou skupinou ``value``.
+    """
+
+    def __init__(self, prefix: Optional[str] = None, tail: Optional[str] = None):
+        """
+        Inicializace šablony.
+
+        Args:
+            prefix: Regulární výraz, který musí bezprostředně předcházet názvu entity.
+            tail: Regulární výraz, který musí bezprostředně následovat za názvem entity.
+        """
+        self.prefix: Optional[Pattern] = re.compile(r"(?i)(?=(?P<prefix>" + prefix + r"))") if prefix else None
+        self.tail: Optional[Pattern] = re.compile(r"(?i)(?=(?P<tail>" + tail + r"))") if tail else None
+
+
+def _templates(*patterns: Tuple[Optional[str], Optional[str]]) -> List[PatternTemplate]:
+    """
+    Zkompiluje seznam šablon z dvojic (prefix, tail).
+    """
+    return [PatternTemplate(prefix, tail) for prefix, tail in patterns]
+
+
+_OCCUPATIONS = (
+    r"čaroděj|kouzelník|válečník|zloděj|hraničář|bard|mnich|paladin|druid|alchymista|obchodník|kovář|hostinský|"
+    r"král|královna|princ|princezna|rytíř|šlechtic|šlechtična|lord|lady|baron|baronka|hrabě|hraběnka|vévoda|"
+    r"vévodkyně|kněz|kněžka|šaman|vůdce|náčelník"
+)
+_WEAPONS = r"zbraň|meč|dýka|sekera|kladivo|palice|hůl|luk|kuše|šíp|kopí"
+_ARMOR = r"brnění|zbroj|přilba|helma|rukavice|boty|štít"
+
+
+def _type_templates(keywords: str, verbs: str) -> List[PatternTemplate]:
+    """
+    Šablony pro určení typu entity ("<typ> NÁZEV" nebo "NÁZEV je <typ>").
+
+    Args:
+        keywords: Alternativy klíčových slov typu.
+        verbs: Alternativy sloves mezi názvem a typem.
+    """
+    return _templates((r"(?:" + keywords + r")\s+", None), (None, r"(?:" + verbs + r")\s+(?:" + keywords + r")"))
+
+
+def _status_templates(verbs: str, states: str) -> List[PatternTemplate]:
+    """
+    Šablony pro určení stavu entity ("NÁZEV je <stav>").
+
+    Args:
+        verbs: Alternativy sloves mezi názvem a stavem.
+        states: Alternativy slov označujících stav.
+    """
+    return _templates((None, r"(?:" + verbs + r")\s+(?:" + states + r")"))
+
+
+# Banka vzorů, kompiluje se jednou při načtení modulu
+NPC_PATTERNS = {
+    "description": _templates(
+        (None, r"(?:\s+je|\s+byl|\s+byla|\s+vypadá|\s+má)\s+(?P<value>[^.!?]+)[.!?]"),
+        (r"(?:popis|vzhled|charakteristika)\s+(?:postavy\s+)?", r"\s*:\s*(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "status": {
+        "Živý": _status_templates(r"\s+je|\s+zůstává", r"naživu|živý|zdravý"),
+        "Mrtvý": _status_templates(r"\s+je|\s+byl|\s+byla", r"mrtvý|mrtvá|zabit|zabita|zemřel|zemřela"),
+        "Zraněný": _status_templates(
+            r"\s+je|\s+byl|\s+byla", r"zraněn|zraněna|zraněný|zraněná|poraněn|poraněna"
+        ),
+    },
+    "occupation": _templates(
+        (None, r"(?:\s+je|\s+byl|\s+byla|\s+pracuje\s+jako)\s+(?P<value>[^,.!?]+(?:" + _OCCUPATIONS + r")[^.!?]*)[.!?]"),
+        (r"(?:povolání|role|zaměstnání|profese)\s+(?:postavy\s+)?", r"\s*:\s*(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "location": _templates(
+        (None, r"(?:\s+se\s+nachází|\s+žije|\s+bydlí|\s+přebývá|\s+pobývá)\s+v\s+(?P<value>[^.!?]+)[.!?]"),
+        (None, r"(?:\s+je|\s+byl|\s+byla)\s+(?:spatřen|spatřena|viděn|viděna)\s+v\s+(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "history": _templates(
+        (r"(?:historie|minulost|příběh)\s+(?:postavy\s+)?", r"\s*:\s*(?P<value>[^.!?]+(?:[.!?][^.!?]+){0,5})[.!?]"),
+        (None, r"(?:\s+dříve|\s+předtím|\s+kdysi)\s+(?P<value>[^.!?]+(?:[.!?][^.!?]+){0,2})[.!?]"),
+    ),
+}
+
+LOCATION_PATTERNS = {
+    "location_type": {
+        "Město": _type_templates(r"město|metropole|velkoměsto", r"\s+je|\s+bylo"),
+        "Vesnice": _type_templates(r"vesnice|vesnička|osada", r"\s+je|\s+byla"),
+        "Dungeon": _type_templates(r"dungeon|kobka|žalář|vězení", r"\s+je|\s+byl|\s+byla"),
+        "Les": _type_templates(r"les|hvozd|prales", r"\s+je|\s+byl"),
+        "Hora": _type_templates(r"hora|pohoří|vrchol", r"\s+je|\s+byla"),
+        "Jeskyně": _type_templates(r"jeskyně|sluj|doupě", r"\s+je|\s+byla"),
+        "Hrad": _type_templates(r"hrad|pevnost|tvrz", r"\s+je|\s+byl"),
+        "Chrám": _type_templates(r"chrám|svatyně|katedrála", r"\s+je|\s+byl|\s+byla"),
+        "Ruiny": _type_templates(r"ruiny|zřícenina|trosky", r"\s+jsou|\s+je|\s+byla"),
+    },
+    "hierarchy": _templates(
+        (None, r"(?:\s+se\s+nachází|\s+leží|\s+je)\s+v\s+(?P<value>[^.!?]+)[.!?]"),
+        (r"(?:oblast|region|země|kontinent)\s+(?:kolem|obsahující)\s+", r"\s+(?:je|se\s+nazývá)\s+(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "description": _templates(
+        (None, r"(?:\s+je|\s+bylo|\s+byla|\s+vypadá)\s+(?P<value>[^.!?]+)[.!?]"),
+        (r"(?:popis|vzhled|charakteristika)\s+(?:lokace\s+)?", r"\s*:\s*(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "status": {
+        "Prosperující": _status_templates(
+            r"\s+je|\s+bylo|\s+byla", r"prosperující|bohaté|bohatá|úspěšné|úspěšná|vzkvétající"
+        ),
+        "V úpadku": _status_templates(
+            r"\s+je|\s+bylo|\s+byla", r"v\s+úpadku|upadající|chudé|chudá|zchátralé|zchátralá"
+        ),
+        "Zničené": _status_templates(
+            r"\s+je|\s+bylo|\s+byla", r"zničené|zničená|zničeno|zpustošené|zpustošená|zpustošeno"
+        ),
+        "Opuštěné": _status_templates(
+            r"\s+je|\s+bylo|\s+byla", r"opuštěné|opuštěná|opuštěno|prázdné|prázdná|prázdno"
+        ),
+        "Nebezpečné": _status_templates(
+            r"\s+je|\s+bylo|\s+byla", r"nebezpečné|nebezpečná|nebezpečno|hrozivé|hrozivá|hrozivo"
+        ),
+        "Bezpečné": _status_templates(
+            r"\s+je|\s+bylo|\s+byla", r"bezpečné|bezpečná|bezpečno|klidné|klidná|klidno"
+        ),
+    },
+}
+
+MONSTER_PATTERNS = {
+    "description": _templates(
+        (None, r"(?:\s+je|\s+byl|\s+byla|\s+vypadá|\s+má)\s+(?P<value>[^.!?]+)[.!?]"),
+        (r"(?:popis|vzhled|charakteristika)\s+(?:příšery\s+)?", r"\s*:\s*(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "status": {
+        "Živá": _status_templates(r"\s+je|\s+zůstává", r"naživu|živá|živý|zdravá|zdravý"),
+        "Mrtvá": _status_templates(r"\s+je|\s+byl|\s+byla", r"mrtvá|mrtvý|zabita|zabit|zemřela|zemřel"),
+        "Zraněná": _status_templates(
+            r"\s+je|\s+byl|\s+byla", r"zraněná|zraněný|zraněna|zraněn|poraněná|poraněný|poraněna|poraněn"
+        ),
+    },
+    "combat_history": _templates(
+        (None, r"(?:\s+bojovala|\s+bojoval|\s+zaútočila|\s+zaútočil|\s+napadla|\s+napadl)\s+(?P<value>[^.!?]+)[.!?]"),
+        (r"(?:souboj|boj|střet|konfrontace)\s+s\s+", r"\s+(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "weaknesses": _templates(
+        (r"(?:slabina|slabost|slabé\s+místo)\s+(?:příšery\s+)?", r"(?:\s+je|\s+byla)\s+(?P<value>[^.!?]+)[.!?]"),
+        (None, r"(?:\s+je|\s+byl|\s+byla)\s+(?:slabá|slabý|zranitelná|zranitelný)\s+(?:vůči|proti)\s+(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "strengths": _templates(
+        (r"(?:silná\s+stránka|síla|přednost)\s+(?:příšery\s+)?", r"(?:\s+je|\s+byla)\s+(?P<value>[^.!?]+)[.!?]"),
+        (None, r"(?:\s+je|\s+byl|\s+byla)\s+(?:silná|silný|odolná|odolný)\s+(?:vůči|proti)\s+(?P<value>[^.!?]+)[.!?]"),
+    ),
+}
+
+ITEM_PATTERNS = {
+    "item_type": {
+        "Zbraň": _type_templates(_WEAPONS, r"\s+je|\s+byl|\s+byla"),
+        "Brnění": _type_templates(_ARMOR, r"\s+je|\s+byl|\s+byla"),
+        "Artefakt": _type_templates(r"artefakt|relikvie|posvátný\s+předmět", r"\s+je|\s+byl|\s+byla"),
+        "Lektvar": _type_templates(r"lektvar|elixír|nápoj", r"\s+je|\s+byl|\s+byla"),
+        "Svitek": _type_templates(r"svitek|pergamen", r"\s+je|\s+byl|\s+byla"),
+        "Běžný předmět": _type_templates(r"předmět|věc|nástroj", r"\s+je|\s+byl|\s+byla"),
+        "Klíč": _type_templates(r"klíč|klíček", r"\s+je|\s+byl|\s+byla"),
+    },
+    "description": _templates(
+        (None, r"(?:\s+je|\s+byl|\s+byla|\s+vypadá|\s+má)\s+(?P<value>[^.!?]+)[.!?]"),
+        (r"(?:popis|vzhled|charakteristika)\s+(?:předmětu\s+)?", r"\s*:\s*(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "ownership_history": _templates(
+        (None, r"(?:\s+patřil|\s+patřila|\s+patřilo|\s+náležel|\s+náležela|\s+náleželo)\s+(?P<value>[^.!?]+)[.!?]"),
+        (r"(?:vlastník|majitel|držitel)\s+(?:předmětu\s+)?", r"(?:\s+je|\s+byl|\s+byla)\s+(?P<value>[^.!?]+)[.!?]"),
+        (None, r"(?:\s+byl|\s+byla|\s+bylo)\s+(?:získán|získána|získáno|nalezen|nalezena|nalezeno)\s+(?P<value>[^.!?]+)[.!?]"),
+    ),
+    "special_abilities": _templates(
+        (None, r"(?:\s+má|\s+poskytuje|\s+dává|\s+umožňuje)\s+(?:schopnost|možnost|sílu)\s+(?P<value>[^.!?]+)[.!?]"),
+        (r"(?:schopnost|moc|síla|vlastnost)\s+(?:předmětu\s+)?", r"(?:\s+je|\s+spočívá\s+v)\s+(?P<value>[^.!?]+)[.!?]"),
+        (None, r"(?:\s+může|\s+dokáže|\s+umí)\s+(?P<value>[^.!?]+)[.!?]"),
+    ),
+}
+
+
 class AttributeExtractor:
     """
     Třída pro extrakci atributů entit z textu.
     """
 
-    def __init__(self, model_name: Optional[str] = None):
+    # Komponenty, které tato třída nepotřebuje a při parsování je přeskakuje
+    DEFAULT_DISABLED_COMPONENTS = ["ner", "fantasy_ner"]
+
+    def __init__(self, model_name: Optional[str] = None, disable: Optional[List[str]] = None):
         """
         Inicializace extraktoru atributů.
 
         Args:
             model_name: Název modelu spaCy. Pokud není zadán, použije se model z konfigurace.
+            disable: Komponenty pipeline, které se při parsování surového textu přeskočí.
+                Pokud nejsou zadány, použijí se DEFAULT_DISABLED_COMPONENTS.
         """
         self.model_name = model_name or SPACY_MODEL
-        try:
-            self.nlp = spacy.load(self.model_name)
-            logger.info(f"Načten model spaCy: {self.model_name}")
-        except OSError:
-            logger.warning(f"Model {self.model_name} není nainstalován. Stahuji...")
-            spacy.cli.download(self.model_name)
-            self.nlp = spacy.load(self.model_name)
-            logger.info(f"Model {self.model_name} byl úspěšně stažen a načten.")
-
-    def extract_npc_attributes(self, text: str, npc_name: str) -> Dict[str, str]:
+        self.nlp = get_model_registry().get(self.model_name)
+        self.disabled_components = list(disable) if disable is not None else list(self.DEFAULT_DISABLED_COMPONENTS)
+
+
+    @staticmethod
+    def _mentions(parsed: ParsedText, name: str) -> List[Tuple[int, int]]:
+        """
+        Najde pozice všech zmínek názvu v textu (bez ohledu na velikost písmen).
+
+        Args:
+            parsed: Rozparsovaný text.
+            name: Název entity.
+
+        Returns:
+            Seznam dvojic (začátek, konec) zmínek seřazený podle pozice.
+        """
+        key = name.lower()
+
+        def find() -> List[Tuple[int, int]]:
+            if not key:
+                return []
+            lowered = parsed.cached("lowered_text", lambda: parsed.text.lower())
+            if len(lowered) != len(parsed.text):
+                # Převod na malá písmena změnil délku textu, pozice by neodpovídaly
+                return [(m.start(), m.end()) for m in re.finditer(re.escape(name), parsed.text, re.IGNORECASE)]
+
+            mentions = []
+            position = lowered.find(key)
+            while position != -1:
+                mentions.append((position, position + len(key)))
+                position = lowered.find(key, position + 1)
+            return mentions
+
+        return parsed.cached(f"mentions:{key}", find)
+
+    @staticmethod
+    def _prefix_hits(parsed: ParsedText, regex: Pattern) -> Dict[int, int]:
+        """
+        Jedním průchodem najde všechny výskyty prefixu šablony.
+
+        Args:
+            parsed: Rozparsovaný text.
+            regex: Zkompilovaný prefix šablony.
+
+        Returns:
+            Slovník konec prefixu -> začátek prefixu.
+        """
+        def scan() -> Dict[int, int]:
+            hits: Dict[int, int] = {}
+            for match in regex.finditer(parsed.text):
+                hits.setdefault(match.end("prefix"), match.start())
+            return hits
+
+        return parsed.cached(f"attribute_prefix:{regex.pattern}", scan)
+
+    @staticmethod
+    def _tail_hits(parsed: ParsedText, regex: Pattern) -> Dict[int, Tuple[int, Optional[str]]]:
+        """
+        Jedním průchodem najde všechny výskyty tailu šablony.
+
+        Args:
+            parsed: Rozparsovaný text.
+            regex: Zkompilovaný tail šablony.
+
+        Returns:
+            Slovník začátek tailu -> (konec tailu, zachycená hodnota).
+        """
+        def scan() -> Dict[int, Tuple[int, Optional[str]]]:
+            has_value = "value" in regex.groupindex
+            return {
+                match.start(): (match.end("tail"), match.group("value") if has_value else None)
+                for match in regex.finditer(parsed.text)
+            }
+
+        return parsed.cached(f"attribute_tail:{regex.pattern}", scan)
+
+    def _findall(self, parsed: ParsedText, template: PatternTemplate, name: str) -> List[str]:
+        """
+        Najde všechny nepřekrývající se shody šablony pro danou entitu.
+
+        Odpovídá ``re.findall`` nad vzorem ``prefix + re.escape(name) + tail``,
+        ale místo nového průchodu textem jen spojí předem nalezené výskyty
+        prefixu a tailu se zmínkami entity.
+
+        Args:
+            parsed: Rozparsovaný text.
+            template: Šablona vzoru.
+            name: Název entity.
+
+        Returns:
+            Seznam zachycených hodnot (prázdný řetězec, pokud šablona hodnotu nezachycuje).
+        """
+        prefix_hits = self._prefix_hits(parsed, template.prefix) if template.prefix else None
+        tail_hits = self._tail_hits(parsed, template.tail) if template.tail else None
+
+        values = []
+        last_end = 0
+        for start, end in self._mentions(parsed, name):
+            match_start = start
+            if prefix_hits is not None:
+                if start not in prefix_hits:
+                    continue
+                match_start = prefix_hits[start]
+            if match_start < last_end:
+                continue
+
+            match_end, value = end, None
+            if tail_hits is not None:
+                if end not in tail_hits:
+                    continue
+                match_end, value = tail_hits[end]
+
+            values.append(value or "")
+            last_end = match_end
+        return values
+
+    def _search(self, parsed: ParsedText, template: PatternTemplate, name: str) -> bool:
+        """
+        Zjistí, zda šablona pro danou entitu v textu odpovídá (obdoba ``re.search``).
+
+        Args:
+            parsed: Rozparsovaný text.
+            template: Šablona vzoru.
+            name: Název entity.
+
+        Returns:
+            True, pokud existuje alespoň jedna shoda.
+        """
+        return bool(self._findall(parsed, template, name))
+
+    def _first_values(self, parsed: ParsedText, templates: List[PatternTemplate], name: str) -> List[str]:
+        """
+        Vrátí shody první šablony ze seznamu, která v textu odpovídá.
+
+        Args:
+            parsed: Rozparsovaný text.
+            templates: Šablony v pořadí priority.
+            name: Název entity.
+
+        Returns:
+            Seznam zachycených hodnot nebo prázdný seznam.
+        """
+        for template in templates:
+            values = self._findall(parsed, template, name)
+            if values:
+                return values
+        return []
+
+    def _all_values(self, parsed: ParsedText, templates: List[PatternTemplate], name: str) -> List[str]:
+        """
+        Vrátí shody všech šablon ze seznamu.
+
+        Args:
+            parsed: Rozparsovaný text.
+            templates: Šablony.
+            name: Název entity.
+
+        Returns:
+            Seznam zachycených hodnot.
+        """
+        values = []
+        for template in templates:
+            values.extend(self._findall(parsed, template, name))
+        return values
+
+    def _matching_keys(
+        self, parsed: ParsedText, templates_by_key: Dict[str, List[PatternTemplate]], name: str
+    ) -> List[str]:
+        """
+        Vrátí klíče (typy nebo stavy), jejichž některá šablona v textu odpovídá.
+
+        Args:
+            parsed: Rozparsovaný text.
+            templates_by_key: Šablony podle klíče.
+            name: Název entity.
+
+        Returns:
+            Odpovídající klíče ve stejném pořadí jako ve slovníku.
+        """
+        return [
+            key for key, templates in templates_by_key.items()
+            if any(self._search(parsed, template, name) for template in templates)
+        ]
+
+    @staticmethod
+    def _description_from_sentences(sentences: List[Span]) -> str:
+        """
+        Vybere jako popis první větu se slovesem popisu.
+
+        Args:
+            sentences: Věty zmiňující entitu.
+
+        Returns:
+            Text věty nebo prázdný řetězec.
+        """
+        for sent in sentences:
+            if any(token.lemma_ in ["být", "vypadat", "mít"] for token in sent):
+                return sent.text
+        return ""
+
+    def extract_npc_attributes(self, text: Union[str, ParsedText], npc_name: str) -> Dict[str, str]:
         """
         Extrahuje atributy NPC z textu.
 
         Args:
-            text: Text, ze kterého se mají extrahovat atributy.
+            text: Text nebo rozparsovaný text, ze kterého se mají extrahovat atributy.
             npc_name: Jméno NPC, pro které se mají extrahovat atributy.
 
         Returns:
-            Slovník s extrahovanými atributy.
+            Slovník s extrahovanými atributy. Stav je prázdný, pokud ho text nezmiňuje.
         """
-        doc = self.nlp(text)
-        
+        parsed = ensure_parsed(self.nlp, text, self.disabled_components)
+
         # Inicializace slovníku pro atributy
         attributes = {
             "description": "",
-            "status": "Živý",  # Výchozí hodnota
+            "status": "",
             "occupation": "",
             "location": "",
             "history": "",
         }
-        
-        # Hledání vět, které zmiňují NPC
-        npc_sentences = []
-        for sent in doc.sents:
-            if npc_name.lower() in sent.text.lower():
-                npc_sentences.append(sent)
-        
-        # Extrakce popisu
-        description_patterns = [
-            r"(?i)" + re.escape(npc_name) + r"(?:\s+je|\s+byl|\s+byla|\s+vypadá|\s+má)\s+([^.!?]+)[.!?]",
-            r"(?i)(?:popis|vzhled|charakteristika)\s+(?:postavy\s+)?" + re.escape(npc_name) + r"\s*:\s*([^.!?]+)[.!?]",
-        ]
-        
-        for pattern in description_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                attributes["description"] = " ".join(matches)
-                break
-        
-        # Pokud nebyl nalezen popis pomocí regulárních výrazů, zkusíme extrahovat z vět
+
+        # Extrakce popisu, pokud nebyl nalezen pomocí vzorů, zkusíme extrahovat z vět
+        attributes["description"] = " ".join(self._first_values(parsed, NPC_PATTERNS["description"], npc_name))
         if not attributes["description"]:
-            for sent in npc_sentences:
-                if any(token.lemma_ in ["být", "vypadat", "mít"] for token in sent):
-                    attributes["description"] = sent.text
-                    break
-        
-        # Extrakce stavu
-        status_patterns = {
-            "Živý": [r"(?i)" + re.escape(npc_name) + r"(?:\s+je|\s+zůstává)\s+(?:naživu|živý|zdravý)"],
-            "Mrtvý": [r"(?i)" + re.escape(npc_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:mrtvý|mrtvá|zabit|zabita|zemřel|zemřela)"],
-            "Zraněný": [r"(?i)" + re.escape(npc_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:zraněn|zraněna|zraněný|zraněná|poraněn|poraněna)"],
-        }
-        
-        for status, patterns in status_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    attributes["status"] = status
-                    break
-        
-        # Extrakce povolání/role
-        occupation_patterns = [
-            r"(?i)" + re.escape(npc_name) + r"(?:\s+je|\s+byl|\s+byla|\s+pracuje\s+jako)\s+([^,.!?]+(?:čaroděj|kouzelník|válečník|zloděj|hraničář|bard|mnich|paladin|druid|alchymista|obchodník|kovář|hostinský|král|královna|princ|princezna|rytíř|šlechtic|šlechtična|lord|lady|baron|baronka|hrabě|hraběnka|vévoda|vévodkyně|kněz|kněžka|šaman|vůdce|náčelník)[^.!?]*)[.!?]",
-            r"(?i)(?:povolání|role|zaměstnání|profese)\s+(?:postavy\s+)?" + re.escape(npc_name) + r"\s*:\s*([^.!?]+)[.!?]",
-        ]
-        
-        for pattern in occupation_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                attributes["occupation"] = matches[0].strip()
-                break
-        
-        # Extrakce lokace
-        location_patterns = [
-            r"(?i)" + re.escape(npc_name) + r"(?:\s+se\s+nachází|\s+žije|\s+bydlí|\s+přebývá|\s+pobývá)\s+v\s+([^.!?]+)[.!?]",
-            r"(?i)" + re.escape(npc_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:spatřen|spatřena|viděn|viděna)\s+v\s+([^.!?]+)[.!?]",
-        ]
-        
-        for pattern in location_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                attributes["location"] = matches[0].strip()
-                break
-        
-        # Extrakce historie
-        history_patterns = [
-            r"(?i)(?:historie|minulost|příběh)\s+(?:postavy\s+)?" + re.escape(npc_name) + r"\s*:\s*([^.!?]+(?:[.!?][^.!?]+){0,5})[.!?]",
-            r"(?i)" + re.escape(npc_name) + r"(?:\s+dříve|\s+předtím|\s+kdysi)\s+([^.!?]+(?:[.!?][^.!?]+){0,2})[.!?]",
-        ]
-        
-        for pattern in history_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                attributes["history"] = matches[0].strip()
-                break
-        
+            attributes["description"] = self._description_from_sentences(parsed.sentences_mentioning(npc_name))
+
+        # Extrakce stavu (platí poslední odpovídající stav)
+        matching_statuses = self._matching_keys(parsed, NPC_PATTERNS["status"], npc_name)
+        if matching_statuses:
+            attributes["status"] = matching_statuses[-1]
+
+        # Extrakce povolání/role, lokace a historie
+        for attribute in ("occupation", "location", "history"):
+            values = self._first_values(parsed, NPC_PATTERNS[attribute], npc_name)
+            if values:
+                attributes[attribute] = values[0].strip()
+
         return attributes
 
-    def extract_location_attributes(self, text: str, location_name: str) -> Dict[str, str]:
+    def extract_location_attributes(self, text: Union[str, ParsedText], location_name: str) -> Dict[str, str]:
         """
         Extrahuje atributy lokace z textu.
 
         Args:
-            text: Text, ze kterého se mají extrahovat atributy.
+            text: Text nebo rozparsovaný text, ze kterého se mají extrahovat atributy.
             location_name: Název lokace, pro kterou se mají extrahovat atributy.
 
         Returns:
-            Slovník s extrahovanými atributy.
+            Slovník s extrahovanými atributy. Stav je prázdný, pokud ho text nezmiňuje.
         """
-        doc = self.nlp(text)
-        
+        parsed = ensure_parsed(self.nlp, text, self.disabled_components)
+
         # Inicializace slovníku pro atributy
         attributes = {
             "location_type": "",
             "hierarchy": "",
             "description": "",
-            "status": "Bezpečné",  # Výchozí hodnota
-        }
-        
-        # Hledání vět, které zmiňují lokaci
-        location_sentences = []
-        for sent in doc.sents:
-            if location_name.lower() in sent.text.lower():
-                location_sentences.append(sent)
-        
-        # Extrakce typu lokace
-        location_type_patterns = {
-            "Město": [r"(?i)(?:město|metropole|velkoměsto)\s+" + re.escape(location_name), r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+bylo)\s+(?:město|metropole|velkoměsto)"],
-            "Vesnice": [r"(?i)(?:vesnice|vesnička|osada)\s+" + re.escape(location_name), r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+byla)\s+(?:vesnice|vesnička|osada)"],
-            "Dungeon": [r"(?i)(?:dungeon|kobka|žalář|vězení)\s+" + re.escape(location_name), r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:dungeon|kobka|žalář|vězení)"],
-            "Les": [r"(?i)(?:les|hvozd|prales)\s+" + re.escape(location_name), r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+byl)\s+(?:les|hvozd|prales)"],
-            "Hora": [r"(?i)(?:hora|pohoří|vrchol)\s+" + re.escape(location_name), r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+byla)\s+(?:hora|pohoří|vrchol)"],
-            "Jeskyně": [r"(?i)(?:jeskyně|sluj|doupě)\s+" + re.escape(location_name), r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+byla)\s+(?:jeskyně|sluj|doupě)"],
-            "Hrad": [r"(?i)(?:hrad|pevnost|tvrz)\s+" + re.escape(location_name), r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+byl)\s+(?:hrad|pevnost|tvrz)"],
-            "Chrám": [r"(?i)(?:chrám|svatyně|katedrála)\s+" + re.escape(location_name), r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:chrám|svatyně|katedrála)"],
-            "Ruiny": [r"(?i)(?:ruiny|zřícenina|trosky)\s+" + re.escape(location_name), r"(?i)" + re.escape(location_name) + r"(?:\s+jsou|\s+je|\s+byla)\s+(?:ruiny|zřícenina|trosky)"],
+            "status": "",
         }
-        
-        for loc_type, patterns in location_type_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    attributes["location_type"] = loc_type
-                    break
-            if attributes["location_type"]:
+
+        # Extrakce typu lokace (platí první odpovídající typ)
+        for loc_type, templates in LOCATION_PATTERNS["location_type"].items():
+            if any(self._search(parsed, template, location_name) for template in templates):
+                attributes["location_type"] = loc_type
                 break
-        
+
         # Extrakce hierarchie
-        hierarchy_patterns = [
-            r"(?i)" + re.escape(location_name) + r"(?:\s+se\s+nachází|\s+leží|\s+je)\s+v\s+([^.!?]+)[.!?]",
-            r"(?i)(?:oblast|region|země|kontinent)\s+(?:kolem|obsahující)\s+" + re.escape(location_name) + r"\s+(?:je|se\s+nazývá)\s+([^.!?]+)[.!?]",
-        ]
-        
-        for pattern in hierarchy_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                attributes["hierarchy"] = matches[0].strip()
-                break
-        
-        # Extrakce popisu
-        description_patterns = [
-            r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+bylo|\s+byla|\s+vypadá)\s+([^.!?]+)[.!?]",
-            r"(?i)(?:popis|vzhled|charakteristika)\s+(?:lokace\s+)?" + re.escape(location_name) + r"\s*:\s*([^.!?]+)[.!?]",
-        ]
-        
-        for pattern in description_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                attributes["description"] = " ".join(matches)
-                break
-        
-        # Pokud nebyl nalezen popis pomocí regulárních výrazů, zkusíme extrahovat z vět
+        values = self._first_values(parsed, LOCATION_PATTERNS["hierarchy"], location_name)
+        if values:
+            attributes["hierarchy"] = values[0].strip()
+
+        # Extrakce popisu, pokud nebyl nalezen pomocí vzorů, zkusíme extrahovat z vět
+        attributes["description"] = " ".join(
+            self._first_values(parsed, LOCATION_PATTERNS["description"], location_name)
+        )
         if not attributes["description"]:
-            for sent in location_sentences:
-                if any(token.lemma_ in ["být", "vypadat", "mít"] for token in sent):
-                    attributes["description"] = sent.text
-                    break
-        
-        # Extrakce stavu
-        status_patterns = {
-            "Prosperující": [r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+bylo|\s+byla)\s+(?:prosperující|bohaté|bohatá|úspěšné|úspěšná|vzkvétající)"],
-            "V úpadku": [r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+bylo|\s+byla)\s+(?:v\s+úpadku|upadající|chudé|chudá|zchátralé|zchátralá)"],
-            "Zničené": [r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+bylo|\s+byla)\s+(?:zničené|zničená|zničeno|zpustošené|zpustošená|zpustošeno)"],
-            "Opuštěné": [r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+bylo|\s+byla)\s+(?:opuštěné|opuštěná|opuštěno|prázdné|prázdná|prázdno)"],
-            "Nebezpečné": [r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+bylo|\s+byla)\s+(?:nebezpečné|nebezpečná|nebezpečno|hrozivé|hrozivá|hrozivo)"],
-            "Bezpečné": [r"(?i)" + re.escape(location_name) + r"(?:\s+je|\s+bylo|\s+byla)\s+(?:bezpečné|bezpečná|bezpečno|klidné|klidná|klidno)"],
-        }
-        
-        for status, patterns in status_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    attributes["status"] = status
+            attributes["description"] = self._description_from_sentences(
+                parsed.sentences_mentioning(location_name)
+            )
+
+        # Extrakce stavu (platí první odpovídající stav odlišný od výchozího)
+        for status, templates in LOCATION_PATTERNS["status"].items():
+            if any(self._search(parsed, template, location_name) for template in templates):
+                attributes["status"] = status
+                if status != "Bezpečné":  # Pokud jsme našli jiný stav než výchozí
                     break
-            if attributes["status"] != "Bezpečné":  # Pokud jsme našli jiný stav než výchozí
-                break
-        
+
         return attributes
 
-    def extract_monster_attributes(self, text: str, monster_name: str) -> Dict[str, str]:
+    def extract_monster_attributes(self, text: Union[str, ParsedText], monster_name: str) -> Dict[str, str]:
         """
         Extrahuje atributy příšery z textu.
 
         Args:
-            text: Text, ze kterého se mají extrahovat atributy.
+            text: Text nebo rozparsovaný text, ze kterého se mají extrahovat atributy.
             monster_name: Název příšery, pro kterou se mají extrahovat atributy.
 
         Returns:
-            Slovník s extrahovanými atributy.
+            Slovník s extrahovanými atributy. Stav je prázdný, pokud ho text nezmiňuje.
         """
-        doc = self.nlp(text)
-        
+        parsed = ensure_parsed(self.nlp, text, self.disabled_components)
+
         # Inicializace slovníku pro atributy
         attributes = {
             "description": "",
-            "status": "Živá",  # Výchozí hodnota
+            "status": "",
             "combat_history": "",
             "weaknesses_strengths": "",
         }
-        
-        # Hledání vět, které zmiňují příšeru
-        monster_sentences = []
-        for sent in doc.sents:
-            if monster_name.lower() in sent.text.lower():
-                monster_sentences.append(sent)
-        
-        # Extrakce popisu
-        description_patterns = [
-            r"(?i)" + re.escape(monster_name) + r"(?:\s+je|\s+byl|\s+byla|\s+vypadá|\s+má)\s+([^.!?]+)[.!?]",
-            r"(?i)(?:popis|vzhled|charakteristika)\s+(?:příšery\s+)?" + re.escape(monster_name) + r"\s*:\s*([^.!?]+)[.!?]",
-        ]
-        
-        for pattern in description_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                attributes["description"] = " ".join(matches)
-                break
-        
-        # Pokud nebyl nalezen popis pomocí regulárních výrazů, zkusíme extrahovat z vět
+
+        # Extrakce popisu, pokud nebyl nalezen pomocí vzorů, zkusíme extrahovat z vět
+        attributes["description"] = " ".join(
+            self._first_values(parsed, MONSTER_PATTERNS["description"], monster_name)
+        )
         if not attributes["description"]:
-            for sent in monster_sentences:
-                if any(token.lemma_ in ["být", "vypadat", "mít"] for token in sent):
-                    attributes["description"] = sent.text
-                    break
-        
-        # Extrakce stavu
-        status_patterns = {
-            "Živá": [r"(?i)" + re.escape(monster_name) + r"(?:\s+je|\s+zůstává)\s+(?:naživu|živá|živý|zdravá|zdravý)"],
-            "Mrtvá": [r"(?i)" + re.escape(monster_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:mrtvá|mrtvý|zabita|zabit|zemřela|zemřel)"],
-            "Zraněná": [r"(?i)" + re.escape(monster_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:zraněná|zraněný|zraněna|zraněn|poraněná|poraněný|poraněna|poraněn)"],
-        }
-        
-        for status, patterns in status_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    attributes["status"] = status
+            attributes["description"] = self._description_from_sentences(
+                parsed.sentences_mentioning(monster_name)
+            )
+
+        # Extrakce stavu (platí první odpovídající stav odlišný od výchozího)
+        for status, templates in MONSTER_PATTERNS["status"].items():
+            if any(self._search(parsed, template, monster_name) for template in templates):
+                attributes["status"] = status
+                if status != "Živá":  # Pokud jsme našli jiný stav než výchozí
                     break
-            if attributes["status"] != "Živá":  # Pokud jsme našli jiný stav než výchozí
-                break
-        
+
         # Extrakce historie soubojů
-        combat_patterns = [
-            r"(?i)" + re.escape(monster_name) + r"(?:\s+bojovala|\s+bojoval|\s+zaútočila|\s+zaútočil|\s+napadla|\s+napadl)\s+([^.!?]+)[.!?]",
-            r"(?i)(?:souboj|boj|střet|konfrontace)\s+s\s+" + re.escape(monster_name) + r"\s+([^.!?]+)[.!?]",
-        ]
-        
-        combat_history = []
-        for pattern in combat_patterns:
-            matches = re.findall(pattern, text)
-            combat_history.extend(matches)
-        
+        combat_history = self._all_values(parsed, MONSTER_PATTERNS["combat_history"], monster_name)
         if combat_history:
             attributes["combat_history"] = " ".join(combat_history)
-        
+
         # Extrakce slabin a silných stránek
-        weakness_patterns = [
-            r"(?i)(?:slabina|slabost|slabé\s+místo)\s+(?:příšery\s+)?" + re.escape(monster_name) + r"(?:\s+je|\s+byla)\s+([^.!?]+)[.!?]",
-            r"(?i)" + re.escape(monster_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:slabá|slabý|zranitelná|zranitelný)\s+(?:vůči|proti)\s+([^.!?]+)[.!?]",
-        ]
-        
-        strength_patterns = [
-            r"(?i)(?:silná\s+stránka|síla|přednost)\s+(?:příšery\s+)?" + re.escape(monster_name) + r"(?:\s+je|\s+byla)\s+([^.!?]+)[.!?]",
-            r"(?i)" + re.escape(monster_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:silná|silný|odolná|odolný)\s+(?:vůči|proti)\s+([^.!?]+)[.!?]",
-        ]
-        
-        weaknesses = []
-        for pattern in weakness_patterns:
-            matches = re.findall(pattern, text)
-            weaknesses.extend(matches)
-        
-        strengths = []
-        for pattern in strength_patterns:
-            matches = re.findall(pattern, text)
-            strengths.extend(matches)
-        
+        weaknesses = self._all_values(parsed, MONSTER_PATTERNS["weaknesses"], monster_name)
+        strengths = self._all_values(parsed, MONSTER_PATTERNS["strengths"], monster_name)
+
         if weaknesses or strengths:
             if weaknesses:
                 attributes["weaknesses_strengths"] = "Slabiny: " + ", ".join(weaknesses)
@@ -337,22 +560,22 @@ class AttributeExtractor:
                 if attributes["weaknesses_strengths"]:
                     attributes["weaknesses_strengths"] += "; "
                 attributes["weaknesses_strengths"] += "Silné stránky: " + ", ".join(strengths)
-        
+
         return attributes
 
-    def extract_item_attributes(self, text: str, item_name: str) -> Dict[str, str]:
+    def extract_item_attributes(self, text: Union[str, ParsedText], item_name: str) -> Dict[str, str]:
         """
         Extrahuje atributy předmětu z textu.
 
         Args:
-            text: Text, ze kterého se mají extrahovat atributy.
+            text: Text nebo rozparsovaný text, ze kterého se mají extrahovat atributy.
             item_name: Název předmětu, pro který se mají extrahovat atributy.
 
         Returns:
             Slovník s extrahovanými atributy.
         """
-        doc = self.nlp(text)
-        
+        parsed = ensure_parsed(self.nlp, text, self.disabled_components)
+
         # Inicializace slovníku pro atributy
         attributes = {
             "item_type": "",
@@ -360,79 +583,26 @@ class AttributeExtractor:
             "ownership_history": "",
             "special_abilities": "",
         }
-        
-        # Hledání vět, které zmiňují předmět
-        item_sentences = []
-        for sent in doc.sents:
-            if item_name.lower() in sent.text.lower():
-                item_sentences.append(sent)
-        
-        # Extrakce typu předmětu
-        item_type_patterns = {
-            "Zbraň": [r"(?i)(?:zbraň|meč|dýka|sekera|kladivo|palice|hůl|luk|kuše|šíp|kopí)\s+" + re.escape(item_name), r"(?i)" + re.escape(item_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:zbraň|meč|dýka|sekera|kladivo|palice|hůl|luk|kuše|šíp|kopí)"],
-            "Brnění": [r"(?i)(?:brnění|zbroj|přilba|helma|rukavice|boty|štít)\s+" + re.escape(item_name), r"(?i)" + re.escape(item_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:brnění|zbroj|přilba|helma|rukavice|boty|štít)"],
-            "Artefakt": [r"(?i)(?:artefakt|relikvie|posvátný\s+předmět)\s+" + re.escape(item_name), r"(?i)" + re.escape(item_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:artefakt|relikvie|posvátný\s+předmět)"],
-            "Lektvar": [r"(?i)(?:lektvar|elixír|nápoj)\s+" + re.escape(item_name), r"(?i)" + re.escape(item_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:lektvar|elixír|nápoj)"],
-            "Svitek": [r"(?i)(?:svitek|pergamen)\s+" + re.escape(item_name), r"(?i)" + re.escape(item_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:svitek|pergamen)"],
-            "Běžný předmět": [r"(?i)(?:předmět|věc|nástroj)\s+" + re.escape(item_name), r"(?i)" + re.escape(item_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:předmět|věc|nástroj)"],
-            "Klíč": [r"(?i)(?:klíč|klíček)\s+" + re.escape(item_name), r"(?i)" + re.escape(item_name) + r"(?:\s+je|\s+byl|\s+byla)\s+(?:klíč|klíček)"],
-        }
-        
-        for item_type, patterns in item_type_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    attributes["item_type"] = item_type
-                    break
-            if attributes["item_type"]:
-                break
-        
-        # Extrakce popisu
-        description_patterns = [
-            r"(?i)" + re.escape(item_name) + r"(?:\s+je|\s+byl|\s+byla|\s+vypadá|\s+má)\s+([^.!?]+)[.!?]",
-            r"(?i)(?:popis|vzhled|charakteristika)\s+(?:předmětu\s+)?" + re.escape(item_name) + r"\s*:\s*([^.!?]+)[.!?]",
-        ]
-        
-        for pattern in description_patterns:
-            matches = re.findall(pattern, text)
-            if matches:
-                attributes["description"] = " ".join(matches)
+
+        # Extrakce typu předmětu (platí první odpovídající typ)
+        for item_type, templates in ITEM_PATTERNS["item_type"].items():
+            if any(self._search(parsed, template, item_name) for template in templates):
+                attributes["item_type"] = item_type
                 break
-        
-        # Pokud nebyl nalezen popis pomocí regulárních výrazů, zkusíme extrahovat z vět
+
+        # Extrakce popisu, pokud nebyl nalezen pomocí vzorů, zkusíme extrahovat z vět
+        attributes["description"] = " ".join(self._first_values(parsed, ITEM_PATTERNS["description"], item_name))
         if not attributes["description"]:
-            for sent in item_sentences:
-                if any(token.lemma_ in ["být", "vypadat", "mít"] for token in sent):
-                    attributes["description"] = sent.text
-                    break
-        
+            attributes["description"] = self._description_from_sentences(parsed.sentences_mentioning(item_name))
+
         # Extrakce historie vlastnictví
-        ownership_patterns = [
-            r"(?i)" + re.escape(item_name) + r"(?:\s+patřil|\s+patřila|\s+patřilo|\s+náležel|\s+náležela|\s+náleželo)\s+([^.!?]+)[.!?]",
-            r"(?i)(?:vlastník|majitel|držitel)\s+(?:předmětu\s+)?" + re.escape(item_name) + r"(?:\s+je|\s+byl|\s+byla)\s+([^.!?]+)[.!?]",
-            r"(?i)" + re.escape(item_name) + r"(?:\s+byl|\s+byla|\s+bylo)\s+(?:získán|získána|získáno|nalezen|nalezena|nalezeno)\s+([^.!?]+)[.!?]",
-        ]
-        
-        ownership_history = []
-        for pattern in ownership_patterns:
-            matches = re.findall(pattern, text)
-            ownership_history.extend(matches)
-        
+        ownership_history = self._all_values(parsed, ITEM_PATTERNS["ownership_history"], item_name)
         if ownership_history:
             attributes["ownership_history"] = " ".join(ownership_history)
-        
+
         # Extrakce speciálních schopností
-        ability_patterns = [
-            r"(?i)" + re.escape(item_name) + r"(?:\s+má|\s+poskytuje|\s+dává|\s+umožňuje)\s+(?:schopnost|možnost|sílu)\s+([^.!?]+)[.!?]",
-            r"(?i)(?:schopnost|moc|síla|vlastnost)\s+(?:předmětu\s+)?" + re.escape(item_name) + r"(?:\s+je|\s+spočívá\s+v)\s+([^.!?]+)[.!?]",
-            r"(?i)" + re.escape(item_name) + r"(?:\s+může|\s+dokáže|\s+umí)\s+([^.!?]+)[.!?]",
-        ]
-        
-        abilities = []
-        for pattern in ability_patterns:
-            matches = re.findall(pattern, text)
-            abilities.extend(matches)
-        
+        abilities = self._all_values(parsed, ITEM_PATTERNS["special_abilities"], item_name)
         if abilities:
             attributes["special_abilities"] = " ".join(abilities)
-        
+
         return attributes
@@ -2,15 +2,15 @@
 Modul pro kategorizaci a tagování entit.
 """
 import logging
-import re
 from typing import Dict, List, Optional, Set, Tuple, Union
 
-import spacy
 from spacy.language import Language
 from spacy.tokens import Doc, Span, Token
 
 from rpg_notion.config.settings import SPACY_MODEL
 from rpg_notion.models.entities import EntityType
+from rpg_notion.nlp.model_registry import get_model_registry
+from rpg_notion.nlp.parsed_text import ParsedText, ensure_parsed
 
 logger = logging.getLogger(__name__)
 
@@ -18,24 +18,28 @@ logger = logging.getLogger(__name__)
 class EntityCategorizer:
     """
     Třída pro kategorizaci a tagování entit.
+
+    Klíčová slova všech typů entit se při inicializaci lemmatizují do jednoho
+    indexu. Každý dokument se pak projde jednou a tagy všech zmíněných entit
+    se určí z vět, které entitu zmiňují, takže cena tagování nezávisí na
+    počtu entit.
     """
 
-    def __init__(self, model_name: Optional[str] = None):
+    # Komponenty, které tato třída nepotřebuje a při parsování je přeskakuje
+    DEFAULT_DISABLED_COMPONENTS = ["ner", "fantasy_ner"]
+
+    def __init__(self, model_name: Optional[str] = None, disable: Optional[List[str]] = None):
         """
         Inicializace kategorizátoru entit.
 
         Args:
             model_name: Název modelu spaCy. Pokud není zadán, použije se model z konfigurace.
+            disable: Komponenty pipeline, které se při parsování surového textu přeskočí.
+                Pokud nejsou zadány, použijí se DEFAULT_DISABLED_COMPONENTS.
         """
         self.model_name = model_name or SPACY_MODEL
-        try:
-            self.nlp = spacy.load(self.model_name)
-            logger.info(f"Načten model spaCy: {self.model_name}")
-        except OSError:
-            logger.warning(f"Model {self.model_name} není nainstalován. Stahuji...")
-            spacy.cli.download(self.model_name)
-            self.nlp = spacy.load(self.model_name)
-            logger.info(f"Model {self.model_name} byl úspěšně stažen a načten.")
+        self.nlp = get_model_registry().get(self.model_name)
+        self.disabled_components = list(disable) if disable is not None else list(self.DEFAULT_DISABLED_COMPONENTS)
         
         # Definice tagů pro jednotlivé typy entit
         self.npc_tags = {
@@ -96,335 +100,193 @@ class EntityCategorizer:
             "Důležitá": ["důležitá", "klíčová", "významná", "zásadní", "přelomová", "rozhodující"],
             "Vedlejší": ["vedlejší", "nepodstatná", "okrajová", "doplňková", "méně důležitá"]
         }
+        
+        self.tags_by_type = {
+            EntityType.NPC: self.npc_tags,
+            EntityType.LOCATION: self.location_tags,
+            EntityType.MONSTER: self.monster_tags,
+            EntityType.ITEM: self.item_tags,
+            EntityType.QUEST: self.quest_tags,
+            EntityType.FACTION: self.faction_tags,
+            EntityType.EVENT: self.event_tags,
+        }
+        self._keyword_index = self._build_keyword_index()
+
+    def _build_keyword_index(self) -> Dict[Tuple[str, ...], Set[Tuple[EntityType, str]]]:
+        """
+        Sestaví index klíčových slov: tvar nebo lemma (n-gram) -> (typ entity, tag).
+
+        Klíčová slova se lemmatizují jednou při inicializaci. Indexuje se
+        lemma i tvar psaný malými písmeny, víceslovná klíčová slova jako n-gramy.
+
+        Returns:
+            Index klíčových slov.
+        """
+        entries = [
+            (keyword, entity_type, tag)
+            for entity_type, tags in self.tags_by_type.items()
+            for tag, keywords in tags.items()
+            for keyword in keywords
+        ]
+        docs = self.nlp.pipe((keyword for keyword, _, _ in entries), disable=self.disabled_components)
+
+        index: Dict[Tuple[str, ...], Set[Tuple[EntityType, str]]] = {}
+        self._max_keyword_length = 1
+        for (_, entity_type, tag), doc in zip(entries, docs):
+            forms = [tuple(token.lower_ for token in doc)]
+            if all(token.lemma_ for token in doc):
+                forms.append(tuple(token.lemma_.lower() for token in doc))
+            for form in forms:
+                index.setdefault(form, set()).add((entity_type, tag))
+            self._max_keyword_length = max(self._max_keyword_length, len(doc))
+        return index
+
+    def _sweep(self, parsed: ParsedText) -> Dict[int, Set[Tuple[EntityType, str]]]:
+        """
+        Jedním průchodem tokeny dokumentu najde tagy všech typů entit v každé větě.
+
+        Výsledek se ukládá do rozparsovaného textu, takže kategorizace dalších
+        entit ze stejného textu už dokument znovu neprochází.
+
+        Args:
+            parsed: Rozparsovaný text.
+
+        Returns:
+            Slovník začátek věty (index tokenu) -> nalezené dvojice (typ entity, tag).
+        """
+        def sweep() -> Dict[int, Set[Tuple[EntityType, str]]]:
+            found_by_sentence = {}
+            for sent in parsed.sentences:
+                lowers = [token.lower_ for token in sent]
+                lemmas = [token.lemma_.lower() for token in sent]
+                found: Set[Tuple[EntityType, str]] = set()
+                for i in range(len(lowers)):
+                    for n in range(1, min(self._max_keyword_length, len(lowers) - i) + 1):
+                        found.update(self._keyword_index.get(tuple(lowers[i:i + n]), ()))
+                        found.update(self._keyword_index.get(tuple(lemmas[i:i + n]), ()))
+                found_by_sentence[sent.start] = found
+            return found_by_sentence
 
-    def categorize_npc(self, text: str, npc_name: str) -> List[str]:
+        return parsed.cached(f"categorizer_sweep:{id(self)}", sweep)
+
+    def _categorize(self, text: Union[str, ParsedText], entity_name: str, entity_type: EntityType) -> List[str]:
+        """
+        Přiřadí entitě tagy podle klíčových slov ve větách, které ji zmiňují.
+
+        Args:
+            text: Text nebo rozparsovaný text.
+            entity_name: Název entity.
+            entity_type: Typ entity.
+
+        Returns:
+            Seznam tagů v pořadí, v jakém jsou definovány.
+        """
+        parsed = ensure_parsed(self.nlp, text, self.disabled_components)
+        found_by_sentence = self._sweep(parsed)
+
+        found: Set[Tuple[EntityType, str]] = set()
+        for sent in parsed.sentences_mentioning(entity_name):
+            found |= found_by_sentence[sent.start]
+
+        return [tag for tag in self.tags_by_type.get(entity_type, {}) if (entity_type, tag) in found]
+
+    def categorize_npc(self, text: Union[str, ParsedText], npc_name: str) -> List[str]:
         """
         Kategorizuje NPC a přiřadí mu tagy na základě textu.
 
         Args:
-            text: Text, na základě kterého se má NPC kategorizovat.
+            text: Text nebo rozparsovaný text, na základě kterého se má NPC kategorizovat.
             npc_name: Jméno NPC.
 
         Returns:
             Seznam tagů pro NPC.
         """
-        doc = self.nlp(text)
-        
-        # Inicializace seznamu tagů
-        tags = []
-        
-        # Hledání vět, které zmiňují NPC
-        npc_sentences = []
-        for sent in doc.sents:
-            if npc_name.lower() in sent.text.lower():
-                npc_sentences.append(sent)
-        
-        # Procházení tagů a hledání odpovídajících klíčových slov v textu
-        for tag, keywords in self.npc_tags.items():
-            # Kontrola, zda některé z klíčových slov je v textu
-            for keyword in keywords:
-                # Hledání v celém textu
-                if re.search(r"(?i)" + re.escape(keyword), text):
-                    # Kontrola, zda klíčové slovo je spojeno s NPC
-                    for sent in npc_sentences:
-                        if keyword.lower() in sent.text.lower():
-                            tags.append(tag)
-                            break
-                    else:
-                        # Hledání v blízkosti jména NPC
-                        pattern = r"(?i)" + re.escape(npc_name) + r"(?:[^.!?]*\s+" + re.escape(keyword) + r"|" + re.escape(keyword) + r"\s+[^.!?]*" + re.escape(npc_name) + r")"
-                        if re.search(pattern, text):
-                            tags.append(tag)
-                    
-                    # Pokud jsme našli tag, přejdeme na další
-                    if tag in tags:
-                        break
-        
-        # Odstranění duplicit
-        return list(set(tags))
+        return self._categorize(text, npc_name, EntityType.NPC)
 
-    def categorize_location(self, text: str, location_name: str) -> List[str]:
+    def categorize_location(self, text: Union[str, ParsedText], location_name: str) -> List[str]:
         """
         Kategorizuje lokaci a přiřadí jí tagy na základě textu.
 
         Args:
-            text: Text, na základě kterého se má lokace kategorizovat.
+            text: Text nebo rozparsovaný text, na základě kterého se má lokace kategorizovat.
             location_name: Název lokace.
 
         Returns:
             Seznam tagů pro lokaci.
         """
-        doc = self.nlp(text)
-        
-        # Inicializace seznamu tagů
-        tags = []
-        
-        # Hledání vět, které zmiňují lokaci
-        location_sentences = []
-        for sent in doc.sents:
-            if location_name.lower() in sent.text.lower():
-                location_sentences.append(sent)
-        
-        # Procházení tagů a hledání odpovídajících klíčových slov v textu
-        for tag, keywords in self.location_tags.items():
-            # Kontrola, zda některé z klíčových slov je v textu
-            for keyword in keywords:
-                # Hledání v celém textu
-                if re.search(r"(?i)" + re.escape(keyword), text):
-                    # Kontrola, zda klíčové slovo je spojeno s lokací
-                    for sent in location_sentences:
-                        if keyword.lower() in sent.text.lower():
-                            tags.append(tag)
-                            break
-                    else:
-                        # Hledání v blízkosti názvu lokace
-                        pattern = r"(?i)" + re.escape(location_name) + r"(?:[^.!?]*\s+" + re.escape(keyword) + r"|" + re.escape(keyword) + r"\s+[^.!?]*" + re.escape(location_name) + r")"
-                        if re.search(pattern, text):
-                            tags.append(tag)
-                    
-                    # Pokud jsme našli tag, přejdeme na další
-                    if tag in tags:
-                        break
-        
-        # Odstranění duplicit
-        return list(set(tags))
+        return self._categorize(text, location_name, EntityType.LOCATION)
 
-    def categorize_monster(self, text: str, monster_name: str) -> List[str]:
+    def categorize_monster(self, text: Union[str, ParsedText], monster_name: str) -> List[str]:
         """
         Kategorizuje příšeru a přiřadí jí tagy na základě textu.
 
         Args:
-            text: Text, na základě kterého se má příšera kategorizovat.
+            text: Text nebo rozparsovaný text, na základě kterého se má příšera kategorizovat.
             monster_name: Název příšery.
 
         Returns:
             Seznam tagů pro příšeru.
         """
-        doc = self.nlp(text)
-        
-        # Inicializace seznamu tagů
-        tags = []
-        
-        # Hledání vět, které zmiňují příšeru
-        monster_sentences = []
-        for sent in doc.sents:
-            if monster_name.lower() in sent.text.lower():
-                monster_sentences.append(sent)
-        
-        # Procházení tagů a hledání odpovídajících klíčových slov v textu
-        for tag, keywords in self.monster_tags.items():
-            # Kontrola, zda některé z klíčových slov je v textu
-            for keyword in keywords:
-                # Hledání v celém textu
-                if re.search(r"(?i)" + re.escape(keyword), text):
-                    # Kontrola, zda klíčové slovo je spojeno s příšerou
-                    for sent in monster_sentences:
-                        if keyword.lower() in sent.text.lower():
-                            tags.append(tag)
-                            break
-                    else:
-                        # Hledání v blízkosti názvu příšery
-                        pattern = r"(?i)" + re.escape(monster_name) + r"(?:[^.!?]*\s+" + re.escape(keyword) + r"|" + re.escape(keyword) + r"\s+[^.!?]*" + re.escape(monster_name) + r")"
-                        if re.search(pattern, text):
-                            tags.append(tag)
-                    
-                    # Pokud jsme našli tag, přejdeme na další
-                    if tag in tags:
-                        break
-        
-        # Odstranění duplicit
-        return list(set(tags))
+        return self._categorize(text, monster_name, EntityType.MONSTER)
 
-    def categorize_item(self, text: str, item_name: str) -> List[str]:
+    def categorize_item(self, text: Union[str, ParsedText], item_name: str) -> List[str]:
         """
         Kategorizuje předmět a přiřadí mu tagy na základě textu.
 
         Args:
-            text: Text, na základě kterého se má předmět kategorizovat.
+            text: Text nebo rozparsovaný text, na základě kterého se má předmět kategorizovat.
             item_name: Název předmětu.
 
         Returns:
             Seznam tagů pro předmět.
         """
-        doc = self.nlp(text)
-        
-        # Inicializace seznamu tagů
-        tags = []
-        
-        # Hledání vět, které zmiňují předmět
-        item_sentences = []
-        for sent in doc.sents:
-            if item_name.lower() in sent.text.lower():
-                item_sentences.append(sent)
-        
-        # Procházení tagů a hledání odpovídajících klíčových slov v textu
-        for tag, keywords in self.item_tags.items():
-            # Kontrola, zda některé z klíčových slov je v textu
-            for keyword in keywords:
-                # Hledání v celém textu
-                if re.search(r"(?i)" + re.escape(keyword), text):
-                    # Kontrola, zda klíčové slovo je spojeno s předmětem
-                    for sent in item_sentences:
-                        if keyword.lower() in sent.text.lower():
-                            tags.append(tag)
-                            break
-                    else:
-                        # Hledání v blízkosti názvu předmětu
-                        pattern = r"(?i)" + re.escape(item_name) + r"(?:[^.!?]*\s+" + re.escape(keyword) + r"|" + re.escape(keyword) + r"\s+[^.!?]*" + re.escape(item_name) + r")"
-                        if re.search(pattern, text):
-                            tags.append(tag)
-                    
-                    # Pokud jsme našli tag, přejdeme na další
-                    if tag in tags:
-                        break
-        
-        # Odstranění duplicit
-        return list(set(tags))
+        return self._categorize(text, item_name, EntityType.ITEM)
 
-    def categorize_quest(self, text: str, quest_name: str) -> List[str]:
+    def categorize_quest(self, text: Union[str, ParsedText], quest_name: str) -> List[str]:
         """
         Kategorizuje quest a přiřadí mu tagy na základě textu.
 
         Args:
-            text: Text, na základě kterého se má quest kategorizovat.
+            text: Text nebo rozparsovaný text, na základě kterého se má quest kategorizovat.
             quest_name: Název questu.
 
         Returns:
             Seznam tagů pro quest.
         """
-        doc = self.nlp(text)
-        
-        # Inicializace seznamu tagů
-        tags = []
-        
-        # Hledání vět, které zmiňují quest
-        quest_sentences = []
-        for sent in doc.sents:
-            if quest_name.lower() in sent.text.lower():
-                quest_sentences.append(sent)
-        
-        # Procházení tagů a hledání odpovídajících klíčových slov v textu
-        for tag, keywords in self.quest_tags.items():
-            # Kontrola, zda některé z klíčových slov je v textu
-            for keyword in keywords:
-                # Hledání v celém textu
-                if re.search(r"(?i)" + re.escape(keyword), text):
-                    # Kontrola, zda klíčové slovo je spojeno s questem
-                    for sent in quest_sentences:
-                        if keyword.lower() in sent.text.lower():
-                            tags.append(tag)
-                            break
-                    else:
-                        # Hledání v blízkosti názvu questu
-                        pattern = r"(?i)" + re.escape(quest_name) + r"(?:[^.!?]*\s+" + re.escape(keyword) + r"|" + re.escape(keyword) + r"\s+[^.!?]*" + re.escape(quest_name) + r")"
-                        if re.search(pattern, text):
-                            tags.append(tag)
-                    
-                    # Pokud jsme našli tag, přejdeme na další
-                    if tag in tags:
-                        break
-        
-        # Odstranění duplicit
-        return list(set(tags))
+        return self._categorize(text, quest_name, EntityType.QUEST)
 
-    def categorize_faction(self, text: str, faction_name: str) -> List[str]:
+    def categorize_faction(self, text: Union[str, ParsedText], faction_name: str) -> List[str]:
         """
         Kategorizuje frakci a přiřadí jí tagy na základě textu.
 
         Args:
-            text: Text, na základě kterého se má frakce kategorizovat.
+            text: Text nebo rozparsovaný text, na základě kterého se má frakce kategorizovat.
             faction_name: Název frakce.
 
         Returns:
             Seznam tagů pro frakci.
         """
-        doc = self.nlp(text)
-        
-        # Inicializace seznamu tagů
-        tags = []
-        
-        # Hledání vět, které zmiňují frakci
-        faction_sentences = []
-        for sent in doc.sents:
-            if faction_name.lower() in sent.text.lower():
-                faction_sentences.append(sent)
-        
-        # Procházení tagů a hledání odpovídajících klíčových slov v textu
-        for tag, keywords in self.faction_tags.items():
-            # Kontrola, zda některé z klíčových slov je v textu
-            for keyword in keywords:
-                # Hledání v celém textu
-                if re.search(r"(?i)" + re.escape(keyword), text):
-                    # Kontrola, zda klíčové slovo je spojeno s frakcí
-                    for sent in faction_sentences:
-                        if keyword.lower() in sent.text.lower():
-                            tags.append(tag)
-                            break
-                    else:
-                        # Hledání v blízkosti názvu frakce
-                        pattern = r"(?i)" + re.escape(faction_name) + r"(?:[^.!?]*\s+" + re.escape(keyword) + r"|" + re.escape(keyword) + r"\s+[^.!?]*" + re.escape(faction_name) + r")"
-                        if re.search(pattern, text):
-                            tags.append(tag)
-                    
-                    # Pokud jsme našli tag, přejdeme na další
-                    if tag in tags:
-                        break
-        
-        # Odstranění duplicit
-        return list(set(tags))
+        return self._categorize(text, faction_name, EntityType.FACTION)
 
-    def categorize_event(self, text: str, event_name: str) -> List[str]:
+    def categorize_event(self, text: Union[str, ParsedText], event_name: str) -> List[str]:
         """
         Kategorizuje událost a přiřadí jí tagy na základě textu.
 
         Args:
-            text: Text, na základě kterého se má událost kategorizovat.
+            text: Text nebo rozparsovaný text, na základě kterého se má událost kategorizovat.
             event_name: Název události.
 
         Returns:
             Seznam tagů pro událost.
         """
-        doc = self.nlp(text)
-        
-        # Inicializace seznamu tagů
-        tags = []
-        
-        # Hledání vět, které zmiňují událost
-        event_sentences = []
-        for sent in doc.sents:
-            if event_name.lower() in sent.text.lower():
-                event_sentences.append(sent)
-        
-        # Procházení tagů a hledání odpovídajících klíčových slov v textu
-        for tag, keywords in self.event_tags.items():
-            # Kontrola, zda některé z klíčových slov je v textu
-            for keyword in keywords:
-                # Hledání v celém textu
-                if re.search(r"(?i)" + re.escape(keyword), text):
-                    # Kontrola, zda klíčové slovo je spojeno s událostí
-                    for sent in event_sentences:
-                        if keyword.lower() in sent.text.lower():
-                            tags.append(tag)
-                            break
-                    else:
-                        # Hledání v blízkosti názvu události
-                        pattern = r"(?i)" + re.escape(event_name) + r"(?:[^.!?]*\s+" + re.escape(keyword) + r"|" + re.escape(keyword) + r"\s+[^.!?]*" + re.escape(event_name) + r")"
-                        if re.search(pattern, text):
-                            tags.append(tag)
-                    
-                    # Pokud jsme našli tag, přejdeme na další
-                    if tag in tags:
-                        break
-        
-        # Odstranění duplicit
-        return list(set(tags))
+        return self._categorize(text, event_name, EntityType.EVENT)
 
-    def categorize_entity(self, text: str, entity_name: str, entity_type: EntityType) -> List[str]:
+    def categorize_entity(self, text: Union[str, ParsedText], entity_name: str, entity_type: EntityType) -> List[str]:
         """
         Kategorizuje entitu a přiřadí jí tagy na základě textu.
 
         Args:
-            text: Text, na základě kterého se má entita kategorizovat.
+            text: Text nebo rozparsovaný text, na základě kterého se má entita kategorizovat.
             entity_name: Název entity.
             entity_type: Typ entity.
 
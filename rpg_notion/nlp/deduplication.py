@@ -0,0 +1,355 @@
+"""
+Modul pro vyhledávání duplicitních entit ve velkých množinách.
+"""
+import hashlib
+import logging
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Hashable, List, Sequence, Set, Tuple
+
+from pydantic import BaseModel
+
+from rpg_notion.models.entities import BaseEntity
+from rpg_notion.nlp.names import name_trigrams, normalize_name
+
+logger = logging.getLogger(__name__)
+
+
+class MergePlan(BaseModel):
+    """
+    Plán sloučení skupiny duplicitních entit.
+    """
+
+    keep: BaseEntity
+    duplicates: List[BaseEntity]
+    similarity: float
+
+    @property
+    def entities(self) -> List[BaseEntity]:
+        """
+        Entity ke sloučení, ponechávaná entita je první (vstup pro EntityMatcher.merge_entities).
+
+        Returns:
+            Seznam entit.
+        """
+        return [self.keep] + self.duplicates
+
+
+class _UnionFind:
+    """
+    Disjunktní množiny se slučováním podle velikosti a kompresí cest.
+    """
+
+    def __init__(self, size: int):
+        """
+        Inicializace disjunktních množin.
+
+        Args:
+            size: Počet prvků.
+        """
+        self.parent = list(range(size))
+        self.size = [1] * size
+
+    def find(self, item: int) -> int:
+        """
+        Vrátí reprezentanta množiny, do které prvek patří.
+
+        Args:
+            item: Prvek.
+
+        Returns:
+            Reprezentant množiny.
+        """
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, first: int, second: int) -> bool:
+        """
+        Sloučí množiny dvou prvků.
+
+        Args:
+            first: První prvek.
+            second: Druhý prvek.
+
+        Returns:
+            True, pokud byly prvky v různých množinách, jinak False.
+        """
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return False
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+        return True
+
+
+def _band_signatures(names: Sequence[str], num_perm: int, rows: int, salt: bytes) -> List[List[Tuple[int, ...]]]:
+    """
+    Spočítá MinHash signatury trigramů názvů rozdělené do pásem LSH.
+
+    Hodnoty všech hashovacích funkcí pro jeden trigram dává jediný výstup
+    SHAKE-128 (s předponou podle semínka); trigramy se mezi názvy hojně
+    opakují, proto se ukládají do cache. Funkce je na úrovni modulu, aby ji
+    bylo možné spouštět v procesním poolu.
+
+    Args:
+        names: Normalizované názvy.
+        num_perm: Počet hashovacích funkcí.
+        rows: Počet hodnot signatury v jednom pásmu.
+        salt: Předpona určující rodinu hashovacích funkcí.
+
+    Returns:
+        Pro každý název seznam pásem signatury.
+    """
+    gram_hashes: Dict[str, Tuple[int, ...]] = {}
+    unpack = struct.Struct(f"<{num_perm}I").unpack
+    signatures = []
+    for normalized in names:
+        values = []
+        for gram in name_trigrams(normalized):
+            hashes = gram_hashes.get(gram)
+            if hashes is None:
+                hashes = gram_hashes[gram] = unpack(hashlib.shake_128(salt + gram.encode("utf-8")).digest(4 * num_perm))
+            values.append(hashes)
+        signature = tuple(map(min, zip(*values)))
+        signatures.append([signature[start:start + rows] for start in range(0, num_perm, rows)])
+    return signatures
+
+
+def _score_pairs(pairs: Sequence[Tuple[int, int]], names: Sequence[str], threshold: float) -> List[Tuple[int, int, float]]:
+    """
+    Spočítá podobnost dvojic názvů a vrátí ty, které dosahují prahu.
+
+    Funkce je na úrovni modulu, aby ji bylo možné spouštět v procesním poolu.
+
+    Args:
+        pairs: Dvojice indexů do names.
+        names: Normalizované názvy.
+        threshold: Práh podobnosti.
+
+    Returns:
+        Seznam trojic (index, index, podobnost).
+    """
+    matcher = SequenceMatcher(None, "", "")
+    matches = []
+    for first, second in pairs:
+        name_a, name_b = names[first], names[second]
+        total_length = len(name_a) + len(name_b)
+        if not total_length or 2.0 * min(len(name_a), len(name_b)) / total_length < threshold:
+            continue
+        matcher.set_seqs(name_a, name_b)
+        if matcher.quick_ratio() < threshold:
+            continue
+        similarity = matcher.ratio()
+        if similarity >= threshold:
+            matches.append((first, second, similarity))
+    return matches
+
+
+class EntityDeduplicator:
+    """
+    Shlukování duplicitních entit podle podobnosti názvů.
+
+    Malé množiny entit (do exhaustive_max_size) se porovnávají po všech
+    dvojicích stejného typu. U větších se entity rozdělí do bloků podle klíčů
+    (typ entity a prefix či sufix normalizovaného názvu, pásma MinHash
+    signatury nad trigramy názvu) a podobnost se počítá jen uvnitř bloků;
+    překlep na začátku názvu zachytí sufix a pásma po dvou hodnotách
+    signatury. Podobné dvojice
+    se slučují pomocí disjunktních množin, takže výsledek nezávisí na pořadí
+    entit na vstupu.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.7,
+        prefix_length: int = 3,
+        num_perm: int = 48,
+        bands: int = 24,
+        max_block_size: int = 1000,
+        exhaustive_max_size: int = 2000,
+        workers: int = 1,
+        parallel_min_size: int = 20000,
+        seed: int = 1,
+    ):
+        """
+        Inicializace deduplikátoru entit.
+
+        Args:
+            threshold: Práh podobnosti názvů (0.0 - 1.0).
+            prefix_length: Délka prefixu a sufixu normalizovaného názvu použitých jako klíče bloků.
+            num_perm: Počet hashovacích funkcí MinHash signatury.
+            bands: Počet pásem LSH, num_perm musí být jejich násobkem.
+            max_block_size: Bloky s více entitami se přeskočí (typicky velmi častý prefix).
+            exhaustive_max_size: Do tohoto počtu entit se porovnávají všechny dvojice stejného typu.
+            workers: Počet procesů pro výpočet signatur a podobnosti, 1 znamená výpočet v aktuálním procesu.
+            parallel_min_size: Minimální počet názvů nebo dvojic, od kterého se použije procesní pool.
+            seed: Semínko pro generování hashovacích funkcí.
+
+        Raises:
+            ValueError: Pokud num_perm není násobkem bands.
+        """
+        if bands < 1 or num_perm % bands:
+            raise ValueError(f"Počet hashovacích funkcí ({num_perm}) musí být násobkem počtu pásem ({bands}).")
+
+        self.threshold = threshold
+        self.prefix_length = prefix_length
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_block_size = max_block_size
+        self.exhaustive_max_size = exhaustive_max_size
+        self.workers = workers
+        self.parallel_min_size = parallel_min_size
+
+        self._salt = f"{seed}:".encode("ascii")
+
+    def _map(self, function: Callable[..., List[Any]], items: Sequence[Any], *args: Any) -> List[Any]:
+        """
+        Zavolá funkci nad částmi vstupu a spojí výsledky, případně paralelně v procesním poolu.
+
+        Args:
+            function: Funkce na úrovni modulu, která jako první argument bere část vstupu.
+            items: Vstup.
+            *args: Další argumenty funkce.
+
+        Returns:
+            Spojené výsledky ve stejném pořadí jako vstup.
+        """
+        if self.workers <= 1 or len(items) < self.parallel_min_size:
+            return function(items, *args)
+
+        chunk_size = -(-len(items) // (self.workers * 4))
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        results: List[Any] = []
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for result in executor.map(function, chunks, *([arg] * len(chunks) for arg in args)):
+                results.extend(result)
+        return results
+
+    def candidate_pairs(self, entities: Sequence[BaseEntity]) -> Set[Tuple[int, int]]:
+        """
+        Najde dvojice entit, které se mají porovnat.
+
+        Do exhaustive_max_size entit jde o všechny dvojice stejného typu.
+        Jinak jde o dvojice, které sdílejí alespoň jeden blok: klíčem bloku je
+        typ entity spolu s prefixem nebo sufixem normalizovaného názvu nebo
+        s jedním pásmem MinHash signatury. Entity různých typů se nikdy
+        neporovnávají.
+
+        Args:
+            entities: Entity.
+
+        Returns:
+            Množina dvojic indexů (menší index první).
+        """
+        pairs: Set[Tuple[int, int]] = set()
+        if len(entities) <= self.exhaustive_max_size:
+            by_type: Dict[Hashable, List[int]] = {}
+            for index, entity in enumerate(entities):
+                by_type.setdefault(entity.type, []).append(index)
+            for members in by_type.values():
+                for position, first in enumerate(members):
+                    for second in members[position + 1:]:
+                        pairs.add((first, second))
+            return pairs
+
+        names = [normalize_name(entity.name) for entity in entities]
+        signatures = self._map(_band_signatures, names, self.num_perm, self.rows, self._salt)
+
+        blocks: Dict[Hashable, List[int]] = {}
+        for index, (entity, normalized, bands) in enumerate(zip(entities, names, signatures)):
+            blocks.setdefault((entity.type, "prefix", normalized[:self.prefix_length]), []).append(index)
+            blocks.setdefault((entity.type, "suffix", normalized[-self.prefix_length:]), []).append(index)
+            for band, values in enumerate(bands):
+                blocks.setdefault((entity.type, band, values), []).append(index)
+
+        skipped = 0
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            if len(members) > self.max_block_size:
+                skipped += 1
+                continue
+            for position, first in enumerate(members):
+                for second in members[position + 1:]:
+                    pairs.add((first, second))
+
+        if skipped:
+            logger.warning(f"Přeskočeno {skipped} bloků s více než {self.max_block_size} entitami.")
+        return pairs
+
+    def find_clusters(self, entities: Sequence[BaseEntity]) -> List[List[BaseEntity]]:
+        """
+        Seskupí podobné entity.
+
+        Args:
+            entities: Entity k seskupení.
+
+        Returns:
+            Seznam skupin (včetně jednoprvkových) v pořadí prvního výskytu;
+            entity ve skupině jsou v pořadí na vstupu.
+        """
+        return [[entities[index] for index in cluster] for cluster, _ in self._clusters(entities)]
+
+    def _clusters(self, entities: Sequence[BaseEntity]) -> List[Tuple[List[int], float]]:
+        """
+        Seskupí podobné entity a ke každé skupině vrátí nejnižší podobnost, která ji spojila.
+
+        Args:
+            entities: Entity k seskupení.
+
+        Returns:
+            Seznam dvojic (indexy entit ve skupině, podobnost).
+        """
+        names = [normalize_name(entity.name) for entity in entities]
+        pairs = sorted(self.candidate_pairs(entities))
+        logger.info(f"Deduplikace {len(entities)} entit: {len(pairs)} kandidátních dvojic.")
+
+        # Slučování od nejpodobnějších dvojic, takže podobnost skupiny je deterministická
+        union_find = _UnionFind(len(entities))
+        linking: Dict[int, float] = {}
+        for first, second, similarity in sorted(self._map(_score_pairs, pairs, names, self.threshold), key=lambda match: (-match[2], match[0], match[1])):
+            first_root, second_root = union_find.find(first), union_find.find(second)
+            if first_root == second_root:
+                continue
+            lowest = min(similarity, linking.pop(first_root, 1.0), linking.pop(second_root, 1.0))
+            union_find.union(first_root, second_root)
+            linking[union_find.find(first)] = lowest
+
+        clusters: Dict[int, List[int]] = {}
+        for index in range(len(entities)):
+            clusters.setdefault(union_find.find(index), []).append(index)
+        return [(members, linking.get(root, 1.0)) for root, members in clusters.items()]
+
+    def plan_merges(self, entities: Sequence[BaseEntity]) -> List[MergePlan]:
+        """
+        Vytvoří plány sloučení pro skupiny duplicitních entit.
+
+        Ponechává se první entita skupiny, která už existuje v Notion (má ID),
+        jinak první entita skupiny.
+
+        Args:
+            entities: Entity k deduplikaci.
+
+        Returns:
+            Seznam plánů sloučení pro skupiny s alespoň dvěma entitami.
+        """
+        plans = []
+        for members, similarity in self._clusters(entities):
+            if len(members) < 2:
+                continue
+            group = [entities[index] for index in members]
+            keep = next((entity for entity in group if entity.id), group[0])
+            plans.append(MergePlan(
+                keep=keep,
+                duplicates=[entity for entity in group if entity is not keep],
+                similarity=similarity,
+            ))
+        return plans
@@ -2,15 +2,155 @@
 Modul pro fuzzy matching entit.
 """
 import logging
-import re
+from collections import Counter
 from difflib import SequenceMatcher
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
 
-from rpg_notion.models.entities import BaseEntity, EntityType
+from rpg_notion.models.entities import BaseEntity
+from rpg_notion.nlp.deduplication import EntityDeduplicator
+from rpg_notion.nlp.names import DIACRITICS_TABLE, name_trigrams, normalize_name
 
 logger = logging.getLogger(__name__)
 
 
+class EntityNameIndex:
+    """
+    Index názvů entit pro rychlé fuzzy vyhledávání.
+
+    Normalizované názvy se rozloží na znakové trigramy uložené v invertovaném
+    indexu. Při vyhledávání se kandidáti vyberou podle počtu společných trigramů
+    a přesnou podobností (SequenceMatcher) se ohodnotí jen nejslibnější z nich.
+    Entity, které s hledaným názvem nesdílejí žádný trigram, se neporovnávají.
+    """
+
+    def __init__(self, entities: Optional[Iterable[BaseEntity]] = None, candidate_limit: int = 50):
+        """
+        Inicializace indexu názvů entit.
+
+        Args:
+            entities: Entity, které se mají do indexu přidat.
+            candidate_limit: Maximální počet kandidátů, pro které se počítá přesná podobnost.
+        """
+        if candidate_limit < 1:
+            raise ValueError(f"Neplatný počet kandidátů: {candidate_limit}")
+
+        self.candidate_limit = candidate_limit
+        self._entries: Dict[int, Tuple[BaseEntity, str, Set[str]]] = {}
+        self._keys_by_object: Dict[int, int] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._next_key = 0
+
+        for entity in entities or []:
+            self.add(entity)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, entity: BaseEntity) -> bool:
+        return id(entity) in self._keys_by_object
+
+    @property
+    def entities(self) -> List[BaseEntity]:
+        """
+        Entity v indexu v pořadí, v jakém byly přidány.
+
+        Returns:
+            Seznam entit.
+        """
+        return [entity for entity, _, _ in self._entries.values()]
+
+    def add(self, entity: BaseEntity) -> None:
+        """
+        Přidá entitu do indexu. Pokud už v indexu je, aktualizuje její název.
+
+        Args:
+            entity: Entita.
+        """
+        if entity in self:
+            self.remove(entity)
+
+        key = self._next_key
+        self._next_key += 1
+
+        normalized = normalize_name(entity.name)
+        grams = name_trigrams(normalized)
+        self._entries[key] = (entity, normalized, grams)
+        self._keys_by_object[id(entity)] = key
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, entity: BaseEntity) -> bool:
+        """
+        Odebere entitu z indexu.
+
+        Args:
+            entity: Entita.
+
+        Returns:
+            True, pokud entita v indexu byla, jinak False.
+        """
+        key = self._keys_by_object.pop(id(entity), None)
+        if key is None:
+            return False
+
+        _, _, grams = self._entries.pop(key)
+        for gram in grams:
+            posting = self._postings[gram]
+            posting.discard(key)
+            if not posting:
+                del self._postings[gram]
+        return True
+
+    def search(self, name: str, threshold: float = 0.0, max_results: Optional[int] = None) -> List[Tuple[BaseEntity, float]]:
+        """
+        Najde entity s názvem podobným zadanému názvu.
+
+        Args:
+            name: Hledaný název.
+            threshold: Minimální podobnost (0.0 - 1.0).
+            max_results: Maximální počet výsledků. Pokud není zadán, vrátí všechny.
+
+        Returns:
+            Seznam dvojic (entita, podobnost) seřazený sestupně podle podobnosti;
+            entity se stejnou podobností jsou v pořadí, v jakém byly přidány.
+        """
+        normalized = normalize_name(name)
+        grams = name_trigrams(normalized)
+
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        # Předvýběr podle počtu společných trigramů, pak pořadí podle Diceova koeficientu
+        def dice(item: Tuple[int, int]) -> float:
+            key, count = item
+            return 2.0 * count / (len(grams) + len(self._entries[key][2]))
+
+        pool = shared.most_common(self.candidate_limit * 4)
+        pool.sort(key=lambda item: (-dice(item), item[0]))
+        candidates = [key for key, _ in pool[:self.candidate_limit]]
+
+        matcher = SequenceMatcher(None, normalized, "")
+        results = []
+        for key in candidates:
+            entity, candidate, _ = self._entries[key]
+            # Horní mez podobnosti daná délkami (odpovídá real_quick_ratio)
+            total_length = len(normalized) + len(candidate)
+            if total_length and 2.0 * min(len(normalized), len(candidate)) / total_length < threshold:
+                continue
+            matcher.set_seq2(candidate)
+            if matcher.quick_ratio() < threshold:
+                continue
+            similarity = matcher.ratio()
+            if similarity >= threshold:
+                results.append((key, entity, similarity))
+
+        results.sort(key=lambda result: (-result[2], result[0]))
+        if max_results is not None:
+            results = results[:max_results]
+        return [(entity, similarity) for _, entity, similarity in results]
+
+
 class EntityMatcher:
     """
     Třída pro fuzzy matching entit.
@@ -35,19 +175,7 @@ class EntityMatcher:
         Returns:
             Normalizovaný text.
         """
-        # Převod na malá písmena
-        text = text.lower()
-        
-        # Odstranění diakritiky
-        text = self._remove_diacritics(text)
-        
-        # Odstranění interpunkce
-        text = re.sub(r"[^\w\s]", "", text)
-        
-        # Odstranění nadbytečných mezer
-        text = re.sub(r"\s+", " ", text).strip()
-        
-        return text
+        return normalize_name(text)
 
     def _remove_diacritics(self, text: str) -> str:
         """
@@ -59,19 +187,7 @@ class EntityMatcher:
         Returns:
             Text bez diakritiky.
         """
-        # Mapování znaků s diakritikou na znaky bez diakritiky
-        diacritics_map = {
-            'á': 'a', 'č': 'c', 'ď': 'd', 'é': 'e', 'ě': 'e', 'í': 'i', 'ň': 'n',
-            'ó': 'o', 'ř': 'r', 'š': 's', 'ť': 't', 'ú': 'u', 'ů': 'u', 'ý': 'y', 'ž': 'z',
-            'Á': 'A', 'Č': 'C', 'Ď': 'D', 'É': 'E', 'Ě': 'E', 'Í': 'I', 'Ň': 'N',
-            'Ó': 'O', 'Ř': 'R', 'Š': 'S', 'Ť': 'T', 'Ú': 'U', 'Ů': 'U', 'Ý': 'Y', 'Ž': 'Z'
-        }
-        
-        # Nahrazení znaků s diakritikou
-        for char, replacement in diacritics_map.items():
-            text = text.replace(char, replacement)
-        
-        return text
+        return text.translate(DIACRITICS_TABLE)
 
     def _calculate_similarity(self, text1: str, text2: str) -> float:
         """
@@ -91,50 +207,63 @@ class EntityMatcher:
         # Výpočet podobnosti pomocí SequenceMatcher
         return SequenceMatcher(None, text1, text2).ratio()
 
-    def find_matching_entity(self, entity_name: str, entities: List[BaseEntity]) -> Optional[BaseEntity]:
+    def build_index(self, entities: Iterable[BaseEntity]) -> EntityNameIndex:
+        """
+        Vytvoří index názvů entit pro opakované vyhledávání.
+
+        Args:
+            entities: Entity, které se mají indexovat.
+
+        Returns:
+            Index názvů entit.
+        """
+        return EntityNameIndex(entities)
+
+    def find_matching_entity(self, entity_name: str, entities: Union[List[BaseEntity], EntityNameIndex]) -> Optional[BaseEntity]:
         """
         Najde entitu, která nejlépe odpovídá zadanému názvu.
 
         Args:
             entity_name: Název entity k vyhledání.
-            entities: Seznam entit, ve kterých se má hledat.
+            entities: Seznam entit nebo index názvů entit, ve kterých se má hledat.
 
         Returns:
             Nejlépe odpovídající entita nebo None, pokud žádná entita neodpovídá.
         """
-        best_match = None
-        best_similarity = 0.0
-        
-        for entity in entities:
-            similarity = self._calculate_similarity(entity_name, entity.name)
-            
-            if similarity > best_similarity and similarity >= self.threshold:
-                best_match = entity
-                best_similarity = similarity
-        
-        return best_match
+        matches = self.find_matching_entities(entity_name, entities, max_results=1)
+        return matches[0][0] if matches else None
 
-    def find_matching_entities(self, entity_name: str, entities: List[BaseEntity], max_results: int = 5) -> List[Tuple[BaseEntity, float]]:
+    def find_matching_entities(self, entity_name: str, entities: Union[List[BaseEntity], EntityNameIndex], max_results: int = 5) -> List[Tuple[BaseEntity, float]]:
         """
         Najde entity, které odpovídají zadanému názvu, seřazené podle podobnosti.
 
+        Pro opakované vyhledávání ve stejné množině entit je výhodnější předat
+        index (viz build_index), seznam entit se prochází celý.
+
         Args:
             entity_name: Název entity k vyhledání.
-            entities: Seznam entit, ve kterých se má hledat.
+            entities: Seznam entit nebo index názvů entit, ve kterých se má hledat.
             max_results: Maximální počet výsledků.
 
         Returns:
             Seznam dvojic (entita, podobnost) seřazený podle podobnosti.
         """
+        if isinstance(entities, EntityNameIndex):
+            return entities.search(entity_name, self.threshold, max_results)
+
+        matcher = SequenceMatcher(None, self._normalize_text(entity_name), "")
         matches = []
         
         for entity in entities:
-            similarity = self._calculate_similarity(entity_name, entity.name)
-            
+            matcher.set_seq2(self._normalize_text(entity.name))
+            if matcher.real_quick_ratio() < self.threshold or matcher.quick_ratio() < self.threshold:
+                continue
+
+            similarity = matcher.ratio()
             if similarity >= self.threshold:
                 matches.append((entity, similarity))
         
-        # Seřazení podle podobnosti (sestupně)
+        # Seřazení podle podobnosti (sestupně, stabilní vůči pořadí entit)
         matches.sort(key=lambda x: x[1], reverse=True)
         
         # Omezení počtu výsledků
@@ -144,38 +273,17 @@ class EntityMatcher:
         """
         Seskupí podobné entity.
 
+        Výpočet deleguje na EntityDeduplicator, který porovnává jen entity stejného
+        typu (u velkých množin jen ty, které sdílejí blok) a skupiny tvoří
+        tranzitivně, nezávisle na pořadí entit.
+
         Args:
             entities: Seznam entit k seskupení.
 
         Returns:
             Seznam skupin podobných entit.
         """
-        # Inicializace skupin
-        groups = []
-        
-        # Procházení entit
-        for entity in entities:
-            # Hledání skupiny pro entitu
-            found_group = False
-            
-            for group in groups:
-                # Kontrola, zda entita patří do skupiny
-                for group_entity in group:
-                    similarity = self._calculate_similarity(entity.name, group_entity.name)
-                    
-                    if similarity >= self.threshold:
-                        group.append(entity)
-                        found_group = True
-                        break
-                
-                if found_group:
-                    break
-            
-            # Pokud entita nepatří do žádné skupiny, vytvoříme novou
-            if not found_group:
-                groups.append([entity])
-        
-        return groups
+        return EntityDeduplicator(threshold=self.threshold).find_clusters(entities)
 
     def merge_entities(self, entities: List[BaseEntity]) -> BaseEntity:
         """
@@ -0,0 +1,163 @@
+"""
+Sdílený registr načtených modelů spaCy.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import spacy
+from spacy.language import Language
+
+from rpg_notion.config.settings import SPACY_MODEL
+
+logger = logging.getLogger(__name__)
+
+ModelKey = Tuple[str, Tuple[str, ...]]
+
+
+def _current_rss_bytes() -> Optional[int]:
+    """
+    Zjistí aktuální rezidentní paměť procesu.
+
+    Returns:
+        Velikost rezidentní paměti v bajtech nebo None, pokud ji nelze zjistit.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # ru_maxrss je maximum za dobu běhu procesu (na Linuxu v kB, na macOS v bajtech)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class SpacyModelRegistry:
+    """
+    Registr, který v rámci procesu drží jedinou instanci každého modelu spaCy.
+
+    Modely se načítají líně při prvním požadavku a jsou identifikovány názvem
+    modelu a seznamem vyloučených komponent. Jednotliví konzumenti mohou
+    nepotřebné komponenty vypnout až při volání (viz ``ensure_parsed``), takže
+    sdílejí jednu kopii modelu.
+    """
+
+    def __init__(self):
+        """
+        Inicializace registru.
+        """
+        self._models: Dict[ModelKey, Language] = {}
+        self._stats: Dict[ModelKey, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _make_key(model_name: str, exclude: Iterable[str]) -> ModelKey:
+        """
+        Vytvoří klíč modelu v registru.
+
+        Args:
+            model_name: Název modelu spaCy.
+            exclude: Komponenty, které se nemají vůbec načíst.
+
+        Returns:
+            Klíč modelu.
+        """
+        return model_name, tuple(sorted(set(exclude)))
+
+    def get(self, model_name: Optional[str] = None, exclude: Iterable[str] = ()) -> Language:
+        """
+        Vrátí sdílenou instanci modelu. Pokud ještě nebyl načten, načte ho.
+
+        Args:
+            model_name: Název modelu spaCy. Pokud není zadán, použije se model z konfigurace.
+            exclude: Komponenty, které se nemají vůbec načíst.
+
+        Returns:
+            Pipeline spaCy.
+        """
+        key = self._make_key(model_name or SPACY_MODEL, exclude)
+        nlp = self._models.get(key)
+        if nlp is not None:
+            return nlp
+
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = self._load(*key)
+            return self._models[key]
+
+    def _load(self, model_name: str, exclude: Tuple[str, ...]) -> Language:
+        """
+        Načte model spaCy a zaznamená dobu načtení a nárůst paměti.
+
+        Args:
+            model_name: Název modelu spaCy.
+            exclude: Komponenty, které se nemají vůbec načíst.
+
+        Returns:
+            Načtená pipeline spaCy.
+        """
+        rss_before = _current_rss_bytes()
+        start = time.perf_counter()
+        try:
+            nlp = spacy.load(model_name, exclude=list(exclude))
+        except OSError:
+            logger.warning(f"Model {model_name} není nainstalován. Stahuji...")
+            spacy.cli.download(model_name)
+            nlp = spacy.load(model_name, exclude=list(exclude))
+        load_seconds = time.perf_counter() - start
+        rss_after = _current_rss_bytes()
+
+        rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+        self._stats[(model_name, exclude)] = {
+            "model_name": model_name,
+            "exclude": list(exclude),
+            "pipe_names": list(nlp.pipe_names),
+            "load_seconds": load_seconds,
+            "rss_before_bytes": rss_before,
+            "rss_after_bytes": rss_after,
+            "rss_delta_bytes": rss_delta,
+        }
+
+        memory_info = f", paměť +{rss_delta / (1024 * 1024):.1f} MB" if rss_delta is not None else ""
+        logger.info(f"Načten model spaCy: {model_name} za {load_seconds:.2f} s{memory_info}")
+        return nlp
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Vrátí statistiky načtených modelů.
+
+        Returns:
+            Seznam slovníků s dobou načtení a paměťovou náročností jednotlivých modelů.
+        """
+        return [dict(stats) for stats in self._stats.values()]
+
+    def clear(self) -> None:
+        """
+        Uvolní všechny načtené modely z registru.
+        """
+        with self._lock:
+            self._models.clear()
+            self._stats.clear()
+
+
+_default_registry = SpacyModelRegistry()
+
+
+def get_model_registry() -> SpacyModelRegistry:
+    """
+    Vrátí výchozí registr modelů sdílený v rámci procesu.
+
+    Returns:
+        Registr modelů spaCy.
+    """
+    return _default_registry
@@ -0,0 +1,51 @@
+"""
+Normalizace názvů entit pro fuzzy porovnávání.
+"""
+import re
+from functools import lru_cache
+from typing import Set
+
+# Mapování znaků s diakritikou na znaky bez diakritiky
+DIACRITICS_TABLE = str.maketrans(
+    "áčďéěíňóřšťúůýžÁČĎÉĚÍŇÓŘŠŤÚŮÝŽ",
+    "acdeeinorstuuyzACDEEINORSTUUYZ",
+)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(text: str) -> str:
+    """
+    Normalizuje název pro porovnávání (malá písmena, bez diakritiky a interpunkce).
+
+    Výsledek se ukládá do cache, takže opakované porovnávání stejných názvů
+    normalizaci nepočítá znovu.
+
+    Args:
+        text: Text k normalizaci.
+
+    Returns:
+        Normalizovaný text.
+    """
+    text = text.lower().translate(DIACRITICS_TABLE)
+    text = _PUNCTUATION_RE.sub("", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def name_trigrams(normalized: str) -> Set[str]:
+    """
+    Vrátí množinu znakových trigramů normalizovaného názvu.
+
+    Název se obalí mezerami, takže i krátké názvy mají alespoň jeden trigram
+    a trigramy na začátku a konci slova mají větší váhu.
+
+    Args:
+        normalized: Normalizovaný název.
+
+    Returns:
+        Množina trigramů.
+    """
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
@@ -1,205 +1,335 @@
 """
 Modul pro rozpoznávání pojmenovaných entit (NER) v textu.
 """
+import json
 import logging
-from typing import Dict, List, Optional, Set, Tuple, Union
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-import spacy
 from spacy.language import Language
+from spacy.matcher import PhraseMatcher
 from spacy.tokens import Doc, Span
+from spacy.util import filter_spans
 
-from rpg_notion.config.settings import NLP_MODELS_DIR, SPACY_MODEL
+from rpg_notion.config.settings import NLP_GAZETTEER_PATH, SPACY_MODEL
 from rpg_notion.models.entities import EntityType
+from rpg_notion.nlp.model_registry import get_model_registry
+from rpg_notion.nlp.parsed_text import ParsedText, ensure_parsed
 
 logger = logging.getLogger(__name__)
 
+# Definice vzorů pro rozpoznávání fantasy entit
+FANTASY_LOCATION_PATTERNS = [
+    "hrad", "pevnost", "věž", "jeskyně", "dungeon", "les", "hora", "město", "vesnice",
+    "chrám", "svatyně", "ruiny", "zřícenina", "hostinec", "taverna", "krčma", "palác",
+    "tvrz", "ostrov", "údolí", "poušť", "bažina", "močál", "řeka", "jezero", "moře",
+    "oceán", "propast", "rokle", "průsmyk", "podzemí", "kobka", "žalář", "vězení"
+]
+
+FANTASY_NPC_PATTERNS = [
+    "král", "královna", "princ", "princezna", "rytíř", "čaroděj", "čarodějka", "kouzelník",
+    "kouzelnice", "mág", "čarodějnice", "alchymista", "obchodník", "hostinský", "kovář",
+    "zbrojíř", "lovec", "hraničář", "druid", "bard", "zloděj", "vrah", "vůdce", "náčelník",
+    "šaman", "kněz", "kněžka", "mnich", "válečník", "bojovník", "paladin", "šlechtic",
+    "šlechtična", "lord", "lady", "baron", "baronka", "hrabě", "hraběnka", "vévoda", "vévodkyně"
+]
+
+FANTASY_MONSTER_PATTERNS = [
+    "drak", "goblin", "skřet", "ork", "troll", "obr", "démon", "nemrtvý", "zombie", "kostlivec",
+    "upír", "vlkodlak", "medvěd", "vlk", "krysa", "netopýr", "pavouk", "had", "bazilišek",
+    "gryf", "hydra", "chiméra", "mantikora", "minotaur", "kyklop", "harpyje", "gorgona",
+    "golem", "elementál", "duch", "přízrak", "stín", "lich", "bludička", "sukuba", "inkubus"
+]
+
+FANTASY_ITEM_PATTERNS = [
+    "meč", "dýka", "sekera", "kladivo", "palice", "hůl", "luk", "kuše", "šíp", "kopí",
+    "štít", "brnění", "přilba", "rukavice", "boty", "plášť", "amulet", "prsten", "náhrdelník",
+    "náramek", "lektvar", "svitek", "kniha", "grimoár", "mapa", "klíč", "truhla", "poklad",
+    "zlato", "stříbro", "drahokam", "rubín", "safír", "diamant", "smaragd", "artefakt"
+]
+
+
+# Výchozí gazetteery podle typu entity. Pořadí určuje prioritu, pokud stejný
+# token odpovídá více typům.
+DEFAULT_FANTASY_GAZETTEERS: Dict[str, List[str]] = {
+    "LOCATION": FANTASY_LOCATION_PATTERNS,
+    "PERSON": FANTASY_NPC_PATTERNS,
+    "MONSTER": FANTASY_MONSTER_PATTERNS,
+    "ITEM": FANTASY_ITEM_PATTERNS,
+}
+
+# Slovní druhy, o které se rozšiřuje nalezený výraz vlevo a vpravo
+_EXPAND_LEFT_POS = {"ADJ", "PROPN"}
+_EXPAND_RIGHT_POS = {"NOUN", "ADJ", "PROPN"}
+
+
+class FantasyEntityRecognizer:
+    """
+    Komponenta pro rozpoznávání fantasy entit pomocí gazetteerů.
+
+    Výrazy z gazetteerů se vyhledávají zkompilovaným ``PhraseMatcher``em podle
+    tvaru (``LOWER``) a lemmatu (``LEMMA``), takže cena na token nezávisí na
+    počtu výrazů a gazetteery mohou obsahovat desítky tisíc kampaňových názvů.
+    Nalezené výrazy se rozšíří o okolní přídavná a podstatná jména (např.
+    "temný les") a do ``doc.ents`` se zapíší jediným přiřazením.
+    """
+
+    def __init__(
+        self,
+        nlp: Language,
+        name: str = "fantasy_ner",
+        gazetteers: Optional[Dict[str, List[str]]] = None,
+        gazetteer_path: Optional[str] = None,
+    ):
+        """
+        Inicializace komponenty.
+
+        Args:
+            nlp: Pipeline spaCy.
+            name: Název komponenty v pipeline.
+            gazetteers: Další výrazy podle typu entity (štítek -> seznam výrazů).
+            gazetteer_path: Cesta k souboru JSON s dalšími výrazy ve stejném formátu.
+        """
+        self.name = name
+        self.vocab = nlp.vocab
+        self.tokenizer = nlp.tokenizer
+        self.lower_matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+        self.lemma_matcher = PhraseMatcher(nlp.vocab, attr="LEMMA")
+        self.label_priority: Dict[str, int] = {}
+
+        for label, terms in DEFAULT_FANTASY_GAZETTEERS.items():
+            self.add_terms(label, terms)
+        for label, terms in (gazetteers or {}).items():
+            self.add_terms(label, terms)
+        if gazetteer_path:
+            self.load_gazetteer(gazetteer_path)
+
+    def add_terms(self, label: str, terms: Iterable[str]) -> None:
+        """
+        Přidá výrazy do gazetteeru daného typu entity.
+
+        Args:
+            label: Štítek entity (např. "PERSON", "LOCATION").
+            terms: Výrazy k přidání.
+        """
+        terms = [term.strip() for term in terms if term and term.strip()]
+        if not terms:
+            return
+
+        self.label_priority.setdefault(label, len(self.label_priority))
+        lower_patterns = list(self.tokenizer.pipe(terms))
+        # Výrazy v gazetteerech jsou základní tvary, proto slouží zároveň jako lemmata
+        lemma_patterns = [
+            Doc(self.vocab, words=[token.text for token in doc], lemmas=[token.lower_ for token in doc])
+            for doc in lower_patterns
+        ]
+        self.lower_matcher.add(label, lower_patterns)
+        self.lemma_matcher.add(label, lemma_patterns)
+
+    def load_gazetteer(self, path: Union[str, Path]) -> None:
+        """
+        Načte výrazy ze souboru JSON ve formátu {štítek: [výrazy]}.
+
+        Args:
+            path: Cesta k souboru.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            gazetteers = json.load(f)
+        for label, terms in gazetteers.items():
+            self.add_terms(label, terms)
+        logger.info(f"Načten gazetteer {path} ({sum(len(terms) for terms in gazetteers.values())} výrazů)")
+
+    @staticmethod
+    def _expand(doc: Doc, start: int, end: int) -> Tuple[int, int]:
+        """
+        Rozšíří nalezený výraz o přídavná jména a vlastní jména před ním
+        a o podstatná jména, přídavná jména a vlastní jména za ním.
+
+        Args:
+            doc: Dokument spaCy.
+            start: Index prvního tokenu výrazu.
+            end: Index za posledním tokenem výrazu.
+
+        Returns:
+            Rozšířené hranice výrazu.
+        """
+        while start > 0 and doc[start - 1].pos_ in _EXPAND_LEFT_POS:
+            start -= 1
+        while end < len(doc) and doc[end].pos_ in _EXPAND_RIGHT_POS:
+            end += 1
+        return start, end
+
+    def __call__(self, doc: Doc) -> Doc:
+        """
+        Rozpozná fantasy entity v dokumentu.
+
+        Args:
+            doc: Dokument spaCy.
+
+        Returns:
+            Dokument s rozpoznanými entitami.
+        """
+        matches = self.lower_matcher(doc)
+        if doc.has_annotation("LEMMA"):
+            matches += self.lemma_matcher(doc)
+        if not matches:
+            return doc
+
+        # Stejně jako dřív se text prochází zleva doprava: na každé pozici vyhrává
+        # typ s nejvyšší prioritou a další výraz začíná až za koncem předchozího.
+        strings = self.vocab.strings
+        candidates = sorted(
+            (start, self.label_priority.get(strings[match_id], len(self.label_priority)), -end, strings[match_id])
+            for match_id, start, end in matches
+        )
+        spans = []
+        next_free = 0
+        for start, _, negative_end, label in candidates:
+            if start < next_free:
+                continue
+            span_start, span_end = self._expand(doc, start, -negative_end)
+            spans.append(Span(doc, span_start, span_end, label=label))
+            next_free = span_end
+
+        # Entity rozpoznané statistickým modelem mají přednost
+        taken = [False] * len(doc)
+        for ent in doc.ents:
+            for i in range(ent.start, ent.end):
+                taken[i] = True
+        new_ents = [span for span in filter_spans(spans) if not any(taken[span.start:span.end])]
+
+        if new_ents:
+            doc.ents = list(doc.ents) + new_ents
+        return doc
+
+
+@Language.factory(
+    "fantasy_ner",
+    default_config={"gazetteers": {}, "gazetteer_path": None},
+)
+def create_fantasy_ner(
+    nlp: Language, name: str, gazetteers: Dict[str, List[str]], gazetteer_path: Optional[str]
+) -> FantasyEntityRecognizer:
+    """
+    Továrna komponenty fantasy_ner.
+
+    Komponenta je registrována v továrně spaCy na úrovni modulu, takže ji
+    lze použít i v pracovních procesech ``nlp.pipe(..., n_process=N)``.
+
+    Args:
+        nlp: Pipeline spaCy.
+        name: Název komponenty v pipeline.
+        gazetteers: Další výrazy podle typu entity.
+        gazetteer_path: Cesta k souboru JSON s dalšími výrazy.
+
+    Returns:
+        Komponenta pro rozpoznávání fantasy entit.
+    """
+    return FantasyEntityRecognizer(nlp, name, gazetteers=gazetteers, gazetteer_path=gazetteer_path)
+
 
 class EntityExtractor:
     """
     Třída pro extrakci entit z textu pomocí NER.
     """
 
-    def __init__(self, model_name: Optional[str] = None):
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        exclude: Optional[List[str]] = None,
+        gazetteers: Optional[Dict[str, List[str]]] = None,
+    ):
         """
         Inicializace extraktoru entit.
 
+        Extraktor používá stejnou sdílenou pipeline z registru modelů jako
+        ostatní konzumenti a nijak ji nemění. Rozpoznávání fantasy entit
+        (FantasyEntityRecognizer) patří jen tomuto extraktoru a spouští se
+        jako samostatný krok nad rozparsovaným dokumentem.
+
         Args:
             model_name: Název modelu spaCy. Pokud není zadán, použije se model z konfigurace.
+            exclude: Komponenty modelu, které se nemají vůbec načíst.
+            gazetteers: Kampaňové výrazy podle štítku entity pro rozpoznávání fantasy entit.
         """
         self.model_name = model_name or SPACY_MODEL
-        try:
-            self.nlp = spacy.load(self.model_name)
-            logger.info(f"Načten model spaCy: {self.model_name}")
-        except OSError:
-            logger.warning(f"Model {self.model_name} není nainstalován. Stahuji...")
-            spacy.cli.download(self.model_name)
-            self.nlp = spacy.load(self.model_name)
-            logger.info(f"Model {self.model_name} byl úspěšně stažen a načten.")
-        
-        # Přidání vlastních komponent do pipeline
-        self._add_custom_components()
+        self.nlp = get_model_registry().get(self.model_name, exclude=exclude or ())
+        self.fantasy_ner = FantasyEntityRecognizer(
+            self.nlp,
+            gazetteers=gazetteers,
+            gazetteer_path=str(NLP_GAZETTEER_PATH) if NLP_GAZETTEER_PATH else None,
+        )
 
-    def _add_custom_components(self) -> None:
+    def add_gazetteer_terms(self, label: str, terms: Iterable[str]) -> None:
         """
-        Přidá vlastní komponenty do pipeline spaCy.
+        Přidá kampaňové výrazy (jména postav, lokací apod.) do rozpoznávání fantasy entit.
+
+        Výrazy se přidají jen do tohoto extraktoru, sdílená pipeline se nemění.
+
+        Args:
+            label: Štítek entity (např. "PERSON", "LOCATION", "MONSTER", "ITEM").
+            terms: Výrazy k přidání.
         """
-        # Přidání vlastního rozpoznávání entit pro fantasy RPG doménu
-        if "fantasy_ner" not in self.nlp.pipe_names:
-            fantasy_ner = self._create_fantasy_ner()
-            self.nlp.add_pipe("fantasy_ner", after="ner")
-            logger.info("Přidána vlastní komponenta pro rozpoznávání fantasy entit.")
+        self.fantasy_ner.add_terms(label, terms)
 
-    def _create_fantasy_ner(self) -> Language.component:
+    def _recognize(self, parsed: ParsedText) -> ParsedText:
         """
-        Vytvoří vlastní komponentu pro rozpoznávání fantasy entit.
+        Doplní do dokumentu fantasy entity, pokud ještě nebyly doplněny.
+
+        Args:
+            parsed: Rozparsovaný text.
 
         Returns:
-            Komponenta pro pipeline spaCy.
+            Stejný rozparsovaný text.
         """
-        # Definice vzorů pro rozpoznávání fantasy entit
-        location_patterns = [
-            "hrad", "pevnost", "věž", "jeskyně", "dungeon", "les", "hora", "město", "vesnice",
-            "chrám", "svatyně", "ruiny", "zřícenina", "hostinec", "taverna", "krčma", "palác",
-            "tvrz", "ostrov", "údolí", "poušť", "bažina", "močál", "řeka", "jezero", "moře",
-            "oceán", "propast", "rokle", "průsmyk", "podzemí", "kobka", "žalář", "vězení"
-        ]
-        
-        npc_patterns = [
-            "král", "královna", "princ", "princezna", "rytíř", "čaroděj", "čarodějka", "kouzelník",
-            "kouzelnice", "mág", "čarodějnice", "alchymista", "obchodník", "hostinský", "kovář",
-            "zbrojíř", "lovec", "hraničář", "druid", "bard", "zloděj", "vrah", "vůdce", "náčelník",
-            "šaman", "kněz", "kněžka", "mnich", "válečník", "bojovník", "paladin", "šlechtic",
-            "šlechtična", "lord", "lady", "baron", "baronka", "hrabě", "hraběnka", "vévoda", "vévodkyně"
-        ]
-        
-        monster_patterns = [
-            "drak", "goblin", "skřet", "ork", "troll", "obr", "démon", "nemrtvý", "zombie", "kostlivec",
-            "upír", "vlkodlak", "medvěd", "vlk", "krysa", "netopýr", "pavouk", "had", "bazilišek",
-            "gryf", "hydra", "chiméra", "mantikora", "minotaur", "kyklop", "harpyje", "gorgona",
-            "golem", "elementál", "duch", "přízrak", "stín", "lich", "bludička", "sukuba", "inkubus"
-        ]
-        
-        item_patterns = [
-            "meč", "dýka", "sekera", "kladivo", "palice", "hůl", "luk", "kuše", "šíp", "kopí",
-            "štít", "brnění", "přilba", "rukavice", "boty", "plášť", "amulet", "prsten", "náhrdelník",
-            "náramek", "lektvar", "svitek", "kniha", "grimoár", "mapa", "klíč", "truhla", "poklad",
-            "zlato", "stříbro", "drahokam", "rubín", "safír", "diamant", "smaragd", "artefakt"
-        ]
-        
-        # Vytvoření komponenty
-        def fantasy_ner(doc: Doc) -> Doc:
-            """
-            Vlastní komponenta pro rozpoznávání fantasy entit.
-
-            Args:
-                doc: Dokument spaCy.
-
-            Returns:
-                Dokument s rozpoznanými entitami.
-            """
-            # Pomocná funkce pro kontrolu, zda token odpovídá vzoru
-            def token_matches_pattern(token, patterns: List[str]) -> bool:
-                """
-                Kontroluje, zda token odpovídá některému ze vzorů.
-
-                Args:
-                    token: Token spaCy.
-                    patterns: Seznam vzorů.
-
-                Returns:
-                    True, pokud token odpovídá některému ze vzorů, jinak False.
-                """
-                return token.text.lower() in patterns or token.lemma_.lower() in patterns
-            
-            # Procházení tokenů a hledání vzorů
-            entities = []
-            i = 0
-            while i < len(doc):
-                # Kontrola, zda token odpovídá některému ze vzorů
-                if token_matches_pattern(doc[i], location_patterns):
-                    # Hledání celé fráze (např. "temný les", "opuštěná věž")
-                    start = i
-                    end = i + 1
-                    # Hledání přídavných jmen před tokenem
-                    j = i - 1
-                    while j >= 0 and (doc[j].pos_ == "ADJ" or doc[j].pos_ == "PROPN"):
-                        start = j
-                        j -= 1
-                    # Hledání podstatných jmen a přídavných jmen za tokenem
-                    j = i + 1
-                    while j < len(doc) and (doc[j].pos_ == "NOUN" or doc[j].pos_ == "ADJ" or doc[j].pos_ == "PROPN"):
-                        end = j + 1
-                        j += 1
-                    # Vytvoření entity
-                    entities.append((start, end, "LOCATION"))
-                    i = end
-                elif token_matches_pattern(doc[i], npc_patterns):
-                    # Podobný postup pro NPC
-                    start = i
-                    end = i + 1
-                    j = i - 1
-                    while j >= 0 and (doc[j].pos_ == "ADJ" or doc[j].pos_ == "PROPN"):
-                        start = j
-                        j -= 1
-                    j = i + 1
-                    while j < len(doc) and (doc[j].pos_ == "NOUN" or doc[j].pos_ == "ADJ" or doc[j].pos_ == "PROPN"):
-                        end = j + 1
-                        j += 1
-                    entities.append((start, end, "PERSON"))
-                    i = end
-                elif token_matches_pattern(doc[i], monster_patterns):
-                    # Podobný postup pro příšery
-                    start = i
-                    end = i + 1
-                    j = i - 1
-                    while j >= 0 and (doc[j].pos_ == "ADJ" or doc[j].pos_ == "PROPN"):
-                        start = j
-                        j -= 1
-                    j = i + 1
-                    while j < len(doc) and (doc[j].pos_ == "NOUN" or doc[j].pos_ == "ADJ" or doc[j].pos_ == "PROPN"):
-                        end = j + 1
-                        j += 1
-                    entities.append((start, end, "MONSTER"))
-                    i = end
-                elif token_matches_pattern(doc[i], item_patterns):
-                    # Podobný postup pro předměty
-                    start = i
-                    end = i + 1
-                    j = i - 1
-                    while j >= 0 and (doc[j].pos_ == "ADJ" or doc[j].pos_ == "PROPN"):
-                        start = j
-                        j -= 1
-                    j = i + 1
-                    while j < len(doc) and (doc[j].pos_ == "NOUN" or doc[j].pos_ == "ADJ" or doc[j].pos_ == "PROPN"):
-                        end = j + 1
-                        j += 1
-                    entities.append((start, end, "ITEM"))
-                    i = end
-                else:
-                    i += 1
-            
-            # Přidání entit do dokumentu
-            for start, end, label in entities:
-                # Kontrola, zda se entity nepřekrývají
-                if not any(start < e.end and end > e.start for e in doc.ents):
-                    span = Span(doc, start, end, label=label)
-                    doc.ents = list(doc.ents) + [span]
-            
-            return doc
-        
-        return fantasy_ner
+        parsed.cached("fantasy_ner", lambda: self.fantasy_ner(parsed.doc))
+        return parsed
+
+    def parse(self, text: Union[str, Doc, ParsedText]) -> ParsedText:
+        """
+        Rozparsuje text sdílenou pipeline a doplní fantasy entity.
+
+        Výsledek lze předat všem metodám extraktorů a kategorizátoru,
+        takže se text během jednoho tahu parsuje pouze jednou.
+
+        Args:
+            text: Text k rozparsování. Již rozparsovaný text se znovu neparsuje.
+
+        Returns:
+            Kontext rozparsovaného textu.
+        """
+        return self._recognize(ensure_parsed(self.nlp, text))
+
+    def parse_many(self, texts: Iterable[str], batch_size: int = 32, n_process: int = 1) -> Iterator[ParsedText]:
+        """
+        Rozparsuje proud textů dávkově pomocí ``nlp.pipe``.
+
+        Texty se zpracovávají líně, takže paměťová náročnost nezávisí na
+        celkovém počtu textů. Při ``n_process > 1`` se dávky parsují
+        v samostatných procesech a fantasy entity se doplní v hlavním procesu.
+
+        Args:
+            texts: Iterovatelný proud textů.
+            batch_size: Počet textů v jedné dávce.
+            n_process: Počet procesů pro paralelní zpracování (-1 = všechna jádra).
+
+        Yields:
+            Kontext rozparsovaného textu pro každý vstupní text ve stejném pořadí.
+        """
+        for doc in self.nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+            yield self._recognize(ParsedText(doc))
 
-    def extract_entities(self, text: str) -> Dict[str, List[Dict[str, str]]]:
+    def extract_entities(self, text: Union[str, ParsedText]) -> Dict[str, List[Dict[str, str]]]:
         """
         Extrahuje entity z textu.
 
         Args:
-            text: Text, ze kterého se mají extrahovat entity.
+            text: Text nebo rozparsovaný text, ze kterého se mají extrahovat entity.
 
         Returns:
             Slovník s extrahovanými entitami podle typu.
         """
-        doc = self.nlp(text)
+        doc = self.parse(text).doc
         
         # Inicializace slovníku pro entity
         entities = {
@@ -237,18 +367,18 @@ class EntityExtractor:
         
         return entities
 
-    def extract_entity_attributes(self, text: str, entity_text: str) -> Dict[str, str]:
+    def extract_entity_attributes(self, text: Union[str, ParsedText], entity_text: str) -> Dict[str, str]:
         """
         Extrahuje atributy entity z textu.
 
         Args:
-            text: Text, ze kterého se mají extrahovat atributy.
+            text: Text nebo rozparsovaný text, ze kterého se mají extrahovat atributy.
             entity_text: Text entity, pro kterou se mají extrahovat atributy.
 
         Returns:
             Slovník s extrahovanými atributy.
         """
-        doc = self.nlp(text)
+        parsed = self.parse(text)
         
         # Inicializace slovníku pro atributy
         attributes = {
@@ -259,10 +389,7 @@ class EntityExtractor:
         }
         
         # Hledání zmínek o entitě v textu
-        entity_mentions = []
-        for sent in doc.sents:
-            if entity_text.lower() in sent.text.lower():
-                entity_mentions.append(sent)
+        entity_mentions = parsed.sentences_mentioning(entity_text)
         
         # Extrakce atributů z vět, které zmiňují entitu
         for sent in entity_mentions:
@@ -305,23 +432,23 @@ class EntityExtractor:
         
         return attributes
 
-    def extract_relationships(self, text: str) -> List[Dict[str, str]]:
+    def extract_relationships(self, text: Union[str, ParsedText]) -> List[Dict[str, str]]:
         """
         Extrahuje vztahy mezi entitami z textu.
 
         Args:
-            text: Text, ze kterého se mají extrahovat vztahy.
+            text: Text nebo rozparsovaný text, ze kterého se mají extrahovat vztahy.
 
         Returns:
             Seznam slovníků s extrahovanými vztahy.
         """
-        doc = self.nlp(text)
+        parsed = self.parse(text)
         
         # Inicializace seznamu pro vztahy
         relationships = []
         
         # Extrakce vztahů z vět
-        for sent in doc.sents:
+        for sent in parsed.sentences:
             # Hledání entit ve větě
             entities = list(sent.ents)
             if len(entities) >= 2:
@@ -364,18 +491,18 @@ class EntityExtractor:
         
         return relationships
 
-    def extract_state_changes(self, text: str, entity_text: str) -> List[Dict[str, str]]:
+    def extract_state_changes(self, text: Union[str, ParsedText], entity_text: str) -> List[Dict[str, str]]:
         """
         Extrahuje změny stavu entity z textu.
 
         Args:
-            text: Text, ze kterého se mají extrahovat změny stavu.
+            text: Text nebo rozparsovaný text, ze kterého se mají extrahovat změny stavu.
             entity_text: Text entity, pro kterou se mají extrahovat změny stavu.
 
         Returns:
             Seznam slovníků s extrahovanými změnami stavu.
         """
-        doc = self.nlp(text)
+        parsed = self.parse(text)
         
         # Inicializace seznamu pro změny stavu
         state_changes = []
@@ -402,30 +529,29 @@ class EntityExtractor:
         }
         
         # Extrakce změn stavu z vět
-        for sent in doc.sents:
-            if entity_text.lower() in sent.text.lower():
-                # Hledání sloves, která mohou indikovat změnu stavu
-                for token in sent:
-                    if token.pos_ == "VERB" and token.lemma_ in state_change_verbs:
-                        # Kontrola, zda se sloveso vztahuje k entitě
-                        for child in token.children:
-                            if child.dep_ == "nsubj" and entity_text.lower() in child.text.lower():
-                                state_change = {
-                                    "entity": entity_text,
-                                    "verb": token.lemma_,
-                                    "new_state": state_change_verbs[token.lemma_],
-                                    "sentence": sent.text,
-                                }
-                                state_changes.append(state_change)
-                                break
-                            elif child.dep_ == "dobj" and entity_text.lower() in child.text.lower():
-                                state_change = {
-                                    "entity": entity_text,
-                                    "verb": token.lemma_,
-                                    "new_state": state_change_verbs[token.lemma_],
-                                    "sentence": sent.text,
-                                }
-                                state_changes.append(state_change)
-                                break
+        for sent in parsed.sentences_mentioning(entity_text):
+            # Hledání sloves, která mohou indikovat změnu stavu
+            for token in sent:
+                if token.pos_ == "VERB" and token.lemma_ in state_change_verbs:
+                    # Kontrola, zda se sloveso vztahuje k entitě
+                    for child in token.children:
+                        if child.dep_ == "nsubj" and entity_text.lower() in child.text.lower():
+                            state_change = {
+                                "entity": entity_text,
+                                "verb": token.lemma_,
+                                "new_state": state_change_verbs[token.lemma_],
+                                "sentence": sent.text,
+                            }
+                            state_changes.append(state_change)
+                            break
+                        elif child.dep_ == "dobj" and entity_text.lower() in child.text.lower():
+                            state_change = {
+                                "entity": entity_text,
+                                "verb": token.lemma_,
+                                "new_state": state_change_verbs[token.lemma_],
+                                "sentence": sent.text,
+                            }
+                            state_changes.append(state_change)
+                            break
         
         return state_changes
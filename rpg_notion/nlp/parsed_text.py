@@ -0,0 +1,99 @@
+"""
+Modul se sdíleným kontextem rozparsovaného textu.
+"""
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+
+logger = logging.getLogger(__name__)
+
+
+class ParsedText:
+    """
+    Kontext jednoho rozparsovaného textu (jeden dokument spaCy na jeden tah).
+
+    Instance se předává extraktorům a kategorizátoru místo surového textu,
+    takže se celý text parsuje pouze jednou a výsledky odvozené z dokumentu
+    (věty, zmínky entit) se sdílejí mezi všemi komponentami.
+    """
+
+    def __init__(self, doc: Doc):
+        """
+        Inicializace kontextu.
+
+        Args:
+            doc: Rozparsovaný dokument spaCy.
+        """
+        self.doc = doc
+        self.text = doc.text
+        self._sentences: Optional[List[Span]] = None
+        self._lowered_sentences: Optional[List[str]] = None
+        self._mentions: Dict[str, List[Span]] = {}
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def sentences(self) -> List[Span]:
+        """
+        Věty dokumentu.
+
+        Returns:
+            Seznam vět dokumentu.
+        """
+        if self._sentences is None:
+            self._sentences = list(self.doc.sents)
+        return self._sentences
+
+    def sentences_mentioning(self, name: str) -> List[Span]:
+        """
+        Vrátí věty, které zmiňují zadaný název (bez ohledu na velikost písmen).
+
+        Args:
+            name: Název entity.
+
+        Returns:
+            Seznam vět, které název obsahují.
+        """
+        key = name.lower()
+        if key not in self._mentions:
+            if self._lowered_sentences is None:
+                self._lowered_sentences = [sent.text.lower() for sent in self.sentences]
+            self._mentions[key] = [
+                sent for sent, lowered in zip(self.sentences, self._lowered_sentences) if key in lowered
+            ]
+        return self._mentions[key]
+
+    def cached(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Vrátí hodnotu odvozenou z dokumentu, kterou spočítá nejvýše jednou.
+
+        Args:
+            key: Klíč hodnoty.
+            factory: Funkce, která hodnotu spočítá.
+
+        Returns:
+            Uložená nebo nově spočítaná hodnota.
+        """
+        if key not in self._cache:
+            self._cache[key] = factory()
+        return self._cache[key]
+
+
+def ensure_parsed(nlp: Language, text: Union[str, Doc, ParsedText], disable: Iterable[str] = ()) -> ParsedText:
+    """
+    Zajistí, že text je rozparsovaný. Již rozparsovaný text se vrací beze změny.
+
+    Args:
+        nlp: Pipeline spaCy, která se použije pro surový text.
+        text: Surový text, dokument spaCy nebo kontext rozparsovaného textu.
+        disable: Komponenty pipeline, které se při parsování surového textu přeskočí.
+
+    Returns:
+        Kontext rozparsovaného textu.
+    """
+    if isinstance(text, ParsedText):
+        return text
+    if isinstance(text, Doc):
+        return ParsedText(text)
+    return ParsedText(nlp(text, disable=list(disable)))
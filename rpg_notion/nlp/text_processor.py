@@ -2,16 +2,19 @@
 Hlavní modul pro zpracování textu.
 """
 import logging
-from typing import Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from rpg_notion.models.entities import (
-    AdventureJournalEntry, BaseEntity, EntityType, Event, Faction, Item, Location, Monster, NPC, Quest
+    AdventureJournalEntry, BaseEntity, EntityType, Event, Faction, Item, Location, LocationStatus, Monster,
+    MonsterStatus, NPC, NPCStatus, Quest
 )
+from rpg_notion.models.relation_writer import RelationWriter
 from rpg_notion.models.repository import EntityRepository
 from rpg_notion.nlp.attribute_extractor import AttributeExtractor
 from rpg_notion.nlp.categorizer import EntityCategorizer
 from rpg_notion.nlp.entity_matcher import EntityMatcher
 from rpg_notion.nlp.ner import EntityExtractor
+from rpg_notion.nlp.parsed_text import ParsedText
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,15 @@ class TextProcessor:
     Hlavní třída pro zpracování textu.
     """
 
+    # Relační pole subjektu podle typů subjektu a objektu vztahu
+    RELATIONSHIP_FIELDS = {
+        (EntityType.NPC, EntityType.NPC): "related_npc_ids",
+        (EntityType.NPC, EntityType.LOCATION): "location_id",
+        (EntityType.NPC, EntityType.ITEM): "item_ids",
+        (EntityType.LOCATION, EntityType.NPC): "npc_ids",
+        (EntityType.LOCATION, EntityType.ITEM): "item_ids",
+    }
+
     def __init__(
         self,
         entity_repository: Optional[EntityRepository] = None,
@@ -28,6 +40,7 @@ class TextProcessor:
         attribute_extractor: Optional[AttributeExtractor] = None,
         entity_categorizer: Optional[EntityCategorizer] = None,
         entity_matcher: Optional[EntityMatcher] = None,
+        relation_writer: Optional[RelationWriter] = None,
     ):
         """
         Inicializace procesoru textu.
@@ -38,25 +51,32 @@ class TextProcessor:
             attribute_extractor: Extraktor atributů.
             entity_categorizer: Kategorizátor entit.
             entity_matcher: Matcher entit.
+            relation_writer: Zapisovač relací.
         """
         self.entity_repository = entity_repository or EntityRepository()
         self.entity_extractor = entity_extractor or EntityExtractor()
         self.attribute_extractor = attribute_extractor or AttributeExtractor()
         self.entity_categorizer = entity_categorizer or EntityCategorizer()
         self.entity_matcher = entity_matcher or EntityMatcher()
+        self.relation_writer = relation_writer or RelationWriter(self.entity_repository)
 
-    def process_text(self, text: str) -> Dict[str, List[BaseEntity]]:
+    def process_text(self, text: Union[str, ParsedText]) -> Dict[str, List[BaseEntity]]:
         """
         Zpracuje text a extrahuje z něj entity.
 
+        Text se rozparsuje pouze jednou a stejný dokument se předává všem
+        extraktorům a kategorizátoru.
+
         Args:
-            text: Text k zpracování.
+            text: Text nebo rozparsovaný text k zpracování.
 
         Returns:
             Slovník s extrahovanými entitami podle typu.
         """
+        parsed = self.entity_extractor.parse(text)
+        
         # Extrakce entit z textu
-        extracted_entities = self.entity_extractor.extract_entities(text)
+        extracted_entities = self.entity_extractor.extract_entities(parsed)
         
         # Inicializace slovníku pro výsledné entity
         result_entities = {
@@ -69,126 +89,226 @@ class TextProcessor:
             EntityType.EVENT.value: [],
         }
         
+        # Hromadné vyhledání existujících entit všech typů (dotazy na databáze běží souběžně)
+        existing = self._find_existing(extracted_entities)
+
         # Zpracování NPC
+        existing_npcs = existing[EntityType.NPC]
         for entity_data in extracted_entities[EntityType.NPC.value]:
             entity_name = entity_data["text"]
             
-            # Hledání existující entity v repozitáři
-            existing_entity = self.entity_repository.find_by_name(EntityType.NPC, entity_name)
+            # Hledání existující entity mezi hromadně nalezenými
+            existing_entity = existing_npcs.get(entity_name)
             
             if existing_entity:
                 # Aktualizace existující entity
-                self._update_npc(existing_entity, text, entity_name)
+                self._update_npc(existing_entity, parsed, entity_name)
                 result_entities[EntityType.NPC.value].append(existing_entity)
             else:
                 # Vytvoření nové entity
-                new_entity = self._create_npc(text, entity_name)
+                new_entity = self._create_npc(parsed, entity_name)
+                existing_npcs[entity_name] = new_entity
                 result_entities[EntityType.NPC.value].append(new_entity)
         
         # Zpracování lokací
+        existing_locations = existing[EntityType.LOCATION]
         for entity_data in extracted_entities[EntityType.LOCATION.value]:
             entity_name = entity_data["text"]
             
-            # Hledání existující entity v repozitáři
-            existing_entity = self.entity_repository.find_by_name(EntityType.LOCATION, entity_name)
+            # Hledání existující entity mezi hromadně nalezenými
+            existing_entity = existing_locations.get(entity_name)
             
             if existing_entity:
                 # Aktualizace existující entity
-                self._update_location(existing_entity, text, entity_name)
+                self._update_location(existing_entity, parsed, entity_name)
                 result_entities[EntityType.LOCATION.value].append(existing_entity)
             else:
                 # Vytvoření nové entity
-                new_entity = self._create_location(text, entity_name)
+                new_entity = self._create_location(parsed, entity_name)
+                existing_locations[entity_name] = new_entity
                 result_entities[EntityType.LOCATION.value].append(new_entity)
         
         # Zpracování příšer
+        existing_monsters = existing[EntityType.MONSTER]
         for entity_data in extracted_entities[EntityType.MONSTER.value]:
             entity_name = entity_data["text"]
             
-            # Hledání existující entity v repozitáři
-            existing_entity = self.entity_repository.find_by_name(EntityType.MONSTER, entity_name)
+            # Hledání existující entity mezi hromadně nalezenými
+            existing_entity = existing_monsters.get(entity_name)
             
             if existing_entity:
                 # Aktualizace existující entity
-                self._update_monster(existing_entity, text, entity_name)
+                self._update_monster(existing_entity, parsed, entity_name)
                 result_entities[EntityType.MONSTER.value].append(existing_entity)
             else:
                 # Vytvoření nové entity
-                new_entity = self._create_monster(text, entity_name)
+                new_entity = self._create_monster(parsed, entity_name)
+                existing_monsters[entity_name] = new_entity
                 result_entities[EntityType.MONSTER.value].append(new_entity)
         
         # Zpracování předmětů
+        existing_items = existing[EntityType.ITEM]
         for entity_data in extracted_entities[EntityType.ITEM.value]:
             entity_name = entity_data["text"]
             
-            # Hledání existující entity v repozitáři
-            existing_entity = self.entity_repository.find_by_name(EntityType.ITEM, entity_name)
+            # Hledání existující entity mezi hromadně nalezenými
+            existing_entity = existing_items.get(entity_name)
             
             if existing_entity:
                 # Aktualizace existující entity
-                self._update_item(existing_entity, text, entity_name)
+                self._update_item(existing_entity, parsed, entity_name)
                 result_entities[EntityType.ITEM.value].append(existing_entity)
             else:
                 # Vytvoření nové entity
-                new_entity = self._create_item(text, entity_name)
+                new_entity = self._create_item(parsed, entity_name)
+                existing_items[entity_name] = new_entity
                 result_entities[EntityType.ITEM.value].append(new_entity)
         
         # Extrakce vztahů mezi entitami
-        relationships = self.entity_extractor.extract_relationships(text)
+        relationships = self.entity_extractor.extract_relationships(parsed)
+        
+        # Mapování typů entit ze spaCy na naše typy
+        entity_type_mapping = {
+            "PERSON": EntityType.NPC,
+            "LOCATION": EntityType.LOCATION,
+            "GPE": EntityType.LOCATION,
+            "FAC": EntityType.LOCATION,
+            "MONSTER": EntityType.MONSTER,
+            "ITEM": EntityType.ITEM,
+            "ORG": EntityType.FACTION,
+            "EVENT": EntityType.EVENT,
+        }
+        
+        # Hromadné vyhledání všech entit zmíněných ve vztazích (jeden dotaz na typ entity)
+        relationship_names: Dict[EntityType, List[str]] = {}
+        for relationship in relationships:
+            for role in ("subject", "object"):
+                entity_type = entity_type_mapping.get(relationship[f"{role}_type"])
+                if entity_type:
+                    relationship_names.setdefault(entity_type, []).append(relationship[role])
+        resolved_entities = self.entity_repository.find_many_by_types(relationship_names)
         
         # Zpracování vztahů
         for relationship in relationships:
-            subject_type = relationship["subject_type"]
-            object_type = relationship["object_type"]
-            
-            # Mapování typů entit ze spaCy na naše typy
-            entity_type_mapping = {
-                "PERSON": EntityType.NPC,
-                "LOCATION": EntityType.LOCATION,
-                "GPE": EntityType.LOCATION,
-                "FAC": EntityType.LOCATION,
-                "MONSTER": EntityType.MONSTER,
-                "ITEM": EntityType.ITEM,
-                "ORG": EntityType.FACTION,
-                "EVENT": EntityType.EVENT,
-            }
-            
-            subject_entity_type = entity_type_mapping.get(subject_type)
-            object_entity_type = entity_type_mapping.get(object_type)
+            subject_entity_type = entity_type_mapping.get(relationship["subject_type"])
+            object_entity_type = entity_type_mapping.get(relationship["object_type"])
             
             if subject_entity_type and object_entity_type:
-                # Hledání entit v repozitáři
-                subject_entity = self.entity_repository.find_by_name(subject_entity_type, relationship["subject"])
-                object_entity = self.entity_repository.find_by_name(object_entity_type, relationship["object"])
+                # Hledání entit mezi hromadně nalezenými
+                subject_entity = resolved_entities[subject_entity_type].get(relationship["subject"])
+                object_entity = resolved_entities[object_entity_type].get(relationship["object"])
                 
                 # Pokud entity existují, vytvoříme vztah
                 if subject_entity and object_entity:
                     self._create_relationship(subject_entity, object_entity, relationship["predicate"])
         
+        # Uložení změn: nejvýše jedna aktualizace stránky na změněnou entitu (atributy i relace)
+        touched_entities = self.relation_writer.apply()
+        for entities in result_entities.values():
+            touched_entities.extend(entities)
+        self._save_changes(touched_entities)
+        self.entity_repository.flush_history()
+        
         return result_entities
 
-    def _create_npc(self, text: str, npc_name: str) -> NPC:
+    def process_texts(
+        self, texts: Iterable[str], batch_size: int = 32, n_process: int = 1
+    ) -> Iterator[Dict[str, List[BaseEntity]]]:
+        """
+        Zpracuje proud textů (např. archiv přepisů herních session).
+
+        Texty se parsují dávkově přes ``nlp.pipe`` a výsledky se vrací jako
+        generátor, takže paměť zůstává omezená i při importu celé kampaně.
+
+        Args:
+            texts: Iterovatelný proud textů k zpracování.
+            batch_size: Počet textů v jedné dávce parsování.
+            n_process: Počet procesů pro parsování (-1 = všechna jádra).
+
+        Yields:
+            Slovník s extrahovanými entitami podle typu pro každý text ve stejném pořadí.
+        """
+        for parsed in self.entity_extractor.parse_many(texts, batch_size=batch_size, n_process=n_process):
+            yield self.process_text(parsed)
+
+    def _find_existing(
+        self, extracted_entities: Dict[str, List[Dict[str, Any]]]
+    ) -> Dict[EntityType, Dict[str, Optional[BaseEntity]]]:
+        """
+        Hromadně vyhledá existující NPC, lokace, příšery a předměty podle názvů extrahovaných z textu.
+
+        Args:
+            extracted_entities: Extrahované entity podle typu.
+
+        Returns:
+            Slovník typ entity -> (název -> existující entita nebo None).
+        """
+        names_by_type = {
+            entity_type: [entity_data["text"] for entity_data in extracted_entities[entity_type.value]]
+            for entity_type in (EntityType.NPC, EntityType.LOCATION, EntityType.MONSTER, EntityType.ITEM)
+        }
+        existing = self.entity_repository.find_many_by_types(
+            {entity_type: names for entity_type, names in names_by_type.items() if names}
+        )
+        return {entity_type: existing.get(entity_type, {}) for entity_type in names_by_type}
+
+    def _save_changes(self, entities: Iterable[BaseEntity]) -> None:
+        """
+        Uloží změny entit upravených během zpracování textu.
+
+        Každá entita se uloží nejvýše jednou a nezměněné entity se přeskočí.
+        Aktualizace různých entit se mohou odeslat souběžně.
+
+        Args:
+            entities: Entity, které mohly být během zpracování změněny.
+        """
+        unique: Dict[int, BaseEntity] = {}
+        for entity in entities:
+            if entity.notion_page_id:
+                unique.setdefault(id(entity), entity)
+        self.entity_repository.save_many(unique.values())
+
+    def _append_history(self, entity: BaseEntity, field: str, entry: str) -> None:
+        """
+        Přidá záznam do historie entity.
+
+        Pokud repozitář ukládá historii jako bloky stránky, záznam se jen zařadí
+        a připojí se na konci zpracování textu; jinak se připíše k poli entity.
+
+        Args:
+            entity: Entita.
+            field: Pole s historií.
+            entry: Záznam historie.
+        """
+        if self.entity_repository.history_mode == "blocks" and entity.notion_page_id:
+            self.entity_repository.queue_history_entry(entity, entry)
+            return
+
+        history = getattr(entity, field)
+        setattr(entity, field, f"{history}\n\n{entry}" if history else entry)
+
+    def _create_npc(self, parsed: ParsedText, npc_name: str) -> NPC:
         """
         Vytvoří novou NPC postavu.
 
         Args:
-            text: Text, ze kterého se mají extrahovat atributy.
+            parsed: Rozparsovaný text, ze kterého se mají extrahovat atributy.
             npc_name: Jméno NPC.
 
         Returns:
             Vytvořená NPC postava.
         """
         # Extrakce atributů
-        attributes = self.attribute_extractor.extract_npc_attributes(text, npc_name)
+        attributes = self.attribute_extractor.extract_npc_attributes(parsed, npc_name)
         
         # Kategorizace a tagování
-        tags = self.entity_categorizer.categorize_npc(text, npc_name)
+        tags = self.entity_categorizer.categorize_npc(parsed, npc_name)
         
         # Vytvoření NPC
         npc = NPC(
             name=npc_name,
             description=attributes["description"],
-            status=attributes["status"],
+            status=attributes["status"] or NPCStatus.ALIVE,  # Výchozí hodnota
             occupation=attributes["occupation"],
             history=attributes["history"],
             tags=tags,
@@ -197,67 +317,61 @@ class TextProcessor:
         # Uložení NPC do repozitáře
         return self.entity_repository.create_npc(npc)
 
-    def _update_npc(self, npc: NPC, text: str, npc_name: str) -> None:
+    def _update_npc(self, npc: NPC, parsed: ParsedText, npc_name: str) -> None:
         """
         Aktualizuje existující NPC postavu.
 
         Args:
             npc: NPC postava k aktualizaci.
-            text: Text, ze kterého se mají extrahovat atributy.
+            parsed: Rozparsovaný text, ze kterého se mají extrahovat atributy.
             npc_name: Jméno NPC.
         """
         # Extrakce atributů
-        attributes = self.attribute_extractor.extract_npc_attributes(text, npc_name)
+        attributes = self.attribute_extractor.extract_npc_attributes(parsed, npc_name)
         
         # Kategorizace a tagování
-        tags = self.entity_categorizer.categorize_npc(text, npc_name)
+        tags = self.entity_categorizer.categorize_npc(parsed, npc_name)
         
         # Aktualizace NPC
         if attributes["description"] and not npc.description:
             npc.description = attributes["description"]
         
-        if attributes["status"] != "Živý" or npc.status != attributes["status"]:
-            # Aktualizace stavu pouze pokud se změnil nebo není výchozí
-            npc.status = attributes["status"]
+        if attributes["status"]:
+            # Aktualizace stavu pouze pokud ho text zmiňuje
+            npc.status = NPCStatus(attributes["status"])
         
         if attributes["occupation"] and not npc.occupation:
             npc.occupation = attributes["occupation"]
         
         if attributes["history"]:
-            if npc.history:
-                npc.history += "\n\n" + attributes["history"]
-            else:
-                npc.history = attributes["history"]
+            self._append_history(npc, "history", attributes["history"])
         
         # Aktualizace tagů
-        npc.tags = list(set(npc.tags + tags))
+        npc.tags = npc.tags + [tag for tag in tags if tag not in npc.tags]
         
         # Extrakce změn stavu
-        state_changes = self.entity_extractor.extract_state_changes(text, npc_name)
+        state_changes = self.entity_extractor.extract_state_changes(parsed, npc_name)
         
         # Aktualizace historie na základě změn stavu
         for state_change in state_changes:
-            if npc.history:
-                npc.history += f"\n\n[Změna stavu] {state_change['sentence']}"
-            else:
-                npc.history = f"[Změna stavu] {state_change['sentence']}"
+            self._append_history(npc, "history", f"[Změna stavu] {state_change['sentence']}")
 
-    def _create_location(self, text: str, location_name: str) -> Location:
+    def _create_location(self, parsed: ParsedText, location_name: str) -> Location:
         """
         Vytvoří novou lokaci.
 
         Args:
-            text: Text, ze kterého se mají extrahovat atributy.
+            parsed: Rozparsovaný text, ze kterého se mají extrahovat atributy.
             location_name: Název lokace.
 
         Returns:
             Vytvořená lokace.
         """
         # Extrakce atributů
-        attributes = self.attribute_extractor.extract_location_attributes(text, location_name)
+        attributes = self.attribute_extractor.extract_location_attributes(parsed, location_name)
         
         # Kategorizace a tagování
-        tags = self.entity_categorizer.categorize_location(text, location_name)
+        tags = self.entity_categorizer.categorize_location(parsed, location_name)
         
         # Vytvoření lokace
         location = Location(
@@ -265,27 +379,27 @@ class TextProcessor:
             location_type=attributes["location_type"] or "Město",  # Výchozí hodnota
             hierarchy=attributes["hierarchy"],
             description=attributes["description"],
-            status=attributes["status"],
+            status=attributes["status"] or LocationStatus.SAFE,  # Výchozí hodnota
             tags=tags,
         )
         
         # Uložení lokace do repozitáře
         return self.entity_repository.create_location(location)
 
-    def _update_location(self, location: Location, text: str, location_name: str) -> None:
+    def _update_location(self, location: Location, parsed: ParsedText, location_name: str) -> None:
         """
         Aktualizuje existující lokaci.
 
         Args:
             location: Lokace k aktualizaci.
-            text: Text, ze kterého se mají extrahovat atributy.
+            parsed: Rozparsovaný text, ze kterého se mají extrahovat atributy.
             location_name: Název lokace.
         """
         # Extrakce atributů
-        attributes = self.attribute_extractor.extract_location_attributes(text, location_name)
+        attributes = self.attribute_extractor.extract_location_attributes(parsed, location_name)
         
         # Kategorizace a tagování
-        tags = self.entity_categorizer.categorize_location(text, location_name)
+        tags = self.entity_categorizer.categorize_location(parsed, location_name)
         
         # Aktualizace lokace
         if attributes["location_type"] and not location.location_type:
@@ -297,35 +411,35 @@ class TextProcessor:
         if attributes["description"] and not location.description:
             location.description = attributes["description"]
         
-        if attributes["status"] != "Bezpečné" or location.status != attributes["status"]:
-            # Aktualizace stavu pouze pokud se změnil nebo není výchozí
-            location.status = attributes["status"]
+        if attributes["status"]:
+            # Aktualizace stavu pouze pokud ho text zmiňuje
+            location.status = LocationStatus(attributes["status"])
         
         # Aktualizace tagů
-        location.tags = list(set(location.tags + tags))
+        location.tags = location.tags + [tag for tag in tags if tag not in location.tags]
 
-    def _create_monster(self, text: str, monster_name: str) -> Monster:
+    def _create_monster(self, parsed: ParsedText, monster_name: str) -> Monster:
         """
         Vytvoří novou příšeru.
 
         Args:
-            text: Text, ze kterého se mají extrahovat atributy.
+            parsed: Rozparsovaný text, ze kterého se mají extrahovat atributy.
             monster_name: Název příšery.
 
         Returns:
             Vytvořená příšera.
         """
         # Extrakce atributů
-        attributes = self.attribute_extractor.extract_monster_attributes(text, monster_name)
+        attributes = self.attribute_extractor.extract_monster_attributes(parsed, monster_name)
         
         # Kategorizace a tagování
-        tags = self.entity_categorizer.categorize_monster(text, monster_name)
+        tags = self.entity_categorizer.categorize_monster(parsed, monster_name)
         
         # Vytvoření příšery
         monster = Monster(
             name=monster_name,
             description=attributes["description"],
-            status=attributes["status"],
+            status=attributes["status"] or MonsterStatus.ALIVE,  # Výchozí hodnota
             combat_history=attributes["combat_history"],
             weaknesses_strengths=attributes["weaknesses_strengths"],
             tags=tags,
@@ -334,67 +448,61 @@ class TextProcessor:
         # Uložení příšery do repozitáře
         return self.entity_repository.create_monster(monster)
 
-    def _update_monster(self, monster: Monster, text: str, monster_name: str) -> None:
+    def _update_monster(self, monster: Monster, parsed: ParsedText, monster_name: str) -> None:
         """
         Aktualizuje existující příšeru.
 
         Args:
             monster: Příšera k aktualizaci.
-            text: Text, ze kterého se mají extrahovat atributy.
+            parsed: Rozparsovaný text, ze kterého se mají extrahovat atributy.
             monster_name: Název příšery.
         """
         # Extrakce atributů
-        attributes = self.attribute_extractor.extract_monster_attributes(text, monster_name)
+        attributes = self.attribute_extractor.extract_monster_attributes(parsed, monster_name)
         
         # Kategorizace a tagování
-        tags = self.entity_categorizer.categorize_monster(text, monster_name)
+        tags = self.entity_categorizer.categorize_monster(parsed, monster_name)
         
         # Aktualizace příšery
         if attributes["description"] and not monster.description:
             monster.description = attributes["description"]
         
-        if attributes["status"] != "Živá" or monster.status != attributes["status"]:
-            # Aktualizace stavu pouze pokud se změnil nebo není výchozí
-            monster.status = attributes["status"]
+        if attributes["status"]:
+            # Aktualizace stavu pouze pokud ho text zmiňuje
+            monster.status = MonsterStatus(attributes["status"])
         
         if attributes["combat_history"]:
-            if monster.combat_history:
-                monster.combat_history += "\n\n" + attributes["combat_history"]
-            else:
-                monster.combat_history = attributes["combat_history"]
+            self._append_history(monster, "combat_history", attributes["combat_history"])
         
         if attributes["weaknesses_strengths"] and not monster.weaknesses_strengths:
             monster.weaknesses_strengths = attributes["weaknesses_strengths"]
         
         # Aktualizace tagů
-        monster.tags = list(set(monster.tags + tags))
+        monster.tags = monster.tags + [tag for tag in tags if tag not in monster.tags]
         
         # Extrakce změn stavu
-        state_changes = self.entity_extractor.extract_state_changes(text, monster_name)
+        state_changes = self.entity_extractor.extract_state_changes(parsed, monster_name)
         
         # Aktualizace historie soubojů na základě změn stavu
         for state_change in state_changes:
-            if monster.combat_history:
-                monster.combat_history += f"\n\n[Změna stavu] {state_change['sentence']}"
-            else:
-                monster.combat_history = f"[Změna stavu] {state_change['sentence']}"
+            self._append_history(monster, "combat_history", f"[Změna stavu] {state_change['sentence']}")
 
-    def _create_item(self, text: str, item_name: str) -> Item:
+    def _create_item(self, parsed: ParsedText, item_name: str) -> Item:
         """
         Vytvoří nový předmět.
 
         Args:
-            text: Text, ze kterého se mají extrahovat atributy.
+            parsed: Rozparsovaný text, ze kterého se mají extrahovat atributy.
             item_name: Název předmětu.
 
         Returns:
             Vytvořený předmět.
         """
         # Extrakce atributů
-        attributes = self.attribute_extractor.extract_item_attributes(text, item_name)
+        attributes = self.attribute_extractor.extract_item_attributes(parsed, item_name)
         
         # Kategorizace a tagování
-        tags = self.entity_categorizer.categorize_item(text, item_name)
+        tags = self.entity_categorizer.categorize_item(parsed, item_name)
         
         # Vytvoření předmětu
         item = Item(
@@ -409,20 +517,20 @@ class TextProcessor:
         # Uložení předmětu do repozitáře
         return self.entity_repository.create_item(item)
 
-    def _update_item(self, item: Item, text: str, item_name: str) -> None:
+    def _update_item(self, item: Item, parsed: ParsedText, item_name: str) -> None:
         """
         Aktualizuje existující předmět.
 
         Args:
             item: Předmět k aktualizaci.
-            text: Text, ze kterého se mají extrahovat atributy.
+            parsed: Rozparsovaný text, ze kterého se mají extrahovat atributy.
             item_name: Název předmětu.
         """
         # Extrakce atributů
-        attributes = self.attribute_extractor.extract_item_attributes(text, item_name)
+        attributes = self.attribute_extractor.extract_item_attributes(parsed, item_name)
         
         # Kategorizace a tagování
-        tags = self.entity_categorizer.categorize_item(text, item_name)
+        tags = self.entity_categorizer.categorize_item(parsed, item_name)
         
         # Aktualizace předmětu
         if attributes["item_type"] and not item.item_type:
@@ -432,68 +540,26 @@ class TextProcessor:
             item.description = attributes["description"]
         
         if attributes["ownership_history"]:
-            if item.ownership_history:
-                item.ownership_history += "\n\n" + attributes["ownership_history"]
-            else:
-                item.ownership_history = attributes["ownership_history"]
+            self._append_history(item, "ownership_history", attributes["ownership_history"])
         
         if attributes["special_abilities"] and not item.special_abilities:
             item.special_abilities = attributes["special_abilities"]
         
         # Aktualizace tagů
-        item.tags = list(set(item.tags + tags))
+        item.tags = item.tags + [tag for tag in tags if tag not in item.tags]
 
     def _create_relationship(self, subject_entity: BaseEntity, object_entity: BaseEntity, predicate: str) -> None:
         """
         Vytvoří vztah mezi entitami.
 
+        Vztah se jen zařadí do zapisovače relací, který ho na konci zpracování
+        textu promítne do obou entit (včetně inverzní strany).
+
         Args:
             subject_entity: Subjekt vztahu.
             object_entity: Objekt vztahu.
             predicate: Predikát vztahu.
         """
-        # Implementace vytvoření vztahu podle typu entit
-        if isinstance(subject_entity, NPC) and isinstance(object_entity, NPC):
-            # Vztah mezi NPC
-            if subject_entity.related_npc_ids is None:
-                subject_entity.related_npc_ids = []
-            
-            if object_entity.id and object_entity.id not in subject_entity.related_npc_ids:
-                subject_entity.related_npc_ids.append(object_entity.id)
-        
-        elif isinstance(subject_entity, NPC) and isinstance(object_entity, Location):
-            # Vztah NPC-lokace
-            subject_entity.location_id = object_entity.id
-        
-        elif isinstance(subject_entity, NPC) and isinstance(object_entity, Item):
-            # Vztah NPC-předmět
-            if subject_entity.item_ids is None:
-                subject_entity.item_ids = []
-            
-            if object_entity.id and object_entity.id not in subject_entity.item_ids:
-                subject_entity.item_ids.append(object_entity.id)
-                
-            # Aktualizace vlastníka předmětu
-            object_entity.owner_id = subject_entity.id
-        
-        elif isinstance(subject_entity, Location) and isinstance(object_entity, NPC):
-            # Vztah lokace-NPC
-            if subject_entity.npc_ids is None:
-                subject_entity.npc_ids = []
-            
-            if object_entity.id and object_entity.id not in subject_entity.npc_ids:
-                subject_entity.npc_ids.append(object_entity.id)
-                
-            # Aktualizace lokace NPC
-            object_entity.location_id = subject_entity.id
-        
-        elif isinstance(subject_entity, Location) and isinstance(object_entity, Item):
-            # Vztah lokace-předmět
-            if subject_entity.item_ids is None:
-                subject_entity.item_ids = []
-            
-            if object_entity.id and object_entity.id not in subject_entity.item_ids:
-                subject_entity.item_ids.append(object_entity.id)
-                
-            # Aktualizace lokace předmětu
-            object_entity.location_id = subject_entity.id
+        field = self.RELATIONSHIP_FIELDS.get((subject_entity.type, object_entity.type))
+        if field:
+            self.relation_writer.add(subject_entity, field, object_entity)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Mikro-benchmark převodu stránek Notion na entity (NotionConverter).
+"""
+import argparse
+import inspect
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Přidání nadřazeného adresáře do sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from rpg_notion.models.converters import PROPERTY_MAP, NotionConverter
+from rpg_notion.models.entities import ENTITY_CLASSES, EntityType
+
+
+def parse_args():
+    """
+    Parsování argumentů příkazové řádky.
+    """
+    parser = argparse.ArgumentParser(description="Mikro-benchmark převodu stránek Notion na entity.")
+    parser.add_argument("--pages", type=int, default=10000, help="Počet stránek na typ entity.")
+    parser.add_argument("--repeat", type=int, default=3, help="Počet opakování měření (použije se nejlepší).")
+    parser.add_argument("--seed", type=int, default=1, help="Semínko generátoru stránek.")
+    return parser.parse_args()
+
+
+def _property_value(entity_class: Any, field: str, property_type: str, rng: random.Random) -> Dict[str, Any]:
+    """
+    Vytvoří hodnotu vlastnosti stránky ve tvaru odpovědi Notion API.
+    """
+    if property_type in ("title", "rich_text"):
+        text = f"{field} {rng.randrange(10 ** 6)}"
+        return {"type": property_type, property_type: [{"type": "text", "text": {"content": text}, "plain_text": text}]}
+    if property_type == "select":
+        annotation = entity_class.model_fields[field].annotation
+        options = [member.value for member in annotation] if inspect.isclass(annotation) else ["A"]
+        return {"type": "select", "select": {"name": rng.choice(options)}}
+    if property_type == "multi_select":
+        return {"type": "multi_select", "multi_select": [{"name": f"Tag {rng.randrange(5)}"} for _ in range(2)]}
+    if property_type == "relation":
+        return {"type": "relation", "relation": [{"id": f"page-{rng.randrange(10 ** 6)}"} for _ in range(3)]}
+    if property_type == "date":
+        return {"type": "date", "date": {"start": "2024-05-01T10:00:00+00:00"}}
+    return {"type": "number", "number": rng.randrange(-5, 6)}
+
+
+def generate_pages(entity_type: EntityType, count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """
+    Vygeneruje syntetické stránky Notion daného typu entity.
+    """
+    entity_class = ENTITY_CLASSES[entity_type]
+    pages = []
+    for index in range(count):
+        properties = {
+            property_name: _property_value(entity_class, field, property_type, rng)
+            for field, (property_name, property_type) in PROPERTY_MAP[entity_type].items()
+        }
+        pages.append({
+            "id": f"{entity_type.value}-{index}",
+            "created_time": "2024-05-01T10:00:00.000Z",
+            "last_edited_time": "2024-05-02T10:00:00.000Z",
+            "properties": properties,
+        })
+    return pages
+
+
+def measure(pages: Dict[EntityType, List[Dict[str, Any]]], repeat: int) -> float:
+    """
+    Změří propustnost převodu v stránkách za sekundu (nejlepší z opakování).
+    """
+    total = sum(len(type_pages) for type_pages in pages.values())
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for entity_type, type_pages in pages.items():
+            for page in type_pages:
+                NotionConverter.notion_to_entity(page, entity_type)
+        best = min(best, time.perf_counter() - start)
+    return total / best
+
+
+def main():
+    """
+    Hlavní funkce skriptu.
+    """
+    args = parse_args()
+    rng = random.Random(args.seed)
+    pages = {entity_type: generate_pages(entity_type, args.pages, rng) for entity_type in PROPERTY_MAP}
+
+    total = sum(len(type_pages) for type_pages in pages.values())
+    print(f"Převod {total} stránek: {measure(pages, args.repeat):,.0f} stránek/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+"""
+Benchmark jednotlivých fází zpracování textu na syntetických českých záznamech her.
+
+Měří propustnost a latenci fází parsování, NER, extrakce atributů,
+kategorizace, párování entit a převodu do Notion a výsledek ukládá jako
+JSON, který lze porovnat s dřívějším během (``--baseline``). Komponenty
+pipeline spaCy se spouštějí jednotlivě, takže do fáze NER patří komponenta
+``ner``, rozpoznávání fantasy entit a sestavení výsledku, do fáze parsování
+ostatní komponenty.
+"""
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import spacy
+from spacy.language import Language
+
+# Přidání nadřazeného adresáře do sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from rpg_notion.config.settings import SPACY_MODEL
+from rpg_notion.models.converters import NotionConverter
+from rpg_notion.models.entities import NPC, BaseEntity, EntityType, Item, ItemType, Location, LocationType, Monster
+from rpg_notion.nlp.attribute_extractor import AttributeExtractor
+from rpg_notion.nlp.categorizer import EntityCategorizer
+from rpg_notion.nlp.entity_matcher import EntityMatcher
+from rpg_notion.nlp.ner import EntityExtractor
+from rpg_notion.nlp.parsed_text import ParsedText
+from rpg_notion.scripts.benchmark_converter import generate_pages
+from rpg_notion.utils.synthetic_corpus import SyntheticCorpus, generate_corpus
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger(__name__)
+
+# Fáze v pořadí, v jakém je prochází zpracování jednoho tahu
+STAGES = ["parse", "ner", "attributes", "categorization", "matching", "conversion"]
+
+# Komponenty pipeline spaCy, jejichž čas se započítává do fáze NER
+NER_COMPONENTS = ("ner", "fantasy_ner")
+
+# Komponenty pipeline spaCy, které nastavují hranice vět
+SENTENCE_COMPONENTS = ("parser", "senter", "sentencizer")
+
+
+def parse_args():
+    """
+    Parsování argumentů příkazové řádky.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark zpracování textu na syntetických záznamech her.")
+    parser.add_argument("--sizes", type=str, default="1000,10000,100000", help="Velikosti korpusů ve slovech.")
+    parser.add_argument("--density", type=float, default=0.3, help="Podíl vět se zmínkou entity (0.0 - 1.0).")
+    parser.add_argument("--seed", type=int, default=1, help="Semínko generátoru korpusu.")
+    parser.add_argument("--model", type=str, default=SPACY_MODEL, help="Model spaCy.")
+    parser.add_argument("--output", type=str, help="Cesta k výstupnímu souboru JSON (jinak standardní výstup).")
+    parser.add_argument("--baseline", type=str, help="Výsledky dřívějšího běhu pro porovnání.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.2,
+        help="Povolený pokles propustnosti proti --baseline (0.2 = 20 %%), při větším skončí skript chybou.",
+    )
+    return parser.parse_args()
+
+
+class StageTimer:
+    """
+    Sběr dob trvání volání jedné fáze.
+    """
+
+    def __init__(self):
+        """
+        Inicializace měření.
+        """
+        self.durations: List[float] = []
+        self.items = 0
+        self.words = 0
+
+    def record(self, seconds: float, items: int = 1, words: int = 0) -> None:
+        """
+        Zaznamená jedno volání fáze.
+
+        Args:
+            seconds: Doba trvání volání.
+            items: Počet zpracovaných položek (tahů, entit, stránek).
+            words: Počet zpracovaných slov.
+        """
+        self.durations.append(seconds)
+        self.items += items
+        self.words += words
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Vrátí souhrn měření.
+
+        Returns:
+            Počet volání, celková doba, propustnost a percentily latence v milisekundách.
+        """
+        total = sum(self.durations)
+        latencies = sorted(duration * 1000 for duration in self.durations)
+        summary = {
+            "calls": len(latencies),
+            "items": self.items,
+            "total_seconds": total,
+            "items_per_second": self.items / total if total else None,
+            "words_per_second": self.words / total if total and self.words else None,
+            "latency_ms": None,
+        }
+        if latencies:
+            summary["latency_ms"] = {
+                "p50": statistics.median(latencies),
+                "p95": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                "max": latencies[-1],
+            }
+        return summary
+
+
+def ensure_sentence_boundaries(nlp: Language) -> None:
+    """
+    Doplní do pipeline pravidlové rozdělení na věty, pokud ho pipeline nemá.
+
+    Kategorizátor a extraktor atributů pracují s větami; bez této komponenty
+    by benchmark na modelu bez parseru (např. ``blank:cs``) selhal.
+
+    Args:
+        nlp: Pipeline spaCy.
+    """
+    if not any(name in nlp.pipe_names for name in SENTENCE_COMPONENTS):
+        logger.warning("Model nemá komponentu pro rozdělení na věty, přidává se sentencizer.")
+        nlp.add_pipe("sentencizer", first=True)
+
+
+def parse_by_stage(nlp: Language, text: str) -> Tuple[ParsedText, float, float]:
+    """
+    Rozparsuje text a změří zvlášť komponenty NER a ostatní komponenty pipeline.
+
+    Args:
+        nlp: Pipeline spaCy.
+        text: Text k rozparsování.
+
+    Returns:
+        Rozparsovaný text, doba parsování bez NER a doba komponent NER v sekundách.
+    """
+    start = time.perf_counter()
+    doc = nlp.make_doc(text)
+    parse_seconds = time.perf_counter() - start
+    ner_seconds = 0.0
+    for name, component in nlp.pipeline:
+        start = time.perf_counter()
+        doc = component(doc)
+        if name in NER_COMPONENTS:
+            ner_seconds += time.perf_counter() - start
+        else:
+            parse_seconds += time.perf_counter() - start
+    return ParsedText(doc), parse_seconds, ner_seconds
+
+
+def build_entities(corpus: SyntheticCorpus) -> Dict[EntityType, Dict[str, BaseEntity]]:
+    """
+    Vytvoří entity kampaně pro fázi párování a převodu.
+
+    Args:
+        corpus: Syntetický korpus.
+
+    Returns:
+        Entity podle typu a názvu.
+    """
+    factories = {
+        EntityType.NPC: lambda name: NPC(name=name),
+        EntityType.LOCATION: lambda name: Location(name=name, location_type=LocationType.CITY),
+        EntityType.MONSTER: lambda name: Monster(name=name),
+        EntityType.ITEM: lambda name: Item(name=name, item_type=ItemType.ARTIFACT),
+    }
+    return {
+        entity_type: {name: factories[entity_type](name) for name in names}
+        for entity_type, names in corpus.entities.items()
+    }
+
+
+def run_corpus(
+    corpus: SyntheticCorpus,
+    extractor: EntityExtractor,
+    attribute_extractor: AttributeExtractor,
+    categorizer: EntityCategorizer,
+    matcher: EntityMatcher,
+    seed: int,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Změří všechny fáze na jednom korpusu.
+
+    Args:
+        corpus: Syntetický korpus.
+        extractor: Extraktor entit.
+        attribute_extractor: Extraktor atributů.
+        categorizer: Kategorizátor entit.
+        matcher: Matcher entit.
+        seed: Semínko generátoru stránek Notion.
+
+    Returns:
+        Souhrn měření podle fáze.
+    """
+    timers = {stage: StageTimer() for stage in STAGES}
+    attribute_methods = {
+        EntityType.NPC: attribute_extractor.extract_npc_attributes,
+        EntityType.LOCATION: attribute_extractor.extract_location_attributes,
+        EntityType.MONSTER: attribute_extractor.extract_monster_attributes,
+        EntityType.ITEM: attribute_extractor.extract_item_attributes,
+    }
+    entities = build_entities(corpus)
+    indexes = {entity_type: matcher.build_index(by_name.values()) for entity_type, by_name in entities.items()}
+    rng = random.Random(seed)
+    pages = {entity_type: generate_pages(entity_type, len(by_name), rng) for entity_type, by_name in entities.items()}
+    page_positions = {entity_type: 0 for entity_type in pages}
+
+    for text, mentions in corpus.turns:
+        parsed, parse_seconds, ner_seconds = parse_by_stage(extractor.nlp, text)
+        timers["parse"].record(parse_seconds, words=len(text.split()))
+
+        start = time.perf_counter()
+        extractor.extract_entities(parsed)
+        timers["ner"].record(ner_seconds + time.perf_counter() - start, words=len(text.split()))
+
+        for entity_type, name in mentions:
+            start = time.perf_counter()
+            attribute_methods[entity_type](parsed, name)
+            timers["attributes"].record(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            categorizer.categorize_entity(parsed, name, entity_type)
+            timers["categorization"].record(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            matcher.find_matching_entity(name.lower(), indexes[entity_type])
+            timers["matching"].record(time.perf_counter() - start)
+
+            type_pages = pages[entity_type]
+            page = type_pages[page_positions[entity_type] % len(type_pages)]
+            page_positions[entity_type] += 1
+            start = time.perf_counter()
+            NotionConverter.notion_to_entity(page, entity_type)
+            NotionConverter.entity_to_properties(entities[entity_type][name])
+            timers["conversion"].record(time.perf_counter() - start)
+
+    return {stage: timer.summary() for stage, timer in timers.items()}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], max_regression: float) -> List[str]:
+    """
+    Porovná propustnost fází s dřívějším během.
+
+    Args:
+        results: Výsledky aktuálního běhu.
+        baseline: Výsledky dřívějšího běhu.
+        max_regression: Povolený relativní pokles propustnosti.
+
+    Returns:
+        Popisy fází, jejichž propustnost klesla víc, než je povoleno.
+    """
+    regressions = []
+    for size, corpus_results in results["corpora"].items():
+        baseline_stages = baseline.get("corpora", {}).get(size, {}).get("stages", {})
+        for stage, summary in corpus_results["stages"].items():
+            current = summary["items_per_second"]
+            previous = baseline_stages.get(stage, {}).get("items_per_second")
+            if not current or not previous:
+                continue
+            ratio = current / previous
+            logger.info(f"{size} slov, {stage}: {current:,.0f}/s (baseline {previous:,.0f}/s, {ratio:.2f}x)")
+            if ratio < 1.0 - max_regression:
+                regressions.append(f"{size} slov, {stage}: {ratio:.2f}x")
+    return regressions
+
+
+def main():
+    """
+    Hlavní funkce skriptu.
+    """
+    args = parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    # Načtení modelu se do měření nezapočítává
+    extractor = EntityExtractor(model_name=args.model)
+    attribute_extractor = AttributeExtractor(model_name=args.model)
+    categorizer = EntityCategorizer(model_name=args.model)
+    matcher = EntityMatcher()
+    ensure_sentence_boundaries(extractor.nlp)
+    extractor.parse("Družina vyrazila na cestu.")
+
+    results: Dict[str, Any] = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "spacy": spacy.__version__,
+            "model": args.model,
+            "seed": args.seed,
+            "entity_density": args.density,
+        },
+        "corpora": {},
+    }
+
+    for size in sizes:
+        corpus = generate_corpus(size, entity_density=args.density, seed=args.seed)
+        logger.info(f"Korpus {size} slov: {len(corpus.turns)} tahů, {corpus.mention_count} zmínek entit")
+        start = time.perf_counter()
+        stages = run_corpus(corpus, extractor, attribute_extractor, categorizer, matcher, args.seed)
+        results["corpora"][str(size)] = {
+            "words": corpus.word_count,
+            "turns": len(corpus.turns),
+            "mentions": corpus.mention_count,
+            "wall_seconds": time.perf_counter() - start,
+            "stages": stages,
+        }
+
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        logger.info(f"Výsledky uloženy do souboru {args.output}")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            logger.error(f"Zpomalení proti baseline: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Skript pro inicializaci databází v Notion.
 import argparse
 import logging
 import os
+import re
 import sys
 from pathlib import Path
 
@@ -43,6 +44,12 @@ def parse_args():
         default=".env",
         help="Cesta k souboru .env s konfigurací.",
     )
+    parser.add_argument(
+        "--manifest",
+        type=str,
+        default=None,
+        help="Cesta k souboru JSON s ID vytvořených databází (opakované spuštění je pak bez volání API).",
+    )
     return parser.parse_args()
 
 
@@ -69,7 +76,7 @@ def main():
         
         # Vytvoření všech databází
         logger.info(f"Vytvářím databáze v rodičovské stránce {args.parent_page_id}...")
-        database_ids = db_manager.create_all_databases(args.parent_page_id)
+        database_ids = db_manager.create_all_databases(args.parent_page_id, manifest_path=args.manifest)
         
         # Výpis ID databází
         logger.info("Databáze byly úspěšně vytvořeny:")
@@ -86,10 +93,9 @@ def main():
             for name, db_id in database_ids.items():
                 env_var_name = f"NOTION_DB_{name.upper()}"
                 if db_id:
-                    if f"{env_var_name}=" in env_content:
-                        env_content = env_content.replace(
-                            f"{env_var_name}=", f"{env_var_name}={db_id}"
-                        )
+                    pattern = re.compile(rf"^{env_var_name}=.*$", re.MULTILINE)
+                    if pattern.search(env_content):
+                        env_content = pattern.sub(f"{env_var_name}={db_id}", env_content)
                     else:
                         env_content += f"\n{env_var_name}={db_id}"
             
@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+"""
+Zátěžový test NotionClientWrapper a EntityRepository proti lokální náhradě Notion API.
+
+Vytvoří databáze, souběžně zapíše stránky NPC a načte je zpět přes
+repozitář (s filtrem i bez něj). Odezvu a chyby Notion API simuluje
+``FakeNotion``, takže test nepotřebuje síť ani Notion workspace.
+"""
+import argparse
+import logging
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+# Přidání nadřazeného adresáře do sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from rpg_notion.api.database_manager import NotionDatabaseManager
+from rpg_notion.api.entity_manager import NotionEntityManager
+from rpg_notion.api.fake_notion import FakeNotion
+from rpg_notion.api.notion_client import NotionClientWrapper
+from rpg_notion.api.rate_limiter import TokenBucketRateLimiter
+from rpg_notion.config.settings import NOTION_MAX_CONCURRENCY
+from rpg_notion.models.entities import EntityType, NPCStatus
+from rpg_notion.models.entity_cache import EntityCache
+from rpg_notion.models.repository import EntityRepository
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger(__name__)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def parse_args():
+    """
+    Parsování argumentů příkazové řádky.
+    """
+    parser = argparse.ArgumentParser(description="Zátěžový test klienta Notion proti lokální náhradě Notion API.")
+    parser.add_argument("--pages", type=int, default=500, help="Počet zapisovaných stránek NPC.")
+    parser.add_argument("--workers", type=int, default=NOTION_MAX_CONCURRENCY, help="Počet souběžných zápisů.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Doba odezvy Notion API v sekundách.")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Největší náhodné prodloužení odezvy v sekundách.")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Podíl požadavků, které skončí chybou.")
+    parser.add_argument(
+        "--error-statuses", type=str, default="429", help="HTTP stavy náhodných chyb oddělené čárkou (např. 429,503)."
+    )
+    parser.add_argument("--retry-after", type=float, default=0.1, help="Hodnota hlavičky Retry-After u chyb 429.")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Limit požadavků klienta za sekundu.")
+    parser.add_argument("--batch-size", type=int, default=100, help="Velikost stránky při čtení databáze.")
+    parser.add_argument("--seed", type=int, default=1, help="Semínko generátoru ID a chyb.")
+    return parser.parse_args()
+
+
+def measure(calls: List[Callable[[], object]], workers: int) -> Dict[str, float]:
+    """
+    Provede volání souběžně a změří jejich latenci.
+
+    Args:
+        calls: Volání bez argumentů.
+        workers: Počet souběžných vláken.
+
+    Returns:
+        Počet volání a chyb, propustnost a percentily latence v milisekundách.
+    """
+    def timed(call: Callable[[], object]) -> Tuple[float, bool]:
+        start = time.perf_counter()
+        try:
+            call()
+            succeeded = True
+        except Exception as e:
+            logger.debug(f"Volání selhalo: {e}")
+            succeeded = False
+        return (time.perf_counter() - start) * 1000, succeeded
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(timed, calls))
+    total = time.perf_counter() - start
+
+    latencies = [latency for latency, _ in results]
+    errors = sum(1 for _, succeeded in results if not succeeded)
+    latencies.sort()
+    return {
+        "calls": len(calls),
+        "errors": errors,
+        "per_second": len(calls) / total if total else 0.0,
+        "p50_ms": statistics.median(latencies) if latencies else 0.0,
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0,
+    }
+
+
+def main():
+    """
+    Hlavní funkce skriptu.
+    """
+    args = parse_args()
+    fake = FakeNotion(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_statuses=tuple(int(status) for status in args.error_statuses.split(",") if status.strip()),
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    client = NotionClientWrapper(
+        api_key="fake-notion",
+        rate_limiter=TokenBucketRateLimiter(rate=args.rate, capacity=max(1, int(args.rate))),
+        http_client=fake.http_client(),
+    )
+
+    start = time.perf_counter()
+    database_ids = NotionDatabaseManager(client).create_all_databases("fake-parent-page")
+    logger.info(f"Vytvořeno {len(database_ids)} databází za {time.perf_counter() - start:.2f} s")
+
+    # Chyby se vkládají až do měřených operací, vytvoření databází musí projít
+    fake.error_rate = args.error_rate
+    entity_manager = NotionEntityManager(client)
+    entity_manager.database_ids = dict(database_ids)
+    repository = EntityRepository(notion_client=client, entity_manager=entity_manager, cache=EntityCache())
+    repository.database_ids = dict(database_ids)
+
+    statuses = [status.value for status in NPCStatus]
+    writes = measure(
+        [
+            (lambda index=index: entity_manager.create_npc(
+                f"NPC {index}", f"Popis NPC {index}", status=statuses[index % len(statuses)]
+            ))
+            for index in range(args.pages)
+        ],
+        args.workers,
+    )
+    logger.info(
+        f"Zápis: {writes['calls']} stránek, {writes['errors']} chyb, {writes['per_second']:.1f} stránek/s, "
+        f"latence p50 {writes['p50_ms']:.0f} ms, p95 {writes['p95_ms']:.0f} ms"
+    )
+
+    status_filter = {"property": "Stav", "select": {"equals": statuses[0]}}
+    for label, scan in (
+        ("Čtení všech NPC", lambda: repository.iter_all(EntityType.NPC, batch_size=args.batch_size)),
+        ("Čtení NPC s filtrem", lambda: repository.iter_all(EntityType.NPC, filter=status_filter, batch_size=args.batch_size)),
+    ):
+        start = time.perf_counter()
+        try:
+            count = sum(1 for _ in scan())
+        except Exception as e:
+            logger.error(f"{label} selhalo: {e}")
+            continue
+        elapsed = time.perf_counter() - start
+        logger.info(f"{label}: {count} entit za {elapsed:.2f} s ({count / elapsed if elapsed else 0:.0f} entit/s)")
+
+    logger.info(f"Požadavky podle operace: {dict(fake.calls)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""
+Skript pro synchronizaci lokálního zrcadla databází Notion.
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Přidání nadřazeného adresáře do sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from dotenv import load_dotenv
+
+from rpg_notion.config.settings import DATA_DIR, LOCAL_MIRROR_PATH, NOTION_API_KEY
+from rpg_notion.models.entities import EntityType
+from rpg_notion.models.local_mirror import LocalMirror
+from rpg_notion.models.repository import EntityRepository
+
+# Nastavení loggeru
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    handlers=[logging.StreamHandler()],
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args():
+    """
+    Parsování argumentů příkazové řádky.
+    """
+    parser = argparse.ArgumentParser(description="Synchronizace lokálního zrcadla databází Notion.")
+    parser.add_argument(
+        "--mirror-path",
+        type=str,
+        default=LOCAL_MIRROR_PATH or str(DATA_DIR / "notion_mirror.sqlite3"),
+        help="Cesta k souboru SQLite se zrcadlem.",
+    )
+    parser.add_argument(
+        "--entity-type",
+        type=str,
+        action="append",
+        choices=[entity_type.value for entity_type in EntityType],
+        help="Typ entity k synchronizaci (lze zadat vícekrát). Výchozí jsou všechny typy.",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignorovat značku poslední synchronizace a načíst celé databáze.",
+    )
+    parser.add_argument(
+        "--env-file",
+        type=str,
+        default=".env",
+        help="Cesta k souboru .env s konfigurací.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    """
+    Hlavní funkce skriptu.
+    """
+    args = parse_args()
+
+    # Načtení proměnných prostředí
+    load_dotenv(args.env_file)
+
+    # Kontrola, zda je nastaven API klíč
+    if not NOTION_API_KEY:
+        logger.error("Notion API klíč není nastaven. Nastavte proměnnou prostředí NOTION_API_KEY.")
+        sys.exit(1)
+
+    entity_types = [EntityType(value) for value in args.entity_type] if args.entity_type else None
+
+    try:
+        mirror = LocalMirror(args.mirror_path)
+        repository = EntityRepository(mirror=mirror)
+
+        logger.info(f"Synchronizuji zrcadlo {args.mirror_path} ({'úplná' if args.full else 'inkrementální'})...")
+        synced = repository.sync_mirror(entity_types, full=args.full)
+
+        for entity_type, count in synced.items():
+            logger.info(f"  {entity_type.value}: {count} stránek, celkem {mirror.count(entity_type)} v zrcadle")
+        mirror.close()
+
+    except Exception as e:
+        logger.error(f"Chyba při synchronizaci zrcadla: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Generátor syntetických českých záznamů RPG her pro výkonnostní testy.
+"""
+import logging
+import random
+from typing import Dict, List, Optional, Tuple
+
+from rpg_notion.models.entities import EntityType
+
+logger = logging.getLogger(__name__)
+
+# Části názvů entit, ze kterých se skládají názvy kampaně
+NPC_FIRST_NAMES = [
+    "Borek", "Milada", "Radim", "Vlasta", "Zdeněk", "Jaromír", "Libuše", "Dobromil", "Ludmila", "Bořivoj",
+    "Svatava", "Kazimír", "Drahomíra", "Vratislav", "Božena", "Ctibor", "Jarmila", "Přemysl", "Věnceslava", "Soběslav",
+]
+NPC_BYNAMES = [
+    "Šedivý", "Kulhavý", "Moudrý", "Statečný", "Ryšavý", "Tichý", "Vousatý", "Jednooký", "Zlatovlasý", "Mladší",
+    "Starší", "Lstivý", "Dobrý", "Černý", "Bílý",
+]
+LOCATION_ADJECTIVES = [
+    "Temný", "Stříbrný", "Zapomenutý", "Šeptající", "Mlžný", "Kamenný", "Zlatý", "Prokletý", "Starý", "Horní",
+    "Dolní", "Ztracený", "Rudý", "Severní", "Tichý",
+]
+LOCATION_NOUNS = ["les", "hrad", "brod", "důl", "chrám", "průsmyk", "hostinec", "ostrov", "žalář", "mlýn", "vrch", "most"]
+MONSTER_ADJECTIVES = [
+    "Jeskynní", "Bažinný", "Horský", "Starý", "Ohnivý", "Ledový", "Jedovatý", "Obří", "Noční", "Krvavý",
+]
+MONSTER_NOUNS = ["troll", "drak", "vlkodlak", "golem", "basilišek", "ghúl", "pavouk", "skřet", "přízrak", "lich"]
+ITEM_ADJECTIVES = [
+    "Runový", "Prastarý", "Elfí", "Trpasličí", "Očarovaný", "Zlomený", "Stříbrný", "Krvavý", "Posvátný", "Stínový",
+]
+ITEM_NOUNS = ["meč", "štít", "amulet", "prsten", "svitek", "klíč", "luk", "plášť", "lektvar", "grimoár"]
+
+# Šablony vět se zmínkami entit. Zástupné symboly {npc}, {location},
+# {monster} a {item} se nahradí názvy entit daného typu.
+ENTITY_SENTENCES: Dict[EntityType, List[str]] = {
+    EntityType.NPC: [
+        "{npc} je zkušený kovář a ochotně pomáhá družině.",
+        "{npc} se nachází v lokaci {location}.",
+        "{npc} byl zraněn v boji s lapky.",
+        "{npc} je spojenec družiny a nabídl jí nocleh.",
+        "{npc} dal družině úkol najít {item}.",
+        "Hostinský prozradil, že {npc} je obávaný zloděj.",
+    ],
+    EntityType.LOCATION: [
+        "Družina dorazila do místa zvaného {location}.",
+        "{location} je nebezpečné místo plné pastí.",
+        "{location} leží v údolí za řekou.",
+        "{location} je opuštěné od doby, kdy odešli horníci.",
+    ],
+    EntityType.MONSTER: [
+        "{monster} zaútočil na družinu u brány.",
+        "{monster} je zranitelný vůči ohni.",
+        "{monster} byl zabit ranou do hlavy.",
+        "V lokaci {location} se skrývá {monster}.",
+    ],
+    EntityType.ITEM: [
+        "{item} je meč z černé oceli.",
+        "{item} patřil dávnému králi.",
+        "{item} umožňuje schopnost vidět ve tmě.",
+        "{npc} našel {item} ve staré truhle.",
+    ],
+}
+
+# Věty bez zmínek entit
+FILLER_SENTENCES = [
+    "Cesta byla dlouhá a vítr foukal od severu.",
+    "Družina se utábořila u ohně a rozdělila si hlídky.",
+    "Ráno začalo pršet a stezka se změnila v bláto.",
+    "Bard zahrál píseň o dávných hrdinech.",
+    "Zásoby jídla docházely rychleji, než čekali.",
+    "Někde v dálce zahoukala sova.",
+    "Hráči chvíli debatovali, kudy se vydat dál.",
+    "Kostky rozhodly, že hlídka nic nezpozorovala.",
+    "Mlha se držela nízko nad zemí až do poledne.",
+    "Koně byli unavení a museli si odpočinout.",
+    "Vypravěč popsal západ slunce nad kopci.",
+    "Na rozcestí stál rozpadlý ukazatel bez nápisů.",
+]
+
+
+class SyntheticCorpus:
+    """
+    Syntetický záznam hry rozdělený na tahy.
+
+    Každý tah je text a seznam zmínek entit (typ, název), které tah obsahuje.
+    """
+
+    def __init__(self, turns: List[Tuple[str, List[Tuple[EntityType, str]]]], entities: Dict[EntityType, List[str]]):
+        """
+        Inicializace korpusu.
+
+        Args:
+            turns: Tahy jako dvojice (text, zmínky entit).
+            entities: Názvy entit kampaně podle typu.
+        """
+        self.turns = turns
+        self.entities = entities
+
+    @property
+    def text(self) -> str:
+        """
+        Celý text korpusu.
+
+        Returns:
+            Text všech tahů oddělený prázdnými řádky.
+        """
+        return "\n\n".join(text for text, _ in self.turns)
+
+    @property
+    def word_count(self) -> int:
+        """
+        Počet slov korpusu.
+
+        Returns:
+            Počet slov oddělených mezerami.
+        """
+        return sum(len(text.split()) for text, _ in self.turns)
+
+    @property
+    def mention_count(self) -> int:
+        """
+        Počet zmínek entit v korpusu.
+
+        Returns:
+            Počet zmínek.
+        """
+        return sum(len(mentions) for _, mentions in self.turns)
+
+
+def _entity_names(rng: random.Random, adjectives: List[str], nouns: List[str], count: int) -> List[str]:
+    """
+    Vybere požadovaný počet různých názvů z kombinací dvou seznamů slov.
+
+    Args:
+        rng: Generátor náhodných čísel.
+        adjectives: První slova názvů.
+        nouns: Druhá slova názvů.
+        count: Počet názvů (nejvýše počet kombinací).
+
+    Returns:
+        Seznam názvů.
+    """
+    combinations = [f"{first} {second}" for first in adjectives for second in nouns]
+    return rng.sample(combinations, min(count, len(combinations)))
+
+
+def generate_corpus(
+    words: int,
+    entity_density: float = 0.3,
+    seed: int = 1,
+    turn_words: int = 150,
+    entities_per_type: Optional[int] = None,
+) -> SyntheticCorpus:
+    """
+    Vygeneruje deterministický syntetický záznam hry.
+
+    Stejné parametry dávají vždy stejný text, takže výsledky měření lze
+    porovnávat mezi běhy.
+
+    Args:
+        words: Přibližný počet slov korpusu (generuje se po celých větách).
+        entity_density: Podíl vět, které zmiňují entitu (0.0 - 1.0).
+        seed: Semínko generátoru.
+        turn_words: Přibližný počet slov jednoho tahu.
+        entities_per_type: Počet různých entit každého typu. Pokud není zadán,
+            odvodí se z velikosti korpusu (jedna entita na 200 slov, alespoň 5).
+
+    Returns:
+        Vygenerovaný korpus.
+
+    Raises:
+        ValueError: Pokud hustota entit není v rozsahu 0.0 - 1.0.
+    """
+    if not 0.0 <= entity_density <= 1.0:
+        raise ValueError(f"Hustota entit musí být v rozsahu 0.0 - 1.0, zadáno: {entity_density}")
+
+    rng = random.Random(seed)
+    count = entities_per_type or max(5, words // 200)
+    entities = {
+        EntityType.NPC: _entity_names(rng, NPC_FIRST_NAMES, NPC_BYNAMES, count),
+        EntityType.LOCATION: _entity_names(rng, LOCATION_ADJECTIVES, LOCATION_NOUNS, count),
+        EntityType.MONSTER: _entity_names(rng, MONSTER_ADJECTIVES, MONSTER_NOUNS, count),
+        EntityType.ITEM: _entity_names(rng, ITEM_ADJECTIVES, ITEM_NOUNS, count),
+    }
+    placeholders = {
+        "npc": EntityType.NPC, "location": EntityType.LOCATION, "monster": EntityType.MONSTER, "item": EntityType.ITEM,
+    }
+    entity_types = list(ENTITY_SENTENCES)
+
+    turns = []
+    sentences: List[str] = []
+    mentions: List[Tuple[EntityType, str]] = []
+    total = turn_total = 0
+    while total < words:
+        if rng.random() < entity_density:
+            template = rng.choice(ENTITY_SENTENCES[rng.choice(entity_types)])
+            names = {}
+            for placeholder, entity_type in placeholders.items():
+                if "{" + placeholder + "}" in template:
+                    names[placeholder] = rng.choice(entities[entity_type])
+                    mentions.append((entity_type, names[placeholder]))
+            sentence = template.format(**names)
+            sentence = sentence[0].upper() + sentence[1:]
+        else:
+            sentence = rng.choice(FILLER_SENTENCES)
+
+        sentences.append(sentence)
+        sentence_words = len(sentence.split())
+        total += sentence_words
+        turn_total += sentence_words
+        if turn_total >= turn_words or total >= words:
+            turns.append((" ".join(sentences), mentions))
+            sentences, mentions, turn_total = [], [], 0
+
+    return SyntheticCorpus(turns, entities)
@@ -0,0 +1,99 @@
+"""
+Testy pro AsyncNotionClientWrapper.
+"""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from notion_client.errors import APIResponseError
+
+from rpg_notion.api.async_notion_client import AsyncNotionClientWrapper
+from rpg_notion.api.rate_limiter import TokenBucketRateLimiter
+
+
+def _rate_limited_error() -> APIResponseError:
+    """
+    Vytvoří chybu rate limitu Notion API.
+    """
+    return APIResponseError(MagicMock(headers={}), "Rate limited", "rate_limited")
+
+
+@pytest.fixture
+def async_client_wrapper():
+    """
+    Fixture pro AsyncNotionClientWrapper s mock Notion klientem a vypnutou kontrolou vlastností.
+    """
+    with patch("rpg_notion.api.async_notion_client.AsyncClient"):
+        yield AsyncNotionClientWrapper(
+            api_key="test_api_key",
+            max_concurrency=2,
+            rate_limiter=TokenBucketRateLimiter(rate=1000, capacity=100, jitter=0),
+            validate=False,
+        )
+
+
+def test_execute_with_retry_rate_limit(async_client_wrapper):
+    """
+    Test opakování operace po rate limitu.
+    """
+    operation = AsyncMock(side_effect=[_rate_limited_error(), "success"])
+
+    with patch.object(async_client_wrapper, "_handle_rate_limit", AsyncMock()) as mock_handle_rate_limit:
+        result = asyncio.run(async_client_wrapper._execute_with_retry(operation, kwarg1="kwarg1"))
+
+    assert result == "success"
+    assert operation.call_count == 2
+    mock_handle_rate_limit.assert_awaited_once_with(1)
+
+
+def test_execute_with_retry_honours_retry_after(async_client_wrapper):
+    """
+    Test, že hlavička Retry-After pozastaví sdílený limiter místo exponenciálního čekání.
+    """
+    error = APIResponseError(MagicMock(headers={"retry-after": "2"}), "Rate limited", "rate_limited")
+    operation = AsyncMock(side_effect=[error, "success"])
+
+    with patch.object(async_client_wrapper, "_handle_rate_limit", AsyncMock()) as mock_handle_rate_limit, \
+            patch.object(async_client_wrapper.rate_limiter, "pause") as mock_pause:
+        result = asyncio.run(async_client_wrapper._execute_with_retry(operation))
+
+    assert result == "success"
+    mock_pause.assert_called_once_with(2.0)
+    mock_handle_rate_limit.assert_not_awaited()
+
+
+def test_execute_with_retry_max_retries(async_client_wrapper):
+    """
+    Test vyčerpání maximálního počtu pokusů.
+    """
+    operation = AsyncMock(side_effect=_rate_limited_error())
+
+    with patch.object(async_client_wrapper, "_handle_rate_limit", AsyncMock()):
+        with pytest.raises(APIResponseError):
+            asyncio.run(async_client_wrapper._execute_with_retry(operation))
+
+    assert operation.call_count == async_client_wrapper.max_retries + 1
+
+
+def test_create_pages_respects_concurrency_limit(async_client_wrapper):
+    """
+    Test, že souběžné vytváření stránek nepřekročí limit semaforu.
+    """
+    running = 0
+    max_running = 0
+
+    async def create(**kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"id": kwargs["properties"]["Název"]}
+
+    async_client_wrapper.client.pages.create = create
+    pages = [{"parent_id": "db", "properties": {"Název": str(i)}} for i in range(6)]
+
+    results = asyncio.run(async_client_wrapper.create_pages(pages))
+
+    assert [page["id"] for page in results] == [str(i) for i in range(6)]
+    assert max_running == 2
@@ -0,0 +1,123 @@
+"""
+Testy pro NotionDatabaseManager.
+"""
+import json
+from itertools import count
+from unittest.mock import MagicMock
+
+import pytest
+
+from rpg_notion.api.database_manager import NotionDatabaseManager
+
+
+def _client(search_results=None, schemas=None):
+    """
+    Vytvoří mock klienta, který databázím přiděluje ID podle pořadí vytvoření a pamatuje si jejich schéma.
+    """
+    client = MagicMock()
+    ids = count(1)
+    schemas = schemas if schemas is not None else {}
+
+    def create_database(**kwargs):
+        database_id = f"db-{next(ids)}"
+        schemas[database_id] = dict(kwargs["properties"])
+        return {"id": database_id}
+
+    def update_database(database_id, properties):
+        schemas.setdefault(database_id, {}).update(properties)
+        return {"id": database_id}
+
+    client.create_database.side_effect = create_database
+    client.update_database.side_effect = update_database
+    client.get_database.side_effect = lambda database_id: {
+        "id": database_id, "properties": schemas.get(database_id, {})
+    }
+    client.search.return_value = search_results or []
+    return client
+
+
+def test_create_all_databases_creates_then_patches_relations(tmp_path):
+    """
+    Test, že se databáze vytvoří bez relací na neexistující databáze a relace se doplní jedním průchodem.
+    """
+    client = _client()
+    manager = NotionDatabaseManager(client, max_workers=4)
+
+    database_ids = manager.create_all_databases("parent", manifest_path=tmp_path / "manifest.json")
+
+    assert client.create_database.call_count == 8
+    assert len(set(database_ids.values())) == 8
+    for call in client.create_database.call_args_list:
+        assert all("relation" not in value for value in call.kwargs["properties"].values())
+
+    patched = {call.kwargs["database_id"]: call.kwargs["properties"] for call in client.update_database.call_args_list}
+    assert len(patched) == client.update_database.call_count
+    assert patched[database_ids["npcs"]]["Lokace"]["relation"]["database_id"] == database_ids["locations"]
+    assert patched[database_ids["npcs"]]["Vztahy"]["relation"]["database_id"] == database_ids["npcs"]
+    assert json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))["database_ids"] == database_ids
+
+
+def test_create_all_databases_is_noop_for_existing_databases(tmp_path):
+    """
+    Test, že opakované spuštění s manifestem nevolá Notion API.
+    """
+    manifest_path = tmp_path / "manifest.json"
+    NotionDatabaseManager(_client()).create_all_databases("parent", manifest_path=manifest_path)
+
+    client = _client()
+    NotionDatabaseManager(client).create_all_databases("parent", manifest_path=manifest_path)
+
+    client.search.assert_not_called()
+    client.create_database.assert_not_called()
+    client.update_database.assert_not_called()
+
+
+def test_create_all_databases_reuses_databases_found_by_search():
+    """
+    Test, že se databáze nalezené vyhledáváním znovu nevytvoří a relace se doplní jen k novým.
+    """
+    search_results = [
+        {"object": "database", "id": "npcs-id", "parent": {"page_id": "par-ent"}, "title": [{"plain_text": "NPC"}]},
+        {"object": "database", "id": "other", "parent": {"page_id": "jinde"}, "title": [{"plain_text": "Lokace"}]},
+    ]
+    client = _client(search_results)
+    manager = NotionDatabaseManager(client, max_workers=1)
+
+    database_ids = manager.create_all_databases("parent")
+
+    assert database_ids["npcs"] == "npcs-id"
+    assert client.create_database.call_count == 7
+    created_titles = {call.kwargs["title"] for call in client.create_database.call_args_list}
+    assert "NPC" not in created_titles
+    npc_patch = next(
+        call.kwargs["properties"] for call in client.update_database.call_args_list
+        if call.kwargs["database_id"] == "npcs-id"
+    )
+    assert set(npc_patch) == {"Lokace", "Významné předměty"}
+
+
+def test_create_all_databases_repairs_relations_after_failed_run(tmp_path):
+    """
+    Test, že opakované spuštění doplní relace, jejichž doplnění v předchozím běhu selhalo.
+    """
+    schemas = {}
+    client = _client(schemas=schemas)
+    client.update_database.side_effect = Exception("rate_limited")
+    manager = NotionDatabaseManager(client, max_workers=1)
+    with pytest.raises(Exception):
+        manager.create_all_databases("parent", manifest_path=tmp_path / "manifest.json")
+    assert not (tmp_path / "manifest.json").exists()
+
+    search_results = [
+        {"object": "database", "id": database_id, "parent": {"page_id": "parent"}, "title": [{"plain_text": title}]}
+        for database_id, title in ((manager.database_ids[key], title) for key, title in manager.DATABASE_TITLES.items())
+    ]
+    client = _client(search_results, schemas=schemas)
+    database_ids = NotionDatabaseManager(client, max_workers=4).create_all_databases(
+        "parent", manifest_path=tmp_path / "manifest.json"
+    )
+
+    client.create_database.assert_not_called()
+    assert client.get_database.call_count == 8
+    assert schemas[database_ids["npcs"]]["Lokace"]["relation"]["database_id"] == database_ids["locations"]
+    assert json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))["relations_complete"] is True
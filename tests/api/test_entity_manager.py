@@ -0,0 +1,97 @@
+"""
+Testy pro NotionEntityManager.
+"""
+from unittest.mock import MagicMock
+
+from rpg_notion.api.entity_manager import NotionEntityManager
+
+
+def test_find_entities_by_names_chunks_or_filter():
+    """
+    Test, že názvy se spojí do filtru ``or`` rozděleného podle limitu Notion API.
+    """
+    client = MagicMock()
+    client.query_database.side_effect = [[{"id": "a"}], [{"id": "b"}]]
+    manager = NotionEntityManager(client)
+    names = [f"NPC {i}" for i in range(NotionEntityManager.MAX_FILTER_CONDITIONS + 5)] + ["NPC 0", ""]
+
+    results = manager.find_entities_by_names("db", names)
+
+    assert results == [{"id": "a"}, {"id": "b"}]
+    assert client.query_database.call_count == 2
+    first_filter = client.query_database.call_args_list[0].kwargs["filter"]
+    second_filter = client.query_database.call_args_list[1].kwargs["filter"]
+    assert len(first_filter["or"]) == NotionEntityManager.MAX_FILTER_CONDITIONS
+    assert len(second_filter["or"]) == 5
+    assert first_filter["or"][0] == {"property": "title", "title": {"equals": "NPC 0"}}
+
+
+def test_append_entity_history_sends_blocks_in_one_request():
+    """
+    Test, že se záznamy historie připojí jako odstavce jedním požadavkem bez čtení stránky.
+    """
+    client = MagicMock()
+    manager = NotionEntityManager(client)
+
+    manager.append_entity_history("page-1", ["Porazil balroga.", "x" * 4500])
+
+    client.get_page.assert_not_called()
+    client.append_block_children.assert_called_once()
+    page_id, blocks = client.append_block_children.call_args.args
+    assert page_id == "page-1"
+    assert [block["type"] for block in blocks] == ["paragraph", "paragraph"]
+    assert blocks[0]["paragraph"]["rich_text"][0]["text"]["content"].endswith("] Porazil balroga.")
+    assert [len(item["text"]["content"]) for item in blocks[1]["paragraph"]["rich_text"]][:2] == [2000, 2000]
+
+
+def test_compact_entity_history_copies_blocks_to_property():
+    """
+    Test kompaktace historie z bloků stránky do vlastnosti.
+
+    Kopírují se jen záznamy s časovým razítkem, které ve vlastnosti ještě
+    nejsou, a dosavadní text vlastnosti zůstane na začátku.
+    """
+    def paragraph(content):
+        return {"type": "paragraph", "paragraph": {"rich_text": [{"type": "text", "text": {"content": content}}]}}
+
+    client = MagicMock()
+    client.get_page.return_value = {"properties": {"Historie změn": {"rich_text": [
+        {"type": "text", "text": {"content": "Starší historie\n\n[2024-05-01 10:00:00] A"}},
+    ]}}}
+    client.iter_block_children.return_value = iter([
+        paragraph("Poznámky vypravěče"),
+        paragraph("[2024-05-01 10:00:00] A"),
+        {"type": "heading_1", "heading_1": {"rich_text": []}},
+        paragraph("[2024-05-02 11:30:00] B"),
+    ])
+    manager = NotionEntityManager(client)
+
+    manager.compact_entity_history("page-1", "Historie změn")
+
+    client.update_page.assert_called_once_with(
+        page_id="page-1",
+        properties={"Historie změn": {"rich_text": [{"type": "text", "text": {
+            "content": "Starší historie\n\n[2024-05-01 10:00:00] A\n\n[2024-05-02 11:30:00] B",
+        }}]}},
+    )
+
+
+def test_create_npc_builds_properties_from_property_map():
+    """
+    Test, že vlastnosti nové NPC se sestaví podle PROPERTY_MAP a prázdná volitelná pole se vynechají.
+    """
+    client = MagicMock()
+    manager = NotionEntityManager(client)
+    manager.database_ids["npcs"] = "db-npcs"
+
+    manager.create_npc("Elrond", "", location_id="loc-1", tags=["elf"])
+
+    client.create_page.assert_called_once()
+    assert client.create_page.call_args.kwargs["parent_id"] == "db-npcs"
+    assert client.create_page.call_args.kwargs["properties"] == {
+        "Jméno": {"title": [{"type": "text", "text": {"content": "Elrond"}}]},
+        "Popis": {"rich_text": []},
+        "Stav": {"select": {"name": "Živý"}},
+        "Lokace": {"relation": [{"id": "loc-1"}]},
+        "Tagy": {"multi_select": [{"name": "elf"}]},
+    }
@@ -0,0 +1,224 @@
+"""
+Testy pro lokální náhradu Notion API (FakeNotion).
+"""
+import asyncio
+
+import pytest
+from notion_client.errors import APIResponseError
+
+from rpg_notion.api.async_notion_client import AsyncNotionClientWrapper
+from rpg_notion.api.database_manager import NotionDatabaseManager
+from rpg_notion.api.entity_manager import NotionEntityManager
+from rpg_notion.api.fake_notion import FakeNotion
+from rpg_notion.api.notion_client import NotionClientWrapper
+from rpg_notion.api.rate_limiter import TokenBucketRateLimiter
+from rpg_notion.models.entities import EntityType, NPCStatus
+from rpg_notion.models.entity_cache import EntityCache
+from rpg_notion.models.repository import EntityRepository
+
+
+def _text(content: str) -> list:
+    """
+    Vytvoří hodnotu textové vlastnosti pro požadavek Notion API.
+    """
+    return [{"type": "text", "text": {"content": content}}]
+
+
+@pytest.fixture
+def fake():
+    """
+    Fixture pro lokální náhradu Notion API.
+    """
+    return FakeNotion(retry_after=0.01)
+
+
+@pytest.fixture
+def client(fake):
+    """
+    Fixture pro NotionClientWrapper napojený na lokální náhradu Notion API.
+    """
+    return NotionClientWrapper(
+        api_key="test_api_key",
+        rate_limiter=TokenBucketRateLimiter(rate=1000, capacity=100, jitter=0),
+        http_client=fake.http_client(),
+    )
+
+
+@pytest.fixture
+def npc_database(client):
+    """
+    Fixture s databází NPC a několika stránkami.
+    """
+    database = client.create_database("parent-page", "NPC", {
+        "Jméno": {"title": {}},
+        "Popis": {"rich_text": {}},
+        "Stav": {"select": {"options": [{"name": "Živý"}, {"name": "Zraněný"}]}},
+        "Lokace": {"relation": {"database_id": "loc-db", "single_property": {}}},
+    })
+    for index, (name, status, location) in enumerate([
+        ("Borek Kovář", "Živý", "loc-1"),
+        ("Milada Bylinkářka", "Zraněný", "loc-1"),
+        ("Radim Lapka", "Zraněný", "loc-2"),
+        ("Vlasta Kovářka", "Živý", None),
+        ("Zdeněk Poustevník", "Živý", "loc-2"),
+    ]):
+        client.create_page(database["id"], properties={
+            "Jméno": {"title": _text(name)},
+            "Popis": {"rich_text": _text(f"Postava číslo {index}")},
+            "Stav": {"select": {"name": status}},
+            "Lokace": {"relation": [{"id": location}] if location else []},
+        })
+    return database["id"]
+
+
+def test_query_filters_and_pagination(fake, client, npc_database):
+    """
+    Test filtrů title, rich_text, select a relation a stránkování kurzorem.
+    """
+    def names(filter=None, **kwargs):
+        return [
+            page["properties"]["Jméno"]["title"][0]["plain_text"]
+            for page in client.iter_query_database(npc_database, filter=filter, **kwargs)
+        ]
+
+    assert len(names(page_size=2)) == 5
+    assert fake.calls["databases.query"] == 3
+    assert names({"property": "Jméno", "title": {"contains": "kovář"}}) == ["Borek Kovář", "Vlasta Kovářka"]
+    assert names({"property": "Popis", "rich_text": {"equals": "Postava číslo 2"}}) == ["Radim Lapka"]
+    assert names({
+        "and": [
+            {"property": "Stav", "select": {"equals": "Zraněný"}},
+            {"property": "Lokace", "relation": {"contains": "loc-1"}},
+        ]
+    }) == ["Milada Bylinkářka"]
+    assert names({"property": "Lokace", "relation": {"is_empty": True}}) == ["Vlasta Kovářka"]
+    assert names(sorts=[{"property": "Jméno", "direction": "descending"}])[0] == "Zdeněk Poustevník"
+
+    projected = next(client.iter_query_database(npc_database, filter_properties=["title"], page_size=1))
+    assert list(projected["properties"]) == ["Jméno"]
+
+    with pytest.raises(APIResponseError):
+        client.query_database(npc_database, filter={"property": "Věk", "number": {"equals": 3}})
+
+
+def test_injected_errors(fake, client, npc_database):
+    """
+    Test, že chyba 429 se zopakuje podle hlavičky Retry-After a chyba 503 se předá volajícímu.
+    """
+    fake.fail_next(429, times=2)
+    assert len(client.query_database(npc_database)) == 5
+    assert fake.calls["databases.query"] == 3
+
+    fake.fail_next(503)
+    with pytest.raises(APIResponseError) as error:
+        client.get_database(npc_database)
+    assert error.value.code == "service_unavailable"
+
+    with pytest.raises(ValueError):
+        FakeNotion(error_rate=1.5)
+
+
+def test_blocks_and_search(client, npc_database):
+    """
+    Test připojení a stránkovaného čtení bloků a vyhledávání databází.
+    """
+    page = client.create_page("parent-page", parent_type="page_id", properties={"title": {"title": _text("Deník")}})
+    blocks = [
+        {"object": "block", "type": "paragraph", "paragraph": {"rich_text": _text(f"Záznam {index}")}}
+        for index in range(5)
+    ]
+    client.append_block_children(page["id"], blocks)
+
+    children = list(client.iter_block_children(page["id"], page_size=2))
+    assert [block["paragraph"]["rich_text"][0]["plain_text"] for block in children] == [
+        f"Záznam {index}" for index in range(5)
+    ]
+    assert [result["id"] for result in client.search("NPC", filter={"property": "object", "value": "database"})] == [
+        npc_database
+    ]
+    assert [result["id"] for result in client.search("deník")] == [page["id"]]
+
+
+def test_repository_offline(fake, client):
+    """
+    Test celého průchodu přes správce databází, správce entit a repozitář bez přístupu k síti.
+    """
+    manager = NotionDatabaseManager(client, max_workers=1)
+    database_ids = manager.create_all_databases("parent-page")
+    assert manager.find_existing_databases("parent-page") == database_ids
+
+    entity_manager = NotionEntityManager(client)
+    entity_manager.database_ids = dict(database_ids)
+    repository = EntityRepository(notion_client=client, entity_manager=entity_manager, cache=EntityCache(ttl=60))
+    repository.database_ids = dict(database_ids)
+    for index in range(6):
+        entity_manager.create_npc(f"NPC {index}", f"Popis {index}", status="Zraněný" if index % 2 else "Živý")
+
+    injured = list(repository.iter_all(
+        EntityType.NPC, filter={"property": "Stav", "select": {"equals": "Zraněný"}}, batch_size=2
+    ))
+    projected = list(repository.iter_all(EntityType.NPC, fields=["name", "status"]))
+
+    assert [npc.name for npc in injured] == ["NPC 1", "NPC 3", "NPC 5"]
+    assert all(npc.status == NPCStatus.INJURED for npc in injured)
+    assert len(projected) == 6
+    assert all(npc.description == "" for npc in projected)
+
+
+def test_async_client(fake, npc_database):
+    """
+    Test, že lokální náhradu lze sdílet i s asynchronním klientem.
+    """
+    async def run():
+        async with AsyncNotionClientWrapper(
+            api_key="test_api_key",
+            rate_limiter=TokenBucketRateLimiter(rate=1000, capacity=100, jitter=0),
+            http_client=fake.async_http_client(),
+        ) as client:
+            await client.create_pages([
+                {"parent_id": npc_database, "properties": {"Jméno": {"title": _text(f"Host {index}")}}}
+                for index in range(3)
+            ])
+            return await client.query_database(npc_database, filter={"property": "Jméno", "title": {"starts_with": "Host"}})
+
+    assert len(asyncio.run(run())) == 3
+
+
+def test_repository_concurrent_requests(fake, client):
+    """
+    Test, že repozitář s asynchronním klientem vyhledá entity více typů a uloží jejich změny souběžně.
+    """
+    database_ids = NotionDatabaseManager(client, max_workers=1).create_all_databases("parent-page")
+    entity_manager = NotionEntityManager(client)
+    entity_manager.database_ids = dict(database_ids)
+    async_client = AsyncNotionClientWrapper(
+        api_key="test_api_key",
+        rate_limiter=client.rate_limiter,
+        schema_cache=client.schema_cache,
+        http_client=fake.async_http_client(),
+    )
+    repository = EntityRepository(
+        notion_client=client, entity_manager=entity_manager, cache=EntityCache(ttl=60), async_client=async_client
+    )
+    repository.database_ids = dict(database_ids)
+    entity_manager.create_npc("Borek Kovář", "Kovář z Mlýnské")
+    entity_manager.create_location("Mlýnská", "Vesnice")
+
+    queries = fake.calls["databases.query"]
+    found = repository.find_many_by_types({
+        EntityType.NPC: ["Borek Kovář", "Neznámý poutník"],
+        EntityType.LOCATION: ["Mlýnská"],
+    })
+    assert fake.calls["databases.query"] - queries == 2
+    assert found[EntityType.NPC]["Neznámý poutník"] is None
+
+    npc = found[EntityType.NPC]["Borek Kovář"]
+    location = found[EntityType.LOCATION]["Mlýnská"]
+    npc.status = NPCStatus.INJURED
+    location.description = "Vypálená vesnice"
+    repository.save_many([npc, location, npc])
+    repository.close()
+
+    assert fake.calls["pages.update"] == 2
+    assert not npc.is_dirty and not location.is_dirty
+    assert client.get_page(npc.notion_page_id)["properties"]["Stav"]["select"]["name"] == "Zraněný"
@@ -44,7 +44,7 @@ def test_init_with_api_key(mock_notion_client):
     with patch.dict(os.environ, {"NOTION_API_KEY": "test_api_key"}):
         client = NotionClientWrapper()
         assert client.api_key == "test_api_key"
-        mock_notion_client.assert_called_once_with(auth="test_api_key", version="2022-06-28")
+        mock_notion_client.assert_called_once_with(auth="test_api_key", notion_version="2022-06-28", client=None)
 
 
 def test_handle_rate_limit(notion_client_wrapper):
@@ -101,3 +101,77 @@ def test_execute_with_retry_max_retries(notion_client_wrapper):
             notion_client_wrapper._execute_with_retry(mock_operation, "arg1", kwarg1="kwarg1")
         assert mock_operation.call_count == notion_client_wrapper.max_retries + 1
         assert mock_handle_rate_limit.call_count == notion_client_wrapper.max_retries
+
+
+@pytest.fixture
+def client_with_api_key(mock_notion_client):
+    """
+    Fixture pro NotionClientWrapper s explicitně zadaným API klíčem.
+    """
+    return NotionClientWrapper(api_key="test_api_key")
+
+
+def test_iter_query_database_follows_cursor(client_with_api_key):
+    """
+    Test procházení všech stránek výsledků pomocí kurzoru.
+    """
+    query = client_with_api_key.client.databases.query
+    query.side_effect = [
+        {"results": [{"id": "1"}, {"id": "2"}], "has_more": True, "next_cursor": "cursor-2"},
+        {"results": [{"id": "3"}], "has_more": False, "next_cursor": None},
+    ]
+
+    results = list(client_with_api_key.iter_query_database("db", page_size=2))
+
+    assert [page["id"] for page in results] == ["1", "2", "3"]
+    assert query.call_count == 2
+    query.assert_any_call(database_id="db", page_size=2)
+    query.assert_called_with(database_id="db", page_size=2, start_cursor="cursor-2")
+
+
+def test_iter_query_database_max_pages(client_with_api_key):
+    """
+    Test omezení počtu načtených stránek.
+    """
+    query = client_with_api_key.client.databases.query
+    query.return_value = {"results": [{"id": "1"}], "has_more": True, "next_cursor": "next"}
+
+    results = list(client_with_api_key.iter_query_database("db", max_pages=3))
+
+    assert len(results) == 3
+    assert query.call_count == 3
+
+
+def test_query_database_returns_all_pages(client_with_api_key):
+    """
+    Test, že query_database vrací výsledky ze všech stránek.
+    """
+    client_with_api_key.client.databases.query.side_effect = [
+        {"results": [{"id": str(i)} for i in range(100)], "has_more": True, "next_cursor": "c"},
+        {"results": [{"id": "100"}], "has_more": False},
+    ]
+
+    assert len(client_with_api_key.query_database("db")) == 101
+
+
+def test_iter_block_children_and_search(client_with_api_key):
+    """
+    Test stránkování potomků bloku a vyhledávání.
+    """
+    client_with_api_key.client.blocks.children.list.side_effect = [
+        {"results": [{"id": "b1"}], "has_more": True, "next_cursor": "c"},
+        {"results": [{"id": "b2"}], "has_more": False},
+    ]
+    client_with_api_key.client.search.return_value = {"results": [{"id": "s1"}], "has_more": False}
+
+    assert [block["id"] for block in client_with_api_key.iter_block_children("page")] == ["b1", "b2"]
+    assert [result["id"] for result in client_with_api_key.iter_search("drak")] == ["s1"]
+    client_with_api_key.client.search.assert_called_once_with(query="drak", page_size=100)
+
+
+def test_invalid_page_size(client_with_api_key):
+    """
+    Test neplatné velikosti stránky.
+    """
+    with pytest.raises(ValueError):
+        list(client_with_api_key.iter_query_database("db", page_size=101))
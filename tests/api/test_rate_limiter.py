@@ -0,0 +1,111 @@
+"""
+Testy pro TokenBucketRateLimiter.
+"""
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from rpg_notion.api.rate_limiter import TokenBucketRateLimiter, get_default_rate_limiter
+
+
+def test_burst_then_throttle(clock):
+    """
+    Test, že po vyčerpání kapacity se požadavky rozloží podle nastavené rychlosti.
+    """
+    limiter = TokenBucketRateLimiter(rate=2, capacity=2, jitter=0, clock=clock)
+
+    waits = [limiter._reserve() for _ in range(4)]
+
+    assert waits == [0.0, 0.0, pytest.approx(0.5), pytest.approx(1.0)]
+
+
+def test_tokens_refill_over_time(clock):
+    """
+    Test doplňování tokenů v čase (nejvýše do kapacity).
+    """
+    limiter = TokenBucketRateLimiter(rate=3, capacity=3, jitter=0, clock=clock)
+    for _ in range(3):
+        limiter._reserve()
+
+    clock.now += 10
+    waits = [limiter._reserve() for _ in range(4)]
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(1 / 3)
+
+
+def test_pause_delays_and_spreads_waiters(clock):
+    """
+    Test, že pauza podle Retry-After zdrží další požadavky a rozloží je v čase.
+    """
+    limiter = TokenBucketRateLimiter(rate=2, capacity=5, jitter=0, clock=clock)
+
+    limiter.pause(3)
+    waits = [limiter._reserve() for _ in range(2)]
+
+    assert waits == [pytest.approx(3.5), pytest.approx(4.0)]
+    assert limiter.get_metrics()["pauses"] == 1
+
+
+def test_jitter_is_bounded(clock):
+    """
+    Test, že náhodné prodloužení čekání nepřekročí nastavenou mez.
+    """
+    limiter = TokenBucketRateLimiter(rate=1, capacity=1, jitter=0.2, clock=clock)
+    limiter._reserve()
+
+    wait = limiter._reserve()
+
+    assert 1.0 <= wait <= 1.2
+
+
+def test_acquire_sleeps_and_records_metrics(clock):
+    """
+    Test blokujícího čekání a metrik fronty.
+    """
+    limiter = TokenBucketRateLimiter(rate=1, capacity=1, jitter=0, clock=clock)
+
+    with patch("rpg_notion.api.rate_limiter.time.sleep") as mock_sleep:
+        limiter.acquire()
+        limiter.acquire()
+
+    mock_sleep.assert_called_once_with(pytest.approx(1.0))
+    metrics = limiter.get_metrics()
+    assert metrics["acquired"] == 2
+    assert metrics["delayed"] == 1
+    assert metrics["queue_depth"] == 0
+    assert metrics["max_queue_depth"] == 1
+    assert metrics["total_wait_seconds"] == pytest.approx(1.0)
+
+
+def test_acquire_async_tracks_queue_depth():
+    """
+    Test, že souběžně čekající asynchronní požadavky se projeví v hloubce fronty.
+    """
+    limiter = TokenBucketRateLimiter(rate=200, capacity=1, jitter=0)
+
+    async def run():
+        await asyncio.gather(*(limiter.acquire_async() for _ in range(5)))
+
+    asyncio.run(run())
+
+    metrics = limiter.get_metrics()
+    assert metrics["acquired"] == 5
+    assert metrics["max_queue_depth"] == 4
+    assert metrics["queue_depth"] == 0
+
+
+def test_invalid_configuration():
+    """
+    Test odmítnutí neplatné konfigurace.
+    """
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(rate=0)
+
+
+def test_default_rate_limiter_is_shared():
+    """
+    Test, že výchozí limiter je sdílený v rámci procesu.
+    """
+    assert get_default_rate_limiter() is get_default_rate_limiter()
@@ -0,0 +1,151 @@
+"""
+Testy pro cache schémat databází a kontrolu vlastností před odesláním.
+"""
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from rpg_notion.api.async_notion_client import AsyncNotionClientWrapper
+from rpg_notion.api.notion_client import NotionClientWrapper
+from rpg_notion.api.rate_limiter import TokenBucketRateLimiter
+from rpg_notion.api.schema_cache import DatabaseSchemaCache, validate_properties
+
+DATABASE = {
+    "id": "db-1",
+    "properties": {
+        "Jméno": {"id": "title", "type": "title", "title": {}},
+        "Popis": {"id": "a", "type": "rich_text", "rich_text": {}},
+        "Stav": {"id": "b", "type": "select", "select": {"options": [{"name": "Živý"}]}},
+        "Vztah k hráči": {"id": "c", "type": "number", "number": {}},
+        "Vztahy": {"id": "d", "type": "relation", "relation": {}},
+    },
+}
+
+
+@pytest.fixture
+def client():
+    """
+    Fixture pro NotionClientWrapper s mock Notion klientem a zapnutou kontrolou vlastností.
+    """
+    with patch("rpg_notion.api.notion_client.Client"):
+        wrapper = NotionClientWrapper(
+            api_key="test_api_key", rate_limiter=TokenBucketRateLimiter(rate=1000, capacity=1000), validate=True
+        )
+    wrapper.client.databases.retrieve.return_value = DATABASE
+    wrapper.client.pages.create.return_value = {"id": "page-1"}
+    return wrapper
+
+
+def test_validate_properties_coerces_values():
+    """
+    Test převodu hodnot do tvaru Notion API.
+    """
+    schema = DatabaseSchemaCache().store("db-1", DATABASE["properties"])
+
+    validated = validate_properties(schema, {
+        "Jméno": {"rich_text": "Gandalf"},
+        "Popis": {"rich_text": [{"type": "text", "text": {"content": "x" * 4500}}]},
+        "Stav": {"select": "Živý"},
+        "Vztah k hráči": {"number": "3"},
+        "Vztahy": {"relation": ["npc-2"]},
+    })
+
+    assert validated["Jméno"] == {"title": [{"type": "text", "text": {"content": "Gandalf"}}]}
+    assert [len(item["text"]["content"]) for item in validated["Popis"]["rich_text"]] == [2000, 2000, 500]
+    assert validated["Stav"] == {"select": {"name": "Živý"}}
+    assert validated["Vztah k hráči"] == {"number": 3.0}
+    assert validated["Vztahy"] == {"relation": [{"id": "npc-2"}]}
+
+
+@pytest.mark.parametrize("properties", [
+    {"Povolání": {"rich_text": []}},
+    {"Stav": {"multi_select": [{"name": "Živý"}]}},
+    {"Vztah k hráči": {"number": "hodně"}},
+    {"Vztahy": {"relation": [{"id": str(i)} for i in range(101)]}},
+])
+def test_validate_properties_rejects_invalid_values(properties):
+    """
+    Test odmítnutí neznámé vlastnosti, nesprávného typu a neplatné hodnoty.
+    """
+    schema = DatabaseSchemaCache().store("db-1", DATABASE["properties"])
+
+    with pytest.raises(ValueError):
+        validate_properties(schema, properties, "db-1")
+
+
+def test_create_page_fetches_schema_once_and_fails_locally(client):
+    """
+    Test, že se schéma načte jednou a chybný zápis selže bez požadavku na vytvoření stránky.
+    """
+    client.create_page("db-1", properties={"Jméno": {"title": []}})
+    client.create_page("db-1", properties={"Jméno": {"title": []}})
+
+    with pytest.raises(ValueError):
+        client.create_page("db-1", properties={"Jmeno": {"title": []}})
+
+    assert client.client.databases.retrieve.call_count == 1
+    assert client.client.pages.create.call_count == 2
+
+
+def test_update_database_refreshes_schema(client):
+    """
+    Test, že aktualizace databáze obnoví schéma v cache a aktualizace stránky se kontroluje.
+    """
+    client.create_page("db-1", properties={"Jméno": {"title": []}})
+    updated = {"id": "db-1", "properties": dict(DATABASE["properties"], Povolání={"type": "rich_text", "rich_text": {}})}
+    client.client.databases.update.return_value = updated
+
+    client.update_database("db-1", properties={"Povolání": {"rich_text": {}}})
+    client.update_page("page-1", properties={"Povolání": {"rich_text": "Čaroděj"}})
+
+    assert client.client.databases.retrieve.call_count == 1
+    client.client.pages.update.assert_called_once_with(
+        page_id="page-1", properties={"Povolání": {"rich_text": [{"type": "text", "text": {"content": "Čaroděj"}}]}}
+    )
+
+
+def test_remembered_pages_are_bounded():
+    """
+    Test, že cache zapomíná nejdéle nepoužité stránky nad limit.
+    """
+    cache = DatabaseSchemaCache(max_pages=2)
+    cache.remember_page("page-1", "db-1")
+    cache.remember_page("page-2", "db-1")
+    assert cache.database_of("page-1") == "db-1"
+
+    cache.remember_page("page-3", "db-2")
+
+    assert cache.database_of("page-2") is None
+    assert cache.database_of("page-1") == "db-1"
+    assert cache.database_of("page-3") == "db-2"
+    with pytest.raises(ValueError):
+        DatabaseSchemaCache(max_pages=0)
+
+
+def test_async_client_shares_schema_validation(client):
+    """
+    Test, že asynchronní klient se sdílenou cache kontroluje vytvoření i aktualizaci stránek
+    bez dalšího načtení schématu.
+    """
+    client.create_page("db-1", properties={"Jméno": {"title": []}})
+    with patch("rpg_notion.api.async_notion_client.AsyncClient"):
+        async_client = AsyncNotionClientWrapper(
+            api_key="test_api_key",
+            rate_limiter=TokenBucketRateLimiter(rate=1000, capacity=1000),
+            validate=True,
+            schema_cache=client.schema_cache,
+        )
+    async_client.client.pages.create = AsyncMock(return_value={"id": "page-2"})
+    async_client.client.pages.update = AsyncMock(return_value={"id": "page-1"})
+    async_client.client.databases.retrieve = AsyncMock(return_value=DATABASE)
+
+    with pytest.raises(ValueError):
+        asyncio.run(async_client.create_page("db-1", properties={"Jmeno": {"title": []}}))
+    asyncio.run(async_client.update_page("page-1", properties={"Stav": {"select": "Živý"}}))
+
+    async_client.client.pages.create.assert_not_awaited()
+    async_client.client.databases.retrieve.assert_not_awaited()
+    async_client.client.pages.update.assert_awaited_once_with(
+        page_id="page-1", properties={"Stav": {"select": {"name": "Živý"}}}
+    )
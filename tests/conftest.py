@@ -3,12 +3,104 @@ Konfigurace pro pytest.
 """
 import os
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+from unittest.mock import MagicMock
 
 import pytest
 from dotenv import load_dotenv
 
+from rpg_notion.models.entity_cache import EntityCache
+from rpg_notion.models.repository import EntityRepository
+
 # Načtení proměnných prostředí z .env souboru
 load_dotenv()
 
 # Nastavení testovacího prostředí
 os.environ["TESTING"] = "True"
+
+
+class FakeClock:
+    """
+    Ručně posouvané hodiny pro deterministické testy.
+    """
+
+    def __init__(self, start: float = 0.0):
+        """
+        Inicializace hodin.
+
+        Args:
+            start: Počáteční čas v sekundách.
+        """
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(request) -> FakeClock:
+    """
+    Fixture pro ručně posouvané hodiny.
+
+    Počáteční čas lze zadat nepřímou parametrizací, např.
+    ``@pytest.mark.parametrize("clock", [100.0], indirect=True)``.
+    """
+    return FakeClock(getattr(request, "param", 0.0))
+
+
+@pytest.fixture
+def notion_npc_page() -> Callable[..., Dict[str, Any]]:
+    """
+    Fixture pro tvorbu stránek NPC ve formátu Notion API.
+    """
+    def build(
+        page_id: str,
+        name: str,
+        status: str = "Živý",
+        description: Optional[str] = None,
+        last_edited_time: Optional[str] = None,
+        item_ids: Iterable[str] = (),
+    ) -> Dict[str, Any]:
+        page: Dict[str, Any] = {
+            "id": page_id,
+            "properties": {
+                "Jméno": {"type": "title", "title": [{"plain_text": name}]},
+                "Stav": {"type": "select", "select": {"name": status}},
+                "Významné předměty": {"type": "relation", "relation": [{"id": item_id} for item_id in item_ids]},
+            },
+        }
+        if description is not None:
+            page["properties"]["Popis"] = {"type": "rich_text", "rich_text": [{"plain_text": description}]}
+        if last_edited_time is not None:
+            page["last_edited_time"] = last_edited_time
+        return page
+
+    return build
+
+
+@pytest.fixture
+def repository_factory() -> Callable[..., EntityRepository]:
+    """
+    Fixture pro tvorbu EntityRepository s mock klientem a mock entity managerem.
+
+    Klíčové argumenty se předají konstruktoru repozitáře a přepíší výchozí hodnoty.
+    """
+    def create(**kwargs: Any) -> EntityRepository:
+        entity_manager = MagicMock()
+        entity_manager.update_entity.return_value = {"id": "page", "last_edited_time": "2024-05-01T10:00:00.000Z"}
+        kwargs.setdefault("notion_client", MagicMock())
+        kwargs.setdefault("entity_manager", entity_manager)
+        kwargs.setdefault("cache", EntityCache(ttl=60))
+        repository = EntityRepository(**kwargs)
+        repository.database_ids["npcs"] = "npc_db"
+        return repository
+
+    return create
+
+
+@pytest.fixture
+def repository(repository_factory) -> EntityRepository:
+    """
+    Fixture pro EntityRepository s mock klientem a mock entity managerem.
+    """
+    return repository_factory()
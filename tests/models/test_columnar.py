@@ -0,0 +1,93 @@
+"""
+Testy pro sloupcovou reprezentaci entit (ColumnarStore).
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from rpg_notion.models.columnar import ColumnarStore, ColumnarTable
+from rpg_notion.models.entities import NPC, EntityType, Location, LocationType, NPCStatus
+from rpg_notion.models.local_mirror import LocalMirror
+
+
+@pytest.fixture
+def npcs():
+    """
+    Fixture se sadou NPC.
+    """
+    return [
+        NPC(
+            name=f"NPC {i}",
+            notion_page_id=f"npc-{i}",
+            status=NPCStatus.INJURED if i % 2 else NPCStatus.ALIVE,
+            location_id="loc-1" if i < 3 else None,
+            item_ids=["item-1", "item-2"][:i % 3],
+            tags=["elf"] if i % 2 else [],
+            created_at=datetime(2024, 5, i + 1, 12, 0, tzinfo=timezone.utc),
+        )
+        for i in range(6)
+    ]
+
+
+def test_table_round_trip(npcs):
+    """
+    Test, že z řádků tabulky lze sestavit původní entity.
+    """
+    table = ColumnarTable.from_entities(EntityType.NPC, iter(npcs))
+
+    assert len(table) == len(npcs)
+    assert table.columns["status"].dtype == np.int8
+    assert table.columns["item_ids"].dtype == np.int32
+    assert table.columns["created_at"].dtype == np.dtype("datetime64[us]")
+    assert list(table.entities()) == npcs
+
+
+def test_filters_and_group_by(npcs):
+    """
+    Test vektorových filtrů a seskupení podle výčtu, relace a tagů.
+    """
+    table = ColumnarTable.from_entities(EntityType.NPC, npcs)
+
+    injured_elves = table.mask_equals("status", "Zraněný") & table.mask_equals("tags", "elf")
+    assert [npc.name for npc in table.entities(injured_elves)] == ["NPC 1", "NPC 3", "NPC 5"]
+    assert table.mask_equals("item_ids", "item-2").tolist() == [False, False, True, False, False, True]
+    assert not table.mask_equals("location_id", "loc-unknown").any()
+    assert table.mask_equals("location_id", None).sum() == 3
+    assert table.count_by("status") == {NPCStatus.ALIVE: 3, NPCStatus.INJURED: 3}
+    assert table.count_by("item_ids") == {"item-1": 4, "item-2": 2}
+    assert table.relation_lengths("item_ids").tolist() == [0, 1, 2, 0, 1, 2]
+
+    with pytest.raises(ValueError):
+        table.mask_equals("status", "Nesmrtelný")
+
+
+def test_join_relation_to_target_table(npcs):
+    """
+    Test, že relaci lze spojit s řádky cílové tabulky přes sdílený slovník ID.
+    """
+    store = ColumnarStore()
+    store.add(EntityType.LOCATION, [Location(name="Roklinka", notion_page_id="loc-1", location_type=LocationType.CITY)])
+    store.add(EntityType.NPC, npcs[:3])
+    store.add(EntityType.NPC, npcs[3:])
+
+    offsets, rows = store.join(EntityType.NPC, "location_id", EntityType.LOCATION)
+
+    assert offsets.tolist() == list(range(7))
+    assert rows.tolist() == [0, 0, 0, -1, -1, -1]
+    with pytest.raises(ValueError):
+        store.join(EntityType.NPC, "name", EntityType.LOCATION)
+
+
+def test_from_mirror(npcs):
+    """
+    Test sestavení úložiště ze synchronizovaných typů v lokálním zrcadle.
+    """
+    mirror = LocalMirror()
+    mirror.upsert_many(npcs)
+    mirror.set_watermark(EntityType.NPC, "npc_db", "2024-05-06T00:00:00.000Z")
+
+    store = ColumnarStore.from_mirror(mirror)
+
+    assert list(store.tables) == [EntityType.NPC]
+    assert store.table(EntityType.NPC).count_by("tags") == {"elf": 3}
@@ -0,0 +1,79 @@
+"""
+Testy pro NotionConverter.
+"""
+from datetime import datetime
+
+import pytest
+
+from rpg_notion.models.converters import NotionConverter
+from rpg_notion.models.entities import NPC, AdventureJournalEntry, EntityType, Faction, NPCStatus
+
+
+def _as_page(page_id: str, properties: dict) -> dict:
+    """
+    Doplní vlastnosti odesílané do Notion o ``plain_text``, jak je vrací Notion API.
+    """
+    for value in properties.values():
+        for key in ("title", "rich_text"):
+            for item in value.get(key, []):
+                item["plain_text"] = item["text"]["content"]
+    return {
+        "id": page_id,
+        "created_time": "2024-05-01T10:00:00.000Z",
+        "last_edited_time": "2024-05-02T10:00:00.000Z",
+        "properties": properties,
+    }
+
+
+@pytest.mark.parametrize("entity", [
+    NPC(
+        name="Elrond",
+        description="Pán Roklinky",
+        status=NPCStatus.INJURED,
+        location_id="loc-1",
+        item_ids=["item-1", "item-2"],
+        tags=["elf"],
+    ),
+    Faction(name="Bílá rada", member_ids=["npc-1"], player_relation=-3),
+    AdventureJournalEntry(name="Epizoda 1", date=datetime(2024, 5, 1, 20, 0), summary="x" * 4500),
+])
+def test_entity_round_trip(entity):
+    """
+    Test, že převod entity na vlastnosti a zpět zachová hodnoty všech polí.
+    """
+    page = _as_page("page-1", NotionConverter.entity_to_properties(entity))
+
+    converted = NotionConverter.notion_to_entity(page, entity.type)
+
+    assert type(converted) is type(entity)
+    assert converted.notion_page_id == "page-1"
+    assert converted.updated_at == datetime.fromisoformat("2024-05-02T10:00:00.000+00:00")
+    expected = entity.model_dump(exclude={"id", "notion_page_id", "created_at", "updated_at"})
+    assert converted.model_dump(exclude={"id", "notion_page_id", "created_at", "updated_at"}) == expected
+    assert not converted.is_dirty
+
+
+def test_notion_to_entity_rejects_unknown_status():
+    """
+    Test, že neplatná hodnota výčtu ze stránky se ohlásí chybou validace.
+    """
+    page = _as_page("page-1", NotionConverter.values_to_properties(EntityType.NPC, {"name": "Elrond"}))
+    page["properties"]["Stav"] = {"type": "select", "select": {"name": "Nesmrtelný"}}
+
+    with pytest.raises(ValueError):
+        NotionConverter.notion_to_entity(page, EntityType.NPC)
+
+
+def test_values_to_properties_skips_unmapped_fields():
+    """
+    Test, že pole bez vlastnosti v Notion se do vlastností nepřevedou.
+    """
+    properties = NotionConverter.values_to_properties(
+        EntityType.NPC, {"name": "Elrond", "status": NPCStatus.ALIVE, "location_id": "loc-1", "id": "x"}
+    )
+
+    assert properties == {
+        "Jméno": {"title": [{"type": "text", "text": {"content": "Elrond"}}]},
+        "Stav": {"select": {"name": "Živý"}},
+        "Lokace": {"relation": [{"id": "loc-1"}]},
+    }
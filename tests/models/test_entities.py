@@ -169,3 +169,43 @@ def test_adventure_journal_entry_creation():
     assert entry.summary == "Družina se setkala v hostinci a vydala se na cestu"
     assert entry.tags == ["Začátek", "Setkání"]
     assert entry.type == EntityType.ADVENTURE_JOURNAL
+
+
+def test_dirty_field_tracking():
+    """
+    Test sledování změněných polí včetně změny seznamu na místě.
+    """
+    npc = NPC(name="Gandalf", description="Mocný čaroděj")
+
+    assert not npc.is_dirty
+    assert npc.dirty_fields() == set()
+
+    npc.description = "Mocný čaroděj"
+    assert not npc.is_dirty
+
+    npc.tags.append("Spojenec")
+    npc.status = NPCStatus.INJURED
+    assert npc.is_dirty
+    assert npc.dirty_fields() == {"tags", "status"}
+
+    npc.mark_clean()
+    assert not npc.is_dirty
+
+
+def test_dirty_tracking_compares_values():
+    """
+    Test, že změna se pozná i u hodnot se stejným hashem (-1 a -2) a u hodnot různého typu.
+    """
+    faction = Faction(name="Cech zlodějů", player_relation=-1)
+
+    faction.player_relation = -2
+    assert faction.dirty_fields() == {"player_relation"}
+
+    faction.mark_clean()
+    faction.player_relation = 0
+    faction.mark_clean()
+    faction.player_relation = False
+    assert faction.is_dirty
+
+    faction.mark_clean(["player_relation"])
+    assert not faction.is_dirty
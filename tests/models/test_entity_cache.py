@@ -0,0 +1,99 @@
+"""
+Testy pro EntityCache a její použití v EntityRepository.
+"""
+from rpg_notion.models.entities import EntityType, NPC
+from rpg_notion.models.entity_cache import EntityCache
+
+
+def test_lookup_normalizes_name():
+    """
+    Test, že klíč cache nezávisí na velikosti písmen a mezerách.
+    """
+    cache = EntityCache(ttl=60, max_size=10)
+    npc = NPC(name="Gandalf Šedý")
+    cache.put_entity(npc)
+
+    assert cache.lookup(EntityType.NPC, "  gandalf   ŠEDÝ ") == (True, npc)
+    assert cache.lookup(EntityType.LOCATION, "Gandalf Šedý") == (False, None)
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_expiration(clock):
+    """
+    Test vypršení platnosti záznamu.
+    """
+    cache = EntityCache(ttl=10, max_size=10, clock=clock)
+    cache.put(EntityType.NPC, "Frodo", None)
+
+    assert cache.lookup(EntityType.NPC, "Frodo") == (True, None)
+    clock.now = 11
+    assert cache.lookup(EntityType.NPC, "Frodo") == (False, None)
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    """
+    Test vytěsnění nejdéle nepoužitého záznamu.
+    """
+    cache = EntityCache(ttl=60, max_size=2)
+    cache.put(EntityType.NPC, "A", None)
+    cache.put(EntityType.NPC, "B", None)
+    cache.lookup(EntityType.NPC, "A")
+    cache.put(EntityType.NPC, "C", None)
+
+    assert cache.lookup(EntityType.NPC, "B") == (False, None)
+    assert cache.lookup(EntityType.NPC, "A")[0]
+    assert cache.lookup(EntityType.NPC, "C")[0]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_repository_find_by_name_uses_cache(repository, notion_npc_page):
+    """
+    Test, že opakované vyhledání stejné entity proběhne v Notion jen jednou.
+    """
+    repository.entity_manager.find_entity_by_name.return_value = notion_npc_page("page-1", "Gandalf")
+
+    first = repository.find_by_name(EntityType.NPC, "Gandalf")
+    second = repository.find_by_name(EntityType.NPC, "gandalf")
+
+    assert first is second
+    assert first.notion_page_id == "page-1"
+    repository.entity_manager.find_entity_by_name.assert_called_once_with("npc_db", "Gandalf")
+
+
+def test_repository_write_through_on_create(repository, notion_npc_page):
+    """
+    Test, že vytvořená entita přepíše negativní záznam v cache.
+    """
+    repository.entity_manager.find_entity_by_name.return_value = None
+    repository.entity_manager.create_npc.return_value = notion_npc_page("page-2", "Frodo")
+
+    assert repository.find_by_name(EntityType.NPC, "Frodo") is None
+    assert repository.find_by_name(EntityType.NPC, "Frodo") is None
+    created = repository.create_npc(NPC(name="Frodo"))
+
+    assert repository.find_by_name(EntityType.NPC, "Frodo") is created
+    repository.entity_manager.find_entity_by_name.assert_called_once()
+
+
+def test_find_many_by_names_single_query(repository, notion_npc_page):
+    """
+    Test, že hromadné vyhledání pošle pro nevyřešené názvy jediný dotaz a výsledky uloží do cache.
+    """
+    repository.entity_manager.find_entities_by_names.return_value = [
+        notion_npc_page("page-1", "Gandalf"),
+        notion_npc_page("page-2", "Frodo"),
+    ]
+
+    resolved = repository.find_many_by_names(EntityType.NPC, ["Gandalf", "frodo", "Saruman", "Gandalf"])
+
+    assert resolved["Gandalf"].notion_page_id == "page-1"
+    assert resolved["frodo"].notion_page_id == "page-2"
+    assert resolved["Saruman"] is None
+    repository.entity_manager.find_entities_by_names.assert_called_once_with(
+        "npc_db", ["Gandalf", "frodo", "Saruman"]
+    )
+
+    assert repository.find_by_name(EntityType.NPC, "Saruman") is None
+    repository.entity_manager.find_entity_by_name.assert_not_called()
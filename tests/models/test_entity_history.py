@@ -0,0 +1,56 @@
+"""
+Testy pro ukládání historie entit jako bloků stránky.
+"""
+import pytest
+
+from rpg_notion.models.entities import NPC, Event
+
+
+@pytest.fixture
+def repository(repository_factory):
+    """
+    Fixture pro EntityRepository v režimu ukládání historie do bloků.
+    """
+    return repository_factory(history_mode="blocks", history_compact_every=3)
+
+
+def test_flush_history_batches_entries_per_page(repository):
+    """
+    Test, že se záznamy jedné stránky připojí jedním požadavkem.
+    """
+    gandalf = NPC(id="npc-1", notion_page_id="npc-1", name="Gandalf")
+    frodo = NPC(id="npc-2", notion_page_id="npc-2", name="Frodo")
+
+    repository.queue_history_entry(gandalf, "Porazil balroga.")
+    repository.queue_history_entry(frodo, "Zničil prsten.")
+    repository.queue_history_entry(gandalf, "Vrátil se jako Bílý.")
+
+    assert repository.flush_history() == 3
+    assert repository.entity_manager.append_entity_history.call_args_list[0].args == (
+        "npc-1", ["Porazil balroga.", "Vrátil se jako Bílý."]
+    )
+    assert repository.entity_manager.append_entity_history.call_count == 2
+    repository.entity_manager.update_entity_history.assert_not_called()
+    assert repository.flush_history() == 0
+
+
+def test_history_is_compacted_periodically(repository):
+    """
+    Test, že se historie po zadaném počtu záznamů zkopíruje do vlastnosti.
+    """
+    gandalf = NPC(id="npc-1", notion_page_id="npc-1", name="Gandalf")
+
+    repository.update_entity_history(gandalf, "První")
+    repository.update_entity_history(gandalf, "Druhý")
+    repository.entity_manager.compact_entity_history.assert_not_called()
+
+    repository.update_entity_history(gandalf, "Třetí")
+    repository.entity_manager.compact_entity_history.assert_called_once_with("npc-1", "Historie změn")
+
+
+def test_queue_history_entry_rejects_unsupported_entity(repository):
+    """
+    Test, že typ entity bez historie vyvolá chybu.
+    """
+    with pytest.raises(ValueError):
+        repository.queue_history_entry(Event(id="e-1", notion_page_id="e-1", name="Bitva"), "Záznam")
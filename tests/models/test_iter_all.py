@@ -0,0 +1,101 @@
+"""
+Testy pro postupné procházení entit (EntityRepository.iter_all).
+"""
+import pytest
+
+from rpg_notion.models.entities import EntityType, LocationType, NPCStatus
+
+
+@pytest.fixture
+def repository(repository):
+    """
+    Fixture pro EntityRepository se schématem databáze NPC.
+    """
+    repository.client.get_database_schema.return_value = {
+        "Jméno": {"id": "title", "type": "title", "options": None},
+        "Stav": {"id": "st%3A", "type": "select", "options": {"Živý", "Zraněný"}},
+    }
+    return repository
+
+
+@pytest.fixture
+def injured_npc_page(notion_npc_page):
+    """
+    Fixture pro tvorbu stránek zraněných NPC s popisem.
+    """
+    return lambda page_id, name: notion_npc_page(page_id, name, status="Zraněný", description=f"Popis {name}")
+
+
+def test_iter_all_converts_pages_lazily(repository, injured_npc_page):
+    """
+    Test, že stránky se převádějí až při procházení a předává se filtr i velikost dávky.
+    """
+    consumed = []
+
+    def pages(*args, **kwargs):
+        for page_id in ("page-1", "page-2"):
+            consumed.append(page_id)
+            yield injured_npc_page(page_id, page_id.upper())
+
+    repository.client.iter_query_database.side_effect = pages
+    status_filter = {"property": "Stav", "select": {"equals": "Zraněný"}}
+
+    entities = repository.iter_all(EntityType.NPC, filter=status_filter, batch_size=25)
+    first = next(entities)
+
+    assert first.name == "PAGE-1"
+    assert consumed == ["page-1"]
+    assert [entity.name for entity in entities] == ["PAGE-2"]
+    repository.client.iter_query_database.assert_called_once_with(
+        "npc_db", filter=status_filter, page_size=25, filter_properties=None
+    )
+    assert repository.cache.lookup(EntityType.NPC, "PAGE-2")[0]
+
+
+def test_iter_all_projects_fields(repository, injured_npc_page):
+    """
+    Test, že při zadání polí se od Notion vyžádají jen odpovídající vlastnosti a dekódují se jen tato pole.
+    """
+    repository.client.iter_query_database.return_value = iter([injured_npc_page("page-1", "Gandalf")])
+
+    entities = list(repository.iter_all(EntityType.NPC, fields=["status"]))
+
+    assert entities[0].name == "Gandalf"
+    assert entities[0].status == NPCStatus.INJURED
+    assert entities[0].description == ""
+    filter_properties = repository.client.iter_query_database.call_args.kwargs["filter_properties"]
+    assert sorted(filter_properties) == ["st%3A", "title"]
+    assert repository.cache.lookup(EntityType.NPC, "Gandalf") == (False, None)
+
+
+def test_iter_all_rejects_unknown_field(repository):
+    """
+    Test, že neznámé pole entity se ohlásí chybou.
+    """
+    with pytest.raises(ValueError):
+        list(repository.iter_all(EntityType.NPC, fields=["wingspan"]))
+
+
+def test_iter_all_projection_keeps_required_fields(repository):
+    """
+    Test, že projekce lokace dekóduje i povinný typ lokace, i když nebyl vyžádán.
+    """
+    repository.database_ids["locations"] = "loc_db"
+    repository.client.get_database_schema.return_value = {
+        "Název": {"id": "title", "type": "title", "options": None},
+        "Typ": {"id": "ty%3A", "type": "select", "options": {"Město", "Les"}},
+    }
+    repository.client.iter_query_database.return_value = iter([{
+        "id": "loc-1",
+        "properties": {
+            "Název": {"type": "title", "title": [{"plain_text": "Roklinka"}]},
+            "Typ": {"type": "select", "select": {"name": "Město"}},
+        },
+    }])
+
+    locations = list(repository.iter_all(EntityType.LOCATION, fields=["name"]))
+
+    assert locations[0].name == "Roklinka"
+    assert locations[0].location_type == LocationType.CITY
+    filter_properties = repository.client.iter_query_database.call_args.kwargs["filter_properties"]
+    assert sorted(filter_properties) == ["title", "ty%3A"]
@@ -0,0 +1,106 @@
+"""
+Testy pro LocalMirror a synchronizaci zrcadla v EntityRepository.
+"""
+import pytest
+
+from rpg_notion.models.entities import EntityType, Item, ItemType, NPC
+from rpg_notion.models.local_mirror import LocalMirror
+
+
+@pytest.fixture
+def mirror():
+    """
+    Fixture pro zrcadlo v paměti.
+    """
+    mirror = LocalMirror()
+    yield mirror
+    mirror.close()
+
+
+@pytest.fixture
+def repository(repository_factory, mirror):
+    """
+    Fixture pro EntityRepository se zrcadlem a mock klientem.
+    """
+    return repository_factory(mirror=mirror)
+
+
+def test_upsert_and_lookup(mirror):
+    """
+    Test uložení entity a vyhledání podle názvu, ID a relací.
+    """
+    npc = NPC(id="npc-1", notion_page_id="npc-1", name="Gandalf", item_ids=["item-1", "item-2"])
+    item = Item(id="item-1", notion_page_id="item-1", name="Glamdring", item_type=ItemType.WEAPON, owner_id="npc-1")
+    mirror.upsert(npc)
+    mirror.upsert(item)
+
+    assert mirror.find_by_name(EntityType.NPC, "gandalf") == npc
+    assert mirror.get(EntityType.ITEM, "item-1") == item
+    assert sorted(mirror.get_related_ids(EntityType.NPC, "npc-1", "item_ids")) == ["item-1", "item-2"]
+    assert mirror.find_referencing(EntityType.ITEM, "npc-1") == [item]
+
+    npc.item_ids = ["item-2"]
+    mirror.upsert(npc)
+    assert mirror.get_related_ids(EntityType.NPC, "npc-1") == ["item-2"]
+    assert mirror.count(EntityType.NPC) == 1
+
+
+def test_incremental_sync_uses_watermark(repository, mirror, notion_npc_page):
+    """
+    Test, že druhá synchronizace načte jen stránky upravené od poslední značky.
+    """
+    repository.client.iter_query_database.return_value = [
+        notion_npc_page("npc-1", "Gandalf", last_edited_time="2024-01-01T10:00:00.000Z"),
+        notion_npc_page("npc-2", "Frodo", last_edited_time="2024-01-02T10:00:00.000Z"),
+    ]
+    assert repository.sync_mirror([EntityType.NPC]) == {EntityType.NPC: 2}
+    first_call = repository.client.iter_query_database.call_args
+    assert first_call.kwargs["filter"] is None
+
+    repository.client.iter_query_database.return_value = [
+        notion_npc_page("npc-2", "Frodo Pytlík", last_edited_time="2024-01-03T10:00:00.000Z"),
+    ]
+    repository.sync_mirror([EntityType.NPC])
+
+    second_call = repository.client.iter_query_database.call_args
+    assert second_call.kwargs["filter"] == {
+        "timestamp": "last_edited_time",
+        "last_edited_time": {"on_or_after": "2024-01-02T10:00:00.000Z"},
+    }
+    assert mirror.get_watermark(EntityType.NPC) == "2024-01-03T10:00:00.000Z"
+    assert mirror.get(EntityType.NPC, "npc-2").name == "Frodo Pytlík"
+
+
+def test_repository_reads_from_synced_mirror(repository, notion_npc_page):
+    """
+    Test, že po synchronizaci repozitář čte ze zrcadla a neposílá dotazy do Notion.
+    """
+    repository.client.iter_query_database.return_value = [
+        notion_npc_page("npc-1", "Gandalf", last_edited_time="2024-01-01T10:00:00.000Z", item_ids=["item-1"]),
+    ]
+    repository.sync_mirror([EntityType.NPC])
+    repository.cache.clear()
+    repository.client.iter_query_database.reset_mock()
+
+    assert repository.find_by_name(EntityType.NPC, "Gandalf").notion_page_id == "npc-1"
+    assert repository.find_by_name(EntityType.NPC, "Saruman") is None
+    assert [npc.name for npc in repository.find_all(EntityType.NPC)] == ["Gandalf"]
+    assert [npc.name for npc in repository.find_referencing(EntityType.NPC, "item-1")] == ["Gandalf"]
+
+    repository.entity_manager.find_entity_by_name.assert_not_called()
+    repository.client.iter_query_database.assert_not_called()
+
+
+def test_full_sync_removes_missing_pages(repository, mirror, notion_npc_page):
+    """
+    Test, že úplná synchronizace odstraní stránky, které v Notion již nejsou.
+    """
+    mirror.upsert(NPC(id="npc-old", notion_page_id="npc-old", name="Smazaný"))
+    repository.client.iter_query_database.return_value = [
+        notion_npc_page("npc-1", "Gandalf", last_edited_time="2024-01-01T10:00:00.000Z"),
+    ]
+
+    repository.sync_mirror([EntityType.NPC], full=True)
+
+    assert mirror.get(EntityType.NPC, "npc-old") is None
+    assert mirror.count(EntityType.NPC) == 1
@@ -0,0 +1,188 @@
+"""
+Testy pro NotionOutbox a zápis přes frontu v EntityRepository.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+from rpg_notion.models.entities import EntityType, NPC
+from rpg_notion.models.outbox import NotionOutbox, is_provisional_id
+
+
+def _title(name: str) -> dict:
+    return {"title": [{"type": "text", "text": {"content": name}}]}
+
+
+def test_flush_resolves_provisional_ids_in_order():
+    """
+    Test, že se dočasná ID v cílové stránce i v relacích nahradí skutečnými.
+    """
+    outbox = NotionOutbox()
+    client = MagicMock()
+    client.create_page.side_effect = [{"id": "page-location"}, {"id": "page-npc"}]
+
+    location_id = outbox.enqueue_create(EntityType.LOCATION, "location_db", {"Název": _title("Roklinka")})
+    npc_id = outbox.enqueue_create(
+        EntityType.NPC, "npc_db", {"Jméno": _title("Elrond"), "Lokace": {"relation": [{"id": location_id}]}}
+    )
+    outbox.enqueue_update(EntityType.NPC, npc_id, {"Stav": {"select": {"name": "Zraněný"}}})
+
+    created = []
+    assert outbox.flush(client, on_created=lambda provisional_id, page: created.append((provisional_id, page["id"]))) == 3
+
+    assert is_provisional_id(npc_id)
+    assert client.create_page.call_args_list[1].kwargs["properties"]["Lokace"] == {"relation": [{"id": "page-location"}]}
+    client.update_page.assert_called_once_with(page_id="page-npc", properties={"Stav": {"select": {"name": "Zraněný"}}})
+    assert created == [(location_id, "page-location"), (npc_id, "page-npc")]
+    assert outbox.resolve_id(npc_id) == "page-npc"
+    assert outbox.pending_count() == 0
+
+
+@pytest.mark.parametrize("clock", [1000.0], indirect=True)
+def test_retry_adopts_page_created_by_lost_attempt(clock):
+    """
+    Test, že opakované vytvoření nejprve dohledá stránku z předchozího pokusu.
+    """
+    outbox = NotionOutbox(clock=clock, backoff=5.0)
+    client = MagicMock()
+    client.create_page.side_effect = TimeoutError("timeout")
+    client.query_database.return_value = [{"id": "page-npc"}]
+
+    npc_id = outbox.enqueue_create(EntityType.NPC, "npc_db", {"Jméno": _title("Elrond")})
+
+    assert outbox.flush(client) == 0
+    assert outbox.pending_count() == 1
+    assert outbox.flush(client) == 0  # Čeká se na uplynutí prodlevy
+
+    clock.now += 5.0
+    assert outbox.flush(client) == 1
+    assert client.create_page.call_count == 1
+    assert outbox.resolve_id(npc_id) == "page-npc"
+
+    # Notion zaokrouhluje čas vytvoření stránky na minuty
+    since = client.query_database.call_args.kwargs["filter"]["and"][1]["created_time"]["on_or_after"]
+    assert since.endswith(":00+00:00")
+
+
+def test_permanent_failure_and_idempotency_key():
+    """
+    Test trvalé chyby a ignorování opakovaného vložení se stejným klíčem.
+    """
+    outbox = NotionOutbox()
+    client = MagicMock()
+    error = Exception("validation_error")
+    error.status = 400
+    client.create_page.side_effect = error
+
+    first = outbox.enqueue_create(EntityType.NPC, "npc_db", {"Jméno": _title("Elrond")}, idempotency_key="npc:elrond")
+    second = outbox.enqueue_create(EntityType.NPC, "npc_db", {"Jméno": _title("Elrond")}, idempotency_key="npc:elrond")
+    outbox.enqueue_update(EntityType.NPC, first, {"Stav": {"select": {"name": "Mrtvý"}}})
+
+    assert first == second
+    assert outbox.flush(client) == 0
+    assert [row["operation"] for row in outbox.failed()] == ["create", "update"]
+    assert outbox.pending_count() == 0
+
+
+def test_derived_idempotency_keys_dedupe_pending_operations():
+    """
+    Test, že bez zadaného klíče se stejná čekající operace vloží jen jednou a po provedení znovu.
+    """
+    outbox = NotionOutbox()
+    client = MagicMock()
+    client.create_page.return_value = {"id": "page-npc"}
+
+    first = outbox.enqueue_create(EntityType.NPC, "npc_db", {"Jméno": _title("Elrond")})
+    second = outbox.enqueue_create(EntityType.NPC, "npc_db", {"Jméno": _title("Elrond")})
+    for _ in range(2):
+        outbox.enqueue_update(EntityType.NPC, first, {"Stav": {"select": {"name": "Mrtvý"}}})
+
+    assert first == second
+    assert outbox.pending_count() == 2
+    assert outbox.flush(client) == 2
+
+    outbox.enqueue_update(EntityType.NPC, first, {"Stav": {"select": {"name": "Mrtvý"}}})
+    assert outbox.pending_count() == 1
+
+
+def test_crash_after_create_does_not_duplicate_page(tmp_path):
+    """
+    Test, že po pádu procesu mezi vytvořením stránky a jeho zaznamenáním se stránka dohledá.
+    """
+    path = tmp_path / "outbox.sqlite3"
+    outbox = NotionOutbox(path)
+    outbox.enqueue_create(EntityType.NPC, "npc_db", {"Jméno": _title("Elrond")})
+    client = MagicMock()
+    client.create_page.side_effect = KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        outbox.flush(client)
+    outbox.close()
+
+    reopened = NotionOutbox(path)
+    client = MagicMock()
+    client.query_database.return_value = [{"id": "page-npc"}]
+
+    assert reopened.flush(client) == 1
+    client.query_database.assert_called_once()
+    client.create_page.assert_not_called()
+
+
+def test_outbox_survives_restart(tmp_path):
+    """
+    Test, že čekající zápisy přežijí uzavření a znovuotevření fronty.
+    """
+    path = tmp_path / "outbox.sqlite3"
+    outbox = NotionOutbox(path)
+    outbox.enqueue_create(EntityType.NPC, "npc_db", {"Jméno": _title("Elrond")})
+    outbox.close()
+
+    reopened = NotionOutbox(path)
+    assert reopened.pending_count() == 1
+
+
+def test_repository_create_returns_provisional_entity(repository_factory):
+    """
+    Test, že repozitář s frontou vrátí entitu okamžitě a po zápisu jí doplní skutečné ID.
+    """
+    repository = repository_factory(outbox=NotionOutbox(), start_flusher=False)
+    client = repository.client
+    client.create_page.return_value = {"id": "page-npc"}
+    entity_manager = repository.entity_manager
+
+    npc = repository.create_npc(NPC(name="Elrond", description="Pán Roklinky"))
+
+    entity_manager.create_npc.assert_not_called()
+    assert is_provisional_id(npc.notion_page_id)
+    assert repository.find_by_id(EntityType.NPC, npc.notion_page_id) is npc
+
+    npc.tags.append("Spojenec")
+    repository.save_changes(npc)
+
+    assert repository.flush_outbox() == 2
+    assert npc.id == npc.notion_page_id == "page-npc"
+    client.update_page.assert_called_once_with(page_id="page-npc", properties={"Tagy": {"multi_select": [{"name": "Spojenec"}]}})
+    assert client.create_page.call_args.kwargs["properties"] == {
+        "Jméno": _title("Elrond"),
+        "Popis": {"rich_text": [{"type": "text", "text": {"content": "Pán Roklinky"}}]},
+        "Stav": {"select": {"name": "Živý"}},
+    }
+
+
+def test_created_page_id_is_applied_on_callers_thread(repository_factory):
+    """
+    Test, že vlákno fronty jen zaznamená ID vytvořené stránky a entitě ho doplní až volající.
+    """
+    outbox = NotionOutbox()
+    repository = repository_factory(outbox=outbox, start_flusher=False)
+    client = repository.client
+    client.create_page.return_value = {"id": "page-npc"}
+    npc = repository.create_npc(NPC(name="Elrond"))
+    provisional_id = npc.notion_page_id
+
+    # Zápis provedený vláknem fronty (mimo repozitář)
+    outbox.flush(client, on_created=repository._on_page_created)
+    assert npc.notion_page_id == provisional_id
+
+    assert repository.find_by_name(EntityType.NPC, "Elrond") is npc
+    assert npc.id == npc.notion_page_id == "page-npc"
+    assert not npc.is_dirty
@@ -0,0 +1,112 @@
+"""
+Testy pro dávkový zápis relací (RelationWriter).
+"""
+from unittest.mock import patch
+
+import pytest
+
+from rpg_notion.models.entities import NPC, EntityType, Item, ItemType, Location, LocationType
+from rpg_notion.models.relation_writer import RelationWriter
+
+def test_add_fills_inverse_side_and_deduplicates(repository):
+    """
+    Test doplnění inverzní strany relace a deduplikace hran.
+    """
+    gandalf = NPC(id="npc-1", notion_page_id="npc-1", name="Gandalf", item_ids=["item-0"])
+    staff = Item(id="item-1", notion_page_id="item-1", name="Hůl", item_type=ItemType.ARTIFACT)
+    writer = RelationWriter(repository)
+
+    writer.add(gandalf, "item_ids", staff)
+    writer.add(gandalf, "item_ids", staff)
+
+    assert len(writer) == 2
+    assert writer.apply() == [gandalf, staff]
+    assert gandalf.item_ids == ["item-0", "item-1"]
+    assert staff.owner_id == "npc-1"
+
+    writer.add(gandalf, "item_ids", staff)
+    assert writer.apply() == []
+
+
+def test_add_rejects_unknown_field(repository):
+    """
+    Test, že neznámé relační pole vyvolá chybu.
+    """
+    writer = RelationWriter(repository)
+
+    with pytest.raises(ValueError):
+        writer.add(NPC(id="npc-1", name="Gandalf"), "npc_ids", NPC(id="npc-2", name="Frodo"))
+
+
+def test_flush_saves_each_page_once(repository):
+    """
+    Test, že se všechny relace jedné stránky uloží jedinou aktualizací.
+    """
+    tavern = Location(id="loc-1", notion_page_id="loc-1", name="Hostinec", location_type=LocationType.CITY)
+    npcs = [NPC(id=f"npc-{i}", notion_page_id=f"npc-{i}", name=f"Host {i}") for i in range(3)]
+    writer = RelationWriter(repository)
+
+    for npc in npcs:
+        writer.add(tavern, "npc_ids", npc)
+    writer.flush()
+
+    calls = repository.entity_manager.update_entity.call_args_list
+    assert [call.args[0] for call in calls] == ["loc-1", "npc-0", "npc-1", "npc-2"]
+    assert calls[0].args[1] == {"Obyvatelé": {"relation": [{"id": f"npc-{i}"} for i in range(3)]}}
+
+
+def test_overwriting_single_relation_removes_old_inverse(repository):
+    """
+    Test, že přesun NPC do jiné lokace ho odebere z obyvatel původní lokace.
+    """
+    old = Location(id="loc-1", notion_page_id="loc-1", name="Kraj", location_type=LocationType.VILLAGE)
+    new = Location(id="loc-2", notion_page_id="loc-2", name="Roklinka", location_type=LocationType.CITY)
+    frodo = NPC(id="npc-1", notion_page_id="npc-1", name="Frodo", location_id="loc-1")
+    old.npc_ids = ["npc-1", "npc-2"]
+    writer = RelationWriter(repository)
+
+    with patch.object(repository, "find_by_id", return_value=old) as find_by_id:
+        writer.add(frodo, "location_id", new)
+        assert writer.apply() == [frodo, new, old]
+
+    find_by_id.assert_called_once_with(EntityType.LOCATION, "loc-1")
+    assert frodo.location_id == "loc-2"
+    assert new.npc_ids == ["npc-1"]
+    assert old.npc_ids == ["npc-2"]
+
+
+def test_overwriting_single_relation_uses_pending_previous_target(repository):
+    """
+    Test, že původní cíl zpracovávaný ve stejné dávce se nenačítá a přidání ho znovu nevrátí.
+    """
+    old = Location(id="loc-1", notion_page_id="loc-1", name="Kraj", location_type=LocationType.VILLAGE)
+    new = Location(id="loc-2", notion_page_id="loc-2", name="Roklinka", location_type=LocationType.CITY)
+    frodo = NPC(id="npc-1", notion_page_id="npc-1", name="Frodo")
+    writer = RelationWriter(repository)
+
+    with patch.object(repository, "find_by_id") as find_by_id:
+        writer.add(old, "npc_ids", frodo)
+        writer.add(frodo, "location_id", new)
+        writer.apply()
+
+    find_by_id.assert_not_called()
+    assert frodo.location_id == "loc-2"
+    assert old.npc_ids == []
+    assert new.npc_ids == ["npc-1"]
+
+
+def test_save_changes_limits_long_relations(repository):
+    """
+    Test, že se relace s více než 100 odkazy zkrátí na nejnovější odkazy a zůstane neuložená.
+    """
+    npc = NPC(id="npc-1", notion_page_id="npc-1", name="Gandalf")
+    npc.item_ids = [f"item-{i}" for i in range(250)]
+    npc.description = "Mocný čaroděj"
+
+    repository.save_changes(npc)
+
+    repository.entity_manager.update_entity.assert_called_once()
+    patch = repository.entity_manager.update_entity.call_args.args[1]
+    assert patch["Významné předměty"]["relation"] == [{"id": f"item-{i}"} for i in range(150, 250)]
+    assert "Popis" in patch
+    assert npc.dirty_fields() == {"item_ids"}
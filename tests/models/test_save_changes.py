@@ -0,0 +1,65 @@
+"""
+Testy pro ukládání změn entit (EntityRepository.save_changes).
+"""
+from datetime import datetime, timezone
+
+import pytest
+
+from rpg_notion.models.converters import NotionConverter
+from rpg_notion.models.entities import NPC, NPCStatus
+
+def test_entity_to_properties_only_selected_fields():
+    """
+    Test převodu vybraných polí entity na vlastnosti Notion.
+    """
+    npc = NPC(name="Gandalf", location_id=None, tags=["Spojenec"], status=NPCStatus.INJURED)
+
+    properties = NotionConverter.entity_to_properties(npc, {"tags", "status", "location_id", "updated_at"})
+
+    assert properties == {
+        "Tagy": {"multi_select": [{"name": "Spojenec"}]},
+        "Stav": {"select": {"name": "Zraněný"}},
+        "Lokace": {"relation": []},
+    }
+
+
+def test_save_changes_sends_minimal_patch(repository):
+    """
+    Test, že se odešle jediná aktualizace jen se změněnými poli.
+    """
+    npc = NPC(id="page-1", notion_page_id="page-1", name="Gandalf", description="Mocný čaroděj")
+    npc.tags.append("Spojenec")
+    npc.history = "Porazil balroga."
+
+    repository.save_changes(npc)
+
+    repository.entity_manager.update_entity.assert_called_once_with("page-1", {
+        "Tagy": {"multi_select": [{"name": "Spojenec"}]},
+        "Historie změn": {"rich_text": [{"type": "text", "text": {"content": "Porazil balroga."}}]},
+    })
+    assert not npc.is_dirty
+    assert npc.updated_at == datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+    assert repository.cache.lookup(npc.type, "Gandalf") == (True, npc)
+
+
+def test_save_changes_skips_unchanged_entity(repository):
+    """
+    Test, že se nezměněná entita neukládá.
+    """
+    npc = NPC(notion_page_id="page-1", name="Gandalf")
+    npc.description = ""
+
+    repository.save_changes(npc)
+
+    repository.entity_manager.update_entity.assert_not_called()
+
+
+def test_save_changes_requires_page_id(repository):
+    """
+    Test, že změněnou entitu bez notion_page_id nelze uložit.
+    """
+    npc = NPC(name="Gandalf")
+    npc.description = "Mocný čaroděj"
+
+    with pytest.raises(ValueError):
+        repository.save_changes(npc)
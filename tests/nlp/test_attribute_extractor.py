@@ -0,0 +1,71 @@
+"""
+Testy pro AttributeExtractor.
+"""
+import pytest
+import spacy
+
+from rpg_notion.nlp.attribute_extractor import AttributeExtractor
+from rpg_notion.nlp.parsed_text import ParsedText
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    """
+    Fixture pro prázdnou českou pipeline s rozdělením na věty.
+    """
+    nlp = spacy.blank("cs")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    """
+    Fixture pro AttributeExtractor nad prázdným modelem.
+    """
+    return AttributeExtractor(model_name="blank:cs")
+
+
+def test_npc_attributes(nlp, extractor):
+    """
+    Test extrakce atributů NPC včetně stavu a povolání.
+    """
+    parsed = ParsedText(nlp("Gandalf je mocný čaroděj z Valinoru. Gandalf byl zraněn. Gandalf se nachází v Roklince."))
+
+    attributes = extractor.extract_npc_attributes(parsed, "gandalf")
+
+    assert attributes["description"] == "mocný čaroděj z Valinoru zraněn"
+    assert attributes["status"] == "Zraněný"
+    assert attributes["occupation"] == "mocný čaroděj z Valinoru"
+    assert attributes["location"] == "Roklince"
+
+
+def test_location_and_item_attributes_share_scans(nlp, extractor):
+    """
+    Test, že šablony se pro jeden text vyhodnotí jednou a sdílí se mezi entitami.
+    """
+    parsed = ParsedText(nlp("Město Brée je nebezpečné. Meč Žihadlo patřil Bilbovi. Žihadlo může svítit."))
+
+    location = extractor.extract_location_attributes(parsed, "Brée")
+    cached_keys = set(parsed._cache)
+    item = extractor.extract_item_attributes(parsed, "Žihadlo")
+
+    assert location["location_type"] == "Město"
+    assert location["status"] == "Nebezpečné"
+    assert item["item_type"] == "Zbraň"
+    assert item["ownership_history"] == "Bilbovi"
+    assert item["special_abilities"] == "svítit"
+    assert any(key.startswith("attribute_tail:") for key in cached_keys)
+    assert cached_keys <= set(parsed._cache)
+
+
+def test_monster_attributes(nlp, extractor):
+    """
+    Test extrakce slabin a silných stránek příšery.
+    """
+    parsed = ParsedText(nlp("Smak je slabý vůči šípům. Smak je odolný proti ohni. Souboj s Smak skončil útěkem."))
+
+    attributes = extractor.extract_monster_attributes(parsed, "Smak")
+
+    assert attributes["weaknesses_strengths"] == "Slabiny: šípům; Silné stránky: ohni"
+    assert attributes["combat_history"] == "skončil útěkem"
@@ -0,0 +1,61 @@
+"""
+Testy pro EntityCategorizer.
+"""
+import pytest
+import spacy
+
+from rpg_notion.models.entities import EntityType
+from rpg_notion.nlp.categorizer import EntityCategorizer
+from rpg_notion.nlp.parsed_text import ParsedText
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    """
+    Fixture pro prázdnou českou pipeline s rozdělením na věty.
+    """
+    nlp = spacy.blank("cs")
+    nlp.add_pipe("sentencizer")
+    return nlp
+
+
+@pytest.fixture(scope="module")
+def categorizer():
+    """
+    Fixture pro EntityCategorizer nad prázdným modelem.
+    """
+    return EntityCategorizer(model_name="blank:cs")
+
+
+def test_tags_from_sentences_mentioning_entity(nlp, categorizer):
+    """
+    Test, že se tagy berou jen z vět, které entitu zmiňují.
+    """
+    parsed = ParsedText(nlp("Bilbo je obchodník a přítel trpaslíků. Smaug je nepřítel všech."))
+
+    assert categorizer.categorize_npc(parsed, "Bilbo") == ["Spojenec", "Obchodník"]
+    assert categorizer.categorize_npc(parsed, "Smaug") == ["Nepřítel"]
+    assert categorizer.categorize_npc(parsed, "Thorin") == []
+
+
+def test_multiword_keywords(nlp, categorizer):
+    """
+    Test víceslovných klíčových slov.
+    """
+    parsed = ParsedText(nlp("Záchrana princezny má časový limit do úplňku."))
+
+    assert categorizer.categorize_quest(parsed, "Záchrana princezny") == ["Časově omezený"]
+
+
+def test_single_sweep_shared_across_entities(nlp, categorizer):
+    """
+    Test, že se dokument projde jednou a výsledek sdílí všechny typy entit.
+    """
+    parsed = ParsedText(nlp("Lich je legendární nemrtvá příšera. Bitva u Morie byla klíčová."))
+
+    assert categorizer.categorize_entity(parsed, "Lich", EntityType.MONSTER) == ["Unikátní", "Nemrtvá"]
+    sweeps = [key for key in parsed._cache if key.startswith("categorizer_sweep")]
+    assert len(sweeps) == 1
+
+    assert categorizer.categorize_entity(parsed, "Bitva u Morie", EntityType.EVENT) == ["Souboj", "Důležitá"]
+    assert [key for key in parsed._cache if key.startswith("categorizer_sweep")] == sweeps
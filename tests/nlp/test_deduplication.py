@@ -0,0 +1,65 @@
+"""
+Testy pro EntityDeduplicator.
+"""
+from rpg_notion.models.entities import NPC, Location, LocationType
+from rpg_notion.nlp.deduplication import EntityDeduplicator
+from rpg_notion.nlp.entity_matcher import EntityMatcher
+
+
+def _names(groups):
+    return sorted(sorted(entity.name for entity in group) for group in groups)
+
+
+def test_clusters_are_transitive_and_order_independent():
+    """
+    Test, že skupiny vznikají tranzitivně a nezávisí na pořadí entit.
+    """
+    names = ["Gandalf Šedý", "Bilbo Pytlík", "Gandalf Sedy", "Gandalf Sedyy", "Smaug", "Bilbo Pytlik"]
+    entities = [NPC(name=name) for name in names]
+    deduplicator = EntityDeduplicator(threshold=0.8)
+
+    expected = [["Bilbo Pytlik", "Bilbo Pytlík"], ["Gandalf Sedy", "Gandalf Sedyy", "Gandalf Šedý"], ["Smaug"]]
+    assert _names(deduplicator.find_clusters(entities)) == expected
+    assert _names(deduplicator.find_clusters(list(reversed(entities)))) == expected
+
+
+def test_typo_at_start_of_name_is_grouped():
+    """
+    Test, že se seskupí i názvy s překlepem na začátku, u malých i velkých množin entit.
+    """
+    assert _names(EntityMatcher().group_similar_entities([NPC(name="Frodo"), NPC(name="Fordo")])) == [
+        ["Fordo", "Frodo"]
+    ]
+
+    entities = [NPC(name="Frodo Pytlík"), NPC(name="Fordo Pytlík"), NPC(name="Smaug"), NPC(name="Elrond")]
+    clusters = EntityDeduplicator(exhaustive_max_size=0).find_clusters(entities)
+    assert _names(clusters) == [["Elrond"], ["Fordo Pytlík", "Frodo Pytlík"], ["Smaug"]]
+
+
+def test_different_types_are_not_grouped():
+    """
+    Test, že se entity různých typů neslučují.
+    """
+    entities = [NPC(name="Roklinka"), Location(name="Roklinka", location_type=LocationType.CITY)]
+
+    assert len(EntityMatcher().group_similar_entities(entities)) == 2
+
+
+def test_merge_plans_keep_existing_entity():
+    """
+    Test, že plán sloučení ponechává entitu, která už existuje v Notion.
+    """
+    new_entity = NPC(name="Thorin Pavéza", tags=["Důležitý"])
+    existing = NPC(id="page-1", name="Thorin Paveza")
+    other = NPC(name="Smaug")
+
+    plans = EntityDeduplicator().plan_merges([new_entity, other, existing])
+
+    assert len(plans) == 1
+    assert plans[0].keep is existing
+    assert plans[0].duplicates == [new_entity]
+    assert plans[0].similarity == 1.0
+
+    merged = EntityMatcher().merge_entities(plans[0].entities)
+    assert merged is existing
+    assert merged.tags == ["Důležitý"]
@@ -0,0 +1,56 @@
+"""
+Testy pro EntityMatcher a EntityNameIndex.
+"""
+import pytest
+
+from rpg_notion.models.entities import NPC
+from rpg_notion.nlp.entity_matcher import EntityMatcher, EntityNameIndex
+from rpg_notion.nlp.names import normalize_name
+
+
+@pytest.fixture
+def entities():
+    """
+    Fixture pro seznam NPC.
+    """
+    names = ["Gandalf Šedý", "Gandalf Bílý", "Bilbo Pytlík", "Frodo Pytlík", "Smaug", "Thorin Pavéza"]
+    return [NPC(name=name) for name in names]
+
+
+def test_normalize_name():
+    """
+    Test normalizace názvu.
+    """
+    assert normalize_name("  Žluťoučký   KŮŇ! ") == "zlutoucky kun"
+
+
+def test_index_matches_linear_search(entities):
+    """
+    Test, že vyhledávání v indexu vrací stejné výsledky jako průchod seznamem.
+    """
+    matcher = EntityMatcher(threshold=0.5)
+    index = matcher.build_index(entities)
+
+    for query in ["gandalf sedy", "Bilbo Pytlik", "Frodo", "Smaugg", "Torin Paveza", "Aragorn"]:
+        assert matcher.find_matching_entities(query, index) == matcher.find_matching_entities(query, entities)
+        assert matcher.find_matching_entity(query, index) is matcher.find_matching_entity(query, entities)
+
+
+def test_index_add_and_remove(entities):
+    """
+    Test přidání a odebrání entity z indexu.
+    """
+    index = EntityNameIndex(entities)
+    smaug = entities[4]
+
+    assert len(index) == 6
+    assert index.search("Smaug", threshold=0.9) == [(smaug, 1.0)]
+
+    assert index.remove(smaug) is True
+    assert index.remove(smaug) is False
+    assert smaug not in index
+    assert index.search("Smaug", threshold=0.9) == []
+
+    index.add(smaug)
+    assert index.search("smaug", threshold=0.9) == [(smaug, 1.0)]
+    assert index.entities[-1] is smaug
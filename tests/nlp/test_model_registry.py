@@ -0,0 +1,72 @@
+"""
+Testy pro SpacyModelRegistry.
+"""
+import pytest
+
+from rpg_notion.nlp.attribute_extractor import AttributeExtractor
+from rpg_notion.nlp.categorizer import EntityCategorizer
+from rpg_notion.nlp.model_registry import SpacyModelRegistry, get_model_registry
+from rpg_notion.nlp.ner import EntityExtractor
+
+
+@pytest.fixture
+def registry():
+    """
+    Fixture pro prázdný registr modelů.
+    """
+    return SpacyModelRegistry()
+
+
+@pytest.fixture
+def default_registry():
+    """
+    Fixture, která po testu vyprázdní výchozí registr modelů.
+    """
+    registry = get_model_registry()
+    registry.clear()
+    yield registry
+    registry.clear()
+
+
+def test_get_returns_shared_instance(registry):
+    """
+    Test, že stejný model se načte jen jednou a vyloučené komponenty jsou součástí klíče.
+    """
+    nlp = registry.get("blank:cs")
+
+    assert registry.get("blank:cs") is nlp
+    assert registry.get("blank:cs", exclude=["ner"]) is not nlp
+    assert [stats["exclude"] for stats in registry.stats()] == [[], ["ner"]]
+
+
+def test_consumers_share_one_unmodified_model(default_registry):
+    """
+    Test, že extraktory a kategorizátor sdílejí jeden model, který extraktor entit nemění.
+    """
+    attribute_extractor = AttributeExtractor(model_name="blank:cs")
+    categorizer = EntityCategorizer(model_name="blank:cs")
+    first = EntityExtractor(model_name="blank:cs")
+    second = EntityExtractor(model_name="blank:cs")
+
+    assert first.nlp is second.nlp is attribute_extractor.nlp is categorizer.nlp
+    assert first.nlp.pipe_names == []
+    assert len(default_registry.stats()) == 1
+
+
+def test_gazetteer_terms_do_not_leak_between_extractors(default_registry):
+    """
+    Test, že kampaňové výrazy jednoho extraktoru neovlivní jiný extraktor ani sdílený model.
+    """
+    first = EntityExtractor(model_name="blank:cs")
+    second = EntityExtractor(model_name="blank:cs")
+
+    first.add_gazetteer_terms("PERSON", ["Aragorn"])
+    first.add_gazetteer_terms("LOCATION", ["Minas Tirith"])
+
+    text = "Aragorn dorazil do Minas Tirith."
+    assert [(ent.text, ent.label_) for ent in first.parse(text).doc.ents] == [
+        ("Aragorn", "PERSON"), ("Minas Tirith", "LOCATION")
+    ]
+    assert list(second.parse(text).doc.ents) == []
+    assert first.nlp is second.nlp
+    assert len(default_registry.stats()) == 1
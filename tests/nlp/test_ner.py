@@ -0,0 +1,107 @@
+"""
+Testy pro komponentu fantasy_ner.
+"""
+import json
+from unittest.mock import MagicMock
+
+import pytest
+import spacy
+from spacy.tokens import Span
+
+from rpg_notion.nlp.ner import EntityExtractor
+
+
+@pytest.fixture
+def nlp():
+    """
+    Fixture pro prázdnou českou pipeline s komponentou fantasy_ner.
+    """
+    nlp = spacy.blank("cs")
+    nlp.add_pipe("fantasy_ner")
+    return nlp
+
+
+def _ents(doc):
+    return [(ent.text, ent.label_) for ent in doc.ents]
+
+
+def test_recognizes_default_gazetteer_terms(nlp):
+    """
+    Test rozpoznání výrazů z výchozích gazetteerů bez ohledu na velikost písmen.
+    """
+    doc = nlp("Rytíř vytasil meč a vstoupil do jeskyně, kde spal Drak.")
+
+    assert _ents(doc) == [("Rytíř", "PERSON"), ("meč", "ITEM"), ("jeskyně", "LOCATION"), ("Drak", "MONSTER")]
+
+
+def test_matches_lemma_when_available(nlp):
+    """
+    Test rozpoznání ohebného tvaru podle lemmatu.
+    """
+    doc = nlp.make_doc("Viděli jsme draka.")
+    doc[2].lemma_ = "drak"
+
+    doc = nlp.get_pipe("fantasy_ner")(doc)
+
+    assert _ents(doc) == [("draka", "MONSTER")]
+
+
+def test_existing_entities_take_precedence(nlp):
+    """
+    Test, že entity rozpoznané dříve v pipeline se nepřepisují.
+    """
+    doc = nlp.make_doc("Král Theoden přijel.")
+    doc.ents = [Span(doc, 0, 2, label="PERSON")]
+
+    doc = nlp.get_pipe("fantasy_ner")(doc)
+
+    assert _ents(doc) == [("Král Theoden", "PERSON")]
+
+
+def test_custom_gazetteer_terms(nlp, tmp_path):
+    """
+    Test přidání kampaňových výrazů za běhu i ze souboru.
+    """
+    nlp.get_pipe("fantasy_ner").add_terms("PERSON", ["Aragorn", "Bílá paní"])
+    path = tmp_path / "gazetteer.json"
+    path.write_text(json.dumps({"LOCATION": ["Minas Tirith"]}), encoding="utf-8")
+    nlp.get_pipe("fantasy_ner").load_gazetteer(path)
+
+    doc = nlp("Aragorn a bílá paní dorazili do Minas Tirith.")
+
+    assert _ents(doc) == [("Aragorn", "PERSON"), ("bílá paní", "PERSON"), ("Minas Tirith", "LOCATION")]
+
+
+def test_gazetteer_from_config():
+    """
+    Test předání gazetteerů v konfiguraci komponenty.
+    """
+    nlp = spacy.blank("cs")
+    nlp.add_pipe("fantasy_ner", config={"gazetteers": {"ITEM": ["Andúril"]}})
+
+    assert _ents(nlp("Nesl Andúril.")) == [("Andúril", "ITEM")]
+
+
+def test_parse_many_keeps_order_and_is_lazy():
+    """
+    Test dávkového parsování: pořadí výsledků, předání batch_size a líné čtení vstupu.
+    """
+    extractor = EntityExtractor(model_name="blank:cs")
+    extractor.nlp = MagicMock(wraps=spacy.blank("cs"))
+    consumed = []
+
+    def texts():
+        for index in range(5):
+            consumed.append(index)
+            yield f"Drak číslo {index}."
+
+    parsed = extractor.parse_many(texts(), batch_size=2)
+    assert consumed == []
+
+    first = next(parsed)
+    assert first.text == "Drak číslo 0."
+    assert len(consumed) < 5
+    assert [item.text for item in parsed] == [f"Drak číslo {index}." for index in range(1, 5)]
+    assert _ents(first.doc) == [("Drak", "MONSTER")]
+    extractor.nlp.pipe.assert_called_once()
+    assert extractor.nlp.pipe.call_args.kwargs == {"batch_size": 2, "n_process": 1}
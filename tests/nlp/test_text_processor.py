@@ -0,0 +1,151 @@
+"""
+Testy pro TextProcessor.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+import spacy
+
+from rpg_notion.models.entities import EntityType, NPC, NPCStatus
+from rpg_notion.nlp.attribute_extractor import AttributeExtractor
+from rpg_notion.nlp.categorizer import EntityCategorizer
+from rpg_notion.nlp.ner import EntityExtractor
+from rpg_notion.nlp.text_processor import TextProcessor
+
+
+class CountingNLP:
+    """
+    Pipeline spaCy, která počítá parsované texty.
+    """
+
+    def __init__(self, nlp):
+        """
+        Inicializace počítající pipeline.
+
+        Args:
+            nlp: Skutečná pipeline spaCy.
+        """
+        self.nlp = nlp
+        self.parsed_texts = []
+
+    def __call__(self, text, disable=()):
+        self.parsed_texts.append(text)
+        return self.nlp(text, disable=disable)
+
+    def pipe(self, texts, **kwargs):
+        for doc in self.nlp.pipe(texts, **kwargs):
+            self.parsed_texts.append(doc.text)
+            yield doc
+
+
+@pytest.fixture
+def nlp():
+    """
+    Fixture pro počítající prázdnou českou pipeline s rozdělením na věty.
+    """
+    nlp = spacy.blank("cs")
+    nlp.add_pipe("sentencizer")
+    return CountingNLP(nlp)
+
+
+@pytest.fixture
+def processor(nlp):
+    """
+    Fixture pro TextProcessor nad počítající pipeline a mock repozitářem.
+
+    Pipeline extraktoru atributů a kategorizátoru se nesmí volat vůbec.
+    """
+    entity_extractor = EntityExtractor(model_name="blank:cs")
+    entity_extractor.nlp = nlp
+    attribute_extractor = AttributeExtractor(model_name="blank:cs")
+    attribute_extractor.nlp = CountingNLP(attribute_extractor.nlp)
+    entity_categorizer = EntityCategorizer(model_name="blank:cs")
+    entity_categorizer.nlp = CountingNLP(entity_categorizer.nlp)
+
+    repository = MagicMock()
+    repository.find_many_by_types.side_effect = lambda names_by_type: {entity_type: {} for entity_type in names_by_type}
+    repository.create_npc.side_effect = lambda entity: entity
+    repository.create_location.side_effect = lambda entity: entity
+    repository.create_monster.side_effect = lambda entity: entity
+    repository.create_item.side_effect = lambda entity: entity
+    relation_writer = MagicMock()
+    relation_writer.apply.return_value = []
+
+    return TextProcessor(
+        entity_repository=repository,
+        entity_extractor=entity_extractor,
+        attribute_extractor=attribute_extractor,
+        entity_categorizer=entity_categorizer,
+        relation_writer=relation_writer,
+    )
+
+
+def test_process_text_parses_once(nlp, processor):
+    """
+    Test, že se text během jednoho tahu parsuje jednou a všem komponentám se předá stejný ParsedText.
+    """
+    received = []
+
+    def record(original):
+        def wrapper(parsed, *args):
+            received.append(parsed)
+            return original(parsed, *args)
+        return wrapper
+
+    for component, method in (
+        (processor.entity_extractor, "extract_entities"),
+        (processor.entity_extractor, "extract_relationships"),
+        (processor.attribute_extractor, "extract_npc_attributes"),
+        (processor.attribute_extractor, "extract_location_attributes"),
+        (processor.entity_categorizer, "categorize_npc"),
+        (processor.entity_categorizer, "categorize_location"),
+    ):
+        setattr(component, method, record(getattr(component, method)))
+
+    text = "Rytíř vytasil meč a vstoupil do jeskyně, kde spal Drak."
+    result = processor.process_text(text)
+
+    assert [npc.name for npc in result[EntityType.NPC.value]] == ["Rytíř"]
+    assert [location.name for location in result[EntityType.LOCATION.value]] == ["jeskyně"]
+    assert nlp.parsed_texts == [text]
+    assert processor.attribute_extractor.nlp.parsed_texts == []
+    assert processor.entity_categorizer.nlp.parsed_texts == []
+    assert len(received) == 6
+    assert all(parsed is received[0] for parsed in received)
+
+
+def test_process_texts_parses_in_batches(nlp, processor):
+    """
+    Test, že proud textů se parsuje dávkově a výsledky se vrací líně ve stejném pořadí.
+    """
+    texts = ["Rytíř vstoupil do jeskyně.", "Kovář ukoval meč.", "Drak spal."]
+
+    results = processor.process_texts(iter(texts), batch_size=2)
+    assert nlp.parsed_texts == []
+
+    npcs = [[npc.name for npc in result[EntityType.NPC.value]] for result in results]
+
+    assert npcs == [["Rytíř"], ["Kovář"], []]
+    assert nlp.parsed_texts == texts
+    assert processor.entity_repository.create_monster.call_args.args[0].name == "Drak"
+
+
+def test_update_keeps_status_not_mentioned_in_text(processor):
+    """
+    Test, že tah bez zmínky o stavu NPC stav nemění a entitu neoznačí jako změněnou.
+    """
+    npc = NPC(name="Rytíř", notion_page_id="page-1", status=NPCStatus.DEAD)
+    npc.mark_clean()
+    processor.entity_repository.find_many_by_types.side_effect = lambda names_by_type: {
+        entity_type: {"Rytíř": npc} if entity_type == EntityType.NPC else {} for entity_type in names_by_type
+    }
+
+    processor.process_text("Rytíř vstoupil do jeskyně.")
+    assert npc.status == NPCStatus.DEAD
+    assert "status" not in npc.dirty_fields()
+
+    parsed = processor.entity_extractor.parse("Rytíř je mrtvý.")
+    assert processor.attribute_extractor.extract_npc_attributes(parsed, "Rytíř")["status"] == "Mrtvý"
+    processor.process_text(parsed)
+    assert npc.status is NPCStatus.DEAD
+    assert "status" not in npc.dirty_fields()
@@ -0,0 +1,3 @@
+"""
+Testy pro pomocné utility.
+"""
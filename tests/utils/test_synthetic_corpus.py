@@ -0,0 +1,51 @@
+"""
+Testy pro generátor syntetických záznamů her.
+"""
+import pytest
+
+from rpg_notion.models.entities import EntityType
+from rpg_notion.utils.synthetic_corpus import generate_corpus
+
+
+def test_corpus_is_deterministic():
+    """
+    Test, že stejné parametry dávají stejný korpus a jiné semínko jiný.
+    """
+    first = generate_corpus(2000, seed=7)
+    second = generate_corpus(2000, seed=7)
+    other = generate_corpus(2000, seed=8)
+
+    assert first.text == second.text
+    assert first.turns == second.turns
+    assert first.text != other.text
+
+
+def test_corpus_size_and_turns():
+    """
+    Test, že korpus má požadovaný počet slov a je rozdělen na tahy.
+    """
+    corpus = generate_corpus(5000, turn_words=100)
+
+    assert 5000 <= corpus.word_count < 5000 + 20
+    assert all(len(text.split()) < 100 + 20 for text, _ in corpus.turns)
+    assert len(corpus.turns) >= 5000 // 120
+
+
+def test_entity_density_controls_mentions():
+    """
+    Test, že hustota entit určuje počet zmínek a zmínky odpovídají textu tahu.
+    """
+    empty = generate_corpus(3000, entity_density=0.0)
+    sparse = generate_corpus(3000, entity_density=0.1)
+    dense = generate_corpus(3000, entity_density=0.9)
+
+    assert empty.mention_count == 0
+    assert sparse.mention_count < dense.mention_count
+    for text, mentions in dense.turns:
+        for entity_type, name in mentions:
+            assert name in text
+            assert name in dense.entities[entity_type]
+    assert set(dense.entities) == {EntityType.NPC, EntityType.LOCATION, EntityType.MONSTER, EntityType.ITEM}
+
+    with pytest.raises(ValueError):
+        generate_corpus(1000, entity_density=1.5)